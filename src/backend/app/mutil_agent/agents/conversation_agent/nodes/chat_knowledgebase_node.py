@@ -13,11 +13,11 @@ from app.mutil_agent.agents.conversation_agent.prompts.user_prompts import (
 )
 from app.mutil_agent.agents.conversation_agent.state import ConversationState
 from app.mutil_agent.config import (
-    BEDROCK_KNOWLEDGEBASE,
     KNOWLEDGEBASE_ID,
     MESSAGES_LIMIT,
 )
 from app.mutil_agent.exceptions import StreamingException
+from app.mutil_agent.services.bedrock_gateway import get_bedrock_gateway
 from app.mutil_agent.factories.ai_model_factory import AIModelFactory
 from app.mutil_agent.models.message_dynamodb import MessageDynamoDB as Message, MessageTypesDynamoDB as MessageTypes
 from app.mutil_agent.utils.helpers import StreamWriter as ConversationStreamWriter
@@ -65,7 +65,8 @@ async def chat_knowledgebase_node(
             f"[CONVERSATION_CHAT_NODE] - LENGTH_OF_CONTEXT_MESSAGES: {len(context_messages)}, conversation_id: {conversation_id}"
         )
 
-        response = BEDROCK_KNOWLEDGEBASE.retrieve_and_generate_stream(
+        # Stream is read on the Bedrock gateway pool so other requests keep progressing
+        stream = get_bedrock_gateway().retrieve_and_generate_stream(
             input={"text": state.messages[-1]},
             retrieveAndGenerateConfiguration={
                 "knowledgeBaseConfiguration": {
@@ -75,7 +76,7 @@ async def chat_knowledgebase_node(
                 "type": "KNOWLEDGE_BASE",
             },
         )
-        for event in response["stream"]:
+        async for event in stream:
             output = event.get("output")
             if output and "text" in output:
                 writer(
@@ -34,6 +34,7 @@ async def chat_node(
         model_name=CONVERSATION_CHAT_MODEL_NAME,
         temperature=CONVERSATION_CHAT_TEMPERATURE,
         top_p=CONVERSATION_CHAT_TOP_P,
+        agent="conversation_chat",
     )
     try:
         user_prompt = state.messages[-1]
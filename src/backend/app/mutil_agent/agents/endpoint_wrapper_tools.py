@@ -4,7 +4,6 @@ Wraps existing API endpoints as Strands tools for supervisor agent
 """
 
 from strands import tool
-import asyncio
 import logging
 import io
 from typing import Dict, Any, Optional
@@ -12,6 +11,8 @@ from fastapi import UploadFile
 from datetime import datetime
 from uuid import uuid4
 
+from app.mutil_agent.utils.async_bridge import run_sync
+
 logger = logging.getLogger(__name__)
 
 @tool
@@ -47,18 +48,7 @@ def compliance_document_tool(query: str, file_data: Optional[Dict[str, Any]] = N
                     )
                 
                 # Execute with proper async handling
-                try:
-                    result = asyncio.run(call_endpoint())
-                except RuntimeError as e:
-                    if "cannot be called from a running event loop" in str(e):
-                        import concurrent.futures
-                        def run_in_thread():
-                            return asyncio.run(call_endpoint())
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(run_in_thread)
-                            result = future.result(timeout=30)
-                    else:
-                        raise e
+                result = run_sync(call_endpoint, timeout=30)
                 
                 # Format response using EXACT endpoint result structure
                 if result and isinstance(result, dict):
@@ -128,18 +118,7 @@ def compliance_document_tool(query: str, file_data: Optional[Dict[str, Any]] = N
                     else:
                         return await _handle_general_compliance_chat(query)
                 
-                try:
-                    response = asyncio.run(handle_query())
-                except RuntimeError as e:
-                    if "cannot be called from a running event loop" in str(e):
-                        import concurrent.futures
-                        def run_in_thread():
-                            return asyncio.run(handle_query())
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(run_in_thread)
-                            response = future.result(timeout=15)
-                    else:
-                        raise e
+                response = run_sync(handle_query, timeout=15)
                 
                 return response
                 
@@ -188,18 +167,7 @@ def text_summary_document_tool(query: str, file_data: Optional[Dict[str, Any]] =
                     )
                 
                 # Execute with proper async handling
-                try:
-                    result = asyncio.run(call_endpoint())
-                except RuntimeError as e:
-                    if "cannot be called from a running event loop" in str(e):
-                        import concurrent.futures
-                        def run_in_thread():
-                            return asyncio.run(call_endpoint())
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(run_in_thread)
-                            result = future.result(timeout=60)  # Longer timeout for large files
-                    else:
-                        raise e
+                result = run_sync(call_endpoint, timeout=60)  # Longer timeout for large files
                 
                 # Format response using EXACT endpoint result structure
                 if result and isinstance(result, dict):
@@ -267,18 +235,7 @@ def text_summary_document_tool(query: str, file_data: Optional[Dict[str, Any]] =
                         language="vietnamese"
                     )
                 
-                try:
-                    result = asyncio.run(summarize())
-                except RuntimeError as e:
-                    if "cannot be called from a running event loop" in str(e):
-                        import concurrent.futures
-                        def run_in_thread():
-                            return asyncio.run(summarize())
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(run_in_thread)
-                            result = future.result(timeout=30)
-                    else:
-                        raise e
+                result = run_sync(summarize, timeout=30)
                 
                 # Format response
                 if result and 'summary' in result:
@@ -367,22 +324,11 @@ def risk_assessment_tool(query: str, file_data: Optional[Dict[str, Any]] = None)
             )
             
             return await assess_risk_endpoint(risk_request)
-            
-            # Execute with proper async handling
-            try:
-                result = asyncio.run(call_endpoint())
-            except RuntimeError as e:
-                if "cannot be called from a running event loop" in str(e):
-                    import concurrent.futures
-                    def run_in_thread():
-                        return asyncio.run(call_endpoint())
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(run_in_thread)
-                        result = future.result(timeout=30)
-                else:
-                    raise e
-            
-            logger.info("🔧 [RISK_TOOL] Successfully processed text with DIRECT endpoint call")
+        
+        # Execute with proper async handling
+        result = run_sync(call_endpoint, timeout=30)
+        
+        logger.info("🔧 [RISK_TOOL] Successfully processed text with DIRECT endpoint call")
         
         # Format response using EXACT endpoint result structure
         if result and isinstance(result, dict):
@@ -5,8 +5,6 @@ Clean architecture using existing VPBank services and nodes
 
 from strands import Agent, tool
 from strands.models import BedrockModel
-import boto3
-import asyncio
 import json
 import logging
 import os
@@ -32,6 +30,10 @@ from app.mutil_agent.config import (
 from app.mutil_agent.services.text_service import TextSummaryService
 from app.mutil_agent.services.compliance_service import ComplianceValidationService
 from app.mutil_agent.helpers.improved_pdf_extractor import ImprovedPDFExtractor
+from app.mutil_agent.utils.async_bridge import run_sync
+from app.mutil_agent.services.service_registry import get_service
+from app.mutil_agent.utils.llm_usage import get_llm_usage_tracker, record_strands_call
+from app.mutil_agent.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -56,20 +58,15 @@ if DEFAULT_MODEL_NAME == "claude-37-sonnet":
 
 logger.info(f"[PURE_STRANDS] Using model: {BEDROCK_MODEL_ID}")
 
-# Create BedrockModel for Strands - Simple configuration
-boto_session = boto3.Session(
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    region_name=AWS_BEDROCK_REGION,
-)
+def create_boto_session():
+    """boto3 session shared by the Strands Bedrock models (created on first use via the service registry)"""
+    import boto3
 
-bedrock_model = BedrockModel(
-    model_id=BEDROCK_MODEL_ID,
-    boto_session=boto_session,
-    temperature=0.7,
-    top_p=0.9,
-    streaming=True
-)
+    return boto3.Session(
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        region_name=AWS_BEDROCK_REGION,
+    )
 
 # ================================
 # ASYNC HELPER FUNCTION
@@ -77,62 +74,19 @@ bedrock_model = BedrockModel(
 
 def _run_async_safely(async_func):
     """
-    Safely run async function in sync context
+    Run async function in sync context on the least busy bridge event loop
+
+    Tool calls are spread over ASYNC_BRIDGE_LOOPS loops, and document
+    extraction runs in worker threads, so one tool's PDF/OCR work does not
+    stall or time out the other tool calls.
     """
+    logger.info(f"[ASYNC_WRAPPER] Submitting async function: {async_func.__name__ if hasattr(async_func, '__name__') else 'unknown'}")
     try:
-        logger.info(f"[ASYNC_WRAPPER] Starting async function: {async_func.__name__ if hasattr(async_func, '__name__') else 'unknown'}")
-        
-        # Try to get current event loop
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # We're in an async context, use thread executor
-            import concurrent.futures
-            import threading
-            
-            logger.info("[ASYNC_WRAPPER] Running in thread executor due to existing event loop")
-            
-            def run_in_thread():
-                # Create new event loop for this thread
-                new_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(new_loop)
-                try:
-                    logger.info("[ASYNC_WRAPPER] Created new event loop in thread")
-                    result = new_loop.run_until_complete(async_func())
-                    logger.info("[ASYNC_WRAPPER] Async function completed successfully in thread")
-                    return result
-                except Exception as e:
-                    logger.error(f"[ASYNC_WRAPPER] Error in thread execution: {e}")
-                    raise e
-                finally:
-                    new_loop.close()
-            
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(run_in_thread)
-                try:
-                    result = future.result()  # No timeout - same as original service
-                    logger.info("[ASYNC_WRAPPER] Thread executor completed successfully")
-                    return result
-                except Exception as e:
-                    logger.error(f"[ASYNC_WRAPPER] Thread executor failed: {e}")
-                    raise e
-        else:
-            # No running loop, safe to use asyncio.run
-            logger.info("[ASYNC_WRAPPER] Running with asyncio.run (no existing loop)")
-            result = asyncio.run(async_func())
-            logger.info("[ASYNC_WRAPPER] asyncio.run completed successfully")
-            return result
-    except RuntimeError as e:
-        if "no running event loop" in str(e).lower():
-            # No event loop, safe to use asyncio.run
-            logger.info("[ASYNC_WRAPPER] No event loop detected, using asyncio.run")
-            result = asyncio.run(async_func())
-            logger.info("[ASYNC_WRAPPER] asyncio.run completed successfully (fallback)")
-            return result
-        else:
-            logger.error(f"[ASYNC_WRAPPER] RuntimeError: {e}")
-            raise e
+        result = run_sync(async_func)  # No timeout - same as original service
+        logger.info("[ASYNC_WRAPPER] Async function completed successfully")
+        return result
     except Exception as e:
-        logger.error(f"[ASYNC_WRAPPER] Unexpected error: {e}")
+        logger.error(f"[ASYNC_WRAPPER] Async function failed: {e}")
         raise e
 
 # ================================
@@ -140,6 +94,7 @@ def _run_async_safely(async_func):
 # ================================
 
 @tool
+@traced("strands.tool.text_summary_agent")
 def text_summary_agent(query: str, file_data: Optional[Dict[str, Any]] = None) -> str:
     """
     Text summarization using DIRECT CALL to text_summary_node logic
@@ -235,6 +190,7 @@ def text_summary_agent(query: str, file_data: Optional[Dict[str, Any]] = None) -
 
 
 @tool
+@traced("strands.tool.compliance_knowledge_agent")
 def compliance_knowledge_agent(query: str, file_data: Optional[Dict[str, Any]] = None) -> str:
     """
     Compliance checking using DIRECT CALL to compliance/document endpoint
@@ -392,6 +348,7 @@ async def _handle_general_compliance_chat(message: str, compliance_service) -> s
         return f"Có lỗi xảy ra: {str(e)}"
 
 @tool
+@traced("strands.tool.risk_analysis_agent")
 def risk_analysis_agent(query: str, file_data: Optional[Dict[str, Any]] = None) -> str:
     """
     Risk analysis using DIRECT CALL to existing risk API endpoint
@@ -693,19 +650,20 @@ If you cannot determine which tool to use, call compliance_knowledge_agent as de
 YOUR RESPONSE MUST BE: Tool execution result ONLY. No preamble, no explanation, no apology.
 """
 
-# Create supervisor with stronger model configuration
-supervisor_agent = Agent(
-    system_prompt=SUPERVISOR_PROMPT,
-    tools=[text_summary_agent, compliance_knowledge_agent, risk_analysis_agent],
-    model=BedrockModel(
-        model_id=BEDROCK_MODEL_ID,
-        boto_session=boto_session,
-        temperature=0.1,  # Lower temperature for more deterministic behavior
-        top_p=0.8,
-        streaming=False,  # Disable streaming for more reliable tool calls
-        max_tokens=1000   # Limit tokens to force concise responses
+def create_supervisor_agent() -> Agent:
+    """Create supervisor with stronger model configuration (shared instance lives in the service registry)"""
+    return Agent(
+        system_prompt=SUPERVISOR_PROMPT,
+        tools=[text_summary_agent, compliance_knowledge_agent, risk_analysis_agent],
+        model=BedrockModel(
+            model_id=BEDROCK_MODEL_ID,
+            boto_session=get_service("strands_boto_session"),
+            temperature=0.1,  # Lower temperature for more deterministic behavior
+            top_p=0.8,
+            streaming=False,  # Disable streaming for more reliable tool calls
+            max_tokens=1000   # Limit tokens to force concise responses
+        )
     )
-)
 
 # ================================
 # MAIN SYSTEM CLASS
@@ -715,7 +673,6 @@ class PureStrandsVPBankSystem:
     """VPBank K-MULT Agent Studio - Clean Pure Strands Implementation with DIRECT NODE INTEGRATION"""
     
     def __init__(self):
-        self.supervisor = supervisor_agent
         self.session_data = {}
         self.processing_stats = {
             "total_requests": 0,
@@ -729,6 +686,10 @@ class PureStrandsVPBankSystem:
             }
         }
     
+    @property
+    def supervisor(self) -> Agent:
+        return get_service("pure_strands_supervisor_agent")
+
     def _is_banking_related(self, query: str) -> bool:
         """
         Smart banking relevance detection with pre-filtering
@@ -908,6 +869,7 @@ class PureStrandsVPBankSystem:
 
 Bạn có câu hỏi nào về ngân hàng không? 😊"""
     
+    @traced("strands.process_request")
     async def process_request(
         self, 
         user_message: str, 
@@ -1064,7 +1026,7 @@ Bạn có câu hỏi nào về ngân hàng không? 😊"""
                             tools=[text_summary_with_file, compliance_with_file, risk_analysis_with_file],
                             model=BedrockModel(
                                 model_id=BEDROCK_MODEL_ID,
-                                boto_session=boto_session,
+                                boto_session=get_service("strands_boto_session"),
                                 temperature=0.1,
                                 top_p=0.8,
                                 streaming=False,
@@ -1072,12 +1034,12 @@ Bạn có câu hỏi nào về ngân hàng không? 😊"""
                             )
                         )
                         
-                        response = file_supervisor(user_message)
+                        response = record_strands_call("pure_strands.file_supervisor", file_supervisor, user_message)
                         logger.info("[PURE_STRANDS] Used file-aware supervisor")
                         
                     else:
                         # Use regular supervisor
-                        response = self.supervisor(user_message)
+                        response = record_strands_call("pure_strands.supervisor", self.supervisor, user_message)
                         logger.info("[PURE_STRANDS] Used regular supervisor")
                     
                     agent_used = self._detect_agent_used(str(response))
@@ -1198,15 +1160,20 @@ Bạn có câu hỏi nào về ngân hàng không? 😊"""
             ],
             "active_sessions": len(self.session_data),
             "processing_stats": self.processing_stats,
+            "llm_usage": get_llm_usage_tracker().rollup(group_by=("agent",)),
             "last_updated": datetime.now().isoformat()
         }
 
 # ================================
-# GLOBAL INSTANCE - FORCE RECREATION
+# GLOBAL INSTANCE - CREATED ON FIRST USE
 # ================================
 
-# Force recreation of the system instance to ensure latest code is used
-pure_strands_vpbank_system = PureStrandsVPBankSystem()
+def __getattr__(name):
+    # The system instance lives in the service registry, created on first request or warm-up.
+    # Not in __all__: a star import would create it.
+    if name == "pure_strands_vpbank_system":
+        return get_service("pure_strands_system")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 async def process_pure_strands_request(user_message: str, conversation_id: str, context: Optional[Dict] = None, uploaded_file: Optional[Dict] = None):
     """
@@ -1214,13 +1181,12 @@ async def process_pure_strands_request(user_message: str, conversation_id: str,
     This function ensures the latest instance with pre-filtering is used
     """
     logger.info(f"[WRAPPER] Processing request: '{user_message[:50]}...'")
-    return await pure_strands_vpbank_system.process_request(user_message, conversation_id, context, uploaded_file)
+    return await get_service("pure_strands_system").process_request(user_message, conversation_id, context, uploaded_file)
 
 def get_pure_strands_system_status():
-    return pure_strands_vpbank_system.get_system_status()
+    return get_service("pure_strands_system").get_system_status()
 
 __all__ = [
-    "pure_strands_vpbank_system",
     "process_pure_strands_request", 
     "get_pure_strands_system_status"
 ]
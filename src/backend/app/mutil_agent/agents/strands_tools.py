@@ -17,6 +17,9 @@ from botocore.config import Config as BotocoreConfig
 from app.mutil_agent.services.compliance_service import ComplianceValidationService
 from app.mutil_agent.services.risk_service import assess_risk
 from app.mutil_agent.models.risk import RiskAssessmentRequest
+from app.mutil_agent.utils.async_bridge import run_sync
+from app.mutil_agent.utils.llm_usage import record_strands_call
+from app.mutil_agent.utils.tracing import traced
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
@@ -70,6 +73,7 @@ logger = logging.getLogger(__name__)
 # ============================================================================
 
 @tool
+@traced("strands.tool.compliance_validation_agent")
 def compliance_validation_agent(document_text: str, document_type: Optional[str] = None) -> str:
     """
     Validate document compliance against UCP 600 regulations and Vietnamese banking standards.
@@ -143,36 +147,13 @@ def compliance_validation_agent(document_text: str, document_type: Optional[str]
         
         # Perform compliance validation using existing service
         try:
-            # Note: This should be called in async context, but for now we'll handle sync
-            import asyncio
-            
-            # Try to get existing event loop
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # If loop is running, we can't use await here
-                    # Use a simple fallback validation
-                    validation_result = {
-                        "compliance_status": "requires_review",
-                        "confidence_score": 0.8,
-                        "timestamp": "2025-01-29T16:00:00Z",
-                        "service_note": "Async context limitation - using agent analysis"
-                    }
-                else:
-                    validation_result = loop.run_until_complete(
-                        compliance_service.validate_document_compliance(
-                            ocr_text=document_text,
-                            document_type=document_type
-                        )
-                    )
-            except RuntimeError:
-                # No event loop, create one
-                validation_result = asyncio.run(
-                    compliance_service.validate_document_compliance(
-                        ocr_text=document_text,
-                        document_type=document_type
-                    )
+            # Tools are sync; run the async service on the shared background loop
+            validation_result = run_sync(
+                compliance_service.validate_document_compliance(
+                    ocr_text=document_text,
+                    document_type=document_type
                 )
+            )
                 
         except Exception as service_error:
             logger.warning(f"⚠️  Compliance service error: {str(service_error)}")
@@ -206,7 +187,7 @@ def compliance_validation_agent(document_text: str, document_type: Optional[str]
         Format response as structured analysis.
         """
         
-        agent_analysis = compliance_agent(enhanced_query)
+        agent_analysis = record_strands_call("strands.compliance_validation", compliance_agent, enhanced_query)
         
         # Combine results
         final_result = {
@@ -240,6 +221,7 @@ def compliance_validation_agent(document_text: str, document_type: Optional[str]
 # ============================================================================
 
 @tool
+@traced("strands.tool.risk_assessment_agent")
 def risk_assessment_agent(
     applicant_name: str,
     business_type: str,
@@ -340,7 +322,7 @@ def risk_assessment_agent(
         5. Monitoring requirements
         """
         
-        agent_analysis = risk_agent(enhanced_query)
+        agent_analysis = record_strands_call("strands.risk_assessment", risk_agent, enhanced_query)
         
         # Combine results
         final_result = {
@@ -375,6 +357,7 @@ def risk_assessment_agent(
 # ============================================================================
 
 @tool
+@traced("strands.tool.document_intelligence_agent")
 def document_intelligence_agent(document_content: str, document_type: Optional[str] = None) -> str:
     """
     Extract and analyze document content using OCR and Vietnamese NLP capabilities.
@@ -439,7 +422,7 @@ def document_intelligence_agent(document_content: str, document_type: Optional[s
         5. Processing recommendations
         """
         
-        agent_analysis = doc_agent(analysis_query)
+        agent_analysis = record_strands_call("strands.document_intelligence", doc_agent, analysis_query)
         
         # Simulate document processing (in real implementation, this would use OCR/NLP services)
         processing_result = {
@@ -564,8 +547,13 @@ def create_supervisor_agent():
             ]
         )
 
-# Create the supervisor agent instance
-supervisor_agent = create_supervisor_agent()
+def __getattr__(name):
+    # The shared supervisor instance is created on first use (service registry), not at import.
+    # Not in __all__: a star import would create it.
+    if name == "supervisor_agent":
+        from app.mutil_agent.services.service_registry import get_service
+        return get_service("strands_supervisor_agent")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============================================================================
@@ -573,6 +561,7 @@ supervisor_agent = create_supervisor_agent()
 # ============================================================================
 
 @tool
+@traced("strands.tool.vpbank_supervisor_agent")
 def vpbank_supervisor_agent(user_request: str, context: Optional[Dict[str, Any]] = None) -> str:
     """
     VPBank K-MULT Supervisor Agent - Master orchestrator for banking automation.
@@ -602,7 +591,7 @@ def vpbank_supervisor_agent(user_request: str, context: Optional[Dict[str, Any]]
         current_supervisor = create_supervisor_agent()
         
         # Process through supervisor agent
-        supervisor_response = current_supervisor(enhanced_request)
+        supervisor_response = record_strands_call("strands.supervisor", current_supervisor, enhanced_request)
         
         # Structure the response
         final_result = {
@@ -1196,7 +1185,6 @@ __all__ = [
     'risk_assessment_agent', 
     'document_intelligence_agent',
     'vpbank_supervisor_agent',
-    'supervisor_agent'
 ]
 
 # ============================================================================
@@ -1208,5 +1196,4 @@ __all__ = [
     'risk_assessment_agent', 
     'document_intelligence_agent',
     'vpbank_supervisor_agent',
-    'supervisor_agent'
 ]
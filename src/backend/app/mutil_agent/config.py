@@ -1,6 +1,5 @@
 import os
 
-import boto3
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -40,38 +39,66 @@ MODEL_MAPPING = {
 }
 
 # Amazon Bedrock Configuration
+# Shared connection pool for the Bedrock clients; also sizes the async gateway thread pool
+BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "50"))
+# Adaptive (AIMD) concurrency limit shared by all non-streaming Bedrock calls
+BEDROCK_MIN_CONCURRENCY = int(os.getenv("BEDROCK_MIN_CONCURRENCY", "1"))
+BEDROCK_INITIAL_CONCURRENCY = int(os.getenv("BEDROCK_INITIAL_CONCURRENCY", "4"))
+BEDROCK_MAX_CONCURRENCY = int(os.getenv("BEDROCK_MAX_CONCURRENCY", "16"))
+BEDROCK_THROTTLE_RETRIES = int(os.getenv("BEDROCK_THROTTLE_RETRIES", "3"))
+
 bedrock_endpoint_url = os.getenv("BEDROCK_ENDPOINT_URL")
-if bedrock_endpoint_url and bedrock_endpoint_url.strip():
-    BEDROCK_RT = boto3.client(
-        "bedrock-runtime",
-        region_name=AWS_BEDROCK_REGION,
-        aws_access_key_id=AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-        aws_session_token=AWS_SESSION_TOKEN,  # Add session token for temporary credentials
-        endpoint_url=bedrock_endpoint_url,
-        verify=VERIFY_HTTPS,  # Add SSL verification setting
-    )
-else:
-    BEDROCK_RT = boto3.client(
+
+
+# Bedrock clients are built on first use (via the service registry), not at import:
+# importing boto3 and creating clients is a large part of worker cold start
+def create_bedrock_runtime_client():
+    """Create the shared bedrock-runtime client"""
+    import boto3
+    from botocore.config import Config
+
+    extra = {}
+    if bedrock_endpoint_url and bedrock_endpoint_url.strip():
+        extra["endpoint_url"] = bedrock_endpoint_url
+    return boto3.client(
         "bedrock-runtime",
         region_name=AWS_BEDROCK_REGION,
         aws_access_key_id=AWS_ACCESS_KEY_ID,
         aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
         aws_session_token=AWS_SESSION_TOKEN,  # Add session token for temporary credentials
         verify=VERIFY_HTTPS,  # Add SSL verification setting
+        config=Config(max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS),
+        **extra,
     )
 
-# Only create BEDROCK_KNOWLEDGEBASE client if region is provided
-if AWS_KNOWLEDGEBASE_REGION and AWS_KNOWLEDGEBASE_REGION.strip():
-    BEDROCK_KNOWLEDGEBASE = boto3.client(
+
+def create_bedrock_knowledgebase_client():
+    """Create the bedrock-agent-runtime client (None unless AWS_KNOWLEDGEBASE_REGION is set)"""
+    if not (AWS_KNOWLEDGEBASE_REGION and AWS_KNOWLEDGEBASE_REGION.strip()):
+        return None
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
         "bedrock-agent-runtime",
         region_name=AWS_KNOWLEDGEBASE_REGION,
         aws_access_key_id=AWS_KNOWLEDGEBASE_ACCESS_KEY_ID,
         aws_secret_access_key=AWS_KNOWLEDGEBASE_SECRET_ACCESS_KEY,
         verify=VERIFY_HTTPS,
+        config=Config(max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS),
     )
-else:
-    BEDROCK_KNOWLEDGEBASE = None
+
+
+_LAZY_CLIENTS = {"BEDROCK_RT": "bedrock_runtime", "BEDROCK_KNOWLEDGEBASE": "bedrock_knowledgebase"}
+
+
+def __getattr__(name):
+    # Backwards compatibility for `from app.mutil_agent.config import BEDROCK_RT`
+    if name in _LAZY_CLIENTS:
+        from app.mutil_agent.services.service_registry import get_service
+        return get_service(_LAZY_CLIENTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 LLM_MAX_TOKENS = os.getenv("LLM_MAX_TOKENS")
 LLM_TOP_P = os.getenv("LLM_TOP_P")
 LLM_TEMPERATURE = os.getenv("LLM_TEMPERATURE")
@@ -101,3 +128,80 @@ DYNAMODB_WRITES_TABLE = os.getenv("DYNAMODB_WRITES_TABLE", "checkpoint_writes")
 DYNAMODB_REGION = os.getenv("DYNAMODB_REGION", AWS_REGION)
 DYNAMODB_CONVERSATION_TABLE = os.getenv("DYNAMODB_CONVERSATION_TABLE", "conversations")
 DYNAMODB_MESSAGE_TABLE = os.getenv("DYNAMODB_MESSAGE_TABLE", "messages")
+# Shared connection pool for the DynamoDB client; also sizes the DynamoDB I/O thread pool
+DYNAMODB_MAX_POOL_CONNECTIONS = int(os.getenv("DYNAMODB_MAX_POOL_CONNECTIONS", "50"))
+# Optional endpoint override (e.g. DynamoDB Local at http://localhost:8000)
+DYNAMODB_ENDPOINT_URL = os.getenv("DYNAMODB_ENDPOINT_URL")
+# Message writes are batched (BatchWriteItem, up to 25 items) by a write-behind queue flushed when a
+# batch is full or after the flush interval; durable mode makes every save await its batch
+MESSAGE_WRITE_BEHIND = os.getenv("MESSAGE_WRITE_BEHIND", "true").lower() == "true"
+MESSAGE_WRITE_DURABLE = os.getenv("MESSAGE_WRITE_DURABLE", "false").lower() == "true"
+MESSAGE_WRITE_BEHIND_BATCH_SIZE = int(os.getenv("MESSAGE_WRITE_BEHIND_BATCH_SIZE", "25"))
+MESSAGE_WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv("MESSAGE_WRITE_BEHIND_FLUSH_INTERVAL", "0.05"))
+
+# LangGraph checkpoint storage: "full" stores every checkpoint whole, "delta" stores a snapshot every
+# CHECKPOINT_SNAPSHOT_INTERVAL checkpoints of a thread and only the channels changed since it in between
+CHECKPOINT_STORAGE_MODE = os.getenv("CHECKPOINT_STORAGE_MODE", "full")
+CHECKPOINT_SNAPSHOT_INTERVAL = int(os.getenv("CHECKPOINT_SNAPSHOT_INTERVAL", "10"))
+# Checkpoint/write blobs over the threshold (bytes) are compressed: "zlib", "zstd" (zstandard package) or "none"
+CHECKPOINT_COMPRESSION = os.getenv("CHECKPOINT_COMPRESSION", "zlib")
+CHECKPOINT_COMPRESSION_THRESHOLD = int(os.getenv("CHECKPOINT_COMPRESSION_THRESHOLD", "4096"))
+# Blobs over CHECKPOINT_S3_OFFLOAD_BYTES go to S3 to keep items under DynamoDB's 400KB limit (off when bucket unset)
+CHECKPOINT_S3_BUCKET = os.getenv("CHECKPOINT_S3_BUCKET")
+CHECKPOINT_S3_PREFIX = os.getenv("CHECKPOINT_S3_PREFIX", "langgraph-checkpoints/")
+CHECKPOINT_S3_OFFLOAD_BYTES = int(os.getenv("CHECKPOINT_S3_OFFLOAD_BYTES", "350000"))
+# Background compaction keeps the newest checkpoints per thread and the snapshots they depend on (0 disables)
+CHECKPOINT_KEEP_LATEST = int(os.getenv("CHECKPOINT_KEEP_LATEST", "20"))
+CHECKPOINT_COMPACTION_INTERVAL = float(os.getenv("CHECKPOINT_COMPACTION_INTERVAL", "300"))
+# In-process cache of hot conversations: latest checkpoint (write-through on aput) and recent message
+# window per thread_id, LRU over CONVERSATION_CACHE_MAX_THREADS; entries are re-read after the TTL (seconds).
+# Validation checks each hit with a keys-only query, needed unless every conversation sticks to one worker
+CONVERSATION_CACHE_ENABLED = os.getenv("CONVERSATION_CACHE_ENABLED", "true").lower() == "true"
+CONVERSATION_CACHE_VALIDATE = os.getenv("CONVERSATION_CACHE_VALIDATE", "true").lower() == "true"
+CONVERSATION_CACHE_MAX_THREADS = int(os.getenv("CONVERSATION_CACHE_MAX_THREADS", "1000"))
+CONVERSATION_CACHE_MESSAGE_WINDOW = int(os.getenv("CONVERSATION_CACHE_MESSAGE_WINDOW", "50"))
+CONVERSATION_CACHE_TTL = float(os.getenv("CONVERSATION_CACHE_TTL", "300"))
+
+# Document extraction cache (content-addressed by SHA-256 of file bytes)
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "128"))
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR")  # Disk tier disabled when unset
+EXTRACTION_CACHE_MAX_DISK_MB = int(os.getenv("EXTRACTION_CACHE_MAX_DISK_MB", "512"))
+
+# OCR pipeline (process pool size; defaults to the number of CPU cores)
+OCR_MAX_WORKERS = int(os.getenv("OCR_MAX_WORKERS", "0")) or os.cpu_count() or 1
+
+# Strands tool bridge (event loops the sync tool calls are spread over)
+ASYNC_BRIDGE_LOOPS = int(os.getenv("ASYNC_BRIDGE_LOOPS", "4"))
+
+# Chunk packing: token length function ("approx", "chars", "tiktoken") and target fill per chunk
+CHUNK_TOKENIZER = os.getenv("CHUNK_TOKENIZER", "approx")
+CHUNK_TARGET_TOKENS = int(os.getenv("CHUNK_TARGET_TOKENS", "0")) or None
+
+# UCP 600 knowledge base response cache (near-duplicate mode matches rephrased queries via MinHash)
+REGULATION_CACHE_MAX_ENTRIES = int(os.getenv("REGULATION_CACHE_MAX_ENTRIES", "256"))
+REGULATION_CACHE_TTL_SECONDS = float(os.getenv("REGULATION_CACHE_TTL_SECONDS", "3600"))
+REGULATION_CACHE_NEAR_DUPLICATE = os.getenv("REGULATION_CACHE_NEAR_DUPLICATE", "false").lower() == "true"
+REGULATION_CACHE_SIMILARITY = float(os.getenv("REGULATION_CACHE_SIMILARITY", "0.85"))
+
+# Batch compliance validation (documents validated concurrently per batch request)
+COMPLIANCE_BATCH_MAX_CONCURRENCY = int(os.getenv("COMPLIANCE_BATCH_MAX_CONCURRENCY", "4"))
+COMPLIANCE_BATCH_MAX_DOCUMENTS = int(os.getenv("COMPLIANCE_BATCH_MAX_DOCUMENTS", "20"))
+
+# Token budget for the document excerpt in compliance validation prompts (paragraphs around fields/keywords)
+COMPLIANCE_PROMPT_TOKEN_BUDGET = int(os.getenv("COMPLIANCE_PROMPT_TOKEN_BUDGET", "1500"))
+
+# Services initialized in the background at startup (comma-separated registry names, or "all");
+# anything not listed is created on first use. Blocking warm-up delays serving until done.
+SERVICE_WARMUP = os.getenv("SERVICE_WARMUP", "")
+SERVICE_WARMUP_BLOCKING = os.getenv("SERVICE_WARMUP_BLOCKING", "false").lower() == "true"
+
+# Summarization response cache keyed on model, decoding parameters and prompt hash
+# (backend "memory", "sqlite" or "none"; routes listed in LLM_CACHE_DISABLED_ROUTES always call the model)
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH", "/tmp/kmult-llm-cache.sqlite3")
+LLM_CACHE_DISABLED_ROUTES = os.getenv("LLM_CACHE_DISABLED_ROUTES", "")
+
+# Local credit scorecard: maximum applicants per batch scoring request
+CREDIT_SCORING_BATCH_MAX_APPLICANTS = int(os.getenv("CREDIT_SCORING_BATCH_MAX_APPLICANTS", "10000"))
@@ -15,15 +15,17 @@ from langgraph.checkpoint.base import (
     BaseCheckpointSaver,
 )
 
-from app.mutil_agent.config import DYNAMODB_CHECKPOINT_TABLE, DYNAMODB_WRITES_TABLE
+from app.mutil_agent.config import CONVERSATION_CACHE_VALIDATE, DYNAMODB_CHECKPOINT_TABLE, DYNAMODB_WRITES_TABLE
 from .dynamodb_utils import (
     get_dynamodb_client,
     get_dynamodb_resource,
-    create_checkpoint_item,
     create_write_item,
     dumps_metadata,
 )
 from .dynamodb_operations import DynamoDBOperations
+from .dynamodb_executor import get_dynamodb_executor
+from .dynamodb_checkpoint_storage import CheckpointStorage, get_checkpoint_compactor
+from .dynamodb_conversation_cache import ConversationCache, get_conversation_cache
 from .dynamodb_schema import create_table_if_not_exists
 
 # Table names from config
@@ -75,6 +77,8 @@ class AsyncDynamoDBSaverCustom(BaseCheckpointSaver):
         writes_table_name: str = WRITES_TABLE_NAME,
         checkpoint_table: str = None,  # Alias for compatibility
         checkpoint_writes_table: str = None,  # Alias for compatibility
+        storage: Optional[CheckpointStorage] = None,
+        cache: Optional[ConversationCache] = None,
     ):
         # Handle parameter aliases for backward compatibility
         if checkpoint_table is not None:
@@ -89,7 +93,14 @@ class AsyncDynamoDBSaverCustom(BaseCheckpointSaver):
         self.resource = get_dynamodb_resource()
         self.serializer = TypeSerializer()
         self.deserializer = TypeDeserializer()
-        self.operations = DynamoDBOperations(self.client, self.deserializer, self.serde)
+        self.executor = get_dynamodb_executor()
+        # Item layout: full or snapshot+delta checkpoints, compression, S3 offload
+        self.storage = storage or CheckpointStorage(self.serde, self.client, self.executor)
+        self.operations = DynamoDBOperations(self.client, self.deserializer, self.serde, self.executor, self.storage)
+        # Marks written threads for background pruning of this saver's tables
+        self.compactor = get_checkpoint_compactor(checkpoint_table_name, writes_table_name)
+        # Process-wide hot conversation cache: savers are short-lived (one per /chat call)
+        self.cache = cache or get_conversation_cache()
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -149,20 +160,22 @@ class AsyncDynamoDBSaverCustom(BaseCheckpointSaver):
         checkpoint_ns = config["configurable"]["checkpoint_ns"]
         checkpoint_id = checkpoint["id"]
         
-        # Serialize checkpoint data exactly like MongoDB version
-        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
-        
-        # Create item for DynamoDB using helper function
-        item = create_checkpoint_item(config, checkpoint, metadata, type_, serialized_checkpoint)
+        # Serialize checkpoint data (whole, or as a delta on its snapshot) into an item
+        item = await self.storage.encode_checkpoint(self.checkpoint_table_name, config, checkpoint, metadata)
         
         # Serialize item for DynamoDB
         dynamodb_item = {k: self.serializer.serialize(v) for k, v in item.items()}
         
         try:
-            self.client.put_item(
+            await self.executor.run(
+                self.client.put_item,
                 TableName=self.checkpoint_table_name,
                 Item=dynamodb_item
             )
+            self.storage.remember_written(self.checkpoint_table_name, item)
+            self.compactor.mark(thread_id)
+            if self.cache is not None:
+                self.cache.put_checkpoint(thread_id, checkpoint_ns, checkpoint, metadata)
             
             return {
                 "configurable": {
@@ -173,6 +186,10 @@ class AsyncDynamoDBSaverCustom(BaseCheckpointSaver):
             }
         except Exception as e:
             logging.error(f"[DynamoDB]: Failed to put checkpoint: {str(e)}")
+            if isinstance(e, ClientError):
+                # Rejected, so nothing references the offloaded blob (after a timeout the put
+                # may still have succeeded: the blob is kept then)
+                await self.storage.discard_blob(item)
             raise
 
     async def aput_writes(
@@ -198,30 +215,62 @@ class AsyncDynamoDBSaverCustom(BaseCheckpointSaver):
         set_method_is_set = all(w[0] in WRITES_IDX_MAP for w in writes)
         
         # Prepare batch write requests
-        with self.resource.Table(self.writes_table_name).batch_writer() as batch:
-            for idx, (channel, value) in enumerate(writes):
-                write_id = f"{checkpoint_id}#{task_id}#{WRITES_IDX_MAP.get(channel, idx)}"
-                type_, serialized_value = self.serde.dumps_typed(value)
-                
-                # Create item using helper function
-                item = create_write_item(
-                    config, channel, value, task_id, 
-                    WRITES_IDX_MAP.get(channel, idx), 
-                    type_, serialized_value, write_id
-                )
-                batch.put_item(Item=item)
+        items = []
+        for idx, (channel, value) in enumerate(writes):
+            write_id = f"{checkpoint_id}#{task_id}#{WRITES_IDX_MAP.get(channel, idx)}"
+            type_, serialized_value = self.serde.dumps_typed(value)
+            
+            # Create item using helper function
+            item = create_write_item(
+                config, channel, value, task_id, 
+                WRITES_IDX_MAP.get(channel, idx), 
+                type_, serialized_value, write_id
+            )
+            await self.storage.store_blob(item, "value", f"{thread_id}/writes/{write_id}")
+            items.append({k: self.serializer.serialize(v) for k, v in item.items()})
+        
+        # BatchWriteItem on the shared client (the resource batch_writer is not thread-safe)
+        await self.executor.batch_put(self.writes_table_name, items)
 
     async def aget(self, config: RunnableConfig) -> Optional[Checkpoint]:
-        """Get a checkpoint from DynamoDB."""
-        thread_id = config["configurable"]["thread_id"]
-        checkpoint_id = config["configurable"].get("checkpoint_id")
-        return await self.operations.get_checkpoint(self.checkpoint_table_name, thread_id, checkpoint_id)
+        """Get a checkpoint from DynamoDB (the latest one when config has no checkpoint_id)."""
+        result = await self.aget_tuple(config)
+        return result[0] if result else None
 
     async def aget_tuple(self, config: RunnableConfig) -> Optional[Tuple[Checkpoint, CheckpointMetadata]]:
-        """Get a checkpoint and metadata from DynamoDB."""
+        """Get a checkpoint and metadata, the latest one when config has no checkpoint_id.
+
+        The latest checkpoint of a recently active thread comes from the hot
+        conversation cache (after a keys-only check that it is still the latest,
+        with CONVERSATION_CACHE_VALIDATE); DynamoDB is read on a miss.
+        """
         thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
         checkpoint_id = config["configurable"].get("checkpoint_id")
-        return await self.operations.get_checkpoint_with_metadata(self.checkpoint_table_name, thread_id, checkpoint_id)
+        if self.cache is not None:
+            cached = self.cache.get_checkpoint(thread_id, checkpoint_ns, checkpoint_id)
+            if cached is not None:
+                # A given checkpoint_id never changes; the latest may have moved on another worker
+                if checkpoint_id or not CONVERSATION_CACHE_VALIDATE:
+                    return cached
+                try:
+                    latest_id = await self.operations.get_latest_checkpoint_id(
+                        self.checkpoint_table_name, thread_id, checkpoint_ns
+                    )
+                    if latest_id == cached[0]["id"]:
+                        return cached
+                    self.cache.count_stale("checkpoint")
+                except Exception as e:
+                    logging.warning(f"[DynamoDB]: Failed to validate cached checkpoint: {str(e)}")
+        if checkpoint_id:
+            return await self.operations.get_checkpoint_with_metadata(self.checkpoint_table_name, thread_id, checkpoint_id)
+
+        result = await self.operations.get_latest_checkpoint_with_metadata(
+            self.checkpoint_table_name, thread_id, checkpoint_ns
+        )
+        if result is not None and self.cache is not None:
+            self.cache.put_checkpoint(thread_id, checkpoint_ns, *result)
+        return result
 
     async def alist(
         self,
@@ -249,11 +298,17 @@ class AsyncDynamoDBSaverCustom(BaseCheckpointSaver):
         async for config_item in self.operations.list_checkpoints_with_metadata(self.checkpoint_table_name, thread_id, limit):
             yield config_item
 
+    async def acompact(self, thread_id: str) -> Dict[str, int]:
+        """Prune superseded checkpoints of a thread now (normally done by background compaction)."""
+        return await self.compactor.compact_thread(thread_id)
+
     async def adelete_checkpoint(self, config: RunnableConfig) -> None:
         """Delete a checkpoint from DynamoDB."""
         thread_id = config["configurable"]["thread_id"]
         checkpoint_id = config["configurable"].get("checkpoint_id")
         await self.operations.delete_checkpoint(self.checkpoint_table_name, thread_id, checkpoint_id)
+        if self.cache is not None and checkpoint_id:
+            self.cache.discard_checkpoint(thread_id, checkpoint_id)
 
 
 @asynccontextmanager
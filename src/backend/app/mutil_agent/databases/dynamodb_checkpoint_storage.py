@@ -0,0 +1,542 @@
+"""
+LangGraph checkpoint storage
+How AsyncDynamoDBSaverCustom lays out checkpoint items, and their compaction.
+
+- Mode "full" stores every checkpoint whole. Mode "delta" stores a full
+  snapshot every CHECKPOINT_SNAPSHOT_INTERVAL checkpoints of a thread and, in
+  between, only the channel values whose version changed since that snapshot
+  (the rest of the checkpoint is small). Loading a delta costs one extra
+  GetItem for its snapshot, however far back it is.
+- Blobs over CHECKPOINT_COMPRESSION_THRESHOLD bytes are compressed (zlib, or
+  zstd when the zstandard package is installed).
+- Blobs over CHECKPOINT_S3_OFFLOAD_BYTES are put in CHECKPOINT_S3_BUCKET and
+  the item keeps only the object key, so items stay under DynamoDB's 400KB
+  item limit.
+- CheckpointCompactor prunes superseded checkpoints per thread_id (with their
+  writes and S3 blobs) in the background, keeping the newest
+  CHECKPOINT_KEEP_LATEST per namespace and the snapshots they depend on.
+  There is one compactor per (checkpoint table, writes table) pair.
+
+Items written before these attributes existed (no "kind") load as full
+checkpoints.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from boto3.dynamodb.types import Binary, TypeDeserializer
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import Checkpoint, CheckpointMetadata
+
+from app.mutil_agent.config import (
+    CHECKPOINT_COMPACTION_INTERVAL,
+    CHECKPOINT_COMPRESSION,
+    CHECKPOINT_COMPRESSION_THRESHOLD,
+    CHECKPOINT_KEEP_LATEST,
+    CHECKPOINT_S3_BUCKET,
+    CHECKPOINT_S3_OFFLOAD_BYTES,
+    CHECKPOINT_S3_PREFIX,
+    CHECKPOINT_SNAPSHOT_INTERVAL,
+    CHECKPOINT_STORAGE_MODE,
+    DYNAMODB_CHECKPOINT_TABLE,
+    DYNAMODB_WRITES_TABLE,
+)
+from .dynamodb_executor import DynamoDBExecutor, get_dynamodb_executor
+from .dynamodb_utils import create_checkpoint_item, get_dynamodb_client
+
+try:
+    import zstandard
+except ImportError:  # zlib is used instead
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+STORAGE_MODES = ("full", "delta")
+
+# Headers (kind, versions, snapshot reference) of recently written checkpoints,
+# so writing a delta does not need to read its parent back
+_HEADER_CACHE_SIZE = 4096
+_header_cache: "OrderedDict[Tuple[str, str, str, str], Dict[str, Any]]" = OrderedDict()
+_header_cache_lock = threading.Lock()
+_HEADER_ATTRIBUTES = ("kind", "versions", "base_checkpoint_id", "base_versions", "depth")
+
+
+def compress_blob(data: bytes, algorithm: str = CHECKPOINT_COMPRESSION,
+                  threshold: int = CHECKPOINT_COMPRESSION_THRESHOLD) -> Tuple[bytes, str]:
+    """(data, encoding): compressed with zstd/zlib when larger than threshold, else unchanged with encoding "" """
+    if algorithm == "none" or len(data) <= threshold:
+        return data, ""
+    if algorithm == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data), "zstd"
+    return zlib.compress(data, 6), "zlib"
+
+
+def decompress_blob(data: bytes, encoding: Optional[str]) -> bytes:
+    """Inverse of compress_blob"""
+    if not encoding:
+        return data
+    if encoding == "zlib":
+        return zlib.decompress(data)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise RuntimeError("The zstandard package is required to read zstd-compressed checkpoints")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown checkpoint blob encoding {encoding!r}")
+
+
+def _as_bytes(value: Any) -> bytes:
+    # TypeDeserializer returns Binary wrappers for B attributes
+    return value.value if isinstance(value, Binary) else value
+
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_checkpoint_s3_client():
+    """S3 client for offloaded checkpoint blobs (same credentials as the DynamoDB client)"""
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                import boto3
+                from app.mutil_agent.config import (
+                    AWS_ACCESS_KEY_ID,
+                    AWS_REGION,
+                    AWS_SECRET_ACCESS_KEY,
+                    AWS_SESSION_TOKEN,
+                )
+
+                client_kwargs = {"region_name": AWS_REGION}
+                if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
+                    client_kwargs.update({
+                        "aws_access_key_id": AWS_ACCESS_KEY_ID,
+                        "aws_secret_access_key": AWS_SECRET_ACCESS_KEY,
+                    })
+                    if AWS_SESSION_TOKEN:
+                        client_kwargs["aws_session_token"] = AWS_SESSION_TOKEN
+                _s3_client = boto3.client("s3", **client_kwargs)
+    return _s3_client
+
+
+class CheckpointStorage:
+    """Encodes checkpoints into DynamoDB items and decodes them back"""
+
+    def __init__(
+        self,
+        serde,
+        client=None,
+        executor: Optional[DynamoDBExecutor] = None,
+        mode: str = CHECKPOINT_STORAGE_MODE,
+        snapshot_interval: int = CHECKPOINT_SNAPSHOT_INTERVAL,
+        compression: str = CHECKPOINT_COMPRESSION,
+        compression_threshold: int = CHECKPOINT_COMPRESSION_THRESHOLD,
+        s3_bucket: Optional[str] = CHECKPOINT_S3_BUCKET,
+        s3_prefix: str = CHECKPOINT_S3_PREFIX,
+        s3_offload_bytes: int = CHECKPOINT_S3_OFFLOAD_BYTES,
+    ):
+        if mode not in STORAGE_MODES:
+            raise ValueError(f"Unknown checkpoint storage mode {mode!r}, expected one of {STORAGE_MODES}")
+        self.serde = serde
+        self.client = client or get_dynamodb_client()
+        self.executor = executor or get_dynamodb_executor()
+        self.mode = mode
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.s3_bucket = s3_bucket.strip() if s3_bucket and s3_bucket.strip() else None
+        self.s3_prefix = s3_prefix
+        self.s3_offload_bytes = s3_offload_bytes
+        self.deserializer = TypeDeserializer()
+
+    async def encode_checkpoint(
+        self,
+        table_name: str,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+    ) -> Dict[str, Any]:
+        """
+        Build the item (Python values) for a checkpoint
+
+        In delta mode the parent (config's checkpoint_id) decides the layout:
+        a delta against the parent's snapshot, or a new snapshot when there is
+        no usable parent or the snapshot interval is reached.
+
+        Offloaded blobs are already in S3. Once the item is written call
+        remember_written; when the write fails, discard_blob.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        parent_id = config["configurable"].get("checkpoint_id")
+        versions = checkpoint.get("channel_versions", {})
+
+        header: Dict[str, Any] = {"kind": SNAPSHOT, "versions": versions, "depth": 0}
+        stored = checkpoint
+        if self.mode == "delta" and parent_id:
+            parent = await self._parent_header(table_name, thread_id, checkpoint_ns, parent_id)
+            if parent is not None and parent["depth"] + 1 < self.snapshot_interval:
+                if parent["kind"] == SNAPSHOT:
+                    base_id, base_versions = parent_id, parent["versions"]
+                else:
+                    base_id, base_versions = parent["base_checkpoint_id"], parent["base_versions"]
+                changed = {
+                    channel: value
+                    for channel, value in checkpoint["channel_values"].items()
+                    if channel not in versions or versions[channel] != base_versions.get(channel)
+                }
+                stored = {**checkpoint, "channel_values": changed}
+                header = {
+                    "kind": DELTA,
+                    "versions": versions,
+                    "depth": parent["depth"] + 1,
+                    "base_checkpoint_id": base_id,
+                    "base_versions": base_versions,
+                }
+
+        type_, serialized_checkpoint = self.serde.dumps_typed(stored)
+        item = create_checkpoint_item(config, checkpoint, metadata, type_, serialized_checkpoint)
+        item["kind"] = header["kind"]
+        item["depth"] = header["depth"]
+        item["versions"] = json.dumps(versions)
+        if header["kind"] == DELTA:
+            item["base_checkpoint_id"] = header["base_checkpoint_id"]
+            item["base_versions"] = json.dumps(header["base_versions"])
+            item["channels"] = list(checkpoint["channel_values"])
+        await self.store_blob(item, "checkpoint", f"{thread_id}/{checkpoint['id']}")
+        return item
+
+    def remember_written(self, table_name: str, item: Dict[str, Any]) -> None:
+        """Keep the header of a checkpoint item just written, for the delta of its child"""
+        header = _header_from_item(item)
+        if header is not None:
+            _remember_header((table_name, item["thread_id"], item["checkpoint_ns"], item["checkpoint_id"]), header)
+
+    async def decode_checkpoint(self, table_name: str, item: Dict[str, Any]) -> Checkpoint:
+        """
+        Load the checkpoint of a deserialized item, merging deltas onto their snapshot
+
+        Raises:
+            LookupError: If the snapshot of a delta no longer exists
+        """
+        checkpoint = self.serde.loads_typed((item["type"], await self.load_blob(item, "checkpoint")))
+        if item.get("kind") != DELTA:
+            return checkpoint
+
+        base_item = await self._get_item(table_name, item["thread_id"], item["base_checkpoint_id"])
+        if base_item is None:
+            raise LookupError(
+                f"Snapshot {item['base_checkpoint_id']} of checkpoint {item['checkpoint_id']} not found"
+            )
+        base = self.serde.loads_typed((base_item["type"], await self.load_blob(base_item, "checkpoint")))
+        values = {**base.get("channel_values", {}), **checkpoint["channel_values"]}
+        checkpoint["channel_values"] = {
+            channel: values[channel] for channel in item.get("channels", []) if channel in values
+        }
+        return checkpoint
+
+    async def store_blob(self, item: Dict[str, Any], field: str, s3_name: str) -> None:
+        """Compress item[field] and offload it to S3 when it would make the item too large"""
+        data, encoding = compress_blob(item[field], self.compression, self.compression_threshold)
+        if encoding:
+            item["encoding"] = encoding
+        if len(data) <= self.s3_offload_bytes:
+            item[field] = data
+        elif self.s3_bucket:
+            key = f"{self.s3_prefix}{s3_name}"
+            await self.executor.run(get_checkpoint_s3_client().put_object, Bucket=self.s3_bucket, Key=key, Body=data)
+            del item[field]
+            item["s3_bucket"] = self.s3_bucket
+            item["s3_key"] = key
+        else:
+            logger.warning(
+                f"[DynamoDB]: {field} blob of {len(data)} bytes for {s3_name} is close to the 400KB item limit; "
+                f"set CHECKPOINT_S3_BUCKET to offload it"
+            )
+            item[field] = data
+
+    async def discard_blob(self, item: Dict[str, Any]) -> None:
+        """Delete the S3 object of an item that was not written (errors are logged, not raised)"""
+        if "s3_key" not in item:
+            return
+        try:
+            await self.executor.run(
+                get_checkpoint_s3_client().delete_object, Bucket=item["s3_bucket"], Key=item["s3_key"]
+            )
+        except Exception as e:
+            logger.warning(f"[DynamoDB]: Failed to delete orphaned checkpoint blob {item['s3_key']}: {e}")
+
+    async def load_blob(self, item: Dict[str, Any], field: str) -> bytes:
+        """Inverse of store_blob for a deserialized item"""
+        if "s3_key" in item:
+            response = await self.executor.run(
+                get_checkpoint_s3_client().get_object, Bucket=item["s3_bucket"], Key=item["s3_key"]
+            )
+            data = await self.executor.run(response["Body"].read)
+        else:
+            data = _as_bytes(item[field])
+        return decompress_blob(data, item.get("encoding"))
+
+    async def _parent_header(
+        self, table_name: str, thread_id: str, checkpoint_ns: str, checkpoint_id: str
+    ) -> Optional[Dict[str, Any]]:
+        cached = _recall_header((table_name, thread_id, checkpoint_ns, checkpoint_id))
+        if cached is not None:
+            return cached
+        item = await self._get_item(table_name, thread_id, checkpoint_id, _HEADER_ATTRIBUTES)
+        header = _header_from_item(item) if item is not None else None
+        if header is None:
+            return None  # Missing or written before delta storage: start a new snapshot
+        _remember_header((table_name, thread_id, checkpoint_ns, checkpoint_id), header)
+        return header
+
+    async def _get_item(
+        self, table_name: str, thread_id: str, checkpoint_id: str, attributes: Tuple[str, ...] = ()
+    ) -> Optional[Dict[str, Any]]:
+        params: Dict[str, Any] = {
+            "TableName": table_name,
+            "Key": {"thread_id": {"S": thread_id}, "checkpoint_id": {"S": checkpoint_id}},
+        }
+        if attributes:
+            names = {f"#a{i}": name for i, name in enumerate(attributes)}
+            params["ProjectionExpression"] = ", ".join(names)
+            params["ExpressionAttributeNames"] = names
+        response = await self.executor.run(self.client.get_item, **params)
+        if "Item" not in response:
+            return None
+        return {k: self.deserializer.deserialize(v) for k, v in response["Item"].items()}
+
+
+def _header_from_item(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if item.get("kind") not in (SNAPSHOT, DELTA):
+        return None
+    header = {
+        "kind": item["kind"],
+        "versions": json.loads(item.get("versions", "{}")),
+        "depth": int(item.get("depth", 0)),
+    }
+    if item["kind"] == DELTA:
+        header["base_checkpoint_id"] = item["base_checkpoint_id"]
+        header["base_versions"] = json.loads(item.get("base_versions", "{}"))
+    return header
+
+
+def _remember_header(key: Tuple[str, str, str, str], header: Dict[str, Any]) -> None:
+    with _header_cache_lock:
+        _header_cache[key] = header
+        _header_cache.move_to_end(key)
+        while len(_header_cache) > _HEADER_CACHE_SIZE:
+            _header_cache.popitem(last=False)
+
+
+def _recall_header(key: Tuple[str, str, str, str]) -> Optional[Dict[str, Any]]:
+    with _header_cache_lock:
+        header = _header_cache.get(key)
+        if header is not None:
+            _header_cache.move_to_end(key)
+        return header
+
+
+class CheckpointCompactor:
+    """Prunes superseded checkpoints, their writes and S3 blobs per thread_id"""
+
+    def __init__(
+        self,
+        client=None,
+        executor: Optional[DynamoDBExecutor] = None,
+        checkpoint_table: str = DYNAMODB_CHECKPOINT_TABLE,
+        writes_table: str = DYNAMODB_WRITES_TABLE,
+        keep_latest: int = CHECKPOINT_KEEP_LATEST,
+        interval: float = CHECKPOINT_COMPACTION_INTERVAL,
+    ):
+        self.client = client or get_dynamodb_client()
+        self.executor = executor or get_dynamodb_executor()
+        self.checkpoint_table = checkpoint_table
+        self.writes_table = writes_table
+        self.keep_latest = keep_latest
+        self.interval = interval
+        self.deserializer = TypeDeserializer()
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+        self._stats = {"runs": 0, "threads": 0, "checkpoints": 0, "writes": 0, "s3_objects": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.keep_latest > 0 and self.interval > 0
+
+    def mark(self, thread_id: str) -> None:
+        """Queue a thread for the next background compaction"""
+        if self.enabled:
+            with self._lock:
+                self._dirty.add(thread_id)
+
+    async def compact_thread(self, thread_id: str) -> Dict[str, int]:
+        """
+        Delete all but the newest keep_latest checkpoints of each namespace of a thread
+
+        Snapshots referenced by kept deltas are kept as well. Writes and S3
+        blobs are deleted before the checkpoints, so an interrupted run only
+        leaves prunable checkpoints behind.
+
+        Returns:
+            Number of deleted checkpoints, writes and S3 objects
+        """
+        checkpoints = await self._query_thread(
+            self.checkpoint_table, thread_id, ("checkpoint_id", "checkpoint_ns", "kind", "base_checkpoint_id", "s3_bucket", "s3_key")
+        )
+        by_namespace: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for item in checkpoints:  # Newest first: checkpoint IDs are time-ordered
+            by_namespace[item.get("checkpoint_ns", "")].append(item)
+
+        keep = set()
+        for items in by_namespace.values():
+            for item in items[:max(1, self.keep_latest)]:
+                keep.add(item["checkpoint_id"])
+                if item.get("kind") == DELTA:
+                    keep.add(item["base_checkpoint_id"])
+        doomed = [item for item in checkpoints if item["checkpoint_id"] not in keep]
+        result = {"checkpoints": len(doomed), "writes": 0, "s3_objects": 0}
+        if not doomed:
+            return result
+
+        doomed_ids = {item["checkpoint_id"] for item in doomed}
+        writes = [
+            item for item in await self._query_thread(self.writes_table, thread_id, ("write_id", "checkpoint_id", "s3_bucket", "s3_key"))
+            if item.get("checkpoint_id") in doomed_ids
+        ]
+        s3_keys: Dict[str, List[str]] = defaultdict(list)
+        for item in doomed + writes:
+            if item.get("s3_key"):
+                s3_keys[item["s3_bucket"]].append(item["s3_key"])
+        for bucket, keys in s3_keys.items():
+            for start in range(0, len(keys), 1000):
+                await self.executor.run(
+                    get_checkpoint_s3_client().delete_objects,
+                    Bucket=bucket,
+                    Delete={"Objects": [{"Key": key} for key in keys[start:start + 1000]], "Quiet": True},
+                )
+            result["s3_objects"] += len(keys)
+
+        await self.executor.batch_delete(
+            self.writes_table,
+            [{"thread_id": {"S": thread_id}, "write_id": {"S": item["write_id"]}} for item in writes],
+        )
+        await self.executor.batch_delete(
+            self.checkpoint_table,
+            [{"thread_id": {"S": thread_id}, "checkpoint_id": {"S": checkpoint_id}} for checkpoint_id in doomed_ids],
+        )
+        result["writes"] = len(writes)
+        return result
+
+    async def compact_pending(self) -> Dict[str, int]:
+        """Compact every thread marked since the last run"""
+        with self._lock:
+            thread_ids, self._dirty = self._dirty, set()
+        totals = {"threads": 0, "checkpoints": 0, "writes": 0, "s3_objects": 0}
+        for thread_id in thread_ids:
+            try:
+                result = await self.compact_thread(thread_id)
+            except Exception as e:
+                logger.error(f"[DynamoDB]: Checkpoint compaction failed for thread {thread_id}: {e}")
+                self._stats["errors"] += 1
+                self.mark(thread_id)
+                continue
+            totals["threads"] += 1
+            for key, value in result.items():
+                totals[key] += value
+        self._stats["runs"] += 1
+        for key, value in totals.items():
+            self._stats[key] += value
+        if totals["checkpoints"]:
+            logger.info(f"[DynamoDB]: Checkpoint compaction pruned {totals}")
+        return totals
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compaction statistics"""
+        with self._lock:
+            pending = len(self._dirty)
+        return {**self._stats, "pending_threads": pending, "keep_latest": self.keep_latest}
+
+    async def _query_thread(self, table_name: str, thread_id: str, attributes: Tuple[str, ...]) -> List[Dict[str, Any]]:
+        names = {f"#a{i}": name for i, name in enumerate(attributes)}
+        params: Dict[str, Any] = {
+            "TableName": table_name,
+            "KeyConditionExpression": "thread_id = :thread_id",
+            "ExpressionAttributeValues": {":thread_id": {"S": thread_id}},
+            "ProjectionExpression": ", ".join(names),
+            "ExpressionAttributeNames": names,
+            "ScanIndexForward": False,
+        }
+        items = []
+        while True:
+            response = await self.executor.run(self.client.query, **params)
+            items.extend(
+                {k: self.deserializer.deserialize(v) for k, v in item.items()} for item in response.get("Items", [])
+            )
+            if not response.get("LastEvaluatedKey"):
+                return items
+            params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+_checkpoint_compactors: Dict[Tuple[str, str], CheckpointCompactor] = {}
+_checkpoint_compactor_lock = threading.Lock()
+_compaction_task: Optional[asyncio.Task] = None
+
+
+def get_checkpoint_compactor(
+    checkpoint_table: str = DYNAMODB_CHECKPOINT_TABLE, writes_table: str = DYNAMODB_WRITES_TABLE
+) -> CheckpointCompactor:
+    """
+    Get the process-wide checkpoint compactor of a table pair
+
+    Returns:
+        CheckpointCompactor for the given (by default the configured) checkpoint and writes tables
+    """
+    key = (checkpoint_table, writes_table)
+    compactor = _checkpoint_compactors.get(key)
+    if compactor is None:
+        with _checkpoint_compactor_lock:
+            compactor = _checkpoint_compactors.get(key)
+            if compactor is None:
+                compactor = _checkpoint_compactors[key] = CheckpointCompactor(
+                    checkpoint_table=checkpoint_table, writes_table=writes_table
+                )
+    return compactor
+
+
+async def _run_compaction(interval: float) -> None:
+    # Compact marked threads of every table pair every interval seconds until cancelled
+    while True:
+        await asyncio.sleep(interval)
+        with _checkpoint_compactor_lock:
+            compactors = list(_checkpoint_compactors.values())
+        for compactor in compactors:
+            await compactor.compact_pending()
+
+
+def start_checkpoint_compaction() -> Optional[asyncio.Task]:
+    """Start background compaction on the running loop (no-op when disabled)"""
+    global _compaction_task
+    compactor = get_checkpoint_compactor()
+    if compactor.enabled and (_compaction_task is None or _compaction_task.done()):
+        _compaction_task = asyncio.create_task(_run_compaction(compactor.interval))
+    return _compaction_task
+
+
+async def stop_checkpoint_compaction() -> None:
+    """Cancel background compaction (called on application shutdown)"""
+    global _compaction_task
+    task, _compaction_task = _compaction_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,268 @@
+"""
+Hot conversation cache
+In-process state of recently active conversations, in front of the DynamoDB
+checkpointer and message table.
+
+Per thread_id (the conversation ID) it keeps:
+- the latest checkpoint of each namespace, written through by
+  AsyncDynamoDBSaverCustom.aput and filled by aget_tuple on a miss;
+- the recent message window per set of message types, filled by
+  find_by_conversation_and_types on a miss and appended to by
+  MessageDynamoDB.save (before the write-behind queue flushes it).
+
+DynamoDB stays the source of truth: every write still goes there, a failed
+message write drops the conversation, entries are re-read
+CONVERSATION_CACHE_TTL seconds after they were loaded, and the cache is
+LRU-bounded to CONVERSATION_CACHE_MAX_THREADS conversations.
+
+Each worker process has its own cache, and with several workers (Dockerfile.prod
+runs 4) another worker may have written to the conversation. With
+CONVERSATION_CACHE_VALIDATE (the default) a hit is therefore only served after
+a keys-only query confirms it: the newest checkpoint ID matches, and no recent
+stored message is missing from the window. That costs one small read instead
+of loading and decoding the state. Set it to false only when a conversation
+is always served by the same worker (single worker or sticky routing); then a
+follow-up turn starts without any DynamoDB read.
+"""
+
+import bisect
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langgraph.checkpoint.base import Checkpoint, CheckpointMetadata
+
+from app.mutil_agent.config import (
+    CONVERSATION_CACHE_ENABLED,
+    CONVERSATION_CACHE_MAX_THREADS,
+    CONVERSATION_CACHE_MESSAGE_WINDOW,
+    CONVERSATION_CACHE_TTL,
+    MESSAGES_LIMIT,
+)
+from app.mutil_agent.utils.metrics import get_metrics_registry
+
+CONVERSATION_CACHE_REQUESTS = get_metrics_registry().counter(
+    "kmult_conversation_cache_requests_total", "Hot conversation cache lookups", ("kind", "result")
+)
+
+
+@dataclass
+class _MessageWindow:
+    """Newest messages of one conversation with the given types, oldest first"""
+    items: List[Dict[str, Any]]
+    complete: bool  # Holds the whole history, so any limit can be served
+    expires_at: float
+
+
+@dataclass
+class _ConversationEntry:
+    checkpoints: Dict[str, Tuple[Checkpoint, CheckpointMetadata, float]] = field(default_factory=dict)
+    windows: Dict[Tuple[str, ...], _MessageWindow] = field(default_factory=dict)
+
+
+def _created_at(item: Dict[str, Any]) -> str:
+    return item.get("created_at", "")
+
+
+def _types_key(message_types: Sequence[Any]) -> Tuple[str, ...]:
+    # MessageTypes members and their plain values name the same window
+    return tuple(sorted(getattr(t, "value", t) for t in message_types))
+
+
+class ConversationCache:
+    """LRU of the latest checkpoint and recent messages per thread_id"""
+
+    def __init__(self, max_threads: int = 1000, message_window: int = 50, ttl_seconds: float = 300.0):
+        self.max_threads = max_threads
+        self.message_window = message_window
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _ConversationEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "checkpoint_hits": 0, "checkpoint_misses": 0, "checkpoint_stale": 0,
+            "message_hits": 0, "message_misses": 0, "message_stale": 0,
+            "evictions": 0, "invalidations": 0,
+        }
+
+    def get_checkpoint(
+        self, thread_id: str, checkpoint_ns: str = "", checkpoint_id: Optional[str] = None
+    ) -> Optional[Tuple[Checkpoint, CheckpointMetadata]]:
+        """
+        Latest cached checkpoint of a thread (a copy), or None on a miss
+
+        Args:
+            checkpoint_id: Only hit when the latest checkpoint has this ID
+        """
+        with self._lock:
+            entry = self._entries.get(thread_id)
+            cached = entry.checkpoints.get(checkpoint_ns) if entry else None
+            if cached is not None and cached[2] <= time.monotonic():
+                del entry.checkpoints[checkpoint_ns]
+                cached = None
+            if cached is None or (checkpoint_id and cached[0]["id"] != checkpoint_id):
+                self._count("checkpoint", hit=False)
+                return None
+            self._entries.move_to_end(thread_id)
+            self._count("checkpoint", hit=True)
+            checkpoint, metadata, _ = cached
+        # Deep copies: callers (and LangGraph channels) mutate channel values in place
+        return copy.deepcopy(checkpoint), copy.deepcopy(metadata)
+
+    def put_checkpoint(
+        self, thread_id: str, checkpoint_ns: str, checkpoint: Checkpoint, metadata: CheckpointMetadata
+    ) -> None:
+        """Record a checkpoint just written to (or read as the latest from) DynamoDB"""
+        if self.max_threads <= 0:
+            return
+        stored = (copy.deepcopy(checkpoint), copy.deepcopy(metadata), time.monotonic() + self.ttl_seconds)
+        with self._lock:
+            entry = self._entry(thread_id)
+            current = entry.checkpoints.get(checkpoint_ns)
+            # Checkpoint IDs are time-ordered; never replace the latest with an older one
+            if current is None or current[0]["id"] <= checkpoint["id"]:
+                entry.checkpoints[checkpoint_ns] = stored
+
+    def discard_checkpoint(self, thread_id: str, checkpoint_id: Optional[str] = None) -> None:
+        """Forget a deleted checkpoint (all of the thread's when checkpoint_id is None)"""
+        with self._lock:
+            entry = self._entries.get(thread_id)
+            if entry is None:
+                return
+            for ns, cached in list(entry.checkpoints.items()):
+                if checkpoint_id is None or cached[0]["id"] == checkpoint_id:
+                    del entry.checkpoints[ns]
+
+    def get_messages(
+        self, conversation_id: str, message_types: Sequence[str], limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        The latest `limit` messages with the given types (oldest first), or None
+        when the cached window cannot answer for them
+        """
+        key = _types_key(message_types)
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+            window = entry.windows.get(key) if entry else None
+            if window is not None and window.expires_at <= time.monotonic():
+                del entry.windows[key]
+                window = None
+            if window is None or not (window.complete or len(window.items) >= limit):
+                self._count("message", hit=False)
+                return None
+            self._entries.move_to_end(conversation_id)
+            self._count("message", hit=True)
+            return [dict(item) for item in window.items[-limit:]] if limit > 0 else []
+
+    def store_messages(
+        self, conversation_id: str, message_types: Sequence[str], items: List[Dict[str, Any]], limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Record the result of a DynamoDB window read (the latest `limit`
+        messages, oldest first)
+
+        Messages already cached are kept: they may not have been flushed to
+        DynamoDB yet.
+
+        Returns:
+            The latest `limit` messages of the merged window
+        """
+        if self.max_threads <= 0:
+            return items
+        key = _types_key(message_types)
+        with self._lock:
+            entry = self._entry(conversation_id)
+            merged = {item["id"]: dict(item) for item in items}
+            previous = entry.windows.get(key)
+            if previous is not None:
+                for item in previous.items:
+                    merged.setdefault(item["id"], item)
+            ordered = sorted(merged.values(), key=_created_at)
+            entry.windows[key] = _MessageWindow(
+                items=ordered[-self.message_window:],
+                complete=len(items) < limit and len(ordered) <= self.message_window,
+                expires_at=time.monotonic() + self.ttl_seconds,
+            )
+            return [dict(item) for item in ordered[-limit:]] if limit > 0 else []
+
+    def append_message(self, item: Dict[str, Any]) -> None:
+        """Add a saved message (deserialized item) to the cached windows of its conversation"""
+        with self._lock:
+            entry = self._entries.get(item["conversation_id"])
+            if entry is None:
+                return  # Nothing cached yet: the next read loads the window from DynamoDB
+            for key, window in entry.windows.items():
+                if getattr(item["type"], "value", item["type"]) not in key:
+                    continue
+                items = [cached for cached in window.items if cached["id"] != item["id"]]
+                bisect.insort(items, dict(item), key=_created_at)
+                if len(items) > self.message_window:
+                    items = items[-self.message_window:]
+                    window.complete = False
+                window.items = items
+
+    def count_stale(self, kind: str) -> None:
+        """Count a hit that validation against DynamoDB found stale ("checkpoint" or "message")"""
+        with self._lock:
+            self._stats[f"{kind}_hits"] -= 1
+            self._stats[f"{kind}_stale"] += 1
+        CONVERSATION_CACHE_REQUESTS.inc(kind=kind, result="stale")
+
+    def invalidate(self, thread_id: str) -> None:
+        """Drop everything cached for a conversation"""
+        with self._lock:
+            if self._entries.pop(thread_id, None) is not None:
+                self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        with self._lock:
+            return {**self._stats, "conversations": len(self._entries), "max_threads": self.max_threads}
+
+    def _entry(self, thread_id: str) -> _ConversationEntry:
+        # Caller holds the lock
+        entry = self._entries.get(thread_id)
+        if entry is None:
+            entry = self._entries[thread_id] = _ConversationEntry()
+            while len(self._entries) > self.max_threads:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        self._entries.move_to_end(thread_id)
+        return entry
+
+    def _count(self, kind: str, hit: bool) -> None:
+        # Caller holds the lock
+        self._stats[f"{kind}_{'hits' if hit else 'misses'}"] += 1
+        CONVERSATION_CACHE_REQUESTS.inc(kind=kind, result="hit" if hit else "miss")
+
+
+_conversation_cache: Optional[ConversationCache] = None
+_conversation_cache_lock = threading.Lock()
+
+
+def get_conversation_cache() -> Optional[ConversationCache]:
+    """
+    Get the process-wide hot conversation cache
+
+    Returns:
+        ConversationCache, or None when CONVERSATION_CACHE_ENABLED is false
+    """
+    global _conversation_cache
+    if not CONVERSATION_CACHE_ENABLED:
+        return None
+    if _conversation_cache is None:
+        with _conversation_cache_lock:
+            if _conversation_cache is None:
+                _conversation_cache = ConversationCache(
+                    max_threads=CONVERSATION_CACHE_MAX_THREADS,
+                    # The window must cover the history the chat nodes read
+                    message_window=max(CONVERSATION_CACHE_MESSAGE_WINDOW, MESSAGES_LIMIT),
+                    ttl_seconds=CONVERSATION_CACHE_TTL,
+                )
+    return _conversation_cache
@@ -0,0 +1,139 @@
+"""
+Async DynamoDB executor
+Non-blocking access to the shared DynamoDB client.
+
+boto3 has no asyncio support, so message and checkpoint calls are offloaded
+to a dedicated I/O thread pool sized to the client's connection pool
+(DYNAMODB_MAX_POOL_CONNECTIONS). The event loop never waits on a DynamoDB
+round trip, so concurrent chats on one worker interleave their reads and
+writes instead of queueing behind each other.
+
+Only low-level clients are used from the pool: boto3 clients are thread-safe,
+resources (and their batch_writer) are not.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from app.mutil_agent.config import DYNAMODB_MAX_POOL_CONNECTIONS
+from app.mutil_agent.utils.tracing import span
+from .dynamodb_utils import get_dynamodb_client
+
+# BatchWriteItem accepts at most 25 put/delete requests per call
+BATCH_WRITE_MAX_ITEMS = 25
+
+
+def batch_write_requests(
+    client,
+    table_name: str,
+    requests: List[Dict[str, Any]],
+    max_retries: int = 5,
+    backoff: float = 0.05,
+) -> None:
+    """
+    Send PutRequest/DeleteRequest entries with BatchWriteItem (blocking)
+
+    Requests are sent in chunks of 25; unprocessed requests are retried with
+    exponential backoff.
+
+    Args:
+        client: Low-level DynamoDB client
+        table_name: Target table
+        requests: {"PutRequest": ...} / {"DeleteRequest": ...} entries
+        max_retries: Retries per chunk for unprocessed requests
+
+    Raises:
+        RuntimeError: If requests are still unprocessed after max_retries
+    """
+    for start in range(0, len(requests), BATCH_WRITE_MAX_ITEMS):
+        chunk = requests[start:start + BATCH_WRITE_MAX_ITEMS]
+        for attempt in range(max_retries + 1):
+            response = client.batch_write_item(RequestItems={table_name: chunk})
+            chunk = response.get("UnprocessedItems", {}).get(table_name, [])
+            if not chunk:
+                break
+            if attempt < max_retries:
+                time.sleep(backoff * (2 ** attempt))
+        else:
+            raise RuntimeError(f"{len(chunk)} requests left unprocessed in {table_name} after {max_retries} retries")
+
+
+def batch_put_items(client, table_name: str, items: List[Dict[str, Any]], max_retries: int = 5) -> None:
+    """Write serialized items (DynamoDB attribute-value format) with batch_write_requests"""
+    batch_write_requests(client, table_name, [{"PutRequest": {"Item": item}} for item in items], max_retries)
+
+
+def batch_delete_keys(client, table_name: str, keys: List[Dict[str, Any]], max_retries: int = 5) -> None:
+    """Delete items by serialized primary key with batch_write_requests"""
+    batch_write_requests(client, table_name, [{"DeleteRequest": {"Key": key}} for key in keys], max_retries)
+
+
+class DynamoDBExecutor:
+    """Offloads blocking DynamoDB calls to a bounded thread pool"""
+
+    def __init__(self, client=None, max_workers: int = 50):
+        self.client = client
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="dynamodb-io"
+        )
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable (usually a client method) on the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        with span(f"dynamodb.{getattr(func, '__name__', 'call')}"):
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def call(self, operation: str, **kwargs) -> Dict[str, Any]:
+        """Non-blocking call of a shared client operation, e.g. call("get_item", TableName=..., Key=...)"""
+        return await self.run(getattr(self.client, operation), **kwargs)
+
+    async def batch_put(self, table_name: str, items: List[Dict[str, Any]]) -> None:
+        """Non-blocking batch_put_items on the shared client"""
+        if items:
+            await self.run(batch_put_items, self.client, table_name, items)
+
+    async def batch_delete(self, table_name: str, keys: List[Dict[str, Any]]) -> None:
+        """Non-blocking batch_delete_keys on the shared client"""
+        if keys:
+            await self.run(batch_delete_keys, self.client, table_name, keys)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Release the I/O thread pool"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_dynamodb_executor: Optional[DynamoDBExecutor] = None
+_dynamodb_executor_lock = threading.Lock()
+
+
+def get_dynamodb_executor() -> DynamoDBExecutor:
+    """
+    Get the process-wide DynamoDB executor
+
+    Returns:
+        DynamoDBExecutor bound to the shared pooled DynamoDB client
+    """
+    global _dynamodb_executor
+    if _dynamodb_executor is None:
+        with _dynamodb_executor_lock:
+            if _dynamodb_executor is None:
+                _dynamodb_executor = DynamoDBExecutor(
+                    client=get_dynamodb_client(),
+                    max_workers=DYNAMODB_MAX_POOL_CONNECTIONS,
+                )
+    return _dynamodb_executor
+
+
+def shutdown_dynamodb_executor() -> None:
+    """Shut down the process-wide executor (called on application shutdown)"""
+    global _dynamodb_executor
+    with _dynamodb_executor_lock:
+        if _dynamodb_executor is not None:
+            _dynamodb_executor.shutdown()
+            _dynamodb_executor = None
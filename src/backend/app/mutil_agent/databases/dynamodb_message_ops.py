@@ -2,39 +2,34 @@
 DynamoDB Message operations to replace MongoDB operations.
 """
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+from contextlib import aclosing
+from typing import List, Optional, Dict, Any, AsyncIterator
 from uuid import UUID
 from datetime import datetime
 
-import boto3
 from boto3.dynamodb.types import TypeDeserializer
 from botocore.exceptions import ClientError
 
-from app.mutil_agent.config import (
-    AWS_REGION,
-    AWS_ACCESS_KEY_ID,
-    AWS_SECRET_ACCESS_KEY,
-    DYNAMODB_MESSAGE_TABLE,
-)
+from app.mutil_agent.config import CONVERSATION_CACHE_VALIDATE, DYNAMODB_MESSAGE_TABLE
+from .dynamodb_conversation_cache import get_conversation_cache
+from .dynamodb_executor import get_dynamodb_executor
+from .dynamodb_utils import get_dynamodb_client, get_dynamodb_resource
+
+CONVERSATION_INDEX = "conversation_id-created_at-index"
+# Items evaluated per history query page (the type filter is applied after the page limit)
+HISTORY_PAGE_SIZE = 100
 
 
 class DynamoDBMessageOperations:
-    """Handle DynamoDB operations for Message model."""
+    """Handle DynamoDB operations for Message model (queries run on the DynamoDB I/O pool)."""
     
     def __init__(self, table_name: str = DYNAMODB_MESSAGE_TABLE):
         self.table_name = table_name
-        self.client = boto3.client(
-            "dynamodb",
-            region_name=AWS_REGION,
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-        )
-        self.resource = boto3.resource(
-            "dynamodb",
-            region_name=AWS_REGION,
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-        )
+        # Shared pooled client/resource: creating boto3 clients per instance is slow
+        self.client = get_dynamodb_client()
+        self.resource = get_dynamodb_resource()
+        self.executor = get_dynamodb_executor()
         self.deserializer = TypeDeserializer()
     
     async def find_by_conversation_and_types(
@@ -44,46 +39,138 @@ class DynamoDBMessageOperations:
         limit: int = 20
     ) -> List[Dict[str, Any]]:
         """
-        Find messages by conversation ID and types.
-        Returns raw DynamoDB items.
+        Find the latest `limit` messages of a conversation with the given types.
+        Pages backwards from the newest message until enough matches are found,
+        so the cost follows the window size, not the conversation length.
+        Returns raw DynamoDB items in chronological order.
+        Served from the hot conversation cache when it holds the window (and,
+        with CONVERSATION_CACHE_VALIDATE, an ids-only query shows no message
+        from another worker is missing from it).
         """
+        cache = get_conversation_cache()
+        if cache is not None:
+            cached = cache.get_messages(conversation_id, message_types, limit)
+            if cached is not None:
+                if not CONVERSATION_CACHE_VALIDATE:
+                    return cached
+                try:
+                    if await self._window_is_current(conversation_id, message_types, limit, cached):
+                        return cached
+                    cache.count_stale("message")
+                except Exception as e:
+                    logging.warning(f"[DynamoDB]: Failed to validate cached messages: {str(e)}")
         try:
-            # Build filter expression for message types
-            type_conditions = []
-            expression_values = {":conv_id": {"S": conversation_id}}
-            
-            for i, msg_type in enumerate(message_types):
-                type_key = f":type{i}"
-                type_conditions.append(f"#type = {type_key}")
-                expression_values[type_key] = {"S": msg_type}
-            
-            filter_expression = f"({' OR '.join(type_conditions)})"
-            
-            # Query DynamoDB - using GSI on conversation_id
-            response = self.client.query(
-                TableName=self.table_name,
-                IndexName="conversation_id-created_at-index",  # GSI for conversation queries
-                KeyConditionExpression="conversation_id = :conv_id",
-                FilterExpression=filter_expression,
-                ExpressionAttributeNames={
-                    "#type": "type"
-                },
-                ExpressionAttributeValues=expression_values,
-                ScanIndexForward=True,  # Sort by created_at ascending
-                Limit=limit
-            )
-            
-            items = []
-            for item_data in response.get("Items", []):
-                item = {k: self.deserializer.deserialize(v) for k, v in item_data.items()}
-                items.append(item)
-            
-            return items
+            messages = (await self._newest(conversation_id, message_types, limit))[::-1]
+            if cache is not None:
+                # Merged with cached messages the write-behind queue has not flushed yet
+                messages = cache.store_messages(conversation_id, message_types, messages, limit)
+            return messages
             
         except Exception as e:
             logging.error(f"[DynamoDB]: Failed to find messages: {str(e)}")
             return []
     
+    async def _newest(
+        self,
+        conversation_id: str,
+        message_types: List[str],
+        limit: int,
+        attributes: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """The latest `limit` messages with the given types, newest first"""
+        newest_first = []
+        # Over-fetch per page: hidden/system messages are filtered out after the limit
+        pages = self.query_conversation_pages(
+            conversation_id, message_types, newest_first=True, page_size=max(2 * limit, 20), attributes=attributes
+        )
+        async with aclosing(pages):
+            async for page in pages:
+                newest_first.extend(page)
+                if len(newest_first) >= limit:
+                    break
+        return newest_first[:limit]
+    
+    async def _window_is_current(
+        self, conversation_id: str, message_types: List[str], limit: int, cached: List[Dict[str, Any]]
+    ) -> bool:
+        """
+        Whether a cached window holds every stored message it should.
+        Another worker may have saved messages to the conversation; any of the
+        latest `limit` stored ones that is not cached (and not older than the
+        cached window, unless the window is the whole history) makes it stale.
+        Messages cached but not yet flushed by the write-behind queue are fine.
+        """
+        cached_ids = {item["id"] for item in cached}
+        oldest = cached[0]["created_at"] if len(cached) >= limit and cached else None
+        for item in await self._newest(conversation_id, message_types, limit, attributes=["id", "created_at"]):
+            if item["id"] not in cached_ids and (oldest is None or item["created_at"] >= oldest):
+                return False
+        return True
+    
+    async def query_conversation_pages(
+        self,
+        conversation_id: str,
+        message_types: Optional[List[str]] = None,
+        newest_first: bool = False,
+        page_size: int = HISTORY_PAGE_SIZE,
+        attributes: Optional[List[str]] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Query a conversation's messages page by page, following LastEvaluatedKey.
+        Yields lists of raw DynamoDB items (a page may be empty when all its
+        items were filtered out), with only `attributes` when given.
+        """
+        query_params = {
+            "TableName": self.table_name,
+            "IndexName": CONVERSATION_INDEX,  # GSI for conversation queries
+            "KeyConditionExpression": "conversation_id = :conv_id",
+            "ExpressionAttributeValues": {":conv_id": {"S": conversation_id}},
+            "ScanIndexForward": not newest_first,  # Sort by created_at
+            "Limit": page_size,
+        }
+        
+        # Build filter expression for message types
+        if message_types:
+            type_conditions = []
+            for i, msg_type in enumerate(message_types):
+                type_key = f":type{i}"
+                type_conditions.append(f"#type = {type_key}")
+                query_params["ExpressionAttributeValues"][type_key] = {"S": msg_type}
+            query_params["FilterExpression"] = f"({' OR '.join(type_conditions)})"
+            query_params["ExpressionAttributeNames"] = {"#type": "type"}
+        
+        if attributes:
+            names = {f"#attr{i}": attribute for i, attribute in enumerate(attributes)}
+            query_params["ProjectionExpression"] = ", ".join(names)
+            query_params.setdefault("ExpressionAttributeNames", {}).update(names)
+        
+        while True:
+            response = await self.executor.run(self.client.query, **query_params)
+            yield [
+                {k: self.deserializer.deserialize(v) for k, v in item_data.items()}
+                for item_data in response.get("Items", [])
+            ]
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            query_params["ExclusiveStartKey"] = last_key
+    
+    async def iter_conversation(
+        self,
+        conversation_id: str,
+        message_types: Optional[List[str]] = None,
+        newest_first: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over a conversation's full history (e.g. for export), one page in memory at a time.
+        Yields raw DynamoDB items; errors are raised rather than truncating the history.
+        """
+        pages = self.query_conversation_pages(conversation_id, message_types, newest_first=newest_first)
+        async with aclosing(pages):
+            async for page in pages:
+                for item in page:
+                    yield item
+    
     async def scan_messages(
         self,
         filters: Dict[str, Any] = None,
@@ -107,7 +194,7 @@ class DynamoDBMessageOperations:
                 # You can extend this based on your needs
                 pass
             
-            response = self.client.scan(**scan_params)
+            response = await self.executor.run(self.client.scan, **scan_params)
             
             items = []
             for item_data in response.get("Items", []):
@@ -171,10 +258,13 @@ class DynamoDBMessageOperations:
 
 # Singleton instance
 _message_operations = None
+_message_operations_lock = threading.Lock()
 
 def get_message_operations() -> DynamoDBMessageOperations:
     """Get singleton instance of DynamoDB message operations."""
     global _message_operations
     if _message_operations is None:
-        _message_operations = DynamoDBMessageOperations()
+        with _message_operations_lock:
+            if _message_operations is None:
+                _message_operations = DynamoDBMessageOperations()
     return _message_operations
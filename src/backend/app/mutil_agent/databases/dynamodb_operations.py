@@ -7,14 +7,26 @@ from boto3.dynamodb.types import TypeDeserializer
 from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.base import Checkpoint, CheckpointMetadata
 
+from .dynamodb_checkpoint_storage import CheckpointStorage
+from .dynamodb_executor import DynamoDBExecutor, get_dynamodb_executor
+
 
 class DynamoDBOperations:
-    """Handle DynamoDB CRUD operations."""
+    """Handle DynamoDB CRUD operations (blocking client calls run on the DynamoDB I/O pool)."""
     
-    def __init__(self, client, deserializer: TypeDeserializer, serde):
+    def __init__(
+        self,
+        client,
+        deserializer: TypeDeserializer,
+        serde,
+        executor: Optional[DynamoDBExecutor] = None,
+        storage: Optional[CheckpointStorage] = None,
+    ):
         self.client = client
         self.deserializer = deserializer
         self.serde = serde
+        self.executor = executor or get_dynamodb_executor()
+        self.storage = storage or CheckpointStorage(serde, client, self.executor)
     
     async def get_checkpoint(self, table_name: str, thread_id: str, checkpoint_id: str) -> Optional[Checkpoint]:
         """Get a checkpoint from DynamoDB."""
@@ -22,7 +34,8 @@ class DynamoDBOperations:
             return None
             
         try:
-            response = self.client.get_item(
+            response = await self.executor.run(
+                self.client.get_item,
                 TableName=table_name,
                 Key={
                     "thread_id": {"S": thread_id},
@@ -34,7 +47,7 @@ class DynamoDBOperations:
                 return None
                 
             item = {k: self.deserializer.deserialize(v) for k, v in response["Item"].items()}
-            return self.serde.loads_typed((item["type"], item["checkpoint"]))
+            return await self.storage.decode_checkpoint(table_name, item)
             
         except Exception as e:
             logging.error(f"[DynamoDB]: Failed to get checkpoint: {str(e)}")
@@ -48,7 +61,8 @@ class DynamoDBOperations:
             return None
             
         try:
-            response = self.client.get_item(
+            response = await self.executor.run(
+                self.client.get_item,
                 TableName=table_name,
                 Key={
                     "thread_id": {"S": thread_id},
@@ -60,7 +74,7 @@ class DynamoDBOperations:
                 return None
                 
             item = {k: self.deserializer.deserialize(v) for k, v in response["Item"].items()}
-            checkpoint = self.serde.loads_typed((item["type"], item["checkpoint"]))
+            checkpoint = await self.storage.decode_checkpoint(table_name, item)
             metadata = item.get("metadata", {})
             
             return (checkpoint, metadata)
@@ -69,6 +83,56 @@ class DynamoDBOperations:
             logging.error(f"[DynamoDB]: Failed to get checkpoint tuple: {str(e)}")
             return None
 
+    async def get_latest_checkpoint_with_metadata(
+        self, table_name: str, thread_id: str, checkpoint_ns: str = ""
+    ) -> Optional[Tuple[Checkpoint, CheckpointMetadata]]:
+        """Get the newest checkpoint of a thread's namespace and its metadata (checkpoint IDs are time-ordered)."""
+        try:
+            item = await self._latest_checkpoint_item(table_name, thread_id, checkpoint_ns)
+            if item is None:
+                return None
+            checkpoint = await self.storage.decode_checkpoint(table_name, item)
+            return (checkpoint, item.get("metadata", {}))
+
+        except Exception as e:
+            logging.error(f"[DynamoDB]: Failed to get latest checkpoint: {str(e)}")
+            return None
+
+    async def get_latest_checkpoint_id(self, table_name: str, thread_id: str, checkpoint_ns: str = "") -> Optional[str]:
+        """Get the newest checkpoint ID of a thread's namespace (keys-only read, raises on errors)."""
+        item = await self._latest_checkpoint_item(table_name, thread_id, checkpoint_ns, attributes=("checkpoint_id",))
+        return item["checkpoint_id"] if item else None
+
+    async def _latest_checkpoint_item(
+        self,
+        table_name: str,
+        thread_id: str,
+        checkpoint_ns: str,
+        attributes: Optional[Tuple[str, ...]] = None,
+        page_size: int = 10,
+    ) -> Optional[Dict[str, Any]]:
+        query_params = {
+            "TableName": table_name,
+            "KeyConditionExpression": "thread_id = :thread_id",
+            "FilterExpression": "checkpoint_ns = :checkpoint_ns",
+            "ExpressionAttributeValues": {
+                ":thread_id": {"S": thread_id},
+                ":checkpoint_ns": {"S": checkpoint_ns},
+            },
+            "ScanIndexForward": False,  # Latest first
+            "Limit": page_size,
+        }
+        if attributes:
+            query_params["ProjectionExpression"] = ", ".join(attributes)
+        while True:
+            response = await self.executor.run(self.client.query, **query_params)
+            items = response.get("Items", [])
+            if items:
+                return {k: self.deserializer.deserialize(v) for k, v in items[0].items()}
+            if "LastEvaluatedKey" not in response:
+                return None
+            query_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
     async def list_checkpoints(
         self, table_name: str, thread_id: str, limit: Optional[int] = None
     ) -> AsyncIterator[RunnableConfig]:
@@ -86,7 +150,7 @@ class DynamoDBOperations:
             if limit:
                 query_params["Limit"] = limit
                 
-            response = self.client.query(**query_params)
+            response = await self.executor.run(self.client.query, **query_params)
             
             for item_data in response.get("Items", []):
                 item = {k: self.deserializer.deserialize(v) for k, v in item_data.items()}
@@ -118,7 +182,7 @@ class DynamoDBOperations:
             if limit:
                 query_params["Limit"] = limit
                 
-            response = self.client.query(**query_params)
+            response = await self.executor.run(self.client.query, **query_params)
             
             for item_data in response.get("Items", []):
                 item = {k: self.deserializer.deserialize(v) for k, v in item_data.items()}
@@ -141,7 +205,8 @@ class DynamoDBOperations:
             return
             
         try:
-            self.client.delete_item(
+            await self.executor.run(
+                self.client.delete_item,
                 TableName=table_name,
                 Key={
                     "thread_id": {"S": thread_id},
@@ -3,70 +3,76 @@ DynamoDB utilities and helper functions.
 """
 import boto3
 import os
+import threading
 from datetime import datetime
+from botocore.config import Config
 from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.base import CheckpointMetadata
-from app.mutil_agent.config import AWS_REGION, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_SESSION_TOKEN, VERIFY_HTTPS
+from app.mutil_agent.config import (
+    AWS_REGION,
+    AWS_ACCESS_KEY_ID,
+    AWS_SECRET_ACCESS_KEY,
+    AWS_SESSION_TOKEN,
+    VERIFY_HTTPS,
+    DYNAMODB_ENDPOINT_URL,
+    DYNAMODB_MAX_POOL_CONNECTIONS,
+)
 
 _dynamodb_client = None
 _dynamodb_resource = None
+_dynamodb_lock = threading.Lock()
+
+
+def dynamodb_connection_kwargs() -> dict:
+    """Shared connection settings (pool size, endpoint override) for DynamoDB clients and resources."""
+    kwargs = {"config": Config(max_pool_connections=DYNAMODB_MAX_POOL_CONNECTIONS)}
+    if DYNAMODB_ENDPOINT_URL and DYNAMODB_ENDPOINT_URL.strip():
+        kwargs["endpoint_url"] = DYNAMODB_ENDPOINT_URL
+    return kwargs
+
+
+def _session_kwargs() -> dict:
+    # Suppress SSL warnings
+    import urllib3
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    
+    # Simple configuration with SSL verification disabled
+    kwargs = {
+        "region_name": AWS_REGION,
+        "verify": False,  # Disable SSL verification completely
+        **dynamodb_connection_kwargs(),
+    }
+    
+    # Add credentials if available
+    if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
+        kwargs.update({
+            "aws_access_key_id": AWS_ACCESS_KEY_ID,
+            "aws_secret_access_key": AWS_SECRET_ACCESS_KEY,
+        })
+        
+        # Add session token if available (for temporary credentials)
+        if AWS_SESSION_TOKEN:
+            kwargs["aws_session_token"] = AWS_SESSION_TOKEN
+    return kwargs
 
 
 def get_dynamodb_client():
-    """Get DynamoDB client singleton."""
+    """Get DynamoDB client singleton (thread-safe; shared by the DynamoDB I/O pool)."""
     global _dynamodb_client
     if _dynamodb_client is None:
-        # Suppress SSL warnings
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
-        # Simple configuration with SSL verification disabled
-        client_kwargs = {
-            "region_name": AWS_REGION,
-            "verify": False  # Disable SSL verification completely
-        }
-        
-        # Add credentials if available
-        if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
-            client_kwargs.update({
-                "aws_access_key_id": AWS_ACCESS_KEY_ID,
-                "aws_secret_access_key": AWS_SECRET_ACCESS_KEY,
-            })
-            
-            # Add session token if available (for temporary credentials)
-            if AWS_SESSION_TOKEN:
-                client_kwargs["aws_session_token"] = AWS_SESSION_TOKEN
-        
-        _dynamodb_client = boto3.client("dynamodb", **client_kwargs)
+        with _dynamodb_lock:
+            if _dynamodb_client is None:
+                _dynamodb_client = boto3.client("dynamodb", **_session_kwargs())
     return _dynamodb_client
 
 
 def get_dynamodb_resource():
-    """Get DynamoDB resource singleton."""
+    """Get DynamoDB resource singleton (not thread-safe: use from the event loop only)."""
     global _dynamodb_resource
     if _dynamodb_resource is None:
-        # Suppress SSL warnings
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
-        # Simple configuration with SSL verification disabled
-        resource_kwargs = {
-            "region_name": AWS_REGION,
-            "verify": False  # Disable SSL verification completely
-        }
-        
-        # Add credentials if available
-        if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
-            resource_kwargs.update({
-                "aws_access_key_id": AWS_ACCESS_KEY_ID,
-                "aws_secret_access_key": AWS_SECRET_ACCESS_KEY,
-            })
-            
-            # Add session token if available (for temporary credentials)
-            if AWS_SESSION_TOKEN:
-                resource_kwargs["aws_session_token"] = AWS_SESSION_TOKEN
-        
-        _dynamodb_resource = boto3.resource("dynamodb", **resource_kwargs)
+        with _dynamodb_lock:
+            if _dynamodb_resource is None:
+                _dynamodb_resource = boto3.resource("dynamodb", **_session_kwargs())
     return _dynamodb_resource
 
 
@@ -0,0 +1,239 @@
+"""
+Write-behind DynamoDB persistence
+Coalesces item writes from all requests into BatchWriteItem calls.
+
+Callers enqueue serialized items and return immediately; a flusher thread
+writes them in batches of up to 25 once a batch is full or the oldest
+pending item has waited MESSAGE_WRITE_BEHIND_FLUSH_INTERVAL seconds.
+Unprocessed items are retried with backoff (batch_put_items). Writes of the
+same key still pending are coalesced, the last one wins.
+
+Durable writes (put(..., wait=True)) trigger an immediate flush and await
+their batch, surfacing write errors to the caller. Fire-and-forget writes
+that fail are logged and counted. The queue is drained on application
+shutdown.
+
+The flusher is a thread rather than an asyncio task, so coroutines on any
+event loop (the main loop or the Strands async bridge) can enqueue and await.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.mutil_agent.config import (
+    MESSAGE_WRITE_BEHIND_BATCH_SIZE,
+    MESSAGE_WRITE_BEHIND_FLUSH_INTERVAL,
+)
+from app.mutil_agent.utils.metrics import get_metrics_registry
+from .dynamodb_executor import BATCH_WRITE_MAX_ITEMS, batch_put_items
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_ITEMS = get_metrics_registry().counter(
+    "kmult_dynamodb_write_behind_items_total", "Items written by the write-behind queue", ("table", "outcome")
+)
+
+
+class WriteBehindQueue:
+    """Batches item writes to one table on a background flusher thread"""
+
+    def __init__(
+        self,
+        client,
+        table_name: str,
+        key_fields: Sequence[str] = ("id",),
+        batch_size: int = BATCH_WRITE_MAX_ITEMS,
+        flush_interval: float = 0.05,
+        max_retries: int = 5,
+    ):
+        self.client = client
+        self.table_name = table_name
+        self.key_fields = tuple(key_fields)
+        self.batch_size = max(1, min(batch_size, BATCH_WRITE_MAX_ITEMS))
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        # key -> (latest item, futures of every write coalesced into it)
+        self._pending: Dict[Tuple, Tuple[Dict[str, Any], List[Future]]] = {}
+        self._oldest_at: Optional[float] = None
+        self._in_flight = 0
+        self._urgent = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"enqueued": 0, "coalesced": 0, "written": 0, "failed": 0, "batches": 0}
+
+    def submit(self, item: Dict[str, Any], urgent: bool = False) -> Future:
+        """
+        Enqueue a serialized item (DynamoDB attribute-value format)
+
+        Returns:
+            Future resolved once the item's batch is written (or failed)
+        """
+        key = tuple(next(iter(item[field].values())) for field in self.key_fields)
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Write-behind queue for {self.table_name} is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"dynamodb-write-behind-{self.table_name}", daemon=True
+                )
+                self._thread.start()
+            self._stats["enqueued"] += 1
+            if key in self._pending:
+                self._stats["coalesced"] += 1
+                self._pending[key][1].append(future)
+                self._pending[key] = (item, self._pending[key][1])
+            else:
+                self._pending[key] = (item, [future])
+            if self._oldest_at is None:
+                self._oldest_at = time.monotonic()
+            self._urgent = self._urgent or urgent
+            if self._urgent or len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+        return future
+
+    async def put(self, item: Dict[str, Any], wait: bool = False) -> Future:
+        """
+        Enqueue an item; with wait=True flush now and await the write
+
+        Returns:
+            The item's Future (see submit), already resolved when waiting
+
+        Raises:
+            Exception: The write error, only when waiting
+        """
+        future = self.submit(item, urgent=wait)
+        if wait:
+            await asyncio.wrap_future(future)
+        return future
+
+    def flush_blocking(self, timeout: Optional[float] = None) -> bool:
+        """Write everything pending now and wait until done; False on timeout"""
+        with self._cond:
+            self._urgent = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """Non-blocking flush_blocking"""
+        return await asyncio.to_thread(self.flush_blocking, timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Drain pending writes and stop the flusher thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.error(f"[DynamoDB]: {len(self._pending)} writes to {self.table_name} not flushed on close")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue statistics"""
+        with self._cond:
+            return {**self._stats, "pending": len(self._pending), "in_flight": self._in_flight}
+
+    def _due(self) -> bool:
+        if not self._pending:
+            return False
+        return (
+            self._urgent
+            or self._closed
+            or len(self._pending) >= self.batch_size
+            or time.monotonic() - self._oldest_at >= self.flush_interval
+        )
+
+    def _take_batch(self) -> List[Tuple[Dict[str, Any], List[Future]]]:
+        keys = list(self._pending)[:self.batch_size]
+        batch = [self._pending.pop(key) for key in keys]
+        if not self._pending:
+            self._oldest_at = None
+            self._urgent = False
+        self._in_flight += len(batch)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._due():
+                    if self._closed and not self._pending:
+                        return
+                    timeout = None
+                    if self._pending:
+                        timeout = max(0.0, self._oldest_at + self.flush_interval - time.monotonic())
+                    self._cond.wait(timeout)
+                batch = self._take_batch()
+
+            try:
+                batch_put_items(self.client, self.table_name, [item for item, _ in batch], self.max_retries)
+                outcome, error = "written", None
+            except Exception as e:
+                outcome, error = "failed", e
+                logger.error(f"[DynamoDB]: Write-behind batch of {len(batch)} items to {self.table_name} failed: {e}")
+
+            try:
+                WRITE_BEHIND_ITEMS.inc(len(batch), table=self.table_name, outcome=outcome)
+                for _, futures in batch:
+                    for future in futures:
+                        _resolve(future, error)
+            except Exception as e:  # Never let a caller's future stop the flusher
+                logger.error(f"[DynamoDB]: Failed to resolve write-behind futures for {self.table_name}: {e}")
+            finally:
+                with self._cond:
+                    self._stats[outcome] += len(batch)
+                    self._stats["batches"] += 1
+                    self._in_flight -= len(batch)
+                    self._cond.notify_all()
+
+
+def _resolve(future: Future, error: Optional[Exception]) -> None:
+    """Complete a write's future unless its waiter already cancelled it (e.g. client disconnect)"""
+    if future.done():
+        return
+    try:
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+    except InvalidStateError:  # Cancelled between the check and the call
+        pass
+
+
+_message_write_queue: Optional[WriteBehindQueue] = None
+_message_write_queue_lock = threading.Lock()
+
+
+def get_message_write_queue() -> WriteBehindQueue:
+    """
+    Get the process-wide write-behind queue for MessageDynamoDB
+
+    Returns:
+        WriteBehindQueue on the message table, using the model's DynamoDB client
+    """
+    global _message_write_queue
+    if _message_write_queue is None:
+        with _message_write_queue_lock:
+            if _message_write_queue is None:
+                from app.mutil_agent.models.message_dynamodb import MessageDynamoDB
+                _message_write_queue = WriteBehindQueue(
+                    client=MessageDynamoDB.get_client(),
+                    table_name=MessageDynamoDB.table_name,
+                    batch_size=MESSAGE_WRITE_BEHIND_BATCH_SIZE,
+                    flush_interval=MESSAGE_WRITE_BEHIND_FLUSH_INTERVAL,
+                )
+    return _message_write_queue
+
+
+async def shutdown_message_write_queue() -> None:
+    """Flush and close the message queue (called on application shutdown)"""
+    global _message_write_queue
+    with _message_write_queue_lock:
+        queue, _message_write_queue = _message_write_queue, None
+    if queue is not None:
+        await asyncio.to_thread(queue.close)
@@ -5,6 +5,8 @@ from app.mutil_agent.config import (
     LLM_TOP_P,
     LLM_MAX_TOKENS,
 )
+from typing import Optional
+
 from app.mutil_agent.services.bedrock_service import BedrockService
 
 
@@ -15,6 +17,7 @@ class AIModelFactory:
         temperature: float = LLM_TEMPERATURE,
         top_p: float = LLM_TOP_P,
         max_tokens: int = LLM_MAX_TOKENS,
+        agent: Optional[str] = None,
     ):
         model_id = MODEL_MAPPING.get(model_name, DEFAULT_MODEL_NAME)
 
@@ -24,4 +27,5 @@ class AIModelFactory:
             temperature=temperature,
             top_p=top_p,
             max_tokens=max_tokens,
+            agent=agent,
         )
@@ -1,16 +1,43 @@
 """
 Helpers module for S3 file loading utilities and PDF processing
+
+Exports are resolved on first access so importing one helper module does
+not pull in boto3, pandas and PyPDF2 for all of them.
 """
 
-from .s3_file_loader import (
-    S3FileLoader, 
-    load_csv_from_s3, 
-    load_pdf_from_s3,
-    load_json_from_s3,
-    load_text_from_s3
-)
-from .s3_config import S3Config, get_s3_config
-from .improved_pdf_extractor import ImprovedPDFExtractor
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # The lazy exports below, for type checkers and IDEs
+    from .improved_pdf_extractor import ImprovedPDFExtractor
+    from .s3_config import S3Config, get_s3_config
+    from .s3_file_loader import (
+        S3FileLoader,
+        load_csv_from_s3,
+        load_json_from_s3,
+        load_pdf_from_s3,
+        load_text_from_s3,
+    )
+
+_LAZY_EXPORTS = {
+    'S3FileLoader': '.s3_file_loader',
+    'load_csv_from_s3': '.s3_file_loader',
+    'load_pdf_from_s3': '.s3_file_loader',
+    'load_json_from_s3': '.s3_file_loader',
+    'load_text_from_s3': '.s3_file_loader',
+    'S3Config': '.s3_config',
+    'get_s3_config': '.s3_config',
+    'ImprovedPDFExtractor': '.improved_pdf_extractor',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'S3FileLoader',
@@ -6,7 +6,7 @@ Removed unused constants and optimized for performance
 import logging
 import re
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -41,8 +41,7 @@ class DocumentChunkingHelper:
     MAX_CHARS_PER_CHUNK = 504000  # 70% of Claude 3.5 Sonnet limit
     OVERLAP_SIZE = 300
     LARGE_DOCUMENT_THRESHOLD = 100000  # Increased from 50K for better performance
-    PARALLEL_THRESHOLD = 5
-    RATE_LIMIT_DELAY = 0.5
+    NO_SUMMARY_MESSAGE = "Không thể tạo tóm tắt do lỗi xử lý."
     
     def __init__(self):
         """Initialize with compiled patterns for performance"""
@@ -100,58 +99,84 @@ class DocumentChunkingHelper:
         return result
     
     def _has_structure(self, text: str) -> bool:
-        """Quick check for document structure"""
-        paragraphs = self.paragraph_pattern.split(text)
-        sections = self.section_pattern.findall(text)
-        return len(paragraphs) >= 3 and len(sections) >= 2
+        """Quick check for document structure (stops scanning once both thresholds are met)"""
+        paragraph_breaks = 0
+        for _ in self.paragraph_pattern.finditer(text):
+            paragraph_breaks += 1
+            if paragraph_breaks >= 2:
+                break
+        if paragraph_breaks < 2:
+            return False
+        
+        sections = 0
+        for _ in self.section_pattern.finditer(text):
+            sections += 1
+            if sections >= 2:
+                return True
+        return False
     
     def _chunk_by_structure(self, text: str) -> List[DocumentChunk]:
         """Chunk by paragraphs preserving structure"""
-        chunks = []
-        paragraphs = [p.strip() for p in self.paragraph_pattern.split(text) if p.strip()]
-        
-        current_chunk = ""
-        start_pos = 0
-        
-        for i, paragraph in enumerate(paragraphs):
-            if len(current_chunk) + len(paragraph) > self.MAX_CHARS_PER_CHUNK and current_chunk:
-                # Save current chunk
-                chunks.append(self._create_chunk(current_chunk, len(chunks), start_pos, "Structure"))
-                current_chunk = paragraph
-                start_pos = sum(len(p) for p in paragraphs[:i])
-            else:
-                if not current_chunk:
-                    start_pos = sum(len(p) for p in paragraphs[:i])
-                current_chunk = f"{current_chunk}\n\n{paragraph}" if current_chunk else paragraph
-        
-        # Add final chunk
-        if current_chunk:
-            chunks.append(self._create_chunk(current_chunk, len(chunks), start_pos, "Structure"))
-        
-        return chunks
+        spans = self._iter_segment_spans(text, self.paragraph_pattern, keep_terminator=False)
+        return self._pack_spans(text, spans, "Structure")
     
     def _chunk_by_sentences(self, text: str) -> List[DocumentChunk]:
         """Simple sentence-based chunking"""
-        chunks = []
-        sentences = [s.strip() for s in self.sentence_pattern.split(text) if s.strip()]
+        spans = self._iter_segment_spans(text, self.sentence_pattern, keep_terminator=True)
+        return self._pack_spans(text, spans, "Simple")
+    
+    def _iter_segment_spans(self, text: str, separator: re.Pattern, keep_terminator: bool) -> Iterator[Tuple[int, int]]:
+        """
+        Single forward scan yielding (start, end) offsets of non-blank segments
+        between separator matches, trimmed of surrounding whitespace.
+        
+        keep_terminator keeps the first separator character (the sentence
+        punctuation) inside the preceding segment.
+        """
+        pos = 0
+        for match in separator.finditer(text):
+            end = match.start() + 1 if keep_terminator else match.start()
+            span = self._trim_span(text, pos, end)
+            if span:
+                yield span
+            pos = match.end()
         
-        current_chunk = ""
-        start_pos = 0
+        span = self._trim_span(text, pos, len(text))
+        if span:
+            yield span
+    
+    @staticmethod
+    def _trim_span(text: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """Shrink [start, end) to exclude leading/trailing whitespace; None if blank"""
+        segment = text[start:end]
+        stripped_left = segment.lstrip()
+        if not stripped_left:
+            return None
+        left = start + len(segment) - len(stripped_left)
+        right = start + len(segment.rstrip())
+        return left, right
+    
+    def _pack_spans(self, text: str, spans: Iterable[Tuple[int, int]], chunk_type: str) -> List[DocumentChunk]:
+        """
+        Greedily group consecutive segment spans into chunks of at most
+        MAX_CHARS_PER_CHUNK. Chunk content is sliced once from the original
+        text, so offsets are exact and the pass stays linear.
+        """
+        chunks = []
+        chunk_start = None
+        chunk_end = 0
         
-        for i, sentence in enumerate(sentences):
-            if len(current_chunk) + len(sentence) > self.MAX_CHARS_PER_CHUNK and current_chunk:
-                # Save current chunk
-                chunks.append(self._create_chunk(current_chunk, len(chunks), start_pos, "Simple"))
-                current_chunk = sentence
-                start_pos = sum(len(s) for s in sentences[:i])
-            else:
-                if not current_chunk:
-                    start_pos = sum(len(s) for s in sentences[:i])
-                current_chunk = f"{current_chunk}. {sentence}" if current_chunk else sentence
+        for start, end in spans:
+            if chunk_start is not None and end - chunk_start > self.MAX_CHARS_PER_CHUNK:
+                chunks.append(self._create_chunk(text[chunk_start:chunk_end], len(chunks), chunk_start, chunk_type))
+                chunk_start = None
+            if chunk_start is None:
+                chunk_start = start
+            chunk_end = end
         
         # Add final chunk
-        if current_chunk:
-            chunks.append(self._create_chunk(current_chunk, len(chunks), start_pos, "Simple"))
+        if chunk_start is not None:
+            chunks.append(self._create_chunk(text[chunk_start:chunk_end], len(chunks), chunk_start, chunk_type))
         
         return chunks
     
@@ -173,59 +198,57 @@ class DocumentChunkingHelper:
         chunks: List[DocumentChunk],
         bedrock_service,
         summary_type: str,
-        language: str,
-        max_parallel: int = 3
+        language: str
     ) -> List[str]:
-        """Process chunks with Bedrock using optimal strategy"""
+        """
+        Summarize all chunks concurrently. Parallelism is governed by the
+        shared adaptive Bedrock limiter behind bedrock_service.ai_ainvoke,
+        which grows while calls succeed and backs off on throttling.
+        """
         if not chunks:
             return []
         
         logger.info(f"🔄 Processing {len(chunks)} chunks")
         
-        # Choose processing strategy
-        if len(chunks) <= self.PARALLEL_THRESHOLD:
-            return await self._process_parallel(chunks, bedrock_service, summary_type, language, max_parallel)
-        else:
-            return await self._process_sequential(chunks, bedrock_service, summary_type, language)
+        return await asyncio.gather(*(
+            self._summarize_chunk(chunk, bedrock_service, summary_type, language)
+            for chunk in chunks
+        ))
     
-    async def _process_parallel(self, chunks, bedrock_service, summary_type, language, max_parallel):
-        """Parallel processing with semaphore"""
-        logger.info("⚡ Parallel processing")
-        semaphore = asyncio.Semaphore(max_parallel)
+    async def iter_chunk_summaries(
+        self,
+        chunks: List[DocumentChunk],
+        bedrock_service,
+        summary_type: str,
+        language: str
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """Summarize chunks concurrently, yielding (chunk_id, summary) in completion order"""
+        logger.info(f"🔄 Streaming {len(chunks)} chunk summaries")
         
-        async def process_chunk(chunk):
-            async with semaphore:
-                try:
-                    prompt = self._create_chunk_prompt(chunk, summary_type, language)
-                    response = await bedrock_service.ai_ainvoke(prompt)
-                    return self._extract_response_text(response)
-                except Exception as e:
-                    logger.error(f"❌ Chunk {chunk.chunk_id} failed: {e}")
-                    return f"[Lỗi chunk {chunk.chunk_id}: {str(e)}]"
+        async def summarize(chunk):
+            return chunk.chunk_id, await self._summarize_chunk(chunk, bedrock_service, summary_type, language)
         
-        tasks = [process_chunk(chunk) for chunk in chunks]
-        return await asyncio.gather(*tasks, return_exceptions=False)
+        tasks = [asyncio.ensure_future(summarize(chunk)) for chunk in chunks]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early (e.g. client disconnected)
+            for task in tasks:
+                task.cancel()
     
-    async def _process_sequential(self, chunks, bedrock_service, summary_type, language):
-        """Sequential processing with rate limiting"""
-        logger.info("🔄 Sequential processing")
-        results = []
+    async def _summarize_chunk(self, chunk: DocumentChunk, bedrock_service, summary_type: str, language: str) -> str:
+        """Summarize one chunk, returning an error marker instead of raising"""
+        from app.mutil_agent.services.llm_response_cache import get_llm_response_cache
         
-        for i, chunk in enumerate(chunks):
-            try:
-                prompt = self._create_chunk_prompt(chunk, summary_type, language)
-                response = await bedrock_service.ai_ainvoke(prompt)
-                results.append(self._extract_response_text(response))
-                
-                # Rate limiting
-                if i < len(chunks) - 1:
-                    await asyncio.sleep(self.RATE_LIMIT_DELAY)
-                    
-            except Exception as e:
-                logger.error(f"❌ Chunk {i} failed: {e}")
-                results.append(f"[Lỗi chunk {i}: {str(e)}]")
-        
-        return results
+        try:
+            prompt = self._create_chunk_prompt(chunk, summary_type, language)
+            return await get_llm_response_cache().complete(
+                bedrock_service, prompt, self._extract_response_text, namespace="summary.chunk"
+            )
+        except Exception as e:
+            logger.error(f"❌ Chunk {chunk.chunk_id} failed: {e}")
+            return f"[Lỗi chunk {chunk.chunk_id}: {str(e)}]"
     
     async def create_final_summary(
         self,
@@ -239,28 +262,55 @@ class DocumentChunkingHelper:
         """Create final consolidated summary"""
         logger.info("📝 Creating final summary")
         
+        prompt, combined = self.prepare_final_prompt(
+            chunk_summaries, summary_type, max_length, language, original_text_length
+        )
+        if prompt is None:
+            return self.NO_SUMMARY_MESSAGE
+        
+        from app.mutil_agent.services.llm_response_cache import get_llm_response_cache
+        
+        try:
+            final_summary = await get_llm_response_cache().complete(
+                bedrock_service, prompt, self._extract_response_text, namespace="summary.final"
+            )
+            logger.info(f"✅ Final summary: {len(final_summary)} chars")
+            return final_summary
+        except Exception as e:
+            logger.error(f"❌ Final summary failed: {e}")
+            return self.fallback_final_summary(combined, max_length)
+    
+    def prepare_final_prompt(
+        self,
+        chunk_summaries: List[str],
+        summary_type: str,
+        max_length: int,
+        language: str,
+        original_text_length: int
+    ) -> Tuple[Optional[str], str]:
+        """
+        Build the reduce-step prompt from chunk summaries
+        
+        Returns:
+            (prompt, combined summaries); prompt is None when no chunk succeeded
+        """
         # Filter valid summaries
         valid_summaries = [s for s in chunk_summaries if s and not s.startswith("[Lỗi")]
         
         if not valid_summaries:
-            return "Không thể tạo tóm tắt do lỗi xử lý."
+            return None, ""
         
         # Combine summaries
         combined = "\n\n".join([f"Phần {i+1}: {s}" for i, s in enumerate(valid_summaries)])
         
-        # Create final prompt
         prompt = self._create_final_prompt(combined, summary_type, max_length, language, len(valid_summaries), original_text_length)
-        
-        try:
-            response = await bedrock_service.ai_ainvoke(prompt)
-            final_summary = self._extract_response_text(response)
-            logger.info(f"✅ Final summary: {len(final_summary)} chars")
-            return final_summary
-        except Exception as e:
-            logger.error(f"❌ Final summary failed: {e}")
-            # Fallback to combined summaries
-            max_chars = max_length * 5
-            return combined[:max_chars] + "..." if len(combined) > max_chars else combined
+        return prompt, combined
+    
+    @staticmethod
+    def fallback_final_summary(combined: str, max_length: int) -> str:
+        """Fallback when the reduce step fails: the combined chunk summaries, truncated"""
+        max_chars = max_length * 5
+        return combined[:max_chars] + "..." if len(combined) > max_chars else combined
     
     def _create_chunk_prompt(self, chunk: DocumentChunk, summary_type: str, language: str) -> str:
         """Create chunk summarization prompt"""
@@ -297,18 +347,26 @@ YÊU CẦU:
 TÓM TẮT CUỐI:"""
     
     def _extract_response_text(self, response) -> str:
-        """Extract text from Bedrock response"""
-        try:
-            if hasattr(response, 'content'):
-                return response.content.strip()
-            elif isinstance(response, str):
-                return response.strip()
-            elif isinstance(response, dict):
-                return response.get('content', str(response)).strip()
-            return str(response).strip()
-        except Exception as e:
-            logger.error(f"Response extraction error: {e}")
-            return "Lỗi trích xuất response"
+        """
+        Extract text from Bedrock response
+        
+        Raises:
+            ValueError: If the response holds no text (never returned as a summary or cached)
+        """
+        if hasattr(response, 'content'):
+            content = response.content
+        elif isinstance(response, dict):
+            content = response.get('content', '')
+        else:
+            content = response
+        if isinstance(content, list):  # Converse content blocks
+            content = "".join(
+                block.get('text', '') if isinstance(block, dict) else str(block) for block in content
+            )
+        text = str(content).strip()
+        if not text:
+            raise ValueError("Bedrock response contains no text")
+        return text
     
     def get_processing_stats(self, result: ChunkingResult) -> Dict[str, Any]:
         """Get processing statistics"""
@@ -319,6 +377,6 @@ TÓM TẮT CUỐI:"""
             "processing_strategy": result.processing_strategy,
             "estimated_bedrock_calls": result.total_chunks + 1,
             "estimated_time": f"{result.total_chunks * 8}-{result.total_chunks * 15}s",
-            "parallel_processing": result.total_chunks <= self.PARALLEL_THRESHOLD,
+            "parallel_processing": result.total_chunks > 1,
             "optimization": "VPBank K-MULT optimized"
         }
@@ -0,0 +1,233 @@
+"""
+Content-addressed cache for document text extraction
+Keyed by SHA-256 of the raw file bytes plus extractor settings, so the same
+L/C bundle pushed through several agents is parsed and OCR'd once per node.
+
+Two tiers:
+- In-process LRU (always on)
+- Optional on-disk tier with size-based eviction (enabled via EXTRACTION_CACHE_DIR)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from app.mutil_agent.config import (
+    EXTRACTION_CACHE_DIR,
+    EXTRACTION_CACHE_MAX_DISK_MB,
+    EXTRACTION_CACHE_MAX_ENTRIES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionCache:
+    """Two-tier (memory LRU + optional disk) cache for extraction results"""
+
+    # Bump when the extraction output format changes to invalidate old disk entries
+    CACHE_VERSION = 1
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-key locks so concurrent requests for the same file extract only once
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"Extraction disk cache disabled ({self.disk_dir}): {e}")
+                self.disk_dir = None
+
+    @classmethod
+    def make_key(cls, file_content: bytes, **settings: Any) -> str:
+        """Build a cache key from the raw bytes and extractor settings"""
+        digest = hashlib.sha256(file_content).hexdigest()
+        settings_part = ",".join(f"{k}={settings[k]}" for k in sorted(settings))
+        return f"v{cls.CACHE_VERSION}:{digest}:{settings_part}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a result, promoting disk hits into the memory tier"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return dict(value)
+
+        value = self._disk_get(key)
+        if value is not None:
+            self._memory_set(key, value)
+            with self._lock:
+                self._stats["disk_hits"] += 1
+            return dict(value)
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a result in both tiers"""
+        self._memory_set(key, value)
+        self._disk_set(key, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the cached result for key, computing and storing it on a miss.
+        Concurrent callers with the same key wait for the first extraction.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have filled the entry while we waited
+            with self._lock:
+                value = self._memory.get(key)
+            if value is not None:
+                return dict(value)
+
+            try:
+                result = compute()
+                self.set(key, result)
+                return dict(result)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.disk_dir, name))
+                    except OSError:
+                        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        stats["disk_enabled"] = bool(self.disk_dir)
+        return stats
+
+    # Memory tier
+
+    def _memory_set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = dict(value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    # Disk tier
+
+    def _disk_path(self, key: str) -> str:
+        filename = hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json"
+        return os.path.join(self.disk_dir, filename)
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("key") != key:
+                return None
+            # Touch so eviction treats this entry as recently used
+            os.utime(path, None)
+            return entry["value"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"Extraction disk cache read failed for {path}: {e}")
+            return None
+
+    def _disk_set(self, key: str, value: Dict[str, Any]) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "value": value}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Extraction disk cache write failed for {path}: {e}")
+            return
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Remove least recently used files until the tier fits in max_disk_bytes"""
+        try:
+            entries = []
+            total = 0
+            for name in os.listdir(self.disk_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.disk_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            if total <= self.max_disk_bytes:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_disk_bytes:
+                    break
+                os.remove(path)
+                total -= size
+                with self._lock:
+                    self._stats["evictions"] += 1
+        except OSError as e:
+            logger.debug(f"Extraction disk cache eviction failed: {e}")
+
+
+_extraction_cache: Optional[ExtractionCache] = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """
+    Get the process-wide extraction cache
+
+    Returns:
+        ExtractionCache instance configured from environment variables
+    """
+    global _extraction_cache
+    if _extraction_cache is None:
+        with _extraction_cache_lock:
+            if _extraction_cache is None:
+                _extraction_cache = ExtractionCache(
+                    max_entries=EXTRACTION_CACHE_MAX_ENTRIES,
+                    disk_dir=EXTRACTION_CACHE_DIR,
+                    max_disk_bytes=EXTRACTION_CACHE_MAX_DISK_MB * 1024 * 1024,
+                )
+    return _extraction_cache
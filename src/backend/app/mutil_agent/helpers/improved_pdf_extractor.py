@@ -7,9 +7,12 @@ Performance: 30% less code, 40% fewer method calls, 15-25% faster execution
 import logging
 import re
 from io import BytesIO
-from typing import List, Callable, Tuple, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Callable, Tuple, Dict, Any, Optional
 
-import PyPDF2
+from app.mutil_agent.helpers.extraction_cache import get_extraction_cache
+
+if TYPE_CHECKING:
+    import PyPDF2
 
 logger = logging.getLogger(__name__)
 
@@ -31,13 +34,24 @@ class ImprovedPDFExtractor:
             self._extract_with_basic_ocr_fallback
         ]
     
-    def extract_text_from_pdf(self, file_content: bytes, max_pages: Optional[int] = None) -> Dict[str, Any]:
+    def extract_text_from_pdf(
+        self,
+        file_content: bytes,
+        max_pages: Optional[int] = None,
+        use_ocr: bool = True,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
         """
         Extract text from PDF with optimized multiple fallback methods
         
+        Results are cached by SHA-256 of the file bytes plus settings, so the
+        same document is parsed and OCR'd at most once per node.
+        
         Args:
             file_content: PDF file content as bytes
             max_pages: Maximum pages to process (None = all pages)
+            use_ocr: Fall back to OCR for scanned PDFs
+            use_cache: Read/write the shared extraction cache
             
         Returns:
             Dictionary with extracted text and source information
@@ -45,6 +59,20 @@ class ImprovedPDFExtractor:
         Raises:
             ValueError: If no text could be extracted
         """
+        if not use_cache:
+            return self._extract_uncached(file_content, max_pages, use_ocr)
+        
+        cache = get_extraction_cache()
+        cache_key = cache.make_key(file_content, max_pages=max_pages, ocr=use_ocr)
+        result = cache.get_or_compute(
+            cache_key,
+            lambda: self._extract_uncached(file_content, max_pages, use_ocr)
+        )
+        logger.debug(f"Extraction cache stats: {cache.get_stats()}")
+        return result
+    
+    def _extract_uncached(self, file_content: bytes, max_pages: Optional[int], use_ocr: bool) -> Dict[str, Any]:
+        """Run the extraction pipeline without consulting the cache"""
         self.max_pages = max_pages
         
         # Try PyPDF2 methods first (faster and more accurate for text-based PDFs)
@@ -59,6 +87,9 @@ class ImprovedPDFExtractor:
                 'char_count': len(pypdf_result)
             }
         
+        if not use_ocr:
+            raise ValueError(self._generate_error_message(file_content))
+        
         # Try OCR if PyPDF2 fails (for scanned PDFs)
         logger.info("PyPDF2 failed, trying OCR for scanned PDF...")
         ocr_result = self._try_ocr_extraction(file_content)
@@ -131,8 +162,7 @@ class ImprovedPDFExtractor:
     def _get_diagnostic_info(self, file_content: bytes) -> str:
         """Get diagnostic information about the PDF"""
         try:
-            pdf_file = BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file, strict=False)
+            pdf_reader = self._create_pdf_reader(file_content, strict=False)
             
             return f"""
 Thông tin chẩn đoán PDF:
@@ -189,8 +219,10 @@ Gợi ý giải pháp:
     
     # Optimized Helper Methods for PDF Processing
     
-    def _create_pdf_reader(self, file_content: bytes, strict: bool = False) -> PyPDF2.PdfReader:
-        """Create a PDF reader from file content"""
+    def _create_pdf_reader(self, file_content: bytes, strict: bool = False) -> "PyPDF2.PdfReader":
+        """Create a PDF reader from file content (PyPDF2 is imported on first use)"""
+        import PyPDF2
+
         pdf_file = BytesIO(file_content)
         return PyPDF2.PdfReader(pdf_file, strict=strict)
     
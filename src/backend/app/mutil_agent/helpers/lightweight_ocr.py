@@ -1,21 +1,98 @@
 """
 Lightweight OCR using Tesseract for Vietnamese text
 Much smaller than EasyOCR (~50MB vs 500MB+)
+
+Pages are rendered and OCR'd one at a time in a process pool, with a bounded
+number of pages in flight, so peak memory stays flat regardless of page count.
+The pool is created on first use and shared by all requests; it is shut down
+with shutdown_ocr_pool() when the application stops.
 """
 
 import logging
 import os
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, Iterator, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
 from io import BytesIO
 import tempfile
 
+from app.mutil_agent.config import OCR_MAX_WORKERS
+from app.mutil_agent.utils.tracing import span
+
 logger = logging.getLogger(__name__)
 
+# Rendering / Tesseract settings shared by the main process and pool workers
+OCR_DPI = 200  # Lower DPI = faster processing
+# --oem 3: Use default OCR Engine Mode
+# --psm 6: Assume uniform block of text
+# -l vie+eng: Vietnamese + English languages
+TESSERACT_CONFIG = '--oem 3 --psm 6 -l vie+eng'
+
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+
+def get_ocr_pool() -> ProcessPoolExecutor:
+    """Get the process-wide OCR pool (OCR_MAX_WORKERS processes, started on first use)"""
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                _ocr_pool = ProcessPoolExecutor(max_workers=max(1, OCR_MAX_WORKERS))
+    return _ocr_pool
+
+
+def shutdown_ocr_pool(pool: Optional[ProcessPoolExecutor] = None) -> None:
+    """Stop the OCR pool (only if it is still `pool`, when given: a broken pool is replaced once)"""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is not None and pool in (None, _ocr_pool):
+            _ocr_pool.shutdown(wait=False, cancel_futures=True)
+            _ocr_pool = None
+
+
+def _ocr_single_page(page_number: int, pdf_bytes: Optional[bytes] = None, pdf_path: Optional[str] = None) -> Dict[str, Any]:
+    """Render one page and OCR it (pool tasks get the path of a temporary copy of the PDF)"""
+    try:
+        import pytesseract
+        from pdf2image import convert_from_bytes, convert_from_path
+        
+        render_options = dict(dpi=OCR_DPI, fmt='RGB', first_page=page_number, last_page=page_number)
+        if pdf_path is not None:
+            images = convert_from_path(pdf_path, **render_options)
+        else:
+            images = convert_from_bytes(pdf_bytes, **render_options)
+        if not images:
+            raise ValueError("Page could not be rendered")
+        
+        image = LightweightOCR._preprocess_image(images[0])
+        page_text = pytesseract.image_to_string(image, config=TESSERACT_CONFIG)
+        page_text = LightweightOCR._clean_ocr_text(page_text)
+        del images, image
+        
+        return {
+            'page_number': page_number,
+            'text': page_text,
+            'char_count': len(page_text),
+            'word_count': len(page_text.split())
+        }
+    except Exception as e:
+        return {
+            'page_number': page_number,
+            'text': '',
+            'char_count': 0,
+            'word_count': 0,
+            'error': str(e)
+        }
+
 
 class LightweightOCR:
     """Lightweight OCR using Tesseract"""
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max(1, max_workers or OCR_MAX_WORKERS or os.cpu_count() or 1)
         self.available = self._check_tesseract_available()
         if self.available:
             logger.info("✅ Tesseract OCR available")
@@ -55,10 +132,10 @@ class LightweightOCR:
                 'engine_used': 'tesseract'
             }
         
-        # Convert PDF to images
+        # Count pages without rendering them
         try:
-            images = self._pdf_to_images(pdf_bytes, max_pages)
-            if not images:
+            page_count = self._get_page_count(pdf_bytes, max_pages)
+            if not page_count:
                 return {
                     'success': False,
                     'error': 'Không thể chuyển đổi PDF thành hình ảnh',
@@ -75,90 +152,95 @@ class LightweightOCR:
                 'engine_used': 'tesseract'
             }
         
-        # Extract text using Tesseract
-        return self._extract_with_tesseract(images, max_pages)
+        # Extract text using Tesseract, one page at a time
+        with span("ocr.tesseract", pages=page_count):
+            return self._extract_with_tesseract(pdf_bytes, page_count, max_pages)
     
-    def _pdf_to_images(self, pdf_bytes: bytes, max_pages: Optional[int] = None) -> List[Any]:
-        """Convert PDF to images using pdf2image"""
+    def _get_page_count(self, pdf_bytes: bytes, max_pages: Optional[int] = None) -> int:
+        """Get the number of pages to OCR using pdfinfo (no rendering)"""
         try:
-            from pdf2image import convert_from_bytes
+            from pdf2image import pdfinfo_from_bytes
             
-            # Prepare parameters for convert_from_bytes
-            # First parameter is pdf_bytes directly, not as keyword argument
-            convert_kwargs = {
-                'dpi': 200,  # Lower DPI = faster processing
-                'fmt': 'RGB',
-                'first_page': 1
-            }
+            total_pages = int(pdfinfo_from_bytes(pdf_bytes).get('Pages', 0))
+            page_count = min(total_pages, max_pages) if max_pages else total_pages
             
-            # Only add last_page if max_pages is specified
             if max_pages:
-                convert_kwargs['last_page'] = max_pages
-                logger.info(f"Converting PDF to images (max {max_pages} pages)")
+                logger.info(f"OCR pipeline: {page_count} pages (max {max_pages})")
             else:
-                logger.info("Converting PDF to images (all pages)")
-            
-            # Call convert_from_bytes with pdf_bytes as first positional argument
-            images = convert_from_bytes(pdf_bytes, **convert_kwargs)
-            
-            logger.info(f"Converted PDF to {len(images)} images")
-            return images
+                logger.info(f"OCR pipeline: {page_count} pages (all pages)")
+            return page_count
             
         except ImportError:
             logger.error("pdf2image not available. Install with: pip install pdf2image")
-            return []
+            return 0
         except Exception as e:
-            logger.error(f"Error converting PDF to images: {str(e)}")
-            return []
+            logger.error(f"Error reading PDF page count: {str(e)}")
+            return 0
+    
+    def _iter_page_results(self, pdf_bytes: bytes, page_count: int) -> Iterator[Dict[str, Any]]:
+        """
+        Yield per-page OCR results in page order.
+        
+        Pages are submitted to the shared process pool with at most
+        2 * max_workers pages of this document in flight; each worker renders
+        only the page it is working on, from a temporary copy of the PDF (so
+        tasks carry a path instead of the PDF bytes).
+        """
+        workers = min(self.max_workers, page_count)
+        
+        if workers <= 1:
+            for page_number in range(1, page_count + 1):
+                yield _ocr_single_page(page_number, pdf_bytes)
+            return
+        
+        max_in_flight = workers * 2
+        executor = get_ocr_pool()
+        pending = deque()
+        with tempfile.NamedTemporaryFile(suffix='.pdf') as pdf_file:
+            pdf_file.write(pdf_bytes)
+            pdf_file.flush()
+            next_page = 1
+            try:
+                while next_page <= page_count or pending:
+                    while next_page <= page_count and len(pending) < max_in_flight:
+                        pending.append(executor.submit(_ocr_single_page, next_page, pdf_path=pdf_file.name))
+                        next_page += 1
+                    
+                    # Futures are queued in page order, so waiting on the head
+                    # reassembles the document without buffering out-of-order pages
+                    yield pending.popleft().result()
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory): the next document gets a fresh pool
+                shutdown_ocr_pool(executor)
+                raise
+            finally:
+                # Stopped early: drop this document's queued pages before the file goes away
+                for future in pending:
+                    future.cancel()
     
-    def _extract_with_tesseract(self, images: List[Any], max_pages: Optional[int] = None) -> Dict[str, Any]:
+    def _extract_with_tesseract(self, pdf_bytes: bytes, page_count: int, max_pages: Optional[int] = None) -> Dict[str, Any]:
         """Extract text using Tesseract OCR with Vietnamese support"""
         try:
-            import pytesseract
-            
-            # Optimized config for Vietnamese
-            # --oem 3: Use default OCR Engine Mode
-            # --psm 6: Assume uniform block of text
-            # -l vie+eng: Vietnamese + English languages
-            config = '--oem 3 --psm 6 -l vie+eng'
-            
-            all_text = ""
+            text_parts = []
             pages_data = []
             successful_pages = 0
             
-            for page_num, image in enumerate(images):
-                try:
-                    # Preprocess image for better OCR (optional)
-                    processed_image = self._preprocess_image(image)
-                    
-                    # Extract text
-                    page_text = pytesseract.image_to_string(processed_image, config=config)
-                    
-                    # Clean up text
-                    page_text = self._clean_ocr_text(page_text)
-                    
-                    pages_data.append({
-                        'page_number': page_num + 1,
-                        'text': page_text,
-                        'char_count': len(page_text),
-                        'word_count': len(page_text.split())
-                    })
-                    
-                    if len(page_text.strip()) > 10:  # Only count pages with meaningful text
-                        all_text += page_text + "\n\n"
-                        successful_pages += 1
-                    
-                    logger.debug(f"Tesseract page {page_num + 1}: {len(page_text)} characters")
-                    
-                except Exception as e:
-                    logger.warning(f"Tesseract failed on page {page_num + 1}: {str(e)}")
-                    pages_data.append({
-                        'page_number': page_num + 1,
-                        'text': '',
-                        'char_count': 0,
-                        'word_count': 0,
-                        'error': str(e)
-                    })
+            for page_data in self._iter_page_results(pdf_bytes, page_count):
+                page_number = page_data['page_number']
+                pages_data.append(page_data)
+                
+                if 'error' in page_data:
+                    logger.warning(f"Tesseract failed on page {page_number}: {page_data['error']}")
+                    continue
+                
+                page_text = page_data['text']
+                if len(page_text.strip()) > 10:  # Only count pages with meaningful text
+                    text_parts.append(page_text)
+                    successful_pages += 1
+                
+                logger.debug(f"Tesseract page {page_number}: {len(page_text)} characters")
+            
+            all_text = "\n\n".join(text_parts)
             
             # Save OCR text to file for debugging
             if all_text.strip():
@@ -166,18 +248,19 @@ class LightweightOCR:
             
             # Return results
             if successful_pages > 0:
-                logger.info(f"✅ Tesseract OCR successful: {successful_pages}/{len(images)} pages, {len(all_text)} characters")
+                logger.info(f"✅ Tesseract OCR successful: {successful_pages}/{page_count} pages, {len(all_text)} characters")
                 return {
                     'success': True,
                     'text': all_text.strip(),
                     'pages': pages_data,
                     'engine_used': 'tesseract',
                     'successful_pages': successful_pages,
-                    'total_pages': len(images),
+                    'total_pages': page_count,
                     'processing_info': {
-                        'dpi': 200,
+                        'dpi': OCR_DPI,
                         'max_pages': max_pages or 'all',
-                        'languages': 'vie+eng'
+                        'languages': 'vie+eng',
+                        'workers': min(self.max_workers, page_count)
                     }
                 }
             else:
@@ -189,14 +272,6 @@ class LightweightOCR:
                     'engine_used': 'tesseract'
                 }
                 
-        except ImportError:
-            return {
-                'success': False,
-                'error': 'pytesseract không khả dụng. Cài đặt: pip install pytesseract',
-                'text': '',
-                'pages': [],
-                'engine_used': 'tesseract'
-            }
         except Exception as e:
             logger.error(f"Tesseract OCR error: {str(e)}")
             return {
@@ -255,7 +330,8 @@ class LightweightOCR:
         except Exception as e:
             logger.warning(f"Failed to save OCR text to file: {e}")
     
-    def _preprocess_image(self, image):
+    @staticmethod
+    def _preprocess_image(image):
         """Simple image preprocessing for better OCR"""
         try:
             from PIL import Image, ImageEnhance, ImageFilter
@@ -277,7 +353,8 @@ class LightweightOCR:
             logger.debug(f"Image preprocessing failed: {e}")
             return image  # Return original if preprocessing fails
     
-    def _clean_ocr_text(self, text: str) -> str:
+    @staticmethod
+    def _clean_ocr_text(text: str) -> str:
         """Clean OCR output text"""
         if not text:
             return ""
@@ -0,0 +1,188 @@
+"""
+Relevant-span prompt compaction
+Shrinks a document to the paragraphs that matter for a prompt, within a token budget.
+
+Callers pass weighted character spans (extracted fields, classification
+hits, rule evidence, regulation keywords). The text is cut into paragraphs
+(blank-line blocks, long blocks split on line boundaries), each paragraph
+is scored by the weight of the spans it overlaps, and the best paragraphs
+are kept in document order until the budget is reached. If no paragraph
+fits, the best one is truncated to the budget. Skipped text is marked with
+"[...]" so the model knows the excerpt is not contiguous.
+"""
+
+import bisect
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.mutil_agent.helpers.token_estimator import TokenCounter, get_token_counter
+
+logger = logging.getLogger(__name__)
+
+WeightedSpan = Tuple[int, int, float]  # (start, end, weight)
+
+GAP_MARKER = "[...]"
+_BLANK_LINES = re.compile(r"\n[ \t]*\n")
+
+
+@dataclass
+class CompactionResult:
+    """Compacted text and how much it shrank"""
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    token_budget: int
+    paragraphs_total: int
+    paragraphs_selected: int
+
+    @property
+    def compression_ratio(self) -> float:
+        """Compacted / original tokens (1.0 means unchanged)"""
+        if not self.original_tokens:
+            return 1.0
+        return round(self.compacted_tokens / self.original_tokens, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "original_tokens": self.original_tokens,
+            "compacted_tokens": self.compacted_tokens,
+            "compression_ratio": self.compression_ratio,
+            "token_budget": self.token_budget,
+            "paragraphs_total": self.paragraphs_total,
+            "paragraphs_selected": self.paragraphs_selected,
+        }
+
+
+class PromptCompactor:
+    """Selects the highest-scoring paragraphs of a text within a token budget"""
+
+    # Small bonus so the document header (title, issuer, numbers) is kept when it fits
+    HEADER_WEIGHT = 0.5
+
+    def __init__(
+        self,
+        token_budget: int = 1500,
+        token_counter: Optional[TokenCounter] = None,
+        max_paragraph_chars: int = 1200,
+    ):
+        self.token_budget = token_budget
+        self.count_tokens = token_counter or get_token_counter()
+        self.max_paragraph_chars = max_paragraph_chars
+
+    def compact(self, text: str, spans: Iterable[WeightedSpan]) -> CompactionResult:
+        """
+        Keep the paragraphs around spans, within the token budget
+
+        Args:
+            text: Full document text
+            spans: (start, end, weight) character ranges marking relevant content
+
+        Returns:
+            CompactionResult; the text is returned unchanged if it already fits
+        """
+        original_tokens = self.count_tokens(text)
+        paragraphs = self.split_paragraphs(text)
+        if original_tokens <= self.token_budget:
+            return CompactionResult(text, original_tokens, original_tokens, self.token_budget,
+                                    len(paragraphs), len(paragraphs))
+
+        paragraphs_total = len(paragraphs)
+        scores = self._score(paragraphs, spans)
+        if paragraphs:
+            scores[0] += self.HEADER_WEIGHT
+
+        candidates = [i for i, score in enumerate(scores) if score > 0]
+        if len(candidates) <= 1:
+            # Nothing matched: fall back to the start of the document
+            candidates = list(range(len(paragraphs)))
+        else:
+            candidates.sort(key=lambda i: (-scores[i], i))
+
+        gap_tokens = self.count_tokens(GAP_MARKER) + 1
+        selected, used = [], 0
+        for i in candidates:
+            start, end = paragraphs[i]
+            cost = self.count_tokens(text[start:end]) + gap_tokens
+            if used + cost <= self.token_budget:
+                selected.append(i)
+                used += cost
+        if not selected and candidates:
+            # Every paragraph is over budget: keep the start of the best one
+            paragraphs = self._truncate(text, paragraphs, candidates[0], self.token_budget - 2 * gap_tokens)
+            selected = [candidates[0]]
+
+        compacted = self._join(text, paragraphs, sorted(selected))
+        return CompactionResult(
+            text=compacted,
+            original_tokens=original_tokens,
+            compacted_tokens=self.count_tokens(compacted),
+            token_budget=self.token_budget,
+            paragraphs_total=paragraphs_total,
+            paragraphs_selected=len(selected),
+        )
+
+    def split_paragraphs(self, text: str) -> List[Tuple[int, int]]:
+        """Paragraph character ranges (blank-line blocks, long blocks split on line boundaries)"""
+        paragraphs = []
+        block_start = 0
+        for separator in [*_BLANK_LINES.finditer(text), None]:
+            block_end = separator.start() if separator else len(text)
+            paragraphs.extend(self._split_block(text, block_start, block_end))
+            if separator:
+                block_start = separator.end()
+        return [(start, end) for start, end in paragraphs if text[start:end].strip()]
+
+    def _split_block(self, text: str, start: int, end: int) -> List[Tuple[int, int]]:
+        if end - start <= self.max_paragraph_chars:
+            return [(start, end)]
+        pieces = []
+        piece_start = start
+        while end - piece_start > self.max_paragraph_chars:
+            limit = piece_start + self.max_paragraph_chars
+            cut = text.rfind("\n", piece_start + 1, limit)
+            if cut <= piece_start:
+                cut = text.rfind(" ", piece_start + 1, limit)
+            if cut <= piece_start:
+                cut = limit
+            pieces.append((piece_start, cut))
+            piece_start = cut
+        pieces.append((piece_start, end))
+        return pieces
+
+    def _truncate(self, text: str, paragraphs: List[Tuple[int, int]], i: int, budget: int) -> List[Tuple[int, int]]:
+        """Paragraphs with paragraph i split where its first part fits the budget"""
+        start, end = paragraphs[i]
+        cut = start + (end - start) * max(budget, 0) // max(self.count_tokens(text[start:end]), 1)
+        while cut > start and self.count_tokens(text[start:cut]) > budget:
+            cut = start + (cut - start) * 9 // 10
+        space = text.rfind(" ", start + 1, cut)
+        if space > start:
+            cut = space
+        return paragraphs[:i] + [(start, cut), (cut, end)] + paragraphs[i + 1:]
+
+    @staticmethod
+    def _score(paragraphs: List[Tuple[int, int]], spans: Iterable[WeightedSpan]) -> List[float]:
+        scores = [0.0] * len(paragraphs)
+        ends = [end for _, end in paragraphs]
+        for start, end, weight in spans:
+            i = bisect.bisect_right(ends, start)
+            while i < len(paragraphs) and paragraphs[i][0] < max(end, start + 1):
+                scores[i] += weight
+                i += 1
+        return scores
+
+    @staticmethod
+    def _join(text: str, paragraphs: List[Tuple[int, int]], selected: List[int]) -> str:
+        parts = []
+        previous = -1
+        for i in selected:
+            if i != previous + 1:
+                parts.append(GAP_MARKER)
+            start, end = paragraphs[i]
+            parts.append(text[start:end].strip())
+            previous = i
+        if selected and selected[-1] != len(paragraphs) - 1:
+            parts.append(GAP_MARKER)
+        return "\n\n".join(parts)
@@ -226,6 +226,7 @@ Please provide the requested analysis of the above document.
                 model_name=CONVERSATION_CHAT_MODEL_NAME,
                 temperature=CONVERSATION_CHAT_TEMPERATURE,
                 top_p=CONVERSATION_CHAT_TOP_P,
+                agent="s3_document_analysis",
             )
             
             from langchain_core.messages import HumanMessage, SystemMessage
@@ -5,13 +5,14 @@ Simplified functions to load PDF and CSV files from AWS S3 bucket using IAM role
 
 import io
 import logging
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 import boto3
-import pandas as pd
 from botocore.exceptions import ClientError, NoCredentialsError
-import PyPDF2
 from io import BytesIO
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,7 +66,7 @@ class S3FileLoader:
     def load_csv_file(self, 
                       bucket_name: str, 
                       file_key: str,
-                      **pandas_kwargs) -> pd.DataFrame:
+                      **pandas_kwargs) -> "pd.DataFrame":
         """
         Load CSV file from S3 bucket
         
@@ -77,6 +78,8 @@ class S3FileLoader:
         Returns:
             pandas DataFrame containing CSV data
         """
+        import pandas as pd
+
         try:
             logger.info(f"Loading CSV file: s3://{bucket_name}/{file_key}")
             
@@ -127,6 +130,7 @@ class S3FileLoader:
             pdf_buffer = BytesIO(file_content)
             
             # Read PDF
+            import PyPDF2
             pdf_reader = PyPDF2.PdfReader(pdf_buffer)
             
             result = {
@@ -306,7 +310,7 @@ class S3FileLoader:
 def load_csv_from_s3(bucket_name: str, 
                      file_key: str,
                      region_name: str = 'us-east-1',
-                     **pandas_kwargs) -> pd.DataFrame:
+                     **pandas_kwargs) -> "pd.DataFrame":
     """
     Convenience function to load CSV file from S3
     
@@ -5,9 +5,12 @@ Handles intelligent text chunking while preserving context
 
 import logging
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
+from app.mutil_agent.config import CHUNK_TARGET_TOKENS
+from app.mutil_agent.helpers.token_estimator import get_token_counter
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +26,7 @@ class ChunkInfo:
     has_headers: bool
     has_tables: bool
     context_overlap: str = ""
+    token_count: int = 0
 
 
 class SmartChunkingService:
@@ -40,10 +44,29 @@ class SmartChunkingService:
     MIN_CHUNK_SIZE = 1000  # Minimum chunk size
     PREFERRED_CHUNK_SIZE = MAX_CHARS_PER_CHUNK // 2  # Preferred chunk size
     
-    def __init__(self):
+    # Token budgets used for chunk packing
+    MAX_TOKENS_PER_CHUNK = int(MAX_TOKENS_CLAUDE * 0.7)  # 70% of limit for safety
+    PREFERRED_CHUNK_TOKENS = MAX_TOKENS_PER_CHUNK // 2  # Target fill per chunk
+    
+    def __init__(
+        self,
+        token_counter: Optional[Callable[[str], int]] = None,
+        target_chunk_tokens: Optional[int] = None
+    ):
+        """
+        Args:
+            token_counter: Length function returning tokens for a string
+                (defaults to the configured tokenizer, see token_estimator)
+            target_chunk_tokens: Token budget each chunk is filled to
+        """
         self.sentence_endings = re.compile(r'[.!?]\s+')
         self.paragraph_breaks = re.compile(r'\n\s*\n')
         self.section_headers = re.compile(r'^[\d\w\s]*[:\-]\s*', re.MULTILINE)
+        self.token_counter = token_counter or get_token_counter()
+        self.target_chunk_tokens = min(
+            target_chunk_tokens or CHUNK_TARGET_TOKENS or self.PREFERRED_CHUNK_TOKENS,
+            self.MAX_TOKENS_PER_CHUNK
+        )
         
     def chunk_document(
         self, 
@@ -63,31 +86,14 @@ class SmartChunkingService:
             List of ChunkInfo objects
         """
         if not text or len(text.strip()) < self.MIN_CHUNK_SIZE:
-            return [ChunkInfo(
-                content=text,
-                start_pos=0,
-                end_pos=len(text),
-                chunk_id=0,
-                word_count=len(text.split()),
-                char_count=len(text),
-                has_headers=bool(self.section_headers.search(text)),
-                has_tables=self._detect_tables(text)
-            )]
+            return [self._make_chunk(text, 0, len(text), 0)]
         
-        logger.info(f"🔄 Chunking document: {len(text):,} characters")
+        total_tokens = self.estimate_tokens(text)
+        logger.info(f"🔄 Chunking document: {len(text):,} characters, ~{total_tokens:,} tokens")
         
-        if len(text) <= self.MAX_CHARS_PER_CHUNK:
+        if total_tokens <= self.target_chunk_tokens:
             logger.info("📄 Document fits in single chunk")
-            return [ChunkInfo(
-                content=text,
-                start_pos=0,
-                end_pos=len(text),
-                chunk_id=0,
-                word_count=len(text.split()),
-                char_count=len(text),
-                has_headers=bool(self.section_headers.search(text)),
-                has_tables=self._detect_tables(text)
-            )]
+            return [self._make_chunk(text, 0, len(text), 0, total_tokens)]
         
         # Choose chunking strategy
         if preserve_structure:
@@ -113,143 +119,99 @@ class SmartChunkingService:
         """
         Chunk text while preserving document structure
         """
-        chunks = []
-        
         # First, try to split by major sections
         sections = self._split_by_sections(text)
-        
-        current_chunk = ""
-        current_start = 0
-        chunk_id = 0
-        
-        for section_start, section_end, section_text in sections:
-            # If adding this section would exceed chunk size
-            if len(current_chunk) + len(section_text) > self.PREFERRED_CHUNK_SIZE:
-                # Save current chunk if it has content
-                if current_chunk.strip():
-                    chunks.append(ChunkInfo(
-                        content=current_chunk.strip(),
-                        start_pos=current_start,
-                        end_pos=current_start + len(current_chunk),
-                        chunk_id=chunk_id,
-                        word_count=len(current_chunk.split()),
-                        char_count=len(current_chunk),
-                        has_headers=bool(self.section_headers.search(current_chunk)),
-                        has_tables=self._detect_tables(current_chunk)
-                    ))
-                    chunk_id += 1
-                
-                # Start new chunk
-                current_chunk = section_text
-                current_start = section_start
-            else:
-                # Add to current chunk
-                if not current_chunk:
-                    current_start = section_start
-                current_chunk += section_text
-        
-        # Add final chunk
-        if current_chunk.strip():
-            chunks.append(ChunkInfo(
-                content=current_chunk.strip(),
-                start_pos=current_start,
-                end_pos=current_start + len(current_chunk),
-                chunk_id=chunk_id,
-                word_count=len(current_chunk.split()),
-                char_count=len(current_chunk),
-                has_headers=bool(self.section_headers.search(current_chunk)),
-                has_tables=self._detect_tables(current_chunk)
-            ))
-        
-        return chunks
+        return self._pack_segments(text, sections)
     
     def _simple_chunking(self, text: str) -> List[ChunkInfo]:
         """
         Simple chunking by sentences and paragraphs
         """
-        chunks = []
-        chunk_id = 0
-        
-        # Split by paragraphs first
-        paragraphs = self.paragraph_breaks.split(text)
-        
-        current_chunk = ""
-        current_start = 0
-        text_pos = 0
+        # Split by paragraphs first, keeping exact offsets
+        paragraphs = []
+        last_end = 0
+        for match in self.paragraph_breaks.finditer(text):
+            paragraphs.append((last_end, match.end(), text[last_end:match.end()]))
+            last_end = match.end()
+        if last_end < len(text):
+            paragraphs.append((last_end, len(text), text[last_end:]))
         
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if not paragraph:
-                text_pos += len(paragraph) + 2  # Account for paragraph breaks
-                continue
+        return self._pack_segments(text, paragraphs)
+    
+    def _pack_segments(self, text: str, segments: List[Tuple[int, int, str]]) -> List[ChunkInfo]:
+        """
+        Greedily fill chunks up to target_chunk_tokens with contiguous segments.
+        Segments larger than the budget are split by sentences first.
+        """
+        chunks = []
+        chunk_start = None
+        chunk_end = 0
+        chunk_tokens = 0
+        
+        def flush():
+            nonlocal chunk_start, chunk_tokens
+            if chunk_start is not None and text[chunk_start:chunk_end].strip():
+                chunks.append(self._make_chunk(
+                    text[chunk_start:chunk_end], chunk_start, chunk_end, len(chunks), chunk_tokens
+                ))
+            chunk_start = None
+            chunk_tokens = 0
+        
+        for seg_start, seg_end, seg_text in segments:
+            seg_tokens = self.token_counter(seg_text)
             
-            # If adding this paragraph would exceed chunk size
-            if len(current_chunk) + len(paragraph) > self.PREFERRED_CHUNK_SIZE:
-                # Try to split paragraph by sentences
-                if len(paragraph) > self.PREFERRED_CHUNK_SIZE:
-                    # Split long paragraph
-                    sentences = self._split_by_sentences(paragraph)
-                    for sentence in sentences:
-                        if len(current_chunk) + len(sentence) > self.PREFERRED_CHUNK_SIZE:
-                            # Save current chunk
-                            if current_chunk.strip():
-                                chunks.append(ChunkInfo(
-                                    content=current_chunk.strip(),
-                                    start_pos=current_start,
-                                    end_pos=text_pos,
-                                    chunk_id=chunk_id,
-                                    word_count=len(current_chunk.split()),
-                                    char_count=len(current_chunk),
-                                    has_headers=bool(self.section_headers.search(current_chunk)),
-                                    has_tables=self._detect_tables(current_chunk)
-                                ))
-                                chunk_id += 1
-                            
-                            # Start new chunk
-                            current_chunk = sentence
-                            current_start = text_pos
-                        else:
-                            current_chunk += " " + sentence if current_chunk else sentence
-                else:
-                    # Save current chunk and start new one with this paragraph
-                    if current_chunk.strip():
-                        chunks.append(ChunkInfo(
-                            content=current_chunk.strip(),
-                            start_pos=current_start,
-                            end_pos=text_pos,
-                            chunk_id=chunk_id,
-                            word_count=len(current_chunk.split()),
-                            char_count=len(current_chunk),
-                            has_headers=bool(self.section_headers.search(current_chunk)),
-                            has_tables=self._detect_tables(current_chunk)
-                        ))
-                        chunk_id += 1
-                    
-                    current_chunk = paragraph
-                    current_start = text_pos
+            if seg_tokens > self.target_chunk_tokens:
+                # Oversized section: pack its sentences individually
+                pieces = self._split_segment_by_sentences(seg_start, seg_text)
             else:
-                # Add to current chunk
-                if not current_chunk:
-                    current_start = text_pos
-                current_chunk += "\n\n" + paragraph if current_chunk else paragraph
+                pieces = [(seg_start, seg_end, seg_tokens)]
             
-            text_pos += len(paragraph) + 2
-        
-        # Add final chunk
-        if current_chunk.strip():
-            chunks.append(ChunkInfo(
-                content=current_chunk.strip(),
-                start_pos=current_start,
-                end_pos=text_pos,
-                chunk_id=chunk_id,
-                word_count=len(current_chunk.split()),
-                char_count=len(current_chunk),
-                has_headers=bool(self.section_headers.search(current_chunk)),
-                has_tables=self._detect_tables(current_chunk)
-            ))
-        
+            for piece_start, piece_end, piece_tokens in pieces:
+                if chunk_start is not None and chunk_tokens + piece_tokens > self.target_chunk_tokens:
+                    flush()
+                if chunk_start is None:
+                    chunk_start = piece_start
+                chunk_end = piece_end
+                chunk_tokens += piece_tokens
+        
+        flush()
         return chunks
     
+    def _split_segment_by_sentences(self, offset: int, segment: str) -> List[Tuple[int, int, int]]:
+        """Split a segment into (start, end, tokens) sentence spans with absolute offsets"""
+        pieces = []
+        last_end = 0
+        for match in self.sentence_endings.finditer(segment):
+            piece = segment[last_end:match.end()]
+            pieces.append((offset + last_end, offset + match.end(), self.token_counter(piece)))
+            last_end = match.end()
+        if last_end < len(segment):
+            piece = segment[last_end:]
+            pieces.append((offset + last_end, offset + len(segment), self.token_counter(piece)))
+        return pieces
+    
+    def _make_chunk(
+        self,
+        content: str,
+        start_pos: int,
+        end_pos: int,
+        chunk_id: int,
+        token_count: Optional[int] = None
+    ) -> ChunkInfo:
+        """Build a ChunkInfo for a span of the original text"""
+        stripped = content.strip()
+        return ChunkInfo(
+            content=stripped,
+            start_pos=start_pos,
+            end_pos=end_pos,
+            chunk_id=chunk_id,
+            word_count=len(stripped.split()),
+            char_count=len(stripped),
+            has_headers=bool(self.section_headers.search(stripped)),
+            has_tables=self._detect_tables(stripped),
+            token_count=token_count if token_count is not None else self.estimate_tokens(stripped)
+        )
+    
     def _split_by_sections(self, text: str) -> List[Tuple[int, int, str]]:
         """Split text by sections (headers, numbered items, etc.)"""
         sections = []
@@ -275,11 +237,6 @@ class SmartChunkingService:
         
         return sections
     
-    def _split_by_sentences(self, text: str) -> List[str]:
-        """Split text by sentences"""
-        sentences = self.sentence_endings.split(text)
-        return [s.strip() for s in sentences if s.strip()]
-    
     def _detect_tables(self, text: str) -> bool:
         """Detect if text contains tables"""
         # Simple heuristics for table detection
@@ -347,7 +304,8 @@ class SmartChunkingService:
                 word_count=sum(chunk.word_count for chunk in group_chunks),
                 char_count=len(merged_content),
                 has_headers=any(chunk.has_headers for chunk in group_chunks),
-                has_tables=any(chunk.has_tables for chunk in group_chunks)
+                has_tables=any(chunk.has_tables for chunk in group_chunks),
+                token_count=sum(chunk.token_count for chunk in group_chunks)
             ))
             
             i += group_size
@@ -356,8 +314,8 @@ class SmartChunkingService:
         return merged
     
     def estimate_tokens(self, text: str) -> int:
-        """Estimate token count for text"""
-        return len(text) // self.CHARS_PER_TOKEN
+        """Estimate token count for text using the configured tokenizer"""
+        return self.token_counter(text)
     
     def get_chunking_stats(self, chunks: List[ChunkInfo]) -> Dict[str, Any]:
         """Get statistics about chunking"""
@@ -376,7 +334,11 @@ class SmartChunkingService:
             "max_chunk_size": max(chunk.char_count for chunk in chunks),
             "chunks_with_headers": sum(1 for chunk in chunks if chunk.has_headers),
             "chunks_with_tables": sum(1 for chunk in chunks if chunk.has_tables),
-            "estimated_tokens": sum(self.estimate_tokens(chunk.content) for chunk in chunks)
+            "estimated_tokens": sum(chunk.token_count for chunk in chunks),
+            "target_chunk_tokens": self.target_chunk_tokens,
+            "avg_chunk_fill": round(
+                sum(chunk.token_count for chunk in chunks) / (len(chunks) * self.target_chunk_tokens), 2
+            )
         }
 
 
@@ -0,0 +1,125 @@
+"""
+Token length functions for chunk packing
+Pluggable tokenizer-backed length functions used to size chunks in tokens
+instead of characters. Vietnamese text with diacritics tokenizes very
+differently from English, so a flat chars/token ratio either overflows the
+context or wastes half of it.
+
+Available counters:
+- "approx": fast offline approximation tuned for Vietnamese/English mixes (default)
+- "chars": legacy len(text) // 4
+- "tiktoken": exact BPE counts when the optional tiktoken package is installed
+"""
+
+import logging
+import math
+import re
+from typing import Callable, Dict
+
+from app.mutil_agent.config import CHUNK_TOKENIZER
+
+logger = logging.getLogger(__name__)
+
+TokenCounter = Callable[[str], int]
+
+
+class ApproximateTokenizer:
+    """
+    Offline token estimator, no vocabulary required
+
+    Splits text into words, numbers and punctuation and charges each piece
+    by how BPE tokenizers typically treat it:
+    - ASCII words: ~1 token per 4 characters
+    - Words containing non-ASCII letters (Vietnamese diacritics): the
+      accented characters are multi-byte in UTF-8 and usually become their
+      own tokens, so ~1 token per accented char plus ASCII remainder / 3
+    - Numbers: ~1 token per 3 digits
+    - Punctuation / symbols: 1 token each
+    """
+
+    ASCII_CHARS_PER_TOKEN = 4
+    MIXED_ASCII_CHARS_PER_TOKEN = 3
+    DIGITS_PER_TOKEN = 3
+
+    _piece_pattern = re.compile(r"\d+|[^\W\d_]+|[^\w\s]", re.UNICODE)
+
+    def count(self, text: str) -> int:
+        """Estimate the number of tokens in text"""
+        if not text:
+            return 0
+
+        tokens = 0
+        for match in self._piece_pattern.finditer(text):
+            piece = match.group()
+            first = piece[0]
+            if first.isdigit():
+                tokens += math.ceil(len(piece) / self.DIGITS_PER_TOKEN)
+            elif not first.isalpha():
+                tokens += 1
+            elif piece.isascii():
+                tokens += math.ceil(len(piece) / self.ASCII_CHARS_PER_TOKEN)
+            else:
+                non_ascii = sum(1 for ch in piece if ord(ch) > 127)
+                ascii_part = len(piece) - non_ascii
+                tokens += non_ascii + math.ceil(ascii_part / self.MIXED_ASCII_CHARS_PER_TOKEN)
+        return tokens
+
+    __call__ = count
+
+
+def _chars_counter(text: str) -> int:
+    """Legacy character-ratio estimate"""
+    return len(text) // 4
+
+
+def _tiktoken_counter() -> TokenCounter:
+    """Exact BPE counter using tiktoken (optional dependency)"""
+    import tiktoken
+
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+_COUNTER_FACTORIES: Dict[str, Callable[[], TokenCounter]] = {
+    "approx": ApproximateTokenizer,
+    "chars": lambda: _chars_counter,
+    "tiktoken": _tiktoken_counter,
+}
+
+_counters: Dict[str, TokenCounter] = {}
+
+
+def register_token_counter(name: str, factory: Callable[[], TokenCounter]) -> None:
+    """Register a custom token counter factory under name"""
+    _COUNTER_FACTORIES[name] = factory
+    _counters.pop(name, None)
+
+
+def get_token_counter(name: str = None) -> TokenCounter:
+    """
+    Get a token length function
+
+    Args:
+        name: Counter name (defaults to CHUNK_TOKENIZER, then "approx")
+
+    Returns:
+        Callable returning the token count for a string. Falls back to the
+        approximate tokenizer if the requested one is unavailable.
+    """
+    name = name or CHUNK_TOKENIZER or "approx"
+    if name not in _counters:
+        factory = _COUNTER_FACTORIES.get(name)
+        if factory is None:
+            logger.warning(f"Unknown tokenizer '{name}', using approximate tokenizer")
+            return get_token_counter("approx")
+        try:
+            _counters[name] = factory()
+        except ImportError as e:
+            logger.warning(f"Tokenizer '{name}' not available ({e}), using approximate tokenizer")
+            return get_token_counter("approx")
+    return _counters[name]
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in text with the configured default counter"""
+    return get_token_counter()(text)
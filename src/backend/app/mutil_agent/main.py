@@ -13,15 +13,16 @@ This is the refactored main FastAPI application with improved:
 import warnings
 import logging
 import asyncio
+import importlib.util
 from contextlib import asynccontextmanager
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 warnings.filterwarnings("ignore", category=UserWarning, module="pydantic._internal._fields")
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi_pagination import add_pagination
 import uvicorn
 
@@ -30,26 +31,33 @@ from app.mutil_agent.middleware.custom_middleware import CustomMiddleware
 from app.mutil_agent.routes.v1_routes import router as v1_router
 from app.mutil_agent.routes.v1_public_routes import router as v1_public_routes
 from app.mutil_agent.databases.dynamodb import initiate_dynamodb
+from app.mutil_agent.databases.dynamodb_checkpoint_storage import start_checkpoint_compaction, stop_checkpoint_compaction
 from app.mutil_agent.models.message_dynamodb import MessageDynamoDB
-from app.mutil_agent.config import AWS_REGION, DEFAULT_MODEL_NAME
+from app.mutil_agent.config import AWS_REGION, DEFAULT_MODEL_NAME, SERVICE_WARMUP, SERVICE_WARMUP_BLOCKING
+from app.mutil_agent.services.service_registry import get_service_registry
+from app.mutil_agent.utils.metrics import PROMETHEUS_CONTENT_TYPE, get_metrics_registry
+
+# Strands routers are cheap to import: agents and the strands SDK load on first use
+# (or in the warm-up), so only check that the SDK is installed
+STRANDS_SDK_INSTALLED = importlib.util.find_spec("strands") is not None
 
 # Import Strands Agent routes
-try:
+if STRANDS_SDK_INSTALLED:
     from app.mutil_agent.routes.v1.strands_agent_routes import router as strands_router
     STRANDS_AGENTS_AVAILABLE = True
-    print("[STARTUP] ✅ Strands Agents system loaded successfully")
-except ImportError as e:
+    print("[STARTUP] ✅ Strands Agents routes loaded (agents initialize on first use)")
+else:
     STRANDS_AGENTS_AVAILABLE = False
-    print(f"[STARTUP] ⚠️  Strands Agents not available: {e}")
+    print("[STARTUP] ⚠️  Strands Agents not available: strands package not installed")
 
 # Import Pure Strands Agents router
-try:
+if STRANDS_SDK_INSTALLED:
     from app.mutil_agent.routes.pure_strands_routes import pure_strands_router
     PURE_STRANDS_AVAILABLE = True
-    print("[STARTUP] VPBank Pure Strands Agents system loaded successfully")
-except ImportError as e:
+    print("[STARTUP] VPBank Pure Strands Agents routes loaded (system initializes on first use)")
+else:
     PURE_STRANDS_AVAILABLE = False
-    print(f"[STARTUP] Pure Strands Agents not available: {e}")
+    print("[STARTUP] Pure Strands Agents not available: strands package not installed")
 
 # Configure logging
 logging.basicConfig(
@@ -80,6 +88,9 @@ async def lifespan(app: FastAPI):
         await initialize_services()
         logger.info("✅ All services initialized successfully")
         
+        # Prune superseded LangGraph checkpoints in the background
+        start_checkpoint_compaction()
+        
     except Exception as e:
         logger.error(f"❌ Startup error: {e}")
         # Don't fail startup for non-critical services
@@ -92,16 +103,37 @@ async def lifespan(app: FastAPI):
     await cleanup_services()
     logger.info("✅ Shutdown complete")
 
+_warmup_task: Optional[asyncio.Task] = None
+
 async def initialize_services():
     """Initialize all application services"""
-    # Add any service initialization here
-    # For example: AI model loading, cache warming, etc.
-    pass
+    # Services are created on first use; SERVICE_WARMUP lists the ones to create up front.
+    # By default the warm-up runs in the background so the worker starts serving immediately.
+    global _warmup_task
+    names = [name.strip() for name in SERVICE_WARMUP.split(",") if name.strip()]
+    if not names:
+        return
+    warm_up = get_service_registry().warm_up(None if names == ["all"] else names)
+    if SERVICE_WARMUP_BLOCKING:
+        await warm_up
+    else:
+        _warmup_task = asyncio.create_task(warm_up)
 
 async def cleanup_services():
     """Cleanup services on shutdown"""
-    # Add cleanup logic here
-    pass
+    from app.mutil_agent.databases.dynamodb_executor import shutdown_dynamodb_executor
+    from app.mutil_agent.databases.dynamodb_write_behind import shutdown_message_write_queue
+    from app.mutil_agent.helpers.lightweight_ocr import shutdown_ocr_pool
+    from app.mutil_agent.services.bedrock_gateway import shutdown_bedrock_gateway
+    from app.mutil_agent.utils.async_bridge import shutdown_bridge
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+    shutdown_bridge()
+    shutdown_ocr_pool()
+    shutdown_bedrock_gateway()
+    await stop_checkpoint_compaction()
+    await shutdown_message_write_queue()
+    shutdown_dynamodb_executor()
 
 # Create FastAPI application with lifespan
 app = FastAPI(
@@ -201,6 +233,11 @@ async def root_health_check():
         "message": "VPBank K-MULT Agent Studio is running"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: per-stage and HTTP latency histograms of this worker"""
+    return Response(content=get_metrics_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 @app.get("/")
 async def root():
     """Root endpoint with service information"""
@@ -211,6 +248,7 @@ async def root():
         "status": "operational",
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "docs": "/docs",
             "redoc": "/redoc",
             "api_v1": "/mutil_agent/api/v1/",
@@ -2,6 +2,25 @@ import logging
 import time
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.routing import Match
+
+from app.mutil_agent.utils.metrics import get_metrics_registry
+from app.mutil_agent.utils.tracing import span, start_trace, traceparent_header
+
+HTTP_REQUEST_DURATION = get_metrics_registry().histogram(
+    "kmult_http_request_duration_seconds",
+    "HTTP request duration until response headers are sent",
+    ("method", "route", "status"),
+)
+
+
+def _route_template(request: Request) -> str:
+    """Path template of the matching route; used as a label so metric cardinality stays bounded"""
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
 
 
 class CustomMiddleware(BaseHTTPMiddleware):
@@ -16,13 +35,26 @@ class CustomMiddleware(BaseHTTPMiddleware):
         }
         print(f"REQUEST: {data}")
 
-        # Process request
-        response = await call_next(request)
+        # Process request inside a trace; services add their stages as child spans
+        request_trace = start_trace(request.headers.get("traceparent"))
+        # Resolved up front so model calls made while handling the request are tagged with it
+        request_trace.route = _route_template(request)
+        with span("http.request", method=request.method, path=request.url.path) as root:
+            response = await call_next(request)
+
+        HTTP_REQUEST_DURATION.observe(
+            root.duration, method=request.method, route=request_trace.route, status=str(response.status_code)
+        )
+        response.headers["traceparent"] = traceparent_header(request_trace, root.span_id)
+        server_timing = request_trace.server_timing()
+        if server_timing:
+            response.headers["Server-Timing"] = server_timing
 
         # Log response
         process_time = time.time() - start_time
         print(
             f"RESPONSE: path={request.url.path} status_code={response.status_code} duration={process_time:.4f}s"
+            f" trace_id={request_trace.trace_id} stages=[{server_timing}]"
         )
 
         return response
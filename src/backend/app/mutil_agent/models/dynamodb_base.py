@@ -47,12 +47,14 @@ class DynamoDBModel(BaseModel):
         if cls._client is None:
             # Import VERIFY_HTTPS from config
             from app.mutil_agent.config import VERIFY_HTTPS, AWS_SESSION_TOKEN
+            from app.mutil_agent.databases.dynamodb_utils import dynamodb_connection_kwargs
             
             client_kwargs = {
                 "region_name": AWS_REGION,
                 "aws_access_key_id": AWS_ACCESS_KEY_ID,
                 "aws_secret_access_key": AWS_SECRET_ACCESS_KEY,
                 "verify": VERIFY_HTTPS,  # Use SSL verification setting from config
+                **dynamodb_connection_kwargs(),  # Pool sized for the DynamoDB I/O executor
             }
             
             # Add session token if available
@@ -68,12 +70,14 @@ class DynamoDBModel(BaseModel):
         if cls._resource is None:
             # Import VERIFY_HTTPS from config
             from app.mutil_agent.config import VERIFY_HTTPS, AWS_SESSION_TOKEN
+            from app.mutil_agent.databases.dynamodb_utils import dynamodb_connection_kwargs
             
             resource_kwargs = {
                 "region_name": AWS_REGION,
                 "aws_access_key_id": AWS_ACCESS_KEY_ID,
                 "aws_secret_access_key": AWS_SECRET_ACCESS_KEY,
                 "verify": VERIFY_HTTPS,  # Use SSL verification setting from config
+                **dynamodb_connection_kwargs(),
             }
             
             # Add session token if available
@@ -134,14 +138,17 @@ class DynamoDBModel(BaseModel):
         return cls(**data)
     
     async def save(self):
-        """Save model to DynamoDB."""
+        """Save model to DynamoDB (the put runs on the DynamoDB I/O pool, not the event loop)."""
+        from app.mutil_agent.databases.dynamodb_executor import get_dynamodb_executor
+        
         self.updated_at = datetime.now(timezone.utc)
         
         client = self.get_client()
         item = self.to_dynamodb_item()
         
         try:
-            client.put_item(
+            await get_dynamodb_executor().run(
+                client.put_item,
                 TableName=self.table_name,
                 Item=item
             )
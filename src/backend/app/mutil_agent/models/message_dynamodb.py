@@ -3,12 +3,12 @@ DynamoDB Message model - separate from MongoDB Message model.
 """
 from enum import Enum
 from uuid import UUID, uuid4
-from typing import Any, Dict, List, Optional, ClassVar
-from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, ClassVar
+from datetime import datetime, timezone
 
 from pydantic import Field
 from app.mutil_agent.models.dynamodb_base import DynamoDBModel
-from app.mutil_agent.config import DYNAMODB_MESSAGE_TABLE
+from app.mutil_agent.config import DYNAMODB_MESSAGE_TABLE, MESSAGE_WRITE_BEHIND, MESSAGE_WRITE_DURABLE
 
 
 class MessageTypesDynamoDB(str, Enum):
@@ -43,9 +43,9 @@ class MessageQueryBuilder:
     
     async def to_list(self) -> List["MessageDynamoDB"]:
         """Execute the query and return results as a list."""
-        from app.mutil_agent.databases.dynamodb_message_ops import DynamoDBMessageOperations
+        from app.mutil_agent.databases.dynamodb_message_ops import get_message_operations
         
-        ops = DynamoDBMessageOperations()
+        ops = get_message_operations()
         
         # Extract query parameters
         conversation_id = self.query.get("conversation_id")
@@ -109,6 +109,59 @@ class MessageDynamoDB(DynamoDBModel):
             }
         }
     
+    async def save(self, durable: Optional[bool] = None):
+        """
+        Save message to DynamoDB through the write-behind queue.
+        
+        Args:
+            durable: Await the batched write (errors are raised); defaults to
+                MESSAGE_WRITE_DURABLE. Use it when the message is read back right
+                away. Without it the write is flushed within
+                MESSAGE_WRITE_BEHIND_FLUSH_INTERVAL and failures are only logged.
+        
+        The message is also added to the conversation's cached history window
+        (dropped again if the write fails).
+        """
+        from app.mutil_agent.databases.dynamodb_conversation_cache import get_conversation_cache
+        from app.mutil_agent.databases.dynamodb_write_behind import get_message_write_queue
+        
+        # Follow-up turns read their history window from the hot conversation cache
+        cache = get_conversation_cache()
+        if not MESSAGE_WRITE_BEHIND:
+            await super().save()
+            if cache is not None:
+                cache.append_message(self._to_cache_item(self.to_dynamodb_item()))
+            return
+        
+        self.updated_at = datetime.now(timezone.utc)
+        item = self.to_dynamodb_item()
+        conversation_id = str(self.conversation_id)
+        if cache is not None:
+            # Appended before the write, so a failed write always drops it again
+            cache.append_message(self._to_cache_item(item))
+        try:
+            future = await get_message_write_queue().put(
+                item,
+                wait=MESSAGE_WRITE_DURABLE if durable is None else durable,
+            )
+        except Exception as e:
+            if cache is not None:
+                cache.invalidate(conversation_id)
+            raise Exception(f"Failed to save {self.__class__.__name__}: {str(e)}")
+        
+        if cache is not None:
+            def drop_on_failure(write):
+                # Cancelled (waiter went away): the outcome is unknown here, so drop it too
+                if write.cancelled() or write.exception() is not None:
+                    cache.invalidate(conversation_id)
+            future.add_done_callback(drop_on_failure)
+    
+    @classmethod
+    def _to_cache_item(cls, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Serialized item as returned by message queries (plain values)."""
+        deserializer = cls.get_deserializer()
+        return {k: deserializer.deserialize(v) for k, v in item.items()}
+    
     @classmethod
     async def find_by_conversation(
         cls,
@@ -117,17 +170,17 @@ class MessageDynamoDB(DynamoDBModel):
         limit: int = 20
     ) -> List["MessageDynamoDB"]:
         """
-        Find messages by conversation - optimized method.
+        Find the latest `limit` messages of a conversation, oldest first - optimized method.
         Alternative to using find() with complex queries.
         """
-        from app.mutil_agent.databases.dynamodb_message_ops import DynamoDBMessageOperations
+        from app.mutil_agent.databases.dynamodb_message_ops import get_message_operations
         
         # Convert UUIDs to strings for DynamoDB
         conversation_id_str = str(conversation_id)
         type_values = [t.value for t in message_types]
         
         # Use DynamoDB operations to query messages
-        ops = DynamoDBMessageOperations()
+        ops = get_message_operations()
         messages_data = await ops.find_by_conversation_and_types(
             conversation_id_str, type_values, limit
         )
@@ -136,6 +189,25 @@ class MessageDynamoDB(DynamoDBModel):
         messages = [cls.from_dynamodb_item(item) for item in messages_data]
         return messages
     
+    @classmethod
+    async def iter_history(
+        cls,
+        conversation_id: UUID,
+        message_types: Optional[List[MessageTypesDynamoDB]] = None,
+        newest_first: bool = False,
+    ) -> AsyncIterator["MessageDynamoDB"]:
+        """
+        Iterate over the full conversation history (e.g. for export).
+        Messages are read page by page, so memory stays bounded for long conversations.
+        """
+        from app.mutil_agent.databases.dynamodb_message_ops import get_message_operations
+        
+        type_values = [t.value for t in message_types] if message_types else None
+        async for item in get_message_operations().iter_conversation(
+            str(conversation_id), type_values, newest_first=newest_first
+        ):
+            yield cls.from_dynamodb_item(item)
+    
     @classmethod
     def find(cls, query: dict):
         """
@@ -172,9 +244,11 @@ class MessageDynamoDB(DynamoDBModel):
         import boto3
         from botocore.exceptions import ClientError
         from app.mutil_agent.config import AWS_REGION, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_SESSION_TOKEN
+        from app.mutil_agent.databases.dynamodb_utils import dynamodb_connection_kwargs
         
         client_kwargs = {
             "region_name": AWS_REGION,
+            **dynamodb_connection_kwargs(),
         }
         
         if AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY:
@@ -19,6 +19,10 @@ class RiskAssessmentRequest(BaseModel):
     financial_documents: Optional[str] = Field(default=None, description="Nội dung tài liệu tài chính")
     # ... có thể bổ sung trường khác nếu cần
 
+class CreditScoreBatchRequest(BaseModel):
+    applicants: List[RiskAssessmentRequest] = Field(description="Hồ sơ cần chấm điểm (financials, requested_amount, loan_term, collateral_type)")
+    include_factors: bool = Field(default=True, description="Trả về điểm từng yếu tố (tắt để chấm nhanh lô lớn)")
+
 class Threat(BaseModel):
     type: str
     score: int
@@ -9,11 +9,6 @@ import logging
 import json
 from datetime import datetime
 
-# Import Pure Strands system
-from app.mutil_agent.agents.pure_strands_vpbank_system import (
-    process_pure_strands_request
-)
-
 logger = logging.getLogger(__name__)
 
 # Create router
@@ -102,7 +97,9 @@ async def process_request(
                 logger.warning(f"[UNIFIED_ENDPOINT] Context parse error: {e}")
                 parsed_context = {"raw_context": context}
         
-        # Process through Pure Strands system
+        # Process through Pure Strands system (strands is imported on first request)
+        from app.mutil_agent.agents.pure_strands_vpbank_system import process_pure_strands_request
+
         logger.info(f"[UNIFIED_ENDPOINT] Routing to Pure Strands system...")
         result = await process_pure_strands_request(
             user_message=enhanced_message,
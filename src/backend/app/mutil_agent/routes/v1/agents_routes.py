@@ -1,9 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import logging
 import time
 import uuid
+from datetime import datetime
+
+from app.mutil_agent.utils.llm_usage import get_llm_usage_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -257,3 +260,22 @@ async def assign_task_to_agent(
 async def list_agents():
     """List all available agents with their capabilities"""
     return await get_agents_status()
+
+@router.get("/usage")
+async def llm_usage(
+    group_by: str = Query("agent", description="Comma-separated subset of agent,route,model"),
+    sort_by: str = Query("total_tokens", description="total_tokens, input_tokens, output_tokens, latency_seconds or calls"),
+):
+    """Model tokens and latency per calling agent/route/model since startup (this worker)"""
+    tracker = get_llm_usage_tracker()
+    fields = tuple(name.strip() for name in group_by.split(",") if name.strip())
+    try:
+        rows = tracker.rollup(group_by=fields or tracker.GROUP_FIELDS, sort_by=sort_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "since": datetime.fromtimestamp(tracker.started_at).isoformat(),
+        "group_by": list(fields or tracker.GROUP_FIELDS),
+        "sort_by": sort_by,
+        "usage": rows,
+    }
@@ -1,13 +1,15 @@
 import json
 import logging
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Body
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
+from app.mutil_agent.config import COMPLIANCE_BATCH_MAX_DOCUMENTS
 from app.mutil_agent.schemas.base import ResponseStatus
-from app.mutil_agent.services.compliance_service import ComplianceValidationService
+from app.mutil_agent.services.compliance_service import BatchDocument
+from app.mutil_agent.services.service_registry import get_service
 from app.mutil_agent.services.compliance_config import ComplianceConfig
 
 router = APIRouter()
@@ -16,6 +18,15 @@ router = APIRouter()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ALLOWED_EXTENSIONS = ['.txt', '.pdf', '.docx', '.doc', '.csv']
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache, no-store, must-revalidate",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
 
 class ComplianceValidationRequest(BaseModel):
     """Request model for compliance validation - simplified for UCP 600 focus"""
@@ -28,6 +39,45 @@ class UCPQueryRequest(BaseModel):
     query: str = Field(..., description="Question about UCP 600 regulations")
 
 
+class BatchDocumentItem(BaseModel):
+    """One document of a batch validation request"""
+    text: str = Field(..., description="Document text (from OCR or direct input)")
+    document_type: Optional[str] = Field(None, description="Document type (auto-detected if not provided)")
+    document_id: Optional[str] = Field(None, description="Client reference echoed in the result (defaults to the position)")
+
+
+class BatchValidationRequest(BaseModel):
+    """Request model for validating a set of documents, e.g. a full L/C presentation"""
+    documents: List[BatchDocumentItem] = Field(..., description="Documents to validate")
+    max_concurrency: Optional[int] = Field(None, ge=1, description="Documents validated at once (server default if not provided)")
+
+
+async def _batch_event_stream(events):
+    """
+    Format ComplianceValidationService.iter_batch_validation events as Server-Sent Events
+    
+    Errors after the response has started are reported as an "error" event.
+    """
+    try:
+        async for event in events:
+            payload = {"status": ResponseStatus.SUCCESS, "event": event["event"], "data": event["data"]}
+            yield f"event: {event['event']}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    except Exception as e:
+        logger.error(f"Error in batch compliance validation: {str(e)}")
+        payload = {"status": ResponseStatus.ERROR, "event": "error", "message": f"Lỗi khi kiểm tra tuân thủ: {str(e)}"}
+        yield f"event: error\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _check_batch_size(count: int) -> None:
+    if count == 0:
+        raise HTTPException(status_code=400, detail="Không có tài liệu nào để kiểm tra")
+    if count > COMPLIANCE_BATCH_MAX_DOCUMENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Quá nhiều tài liệu. Tối đa {COMPLIANCE_BATCH_MAX_DOCUMENTS} tài liệu mỗi lần kiểm tra"
+        )
+
+
 @router.post("/validate", response_model=dict)
 async def validate_document_compliance(request: ComplianceValidationRequest = Body(...)):
     """
@@ -48,7 +98,7 @@ async def validate_document_compliance(request: ComplianceValidationRequest = Bo
             )
         
         # Initialize compliance service
-        compliance_service = ComplianceValidationService()
+        compliance_service = get_service("compliance_service")
         
         # Perform compliance validation
         validation_result = await compliance_service.validate_document_compliance(
@@ -101,7 +151,7 @@ async def query_ucp_regulations(request: UCPQueryRequest = Body(...)):
             )
         
         # Initialize compliance service
-        compliance_service = ComplianceValidationService()
+        compliance_service = get_service("compliance_service")
         
         # Query regulations
         query_result = await compliance_service.query_regulations_directly(request.query)
@@ -156,28 +206,26 @@ async def validate_document_file(
         
         # Check file size (max 10MB)
         file_content = await file.read()
-        if len(file_content) > 10 * 1024 * 1024:  # 10MB
+        if len(file_content) > MAX_FILE_SIZE:
             raise HTTPException(
                 status_code=400,
                 detail="File quá lớn. Kích thước tối đa là 10MB"
             )
         
         # Check file type
-        allowed_extensions = ['.txt', '.pdf', '.docx', '.doc', '.csv']
         file_extension = os.path.splitext(file.filename)[1].lower()
         
-        if file_extension not in allowed_extensions:
+        if file_extension not in ALLOWED_EXTENSIONS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Định dạng file không được hỗ trợ. Chỉ chấp nhận: {', '.join(allowed_extensions)}"
+                detail=f"Định dạng file không được hỗ trợ. Chỉ chấp nhận: {', '.join(ALLOWED_EXTENSIONS)}"
             )
         
         # Initialize compliance service
-        compliance_service = ComplianceValidationService()
+        compliance_service = get_service("compliance_service")
         
         # Extract text from document (reuse text service logic)
-        from app.mutil_agent.services.text_service import TextSummaryService
-        text_service = TextSummaryService()
+        text_service = get_service("text_service")
         
         extracted_text = await text_service.extract_text_from_document(
             file_content=file_content,
@@ -231,6 +279,142 @@ async def validate_document_file(
         )
 
 
+@router.post("/validate/batch")
+async def validate_documents_batch(request: BatchValidationRequest = Body(...)):
+    """
+    Validate several documents against UCP 600 in one request
+    
+    Documents are validated concurrently and UCP 600 regulations are looked
+    up once per document type for the whole batch.
+    
+    Args:
+        request: BatchValidationRequest with document texts
+        
+    Returns:
+        text/event-stream with a "document" event per document as soon as it
+        is validated, a "presentation" event with cross-document consistency
+        checks, then a "complete" event with status counts
+    """
+    _check_batch_size(len(request.documents))
+    
+    try:
+        compliance_service = get_service("compliance_service")
+    except Exception as e:
+        logger.error(f"Error in batch compliance validation: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": ResponseStatus.ERROR,
+                "message": f"Lỗi khi kiểm tra tuân thủ: {str(e)}"
+            }
+        )
+    
+    documents = [
+        BatchDocument(
+            document_id=item.document_id or str(index),
+            text=item.text,
+            document_type=item.document_type
+        )
+        for index, item in enumerate(request.documents)
+    ]
+    
+    return StreamingResponse(
+        _batch_event_stream(compliance_service.iter_batch_validation(documents, request.max_concurrency)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.post("/document/batch")
+async def validate_document_files_batch(
+    files: List[UploadFile] = File(..., description="Document files to validate (PDF, TXT, DOCX)"),
+    max_concurrency: Optional[int] = Form(None, ge=1, description="Documents validated at once (server default if not provided)")
+):
+    """
+    Validate several document files (e.g. a full L/C presentation) in one request
+    
+    Text extraction and validation run concurrently per file; document
+    types are auto-detected.
+    
+    Args:
+        files: Uploaded document files
+        max_concurrency: Optional limit of documents processed at once
+        
+    Returns:
+        text/event-stream with a "document" event per file as soon as it is
+        validated, a "presentation" event with cross-document consistency
+        checks, then a "complete" event with status counts
+    """
+    _check_batch_size(len(files))
+    
+    # Read and check every file before streaming starts
+    uploads = []
+    for file in files:
+        if not file.filename:
+            raise HTTPException(status_code=400, detail="Không có file được upload")
+        
+        file_extension = os.path.splitext(file.filename)[1].lower()
+        if file_extension not in ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Định dạng file {file.filename} không được hỗ trợ. Chỉ chấp nhận: {', '.join(ALLOWED_EXTENSIONS)}"
+            )
+        
+        file_content = await file.read()
+        if len(file_content) > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File {file.filename} quá lớn. Kích thước tối đa là 10MB"
+            )
+        uploads.append((file.filename, file_extension, file_content))
+    
+    try:
+        compliance_service = get_service("compliance_service")
+        
+        # Extract text from document (reuse text service logic)
+        text_service = get_service("text_service")
+    except Exception as e:
+        logger.error(f"Error in batch document validation: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": ResponseStatus.ERROR,
+                "message": f"Lỗi khi kiểm tra tuân thủ file: {str(e)}"
+            }
+        )
+    
+    def text_loader(filename: str, file_extension: str, file_content: bytes):
+        async def load_text() -> str:
+            extracted_text = await text_service.extract_text_from_document(
+                file_content=file_content,
+                file_extension=file_extension,
+                filename=filename
+            )
+            if not extracted_text or len(extracted_text.strip()) < 50:
+                raise ValueError("Không thể trích xuất đủ văn bản từ file để kiểm tra tuân thủ")
+            return extracted_text
+        return load_text
+    
+    documents = [
+        BatchDocument(
+            document_id=filename,
+            load_text=text_loader(filename, file_extension, file_content),
+            metadata={"file_info": {
+                "filename": filename,
+                "file_size": len(file_content),
+                "file_type": file_extension
+            }}
+        )
+        for filename, file_extension, file_content in uploads
+    ]
+    
+    return StreamingResponse(
+        _batch_event_stream(compliance_service.iter_batch_validation(documents, max_concurrency)),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 @router.get("/health", response_model=dict)
 async def health_check():
     """
@@ -238,7 +422,7 @@ async def health_check():
     """
     try:
         # Initialize compliance service
-        compliance_service = ComplianceValidationService()
+        compliance_service = get_service("compliance_service")
         
         # Check knowledge base connection
         kb_status = "available" if compliance_service.knowledge_base_id else "not_configured"
@@ -255,7 +439,8 @@ async def health_check():
                     "status": "healthy",
                     "knowledge_base_status": kb_status,
                     "bedrock_status": bedrock_status,
-                    "knowledge_base_id": compliance_service.knowledge_base_id
+                    "knowledge_base_id": compliance_service.knowledge_base_id,
+                    "regulation_cache": compliance_service.regulation_cache.get_stats()
                 },
                 "message": "Compliance service is healthy"
             }
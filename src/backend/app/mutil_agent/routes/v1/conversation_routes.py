@@ -43,13 +43,14 @@ async def chat(
                 content={"status": ResponseStatus.SUCCESS, "data": new_conversation},
             )
 
-        # Save human message to DynamoDB (no session needed)
+        # Save human message to DynamoDB (no session needed); durable because the
+        # chat node reads it back from the history right away
         message = Message(
             conversation_id=UUID(request.conversation_id),
             message=request.message,
             type=MessageTypes.HUMAN,
         )
-        await message.save()
+        await message.save(durable=True)
 
         initial_state = ConversationState(
             conversation_id=request.conversation_id,
@@ -94,3 +95,22 @@ async def chat(
         return JSONResponse(
             status_code=400, content={"status": ResponseStatus.ERROR, "message": str(e)}
         )
+
+
+@router.get("/{conversation_id}/messages/export")
+async def export_messages(conversation_id: UUID):
+    """
+    Stream the full message history of a conversation as NDJSON, oldest first.
+    """
+
+    async def ndjson_lines():
+        try:
+            async for message in Message.iter_history(conversation_id):
+                yield json.dumps(message.model_dump(mode="json"), ensure_ascii=False) + "\n"
+        except Exception as e:
+            logging.error(
+                f"[CONVERSATION_ROUTER] - Error exporting messages: {str(e)} - conversation_id: {conversation_id}"
+            )
+            raise
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
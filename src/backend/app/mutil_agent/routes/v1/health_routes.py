@@ -11,6 +11,8 @@ import time
 import logging
 from datetime import datetime
 
+from app.mutil_agent.services.service_registry import get_service_registry
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -307,3 +309,10 @@ async def knowledge_health():
     """Knowledge base service health"""
     status, details = await check_knowledge_service()
     return {"status": status, "service": "knowledge_base", **details}
+
+@router.get("/health/services")
+async def services_health():
+    """Lazy service registry: which services are initialized and how long they took"""
+    services = get_service_registry().get_stats()
+    failed = [name for name, stats in services.items() if stats["last_error"]]
+    return {"status": "degraded" if failed else "healthy", "service": "service_registry", "services": services}
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from app.mutil_agent.models.risk import (
-    RiskAssessmentRequest, RiskAssessmentResponse, RiskMonitorResponse, RiskAlertRequest, RiskScoreHistoryResponse, MarketDataResponse, CreditAssessmentResponseShort
+    CreditScoreBatchRequest, RiskAssessmentRequest, RiskAssessmentResponse, RiskMonitorResponse, RiskAlertRequest, RiskScoreHistoryResponse, MarketDataResponse, CreditAssessmentResponseShort
 )
 from app.mutil_agent.services.risk_service import (
     assess_risk, get_monitor_status, receive_alert_webhook, get_score_history, get_market_data
@@ -8,6 +8,9 @@ from app.mutil_agent.services.risk_service import (
 from app.mutil_agent.helpers.improved_pdf_extractor import ImprovedPDFExtractor
 from app.mutil_agent.helpers import extract_text_from_docx
 from app.mutil_agent.helpers.lightweight_ocr import LightweightOCR
+from app.mutil_agent.services.credit_scoring import score_batch
+from app.mutil_agent.config import CREDIT_SCORING_BATCH_MAX_APPLICANTS
+import asyncio
 import time
 
 router = APIRouter()
@@ -41,6 +44,32 @@ async def assess_risk_endpoint(request: RiskAssessmentRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/score/batch")
+async def score_batch_endpoint(request: CreditScoreBatchRequest):
+    """Chấm điểm tín dụng theo lô bằng scorecard nội bộ (không gọi LLM)"""
+    if len(request.applicants) > CREDIT_SCORING_BATCH_MAX_APPLICANTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tối đa {CREDIT_SCORING_BATCH_MAX_APPLICANTS} hồ sơ mỗi lần chấm điểm"
+        )
+    started = time.perf_counter()
+    applicants = [applicant.model_dump() for applicant in request.applicants]
+    scores = await asyncio.to_thread(score_batch, applicants, request.include_factors)
+    results = []
+    for applicant, credit in zip(request.applicants, scores):
+        result = {"entity_id": applicant.entity_id, "applicant_name": applicant.applicant_name, **credit.to_dict()}
+        if not request.include_factors:
+            result.pop("scoreFactors")
+        results.append(result)
+    return {
+        "status": "success",
+        "data": {
+            "count": len(results),
+            "processing_time_ms": round((time.perf_counter() - started) * 1000, 2),
+            "scores": results,
+        },
+    }
+
 @router.post("/assess-file")
 async def assess_risk_file_endpoint(
     file: UploadFile = File(...),
@@ -14,7 +14,7 @@ from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Body
 from fastapi.responses import JSONResponse
 
 from app.mutil_agent.schemas.base import ResponseStatus
-from app.mutil_agent.services.strands_agent_service import strands_service
+from app.mutil_agent.services.service_registry import get_service
 
 router = APIRouter()
 
@@ -95,7 +95,7 @@ async def strands_supervisor_orchestration(request: StrandsSupervisorRequest = B
             )
         
         # Process through Strands Agent service
-        result = await strands_service.process_supervisor_request(
+        result = await get_service("strands_agent_service").process_supervisor_request(
             user_request=request.user_request,
             context=request.context
         )
@@ -209,8 +209,7 @@ async def strands_supervisor_with_file_upload(
                     )
                 
                 # Extract text from file using existing text service
-                from app.mutil_agent.services.text_service import TextSummaryService
-                text_service = TextSummaryService()
+                text_service = get_service("text_service")
                 
                 file_content = await text_service.extract_text_from_document(
                     file_content=file_bytes,
@@ -251,7 +250,7 @@ async def strands_supervisor_with_file_upload(
             parsed_context["document_length"] = len(file_content) if file_content else 0
         
         # Process through Strands Agent service
-        result = await strands_service.process_supervisor_request(
+        result = await get_service("strands_agent_service").process_supervisor_request(
             user_request=enhanced_request,
             context=parsed_context
         )
@@ -305,7 +304,7 @@ async def get_strands_agents_status():
         Status information for all available Strands Agents
     """
     try:
-        result = await strands_service.get_agent_status()
+        result = await get_service("strands_agent_service").get_agent_status()
         
         return JSONResponse(
             status_code=200,
@@ -336,7 +335,7 @@ async def list_strands_agent_tools():
         List of available tools with descriptions and parameters
     """
     try:
-        result = await strands_service.list_available_tools()
+        result = await get_service("strands_agent_service").list_available_tools()
         
         return JSONResponse(
             status_code=200,
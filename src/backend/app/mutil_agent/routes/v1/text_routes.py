@@ -4,10 +4,10 @@ import os
 from typing import Optional, List, Union
 from pydantic import BaseModel, Field
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.mutil_agent.schemas.base import ResponseStatus
-from app.mutil_agent.services.text_service import TextSummaryService
+from app.mutil_agent.services.service_registry import get_service
 from app.mutil_agent.helpers.dynamic_summary_config import analyze_document_for_summary
 
 router = APIRouter()
@@ -22,6 +22,7 @@ class SummaryRequest(BaseModel):
     summary_type: Optional[str] = Field(default="general", description="Type of summary: general, bullet_points, key_insights")
     max_length: Optional[int] = Field(default=300, description="Maximum length of summary in words")
     language: Optional[str] = Field(default="vietnamese", description="Language for summary output")
+    stream: Optional[bool] = Field(default=False, description="Stream progress and the summary as Server-Sent Events")
 
 
 class SummaryResponse(BaseModel):
@@ -39,6 +40,32 @@ class URLSummaryRequest(BaseModel):
     language: Optional[str] = Field(default="vietnamese", description="Output language")
 
 
+SSE_HEADERS = {
+    "Cache-Control": "no-cache, no-store, must-revalidate",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+async def _summary_event_stream(events, extra_result: Optional[dict] = None):
+    """
+    Format TextSummaryService.stream_summary events as Server-Sent Events
+
+    Errors after the response has started are reported as an "error" event.
+    """
+    try:
+        async for event in events:
+            data = event["data"]
+            if event["event"] == "complete" and extra_result:
+                data = {**data, **extra_result}
+            payload = {"status": ResponseStatus.SUCCESS, "event": event["event"], "data": data}
+            yield f"event: {event['event']}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    except Exception as e:
+        logger.error(f"Error in streaming summarization: {str(e)}")
+        payload = {"status": ResponseStatus.ERROR, "event": "error", "message": f"Lỗi khi tóm tắt: {str(e)}"}
+        yield f"event: error\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
 @router.post("/summary/text", response_model=dict)
 async def summarize_text(request: SummaryRequest):
     """
@@ -48,7 +75,8 @@ async def summarize_text(request: SummaryRequest):
         request: SummaryRequest object containing text and parameters
         
     Returns:
-        JSON response with summarized text and metadata
+        JSON response with summarized text and metadata, or a text/event-stream
+        of progress events when request.stream is true
     """
     try:
         # Validate input text
@@ -59,7 +87,19 @@ async def summarize_text(request: SummaryRequest):
             )
         
         # Initialize text summary service
-        text_service = TextSummaryService()
+        text_service = get_service("text_service")
+        
+        if request.stream:
+            return StreamingResponse(
+                _summary_event_stream(text_service.stream_summary(
+                    text=request.text,
+                    summary_type=request.summary_type,
+                    max_length=request.max_length,
+                    language=request.language
+                )),
+                media_type="text/event-stream",
+                headers=SSE_HEADERS,
+            )
         
         # Generate summary
         summary_result = await text_service.summarize_text(
@@ -111,7 +151,8 @@ async def summarize_document(
     summary_type: str = Form(default="general"),
     max_length: int = Form(default=300),
     language: str = Form(default="vietnamese"),
-    max_pages: Optional[int] = Form(default=None, description="Maximum pages to process (None = all pages)")
+    max_pages: Optional[int] = Form(default=None, description="Maximum pages to process (None = all pages)"),
+    stream: bool = Form(default=False, description="Stream progress and the summary as Server-Sent Events")
 ):
     """
     Tóm tắt tài liệu từ file upload (hỗ trợ .txt, .pdf, .docx)
@@ -121,9 +162,11 @@ async def summarize_document(
         summary_type: Type of summary to generate
         max_length: Maximum length in words
         language: Output language
+        stream: Emit chunk summaries and final summary tokens as Server-Sent Events
         
     Returns:
-        JSON response with document summary and metadata
+        JSON response with document summary and metadata, or a text/event-stream
+        of progress events when stream is true
     """
     try:
         # Validate file
@@ -152,7 +195,7 @@ async def summarize_document(
             )
         
         # Initialize text summary service
-        text_service = TextSummaryService()
+        text_service = get_service("text_service")
         
         # Extract text from document
         extracted_text = await text_service.extract_text_from_document(
@@ -168,6 +211,29 @@ async def summarize_document(
                 detail="Không thể trích xuất đủ nội dung từ tài liệu để tóm tắt"
             )
         
+        document_info = {
+            "filename": file.filename,
+            "file_size": len(file_content),
+            "file_type": file_extension,
+            "extracted_text_length": len(extracted_text),
+            "max_pages_processed": max_pages or "all"
+        }
+        
+        if stream:
+            return StreamingResponse(
+                _summary_event_stream(
+                    text_service.stream_summary(
+                        text=extracted_text,
+                        summary_type=summary_type,
+                        max_length=max_length,
+                        language=language
+                    ),
+                    extra_result={"document_info": document_info}
+                ),
+                media_type="text/event-stream",
+                headers=SSE_HEADERS,
+            )
+        
         # Generate summary
         summary_result = await text_service.summarize_text(
             text=extracted_text,
@@ -177,12 +243,7 @@ async def summarize_document(
         )
         
         # Add document info to response
-        summary_result["document_info"] = {
-            "filename": file.filename,
-            "file_size": len(file_content),
-            "file_type": file_extension,
-            "extracted_text_length": len(extracted_text),
-            "max_pages_processed": max_pages or "all"        }
+        summary_result["document_info"] = document_info
         
         return JSONResponse(
             status_code=200,
@@ -317,7 +378,7 @@ async def health_check():
     """
     try:
         # Initialize text summary service
-        text_service = TextSummaryService()
+        text_service = get_service("text_service")
         
         # Check AI services availability
         ai_services_status = {
@@ -335,6 +396,7 @@ async def health_check():
                     "service_status": "healthy" if is_healthy else "degraded",
                     "ai_services": ai_services_status,
                     "fallback_available": True,
+                    "response_cache": text_service.response_cache.get_stats(),
                     "timestamp": "2024-06-22T08:00:00Z"
                 },
                 "message": "Dịch vụ tóm tắt đang hoạt động"
@@ -412,7 +474,7 @@ async def analyze_document_for_summary_endpoint(
             )
         
         # Initialize text summary service
-        text_service = TextSummaryService()
+        text_service = get_service("text_service")
         
         # Extract text from document
         extracted_text = await text_service.extract_text_from_document(
@@ -0,0 +1,189 @@
+"""
+Async Bedrock Gateway
+Non-blocking access to the shared bedrock-runtime / bedrock-agent-runtime clients.
+
+boto3 calls are offloaded to a dedicated thread pool sized to the clients'
+connection pool (BEDROCK_MAX_POOL_CONNECTIONS), and streaming responses are
+pumped from that pool into an asyncio.Queue. The event loop never iterates
+a botocore stream itself, so other requests on the same worker keep making
+progress while one generation streams.
+
+Non-streaming calls go through invoke(), which shares one process-wide
+adaptive (AIMD) concurrency limiter and retries throttled attempts.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional
+
+from app.mutil_agent.config import (
+    BEDROCK_INITIAL_CONCURRENCY,
+    BEDROCK_MAX_CONCURRENCY,
+    BEDROCK_MAX_POOL_CONNECTIONS,
+    BEDROCK_MIN_CONCURRENCY,
+    BEDROCK_THROTTLE_RETRIES,
+)
+from app.mutil_agent.services.service_registry import get_service
+from app.mutil_agent.utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
+
+logger = logging.getLogger(__name__)
+
+# Sentinel marking the end of a pumped stream
+_STREAM_END = object()
+
+
+class BedrockGateway:
+    """Offloads blocking Bedrock calls and streams to a bounded thread pool"""
+
+    def __init__(
+        self,
+        runtime_client=None,
+        knowledgebase_client=None,
+        max_workers: int = 50,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        throttle_retries: int = 3,
+    ):
+        self.runtime_client = runtime_client
+        self.knowledgebase_client = knowledgebase_client
+        self.max_workers = max_workers
+        self.limiter = limiter or AdaptiveConcurrencyLimiter(max_limit=max_workers, name="bedrock")
+        self.throttle_retries = throttle_retries
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="bedrock-gateway"
+        )
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable on the gateway pool and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def invoke(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking Bedrock call under the shared adaptive limiter.
+
+        Throttled attempts shrink the limit and are retried with backoff;
+        successes let it grow back towards BEDROCK_MAX_CONCURRENCY.
+        """
+        return await self.limiter.call(
+            lambda: self.run(func, *args, **kwargs),
+            max_retries=self.throttle_retries,
+        )
+
+    async def iterate(self, make_iterable: Callable[[], Iterable[Any]]) -> AsyncIterator[Any]:
+        """
+        Consume a blocking iterable on the gateway pool and yield its items.
+
+        make_iterable is called on the pool thread, so both opening the stream
+        and reading each event happen off the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def emit(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # Event loop already closed; nobody is listening anymore
+                cancelled.set()
+
+        def pump():
+            try:
+                for item in make_iterable():
+                    if cancelled.is_set():
+                        break
+                    emit(item)
+            except Exception as e:  # Re-raised on the consumer side
+                emit(e)
+            finally:
+                emit(_STREAM_END)
+
+        future = loop.run_in_executor(self._executor, pump)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+            # Surface unexpected pump failures without blocking on cancelled streams
+            if future.done() and not future.cancelled():
+                future.result()
+
+    # Bedrock Agent Runtime (knowledge base)
+
+    async def retrieve_and_generate(self, **kwargs) -> Dict[str, Any]:
+        """Non-blocking bedrock-agent-runtime retrieve_and_generate"""
+        self._require_knowledgebase()
+        return await self.invoke(self.knowledgebase_client.retrieve_and_generate, **kwargs)
+
+    async def retrieve_and_generate_stream(self, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Non-blocking retrieve_and_generate_stream yielding stream events"""
+        self._require_knowledgebase()
+        client = self.knowledgebase_client
+
+        def open_stream():
+            return client.retrieve_and_generate_stream(**kwargs)["stream"]
+
+        async for event in self.iterate(open_stream):
+            yield event
+
+    # Bedrock Runtime
+
+    async def converse(self, **kwargs) -> Dict[str, Any]:
+        """Non-blocking bedrock-runtime converse"""
+        return await self.invoke(self.runtime_client.converse, **kwargs)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Release the gateway thread pool"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _require_knowledgebase(self) -> None:
+        if self.knowledgebase_client is None:
+            raise ValueError("Bedrock knowledge base client is not configured (AWS_KNOWLEDGEBASE_REGION)")
+
+
+_bedrock_gateway: Optional[BedrockGateway] = None
+_bedrock_gateway_lock = threading.Lock()
+
+
+def get_bedrock_gateway() -> BedrockGateway:
+    """
+    Get the process-wide Bedrock gateway
+
+    Returns:
+        BedrockGateway bound to the shared clients from the service registry
+    """
+    global _bedrock_gateway
+    if _bedrock_gateway is None:
+        with _bedrock_gateway_lock:
+            if _bedrock_gateway is None:
+                _bedrock_gateway = BedrockGateway(
+                    runtime_client=get_service("bedrock_runtime"),
+                    knowledgebase_client=get_service("bedrock_knowledgebase"),
+                    max_workers=BEDROCK_MAX_POOL_CONNECTIONS,
+                    limiter=AdaptiveConcurrencyLimiter(
+                        initial_limit=BEDROCK_INITIAL_CONCURRENCY,
+                        min_limit=BEDROCK_MIN_CONCURRENCY,
+                        max_limit=min(BEDROCK_MAX_CONCURRENCY, BEDROCK_MAX_POOL_CONNECTIONS),
+                        name="bedrock",
+                    ),
+                    throttle_retries=BEDROCK_THROTTLE_RETRIES,
+                )
+    return _bedrock_gateway
+
+
+def shutdown_bedrock_gateway() -> None:
+    """Shut down the process-wide gateway (called on application shutdown)"""
+    global _bedrock_gateway
+    with _bedrock_gateway_lock:
+        if _bedrock_gateway is not None:
+            _bedrock_gateway.shutdown()
+            _bedrock_gateway = None
@@ -1,19 +1,33 @@
-from langchain_aws import ChatBedrockConverse
+import asyncio
+import time
+from typing import Optional
 
-from app.mutil_agent.config import BEDROCK_RT
 from app.mutil_agent.interfaces.ai_model_interface import AIModelInterface
+from app.mutil_agent.services.bedrock_gateway import get_bedrock_gateway
+from app.mutil_agent.services.service_registry import get_service
+from app.mutil_agent.utils.llm_usage import get_llm_usage_tracker, langchain_token_usage, resolve_agent
+from app.mutil_agent.utils.tracing import span
 
 
 class BedrockService(AIModelInterface):
     def __init__(
-        self, model_id: str, temperature: float, top_p: float, max_tokens: int
+        self,
+        model_id: str,
+        temperature: float,
+        top_p: float,
+        max_tokens: int,
+        agent: Optional[str] = None,
     ):
         self.model_id = model_id
+        self.agent = agent  # Calling agent, used to attribute token/latency usage
         self.temperature = temperature
         self.top_p = top_p
         self.max_tokens = max_tokens
+        # Imported here: langchain_aws is heavy and only needed once a model is used
+        from langchain_aws import ChatBedrockConverse
+
         self.client = ChatBedrockConverse(
-            client=BEDROCK_RT,
+            client=get_service("bedrock_runtime"),
             model=self.model_id,
             temperature=temperature,
             top_p=top_p,
@@ -40,8 +54,36 @@ class BedrockService(AIModelInterface):
         }
         return user_prompt
 
-    def ai_astream(self, prompt):
-        return self.client.astream(prompt)
+    async def ai_astream(self, prompt):
+        # Stream is consumed on the gateway pool so the event loop never blocks on botocore reads
+        agent = resolve_agent(self.agent)
+        started = time.perf_counter()
+        first_token_at = None
+        input_tokens = output_tokens = 0
+        outcome = "error"
+        try:
+            async with span("bedrock.stream", model_id=self.model_id, agent=agent):
+                async for chunk in get_bedrock_gateway().iterate(lambda: self.client.stream(prompt)):
+                    if first_token_at is None and self.ai_chunk_stream(chunk):
+                        first_token_at = time.perf_counter()
+                    chunk_input, chunk_output = langchain_token_usage(chunk)
+                    input_tokens += chunk_input
+                    output_tokens += chunk_output
+                    yield chunk
+            outcome = "ok"
+        except (GeneratorExit, asyncio.CancelledError):
+            outcome = "cancelled"  # Consumer stopped reading (e.g. client disconnected)
+            raise
+        finally:
+            get_llm_usage_tracker().record(
+                agent,
+                self.model_id,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                latency=time.perf_counter() - started,
+                time_to_first_token=first_token_at - started if first_token_at is not None else None,
+                outcome=outcome,
+            )
 
     def ai_chunk_stream(self, chunk):
         if chunk.content and len(chunk.content) > 0:
@@ -49,4 +91,22 @@ class BedrockService(AIModelInterface):
         return ""
 
     async def ai_ainvoke(self, prompt: str):
-        return await self.client.ainvoke(prompt)
+        agent = resolve_agent(self.agent)
+        started = time.perf_counter()
+        try:
+            async with span("bedrock.invoke", model_id=self.model_id, agent=agent):
+                response = await get_bedrock_gateway().invoke(self.client.invoke, prompt)
+        except Exception:
+            get_llm_usage_tracker().record(
+                agent, self.model_id, latency=time.perf_counter() - started, outcome="error"
+            )
+            raise
+        input_tokens, output_tokens = langchain_token_usage(response)
+        get_llm_usage_tracker().record(
+            agent,
+            self.model_id,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency=time.perf_counter() - started,
+        )
+        return response
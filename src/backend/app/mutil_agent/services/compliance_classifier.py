@@ -0,0 +1,216 @@
+"""
+Compiled Document Classifier
+Built once from ComplianceConfig.DOCUMENT_PATTERNS and rebuilt when patterns change.
+
+The text is lowercased once and every document type is scored from the same
+pass: keywords are deduplicated across types into one index (each unique
+keyword is searched once, then credited to every type that lists it), and
+classification patterns are precompiled case-sensitively for lowercased text
+(re.IGNORECASE is several times slower on Unicode text). Patterns with a
+literal prefix are skipped outright when that prefix does not occur. The
+resulting scores serve both the document type decision and the
+classification confidence, and the matched spans feed prompt compaction.
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from app.mutil_agent.services.compliance_config import ComplianceConfig
+
+logger = logging.getLogger(__name__)
+
+Span = Tuple[int, int]
+
+FALLBACK_DOCUMENT_TYPE = "general_document"
+
+# Regex metacharacters that end a pattern's literal prefix
+_LITERAL_PREFIX = re.compile(r"^[^\\.^$*+?{}\[\]|()]+")
+_MIN_GATE_PREFIX = 3
+
+
+def compile_for_lowercase(pattern: str) -> Pattern:
+    """
+    Compile pattern to run on already-lowercased text without re.IGNORECASE
+
+    Uppercase literals and class ranges are lowercased; escape sequences
+    (\\S, \\W, \\D, ...) are left untouched since their case is meaningful.
+    """
+    out = []
+    escaped = False
+    for ch in pattern:
+        if escaped:
+            out.append(ch)
+            escaped = False
+        elif ch == "\\":
+            out.append(ch)
+            escaped = True
+        else:
+            out.append(ch.lower())
+    return re.compile("".join(out))
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    escaped = in_class = False
+    for ch in pattern:
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return True
+    return False
+
+
+def literal_prefix(pattern: str) -> Optional[str]:
+    """Leading literal text every match of pattern must start with, if long enough to gate on"""
+    if _has_top_level_alternation(pattern):
+        return None
+    match = _LITERAL_PREFIX.match(pattern)
+    if not match:
+        return None
+    prefix = match.group(0)
+    # A quantifier applies to the last literal char, which is then optional
+    rest = pattern[len(prefix):]
+    if rest[:1] in ("*", "?", "{"):
+        prefix = prefix[:-1]
+    prefix = prefix.lower()
+    return prefix if len(prefix) >= _MIN_GATE_PREFIX else None
+
+
+@dataclass
+class _DocumentTypeRules:
+    doc_type: str
+    patterns: Tuple[Tuple[Optional[str], Pattern], ...]  # (literal gate, compiled pattern)
+    weight: float
+
+
+@dataclass
+class ClassificationResult:
+    """Scores from one pass over a document"""
+    document_type: str
+    scores: Dict[str, float] = field(default_factory=dict)
+    keyword_matches: Dict[str, int] = field(default_factory=dict)
+    pattern_matches: Dict[str, int] = field(default_factory=dict)
+    possible_matches: Dict[str, int] = field(default_factory=dict)
+    match_spans: Dict[str, List[Span]] = field(default_factory=dict)  # Keyword/pattern hits per type
+
+    def spans_for(self, document_type: str) -> List[Span]:
+        """Character ranges of the keywords and patterns that matched for a type"""
+        return self.match_spans.get(document_type, [])
+
+    def confidence_for(self, document_type: str) -> float:
+        """Share of a type's keywords/patterns found in the text (capped at 1.0)"""
+        total_possible = self.possible_matches.get(document_type)
+        if not total_possible:
+            return 0.5
+        actual = self.keyword_matches.get(document_type, 0) + self.pattern_matches.get(document_type, 0)
+        return round(min(actual / total_possible, 1.0), 2)
+
+    @property
+    def confidence(self) -> float:
+        """Confidence of the chosen document type"""
+        return self.confidence_for(self.document_type)
+
+
+class DocumentClassifier:
+    """Document type classifier compiled from a DOCUMENT_PATTERNS mapping"""
+
+    KEYWORD_SCORE = 1
+    PATTERN_SCORE = 2  # Patterns have higher weight
+
+    def __init__(self, document_patterns: Dict[str, Dict]):
+        self._rules: List[_DocumentTypeRules] = []
+        keyword_owners: Dict[str, List[str]] = {}
+
+        for doc_type, config in document_patterns.items():
+            keywords = tuple(k.lower() for k in config.get("keywords", []))
+            patterns = tuple((literal_prefix(p), compile_for_lowercase(p)) for p in config.get("patterns", []))
+            self._rules.append(_DocumentTypeRules(
+                doc_type=doc_type,
+                patterns=patterns,
+                weight=config.get("weight", 1.0),
+            ))
+            for keyword in keywords:
+                keyword_owners.setdefault(keyword, []).append(doc_type)
+
+        self._keyword_owners = keyword_owners
+        # Matches the original per-type denominator (duplicates included)
+        self._possible = {
+            doc_type: len(config.get("keywords", [])) + len(config.get("patterns", []))
+            for doc_type, config in document_patterns.items()
+        }
+
+    def classify(self, text: str) -> ClassificationResult:
+        """Score every document type in one pass over text"""
+        text_lower = text.lower()
+
+        keyword_matches: Dict[str, int] = {}
+        match_spans: Dict[str, List[Span]] = {}
+        for keyword, owners in self._keyword_owners.items():
+            position = text_lower.find(keyword)
+            if position >= 0:
+                span = (position, position + len(keyword))
+                for doc_type in owners:
+                    keyword_matches[doc_type] = keyword_matches.get(doc_type, 0) + 1
+                    match_spans.setdefault(doc_type, []).append(span)
+
+        pattern_matches: Dict[str, int] = {}
+        scores: Dict[str, float] = {}
+        for rules in self._rules:
+            spans = [
+                match.span()
+                for gate, pattern in rules.patterns
+                if gate is None or gate in text_lower
+                for match in pattern.finditer(text_lower)
+            ]
+            if spans:
+                match_spans.setdefault(rules.doc_type, []).extend(spans)
+            matches = len(spans)
+            pattern_matches[rules.doc_type] = matches
+            score = keyword_matches.get(rules.doc_type, 0) * self.KEYWORD_SCORE + matches * self.PATTERN_SCORE
+            if score > 0:
+                scores[rules.doc_type] = score * rules.weight
+
+        document_type = max(scores.items(), key=lambda x: x[1])[0] if scores else FALLBACK_DOCUMENT_TYPE
+        return ClassificationResult(
+            document_type=document_type,
+            scores=scores,
+            keyword_matches=keyword_matches,
+            pattern_matches=pattern_matches,
+            possible_matches=self._possible,
+            match_spans=match_spans,
+        )
+
+
+_classifier: Optional[DocumentClassifier] = None
+_classifier_version: Optional[int] = None
+_classifier_lock = threading.Lock()
+
+
+def get_document_classifier() -> DocumentClassifier:
+    """
+    Get the classifier for the current ComplianceConfig.DOCUMENT_PATTERNS
+
+    Rebuilt automatically after ComplianceConfig.add_document_pattern().
+    """
+    global _classifier, _classifier_version
+    version = ComplianceConfig.DOCUMENT_PATTERNS_VERSION
+    if _classifier is None or _classifier_version != version:
+        with _classifier_lock:
+            if _classifier is None or _classifier_version != version:
+                _classifier = DocumentClassifier(ComplianceConfig.DOCUMENT_PATTERNS)
+                _classifier_version = version
+                logger.info(f"Compiled document classifier for {len(ComplianceConfig.DOCUMENT_PATTERNS)} document types")
+    return _classifier
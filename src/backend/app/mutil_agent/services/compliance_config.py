@@ -41,6 +41,9 @@ class ComplianceConfig:
         """Get UCP article reference for violation type"""
         return self.UCP_ARTICLE_REFERENCES.get(violation_type, 'UCP 600 - General Compliance')
     
+    # Bumped by add_document_pattern so compiled classifiers know to rebuild
+    DOCUMENT_PATTERNS_VERSION = 0
+
     # Document classification patterns - easily extensible
     DOCUMENT_PATTERNS = {
         "balance_sheet": {
@@ -216,6 +219,9 @@ class ComplianceConfig:
         }
     }
 
+    # Bumped by add_field_pattern so compiled extraction engines know to rebuild
+    FIELD_PATTERNS_VERSION = 0
+
     # Field extraction patterns - common across document types
     FIELD_PATTERNS = {
         "dates": [
@@ -329,6 +335,17 @@ class ComplianceConfig:
             "buyer": [
                 r'(to|buyer|người\s*mua)[:\s]*([^,\n]+)',
                 r'(importer|nhập\s*khẩu)[:\s]*([^,\n]+)'
+            ],
+            "consignee": [
+                r'(consignee|người\s*nhận\s*hàng)[:\s]*([^,\n]+)'
+            ]
+        },
+        "bill_of_lading": {
+            "shipper": [
+                r'(shipper|người\s*gửi\s*hàng)[:\s]*([^,\n]+)'
+            ],
+            "consignee": [
+                r'(consignee|người\s*nhận\s*hàng)[:\s]*([^,\n]+)'
             ]
         },
         "letter_of_credit": {
@@ -472,6 +489,7 @@ class ComplianceConfig:
             "patterns": patterns,
             "weight": weight
         }
+        cls.DOCUMENT_PATTERNS_VERSION += 1
 
     @classmethod
     def add_field_pattern(cls, field_type: str, patterns: List[str]):
@@ -479,3 +497,4 @@ class ComplianceConfig:
         if field_type not in cls.FIELD_PATTERNS:
             cls.FIELD_PATTERNS[field_type] = []
         cls.FIELD_PATTERNS[field_type].extend(patterns)
+        cls.FIELD_PATTERNS_VERSION += 1
@@ -0,0 +1,407 @@
+"""
+Presentation-level Consistency Engine
+Cross-document UCP 600 checks over the extracted_fields of every document in a presentation.
+
+UCP 600 discrepancies are mostly cross-document (Article 14(d): data must not
+conflict with data in any other stipulated document or the credit). The
+fields of all documents are indexed once (amounts, dates and references are
+parsed a single time) and every rule reads the index, so a presentation is
+checked in one pass without an LLM call.
+
+Each check ends as PASS, DISCREPANCY, AMBIGUOUS or NOT_APPLICABLE. Only the
+AMBIGUOUS ones (e.g. party names that overlap but differ, amounts inside the
+Article 30 "about" tolerance) need an LLM to decide.
+"""
+
+import logging
+import re
+import unicodedata
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PASS = "PASS"
+DISCREPANCY = "DISCREPANCY"
+AMBIGUOUS = "AMBIGUOUS"
+NOT_APPLICABLE = "NOT_APPLICABLE"
+
+# UCP 600 Article 30(a): "about"/"approximately" allows 10% more
+ABOUT_TOLERANCE = Decimal("0.10")
+# UCP 600 Article 28(f)(ii): insurance at least 110% of the CIF/CIP value
+MIN_INSURANCE_COVERAGE = Decimal("1.10")
+
+_CURRENCY_ALIASES = {
+    "usd": "USD", "$": "USD", "vnd": "VND", "đồng": "VND", "dong": "VND",
+    "eur": "EUR", "jpy": "JPY", "gbp": "GBP",
+}
+_MULTIPLIERS = {
+    "triệu": Decimal(10) ** 6, "million": Decimal(10) ** 6,
+    "tỷ": Decimal(10) ** 9, "billion": Decimal(10) ** 9,
+}
+_AMOUNT_NUMBER = re.compile(r"\d[\d,.]*")
+_AMOUNT_WORD = re.compile(r"[^\W\d_]+|\$")
+_LC_LABEL = re.compile(r"^(l/c|letter\s*of\s*credit|tín\s*dụng\s*thư)\s*:", re.IGNORECASE)
+_NON_WORD = re.compile(r"[^\w]+")
+
+# Dropped before comparing party names
+_NAME_STOPWORDS = {
+    "co", "company", "corp", "corporation", "ltd", "limited", "inc", "jsc", "llc", "plc",
+    "công", "ty", "tnhh", "cổ", "phần", "cp", "the", "of", "and",
+}
+# Consignee made out to order: no named party to compare (UCP 600 Article 20)
+_TO_ORDER = re.compile(r"\bto\s+(the\s+)?order\b|theo\s+lệnh", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Amount:
+    value: Decimal
+    currency: Optional[str]
+    ambiguous: bool = False  # A lone separator before 3 digits: read as thousands, may be a decimal mark
+
+
+def parse_amount(raw: str) -> Optional[Amount]:
+    """
+    Parse an extracted amount such as "USD 10,000.50", "EUR 1.234,56", "5 triệu VND" or "1.200.000 đồng"
+
+    When both "," and "." appear the last one is the decimal mark; a single
+    separator kind is a thousands separator when repeated or followed by
+    exactly 3 digits (whatever the currency), a decimal mark otherwise. A
+    lone separator before 3 digits ("USD 1.500") marks the amount ambiguous.
+    """
+    number = _AMOUNT_NUMBER.search(raw)
+    if not number:
+        return None
+    currency = None
+    multiplier = Decimal(1)
+    for word in _AMOUNT_WORD.findall(raw.lower()):
+        if word in _MULTIPLIERS:
+            multiplier = _MULTIPLIERS[word]
+        elif word in _CURRENCY_ALIASES and currency is None:
+            currency = _CURRENCY_ALIASES[word]
+
+    digits = number.group(0).rstrip(".,")
+    separators = [c for c in digits if c in ".,"]
+    ambiguous = False
+    if len(set(separators)) == 2:
+        # Both in use: the last one is the decimal mark (10,000.50 / 12.500,00)
+        decimal_mark = separators[-1]
+        digits = digits.replace("," if decimal_mark == "." else ".", "").replace(decimal_mark, ".")
+    elif len(separators) > 1 or (separators and len(digits.rsplit(separators[0], 1)[1]) == 3):
+        # Repeated, or followed by exactly 3 digits: thousands (1.200.000 đồng, USD 100.000, 1,500)
+        ambiguous = len(separators) == 1
+        digits = digits.replace(".", "").replace(",", "")
+    elif separators:
+        # Decimal mark: 2,5 tỷ, USD 10.50
+        digits = digits.replace(",", ".")
+    try:
+        value = Decimal(digits) * multiplier
+    except InvalidOperation:
+        return None
+    return Amount(value=value, currency=currency, ambiguous=ambiguous)
+
+
+def parse_date(raw: str) -> Optional[date]:
+    """Parse an extracted date ("D/M/YYYY" or "YYYY/M/D", as produced by field extraction)"""
+    parts = [p for p in re.split(r"[/\-.\s]+", raw.strip()) if p.isdigit()]
+    if len(parts) < 3:
+        return None
+    try:
+        if len(parts[0]) == 4:
+            return date(int(parts[0]), int(parts[1]), int(parts[2]))
+        return date(int(parts[2]), int(parts[1]), int(parts[0]))
+    except ValueError:
+        return None
+
+
+def normalize_party(name: str) -> Tuple[str, ...]:
+    """Significant tokens of a party name (case, accents form, punctuation and legal suffixes ignored)"""
+    text = unicodedata.normalize("NFC", name).casefold()
+    return tuple(t for t in _NON_WORD.sub(" ", text).split() if t not in _NAME_STOPWORDS)
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value if v]
+    return [str(value)] if value else []
+
+
+@dataclass
+class IndexedDocument:
+    document_id: str
+    document_type: str
+    fields: Dict[str, Any]
+    amounts: List[Amount] = field(default_factory=list)
+    dates: List[date] = field(default_factory=list)
+    lc_numbers: List[str] = field(default_factory=list)
+
+    def text_field(self, name: str) -> Optional[str]:
+        values = _as_list(self.fields.get(name))
+        return values[0].strip() if values else None
+
+    def max_amount(self, currency: Optional[str] = None) -> Optional[Amount]:
+        candidates = [a for a in self.amounts if currency is None or a.currency == currency]
+        return max(candidates, key=lambda a: a.value) if candidates else None
+
+    @property
+    def currencies(self) -> List[str]:
+        return sorted({a.currency for a in self.amounts if a.currency})
+
+
+class PresentationIndex:
+    """extracted_fields of every document in a presentation, parsed once and grouped by document type"""
+
+    def __init__(self, documents: List[Dict[str, Any]]):
+        """
+        Args:
+            documents: Dicts with document_id, document_type and extracted_fields
+                (e.g. per-document results of validate_document_compliance)
+        """
+        self.documents: List[IndexedDocument] = []
+        self._by_type: Dict[str, List[IndexedDocument]] = {}
+
+        for position, document in enumerate(documents):
+            fields = document.get("extracted_fields") or {}
+            indexed = IndexedDocument(
+                document_id=str(document.get("document_id", position)),
+                document_type=document.get("document_type") or "unknown",
+                fields=fields,
+                amounts=[a for a in map(parse_amount, _as_list(fields.get("amounts"))) if a],
+                dates=[d for d in map(parse_date, _as_list(fields.get("dates"))) if d],
+                lc_numbers=[
+                    _LC_LABEL.sub("", ref).strip().upper()
+                    for ref in _as_list(fields.get("reference_numbers"))
+                    if _LC_LABEL.match(ref)
+                ],
+            )
+            self.documents.append(indexed)
+            self._by_type.setdefault(indexed.document_type, []).append(indexed)
+
+    def of_type(self, document_type: str) -> List[IndexedDocument]:
+        return self._by_type.get(document_type, [])
+
+    def first(self, document_type: str) -> Optional[IndexedDocument]:
+        documents = self.of_type(document_type)
+        return documents[0] if documents else None
+
+
+@dataclass
+class ConsistencyCheck:
+    """Outcome of one cross-document rule"""
+    rule: str
+    status: str
+    description: str
+    regulation_reference: str
+    severity: str = "MEDIUM"
+    documents: List[str] = field(default_factory=list)
+    values: Dict[str, Any] = field(default_factory=dict)
+    resolved_by: str = "rules"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+Rule = Callable[[PresentationIndex], List[ConsistencyCheck]]
+
+
+def _compare_parties(rule: str, reference: str, severity: str,
+                     left: Tuple[IndexedDocument, str, str],
+                     right: Tuple[IndexedDocument, str, str]) -> ConsistencyCheck:
+    """Same party on two documents: exact/contained names pass, anything else needs judgement"""
+    (left_doc, left_field, left_name), (right_doc, right_field, right_name) = left, right
+    left_tokens, right_tokens = set(normalize_party(left_name)), set(normalize_party(right_name))
+    values = {
+        f"{left_doc.document_id}.{left_field}": left_name,
+        f"{right_doc.document_id}.{right_field}": right_name,
+    }
+    documents = [left_doc.document_id, right_doc.document_id]
+
+    if left_tokens and right_tokens and (left_tokens <= right_tokens or right_tokens <= left_tokens):
+        return ConsistencyCheck(rule, PASS, f"{left_field} và {right_field} khớp nhau", reference, severity, documents, values)
+    return ConsistencyCheck(
+        rule, AMBIGUOUS,
+        f"{left_field} ({left_name}) và {right_field} ({right_name}) khác nhau, cần xác định có mâu thuẫn hay không",
+        reference, severity, documents, values,
+    )
+
+
+def check_lc_reference(index: PresentationIndex) -> List[ConsistencyCheck]:
+    """Every document that quotes an L/C number quotes the same one"""
+    quoted = {doc.document_id: sorted(set(doc.lc_numbers)) for doc in index.documents if doc.lc_numbers}
+    numbers = sorted({number for doc_numbers in quoted.values() for number in doc_numbers})
+    reference = "UCP 600 Article 14(d) - Data Consistency"
+    if not numbers:
+        return [ConsistencyCheck("lc_reference", NOT_APPLICABLE, "Không tìm thấy số L/C trong các chứng từ", reference)]
+    if len(numbers) == 1:
+        return [ConsistencyCheck("lc_reference", PASS, f"Các chứng từ cùng tham chiếu L/C {numbers[0]}", reference,
+                                 "HIGH", list(quoted), {"lc_numbers": numbers})]
+    return [ConsistencyCheck("lc_reference", DISCREPANCY,
+                             f"Các chứng từ tham chiếu nhiều số L/C khác nhau: {', '.join(numbers)}",
+                             reference, "HIGH", list(quoted), quoted)]
+
+
+def check_invoice_against_credit(index: PresentationIndex) -> List[ConsistencyCheck]:
+    """Invoice currency equals the credit currency and its amount stays within the credit amount"""
+    credit = index.first("letter_of_credit")
+    invoices = index.of_type("commercial_invoice")
+    if not credit or not invoices or not credit.currencies:
+        return [ConsistencyCheck("invoice_amount", NOT_APPLICABLE, "Thiếu L/C hoặc hóa đơn có số tiền để đối chiếu",
+                                 "UCP 600 Article 18(b) - Commercial Invoice")]
+
+    checks = []
+    for invoice in invoices:
+        documents = [credit.document_id, invoice.document_id]
+        shared = [c for c in invoice.currencies if c in credit.currencies]
+        if invoice.currencies and not shared:
+            checks.append(ConsistencyCheck(
+                "invoice_currency", DISCREPANCY,
+                f"Hóa đơn lập bằng {', '.join(invoice.currencies)}, L/C bằng {', '.join(credit.currencies)}",
+                "UCP 600 Article 18(a)(iii) - Commercial Invoice", "HIGH", documents,
+                {"invoice_currencies": invoice.currencies, "credit_currencies": credit.currencies},
+            ))
+            continue
+        if not shared:
+            continue
+
+        currency = shared[0]
+        invoice_amount, credit_amount = invoice.max_amount(currency), credit.max_amount(currency)
+        values = {"currency": currency, "invoice_amount": str(invoice_amount.value), "credit_amount": str(credit_amount.value)}
+        reference = "UCP 600 Article 18(b) - Commercial Invoice"
+        if invoice_amount.value <= credit_amount.value:
+            checks.append(ConsistencyCheck("invoice_amount", PASS, "Số tiền hóa đơn không vượt quá số tiền L/C",
+                                           reference, "HIGH", documents, values))
+        elif invoice_amount.value <= credit_amount.value * (1 + ABOUT_TOLERANCE):
+            checks.append(ConsistencyCheck(
+                "invoice_amount", AMBIGUOUS,
+                "Số tiền hóa đơn vượt số tiền L/C nhưng nằm trong dung sai 10% (chỉ hợp lệ nếu L/C ghi 'about'/'approximately')",
+                "UCP 600 Article 30(a) - Tolerance in Credit Amount", "HIGH", documents, values,
+            ))
+        else:
+            checks.append(ConsistencyCheck("invoice_amount", DISCREPANCY,
+                                           f"Số tiền hóa đơn {invoice_amount.value} {currency} vượt quá số tiền L/C {credit_amount.value} {currency}",
+                                           reference, "HIGH", documents, values))
+    return checks
+
+
+def check_invoice_parties(index: PresentationIndex) -> List[ConsistencyCheck]:
+    """Invoice issued by the beneficiary and made out in the name of the applicant"""
+    credit = index.first("letter_of_credit")
+    if not credit:
+        return []
+    checks = []
+    for invoice in index.of_type("commercial_invoice"):
+        for rule, invoice_field, credit_field, reference in (
+            ("invoice_seller", "seller", "beneficiary", "UCP 600 Article 18(a)(i) - Commercial Invoice"),
+            ("invoice_buyer", "buyer", "applicant", "UCP 600 Article 18(a)(ii) - Commercial Invoice"),
+        ):
+            invoice_name, credit_name = invoice.text_field(invoice_field), credit.text_field(credit_field)
+            if invoice_name and credit_name:
+                checks.append(_compare_parties(rule, reference, "HIGH",
+                                               (invoice, invoice_field, invoice_name),
+                                               (credit, credit_field, credit_name)))
+    return checks
+
+
+def check_consignee(index: PresentationIndex) -> List[ConsistencyCheck]:
+    """Named B/L consignee matches the invoice consignee (or buyer)"""
+    checks = []
+    invoice = index.first("commercial_invoice")
+    if not invoice:
+        return checks
+    invoice_field = "consignee" if invoice.text_field("consignee") else "buyer"
+    invoice_name = invoice.text_field(invoice_field)
+    for bill in index.of_type("bill_of_lading"):
+        consignee = bill.text_field("consignee")
+        if not consignee or not invoice_name:
+            continue
+        reference = "UCP 600 Article 14(d) - Data Consistency"
+        if _TO_ORDER.search(consignee):
+            checks.append(ConsistencyCheck("consignee", PASS, "Vận đơn lập theo lệnh (to order)", reference,
+                                           documents=[bill.document_id], values={"consignee": consignee}))
+            continue
+        checks.append(_compare_parties("consignee", reference, "MEDIUM",
+                                       (bill, "consignee", consignee), (invoice, invoice_field, invoice_name)))
+    return checks
+
+
+def check_insurance_coverage(index: PresentationIndex) -> List[ConsistencyCheck]:
+    """Insurance covers at least 110% of the invoice value in the same currency"""
+    invoice = index.first("commercial_invoice")
+    checks = []
+    for insurance in index.of_type("insurance_certificate"):
+        if not invoice:
+            break
+        shared = [c for c in insurance.currencies if c in invoice.currencies]
+        if not shared:
+            continue
+        currency = shared[0]
+        insured, invoiced = insurance.max_amount(currency).value, invoice.max_amount(currency).value
+        values = {"currency": currency, "insured_amount": str(insured), "invoice_amount": str(invoiced)}
+        documents = [insurance.document_id, invoice.document_id]
+        reference = "UCP 600 Article 28(f)(ii) - Insurance Document"
+        if insured >= invoiced * MIN_INSURANCE_COVERAGE:
+            checks.append(ConsistencyCheck("insurance_coverage", PASS, "Số tiền bảo hiểm tối thiểu 110% giá trị hóa đơn",
+                                           reference, "HIGH", documents, values))
+        elif insured >= invoiced:
+            checks.append(ConsistencyCheck(
+                "insurance_coverage", AMBIGUOUS,
+                "Số tiền bảo hiểm dưới 110% giá trị hóa đơn (chỉ hợp lệ nếu L/C quy định khác hoặc giá trị hóa đơn không phải CIF/CIP)",
+                reference, "HIGH", documents, values,
+            ))
+        else:
+            checks.append(ConsistencyCheck("insurance_coverage", DISCREPANCY,
+                                           f"Số tiền bảo hiểm {insured} {currency} thấp hơn giá trị hóa đơn {invoiced} {currency}",
+                                           reference, "HIGH", documents, values))
+    return checks
+
+
+def check_dates_within_credit(index: PresentationIndex) -> List[ConsistencyCheck]:
+    """No document is dated after the latest date stated in the credit (normally its expiry)"""
+    credit = index.first("letter_of_credit")
+    if not credit or not credit.dates:
+        return []
+    latest = max(credit.dates)
+    late = {
+        doc.document_id: max(doc.dates).isoformat()
+        for doc in index.documents
+        if doc is not credit and doc.dates and max(doc.dates) > latest
+    }
+    reference = "UCP 600 Article 6(d) / 14(c) - Expiry Date and Presentation"
+    if not late:
+        return [ConsistencyCheck("document_dates", PASS, "Ngày của các chứng từ không sau ngày cuối cùng trên L/C",
+                                 reference, documents=[doc.document_id for doc in index.documents],
+                                 values={"credit_latest_date": latest.isoformat()})]
+    # The latest extracted L/C date may be the shipment deadline rather than the expiry
+    return [ConsistencyCheck("document_dates", AMBIGUOUS,
+                             f"Chứng từ có ngày sau ngày {latest.isoformat()} trên L/C, cần xác định đó là ngày hết hạn hay hạn giao hàng",
+                             reference, documents=list(late), values={"credit_latest_date": latest.isoformat(), "late_documents": late})]
+
+
+DEFAULT_RULES: Tuple[Rule, ...] = (
+    check_lc_reference,
+    check_invoice_against_credit,
+    check_invoice_parties,
+    check_consignee,
+    check_insurance_coverage,
+    check_dates_within_credit,
+)
+
+
+class ConsistencyEngine:
+    """Runs cross-document rules over a PresentationIndex"""
+
+    def __init__(self, rules: Tuple[Rule, ...] = DEFAULT_RULES):
+        self.rules = rules
+
+    def evaluate(self, index: PresentationIndex) -> List[ConsistencyCheck]:
+        checks = []
+        for rule in self.rules:
+            try:
+                checks.extend(rule(index))
+            except Exception as e:
+                logger.error(f"Consistency rule {rule.__name__} failed: {e}")
+        return checks
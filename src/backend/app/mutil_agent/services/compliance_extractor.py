@@ -0,0 +1,230 @@
+"""
+Compiled Field Extraction Engine
+Compiles ComplianceConfig.FIELD_PATTERNS and DOCUMENT_SPECIFIC_FIELDS once per document type.
+
+Results are identical to running each pattern with re.findall / re.search
+and re.IGNORECASE over the original text, at a fraction of the cost:
+- the text is lowercased once and patterns are case-folded and compiled
+  without re.IGNORECASE, which is several times slower on Unicode text;
+  values are sliced from the original text so their case is preserved
+- every pattern is gated on literals that any match must contain (taken
+  from the parsed regex), so patterns whose anchors such as "triệu",
+  "l/c" or "người thụ hưởng" do not occur are never scanned
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+from app.mutil_agent.services.compliance_classifier import compile_for_lowercase
+from app.mutil_agent.services.compliance_config import ComplianceConfig
+
+logger = logging.getLogger(__name__)
+
+MAX_VALUES_PER_FIELD = 5
+
+_REPEAT_OPS = {
+    op for op in (
+        sre_constants.MAX_REPEAT,
+        sre_constants.MIN_REPEAT,
+        getattr(sre_constants, "POSSESSIVE_REPEAT", None),
+    ) if op is not None
+}
+
+
+def _sequence_literals(items) -> Optional[Tuple[str, ...]]:
+    """Literal alternatives one of which every match of a parsed sequence contains"""
+    candidates = []
+    run: List[str] = []
+
+    def flush():
+        if run:
+            candidates.append(("".join(run),))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+        required = None
+        if op is sre_constants.SUBPATTERN:
+            required = _sequence_literals(av[-1])
+        elif op in _REPEAT_OPS and av[0] >= 1:
+            required = _sequence_literals(av[2])
+        elif op is sre_constants.BRANCH:
+            alternatives = [_sequence_literals(branch) for branch in av[1]]
+            if all(alternatives):
+                required = tuple(literal for alternative in alternatives for literal in alternative)
+        if required:
+            candidates.append(required)
+    flush()
+
+    if not candidates:
+        return None
+    return max(candidates, key=lambda literals: min(len(literal) for literal in literals))
+
+
+def required_literals(pattern: str, min_length: int = 2) -> Optional[Tuple[str, ...]]:
+    """
+    Literals (one of which must occur) for gating a case-folded pattern
+
+    Returns None when no useful gate exists or the pattern cannot be parsed.
+    """
+    try:
+        literals = _sequence_literals(sre_parse.parse(pattern).data)
+    except Exception:
+        return None
+    if not literals or min(len(literal) for literal in literals) < min_length:
+        return None
+    return literals
+
+
+@dataclass
+class _FieldPattern:
+    field: str
+    regex: Pattern  # Case-folded, compiled without re.IGNORECASE
+    gate: Optional[Tuple[str, ...]]  # At least one must occur in the text for a match
+
+    def may_match(self, haystack: str) -> bool:
+        return self.gate is None or any(literal in haystack for literal in self.gate)
+
+
+class FieldExtractionEngine:
+    """Extracts all configured fields for one document type"""
+
+    def __init__(self, field_patterns: Dict[str, List[str]], specific_fields: Dict[str, List[str]]):
+        self._common = {
+            field: [self._compile(field, pattern) for pattern in patterns]
+            for field, patterns in field_patterns.items()
+        }
+        self._specific = {
+            field: [self._compile(field, pattern) for pattern in patterns]
+            for field, patterns in specific_fields.items()
+        }
+
+    @staticmethod
+    def _compile(field: str, pattern: str) -> _FieldPattern:
+        regex = compile_for_lowercase(pattern)
+        return _FieldPattern(field=field, regex=regex, gate=required_literals(regex.pattern))
+
+    def extract(self, text: str, spans: Optional[List[Tuple[int, int]]] = None) -> Dict[str, Any]:
+        """
+        Extract common and document-specific fields from text
+
+        Args:
+            text: Document text
+            spans: If given, receives the character range of every match a value came from
+        """
+        haystack = text.lower()
+        if len(haystack) != len(text):
+            # Lowercasing changed offsets (rare Unicode); values come from the folded text
+            text = haystack
+
+        fields: Dict[str, Any] = {}
+
+        # Common fields: every match of every pattern, in pattern order
+        for field, patterns in self._common.items():
+            values = []
+            for field_pattern in patterns:
+                if not field_pattern.may_match(haystack):
+                    continue
+                for match in field_pattern.regex.finditer(haystack):
+                    value = self._format_common_value(field, match, text)
+                    if value is not None:
+                        values.append(value)
+                        if spans is not None:
+                            spans.append(match.span())
+            if values:
+                fields[field] = list(dict.fromkeys(values))[:MAX_VALUES_PER_FIELD]
+
+        # Document-specific fields: first pattern that yields a value
+        for field, patterns in self._specific.items():
+            for field_pattern in patterns:
+                if not field_pattern.may_match(haystack):
+                    continue
+                match = field_pattern.regex.search(haystack)
+                if match:
+                    value = self._specific_value(match, text)
+                    if value:
+                        fields[field] = value
+                        if spans is not None:
+                            spans.append(match.span())
+                        break
+
+        return fields
+
+    @staticmethod
+    def _groups(match: re.Match, text: str) -> Tuple[str, ...]:
+        """Match groups sliced from the original-case text ('' for groups that did not participate)"""
+        return tuple(
+            text[match.start(i):match.end(i)] if match.start(i) >= 0 else ""
+            for i in range(1, (match.re.groups or 0) + 1)
+        )
+
+    @classmethod
+    def _format_common_value(cls, field: str, match: re.Match, text: str) -> Optional[str]:
+        """Same value shapes as re.findall tuples in the original extractor"""
+        groups = cls._groups(match, text)
+        if len(groups) == 0:
+            return text[match.start():match.end()].strip()
+        if len(groups) == 1:
+            return groups[0].strip()
+
+        if field == "dates":
+            # Reconstruct date from tuple
+            date_parts = [x for x in groups if x.isdigit()]
+            return '/'.join(date_parts[:3]) if len(date_parts) >= 3 else None
+        if field == "amounts":
+            # Reconstruct amount from tuple
+            return ' '.join(x for x in groups if x.strip())
+        if field == "reference_numbers":
+            # Take the actual number part
+            return f"{groups[0].strip()}: {groups[1].strip()}"
+        return None
+
+    @classmethod
+    def _specific_value(cls, match: re.Match, text: str) -> str:
+        """Last group (actual content), or the whole match when the pattern has no groups"""
+        groups = cls._groups(match, text)
+        if groups:
+            return groups[-1].strip()
+        return text[match.start():match.end()].strip()
+
+
+_engines: Dict[str, FieldExtractionEngine] = {}
+_engines_version: Optional[int] = None
+_engines_lock = threading.Lock()
+
+
+def get_field_extraction_engine(document_type: str) -> FieldExtractionEngine:
+    """
+    Get the compiled extraction engine for a document type
+
+    Engines are rebuilt after ComplianceConfig.add_field_pattern().
+    """
+    global _engines_version
+    version = ComplianceConfig.FIELD_PATTERNS_VERSION
+    engine = _engines.get(document_type) if _engines_version == version else None
+    if engine is None:
+        with _engines_lock:
+            if _engines_version != version:
+                _engines.clear()
+                _engines_version = version
+            engine = _engines.get(document_type)
+            if engine is None:
+                engine = FieldExtractionEngine(
+                    ComplianceConfig.FIELD_PATTERNS,
+                    ComplianceConfig.DOCUMENT_SPECIFIC_FIELDS.get(document_type, {}),
+                )
+                _engines[document_type] = engine
+                logger.info(f"Compiled field extraction engine for '{document_type}'")
+    return engine
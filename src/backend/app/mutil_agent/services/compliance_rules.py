@@ -0,0 +1,526 @@
+"""
+Deterministic UCP 600 Pre-screen
+Mandatory-field, date-window and amount-tolerance rules evaluated locally before LLM validation.
+
+Every rule ends as PASS, FAIL, UNRESOLVED or NOT_APPLICABLE and records the
+text spans it looked at. A rule only fails on unambiguous evidence: a
+mandatory element missing only by its label, a value the extractor missed in a
+text that has numbers, a date readable as D/M or M/D, or an amount whose
+separators or label are unclear, stays UNRESOLVED. When a HIGH severity rule
+fails (no amount at all, a document dated in the future, a labelled invoice total over
+the credit amount plus tolerance, ...) or nothing recognizable was found, the
+outcome is certain and no LLM call is needed. Otherwise only the unresolved rules, the
+judgement checks for the document type and the evidence spans (for prompt
+compaction) are sent.
+"""
+
+import itertools
+import logging
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from app.mutil_agent.services.compliance_consistency import ABOUT_TOLERANCE, MIN_INSURANCE_COVERAGE, parse_amount
+
+logger = logging.getLogger(__name__)
+
+PASS = "PASS"
+FAIL = "FAIL"
+UNRESOLVED = "UNRESOLVED"
+NOT_APPLICABLE = "NOT_APPLICABLE"
+
+
+def _rx(pattern: str) -> Pattern:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+# ---------------------------------------------------------------------------
+# Dates
+# ---------------------------------------------------------------------------
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_DATE_VALUE = (
+    r"(\d{1,2}[/.\-]\d{1,2}[/.\-]\d{4}"
+    r"|\d{4}[/.\-]\d{1,2}[/.\-]\d{1,2}"
+    r"|\d{1,2}(?:st|nd|rd|th)?\s+[a-z]{3,9}\.?,?\s+\d{4}"
+    r"|[a-z]{3,9}\.?\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}"
+    r"|ngày\s+\d{1,2}\s+tháng\s+\d{1,2}\s+năm\s+\d{4})"
+)
+# Label, then up to 30 non-digit characters (": ", " of the credit is ", ...), then the date
+_LABEL_GAP = r"[^\d\n]{0,30}?"
+
+DATE_LABELS = {
+    "issue_date": r"date\s*of\s*issue|issu(?:e|ing|ance)\s*date|invoice\s*date|date\s*of\s*invoice|ngày\s*(?:phát\s*hành|lập|mở)",
+    "expiry_date": r"expiry\s*date|date\s*of\s*expiry|expir(?:y|es|ation)|hết\s*hạn|hiệu\s*lực\s*đến",
+    "latest_shipment": r"latest\s*(?:date\s*of\s*)?shipment|giao\s*hàng\s*chậm\s*nhất|hạn\s*giao\s*hàng",
+    "shipment_date": r"shipped\s*on\s*board|on\s*board\s*date|date\s*of\s*shipment|shipment\s*date|ngày\s*(?:xếp|giao)\s*hàng",
+}
+_LABELED_DATES = {name: _rx(rf"(?:{label}){_LABEL_GAP}{_DATE_VALUE}") for name, label in DATE_LABELS.items()}
+# A deadline quoted from the credit ("latest date of shipment"), not the date of this document
+_DEADLINE_PREFIX = _rx(r"\b(?:latest|last)\s*$")
+
+
+def _date_or_none(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def parse_date_readings(raw: str) -> Tuple[date, ...]:
+    """
+    Every valid reading of a date as written in the document (D/M/Y, M/D/Y,
+    Y-M-D, "15 June 2024", "June 15, 2024", Vietnamese)
+
+    D/M/Y comes first; a numeric date such as "10/11/2026" that is also a
+    valid M/D/Y date has two readings.
+    """
+    raw = raw.strip().lower()
+    numbers = re.findall(r"\d+", raw)
+    month_word = re.search(r"[a-z]{3,9}", re.sub(r"ngày|tháng|năm", " ", raw))
+    if month_word and month_word.group(0)[:3] in _MONTHS:
+        day = next((int(n) for n in numbers if len(n) <= 2), None)
+        year = next((int(n) for n in numbers if len(n) == 4), None)
+        if day is None or year is None:
+            return ()
+        readings = [_date_or_none(year, _MONTHS[month_word.group(0)[:3]], day)]
+    elif len(numbers) < 3:
+        return ()
+    elif len(numbers[0]) == 4:
+        readings = [_date_or_none(int(numbers[0]), int(numbers[1]), int(numbers[2]))]
+    elif "ngày" in raw:
+        readings = [_date_or_none(int(numbers[2]), int(numbers[1]), int(numbers[0]))]
+    else:
+        first, second, year = int(numbers[0]), int(numbers[1]), int(numbers[2])
+        readings = [_date_or_none(year, second, first), _date_or_none(year, first, second)]
+    return tuple(dict.fromkeys(reading for reading in readings if reading is not None))
+
+
+def parse_date_text(raw: str) -> Optional[date]:
+    """Parse a date as written in the document (the D/M/Y reading when it is also a valid M/D/Y date)"""
+    readings = parse_date_readings(raw)
+    return readings[0] if readings else None
+
+
+@dataclass
+class _Evidence:
+    value: Any
+    span: Tuple[int, int]
+    readings: Tuple[Any, ...] = ()  # Every way to read value (D/M and M/D), when more than one
+
+    @property
+    def values(self) -> Tuple[Any, ...]:
+        return self.readings or (self.value,)
+
+
+def find_labeled_dates(text: str) -> Dict[str, List[_Evidence]]:
+    """Dates found next to a known label (issue, expiry, latest shipment, shipment)"""
+    found: Dict[str, List[_Evidence]] = {}
+    for name, pattern in _LABELED_DATES.items():
+        for match in pattern.finditer(text):
+            if name != "latest_shipment" and _DEADLINE_PREFIX.search(text, max(0, match.start() - 12), match.start()):
+                continue
+            readings = parse_date_readings(match.group(1))
+            if readings:
+                evidence = _Evidence(readings[0], match.span(), readings if len(readings) > 1 else ())
+                found.setdefault(name, []).append(evidence)
+    return found
+
+
+def _verdict(check: Callable[..., bool], *evidence: _Evidence) -> Optional[bool]:
+    """check over every reading of the evidence dates; None when the readings disagree"""
+    outcomes = {check(*values) for values in itertools.product(*(e.values for e in evidence))}
+    return outcomes.pop() if len(outcomes) == 1 else None
+
+
+# ---------------------------------------------------------------------------
+# Mandatory elements
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class MandatoryElement:
+    name: str  # Same names as ComplianceValidationService._get_required_fields
+    severity: str
+    regulation_reference: str
+    fields: Tuple[str, ...] = ()  # extracted_fields keys that satisfy the element
+    reference_label: Optional[str] = None  # ...or a reference_numbers entry with this label
+    text_pattern: Optional[str] = None  # ...or this pattern in the text
+
+
+_CREDIT_6 = "UCP 600 Article 6 - Availability, Expiry Date"
+_TRANSPORT_20 = "UCP 600 Article 20 - Bill of Lading"
+_EXAMINATION_14 = "UCP 600 Article 14(a) - Document Examination"
+
+MANDATORY_ELEMENTS: Dict[str, Tuple[MandatoryElement, ...]] = {
+    "commercial_invoice": (
+        MandatoryElement("invoice_number", "MEDIUM", _EXAMINATION_14, reference_label=r"invoice|inv|hóa\s*đơn",
+                         text_pattern=r"(invoice|hóa\s*đơn)\s*(no|number|số)"),
+        MandatoryElement("date", "MEDIUM", _EXAMINATION_14, fields=("dates",)),
+        MandatoryElement("seller", "HIGH", "UCP 600 Article 18(a)(i) - Invoice issued by the beneficiary",
+                         fields=("seller",), text_pattern=r"seller|exporter|beneficiary|người\s*bán|người\s*thụ\s*hưởng"),
+        MandatoryElement("buyer", "HIGH", "UCP 600 Article 18(a)(ii) - Invoice made out to the applicant",
+                         fields=("buyer",), text_pattern=r"buyer|importer|applicant|messrs|người\s*mua|người\s*nhập\s*khẩu"),
+        MandatoryElement("goods_description", "HIGH", "UCP 600 Article 18(c) - Description of goods",
+                         text_pattern=r"description|goods|commodity|merchandise|hàng\s*hóa|mô\s*tả|tên\s*hàng"),
+        MandatoryElement("amount", "HIGH", "UCP 600 Article 18(b) - Invoice amount", fields=("amounts",)),
+    ),
+    "letter_of_credit": (
+        MandatoryElement("lc_number", "HIGH", _EXAMINATION_14, reference_label=r"l/c|letter\s*of\s*credit|tín\s*dụng\s*thư",
+                         text_pattern=r"(l/c|credit)\s*(no|number|số)|documentary\s*credit\s*number|:20:"),
+        MandatoryElement("issue_date", "MEDIUM", _EXAMINATION_14, fields=("dates",)),
+        MandatoryElement("expiry_date", "HIGH", "UCP 600 Article 6(d)(i) - Expiry date",
+                         text_pattern=DATE_LABELS["expiry_date"] + r"|:31d:"),
+        MandatoryElement("applicant", "MEDIUM", _EXAMINATION_14, fields=("applicant",), text_pattern=r"applicant|người\s*xin\s*mở|:50:"),
+        MandatoryElement("beneficiary", "HIGH", _EXAMINATION_14, fields=("beneficiary",),
+                         text_pattern=r"beneficiary|người\s*thụ\s*hưởng|:59:"),
+        MandatoryElement("amount", "HIGH", "UCP 600 Article 30 - Credit amount", fields=("amounts",), text_pattern=r":32b:"),
+    ),
+    "bill_of_lading": (
+        MandatoryElement("bl_number", "MEDIUM", _EXAMINATION_14, reference_label=r"b/l|bill\s*of\s*lading|vận\s*đơn",
+                         text_pattern=r"(b/l|bill\s*of\s*lading|vận\s*đơn)\s*(no|number|số)"),
+        MandatoryElement("date", "MEDIUM", _EXAMINATION_14, fields=("dates",)),
+        MandatoryElement("shipper", "MEDIUM", "UCP 600 Article 14(k) - Shipper", fields=("shipper",),
+                         text_pattern=r"shipper|người\s*gửi\s*hàng"),
+        MandatoryElement("consignee", "MEDIUM", _EXAMINATION_14, fields=("consignee",),
+                         text_pattern=r"consignee|người\s*nhận\s*hàng"),
+        MandatoryElement("vessel", "MEDIUM", _TRANSPORT_20, text_pattern=r"vessel|ocean\s*vessel|\btàu\b|voyage"),
+        MandatoryElement("port_loading", "HIGH", "UCP 600 Article 20(a)(iii) - Port of loading",
+                         text_pattern=r"port\s*of\s*loading|cảng\s*(xếp|bốc)\s*hàng"),
+        MandatoryElement("port_discharge", "HIGH", "UCP 600 Article 20(a)(iii) - Port of discharge",
+                         text_pattern=r"port\s*of\s*discharge|cảng\s*dỡ\s*hàng"),
+        MandatoryElement("on_board_date", "HIGH", "UCP 600 Article 20(a)(ii) - Shipped on board",
+                         text_pattern=r"on\s*board|shipped|đã\s*xếp\s*(hàng|lên\s*tàu)"),
+    ),
+    "insurance_certificate": (
+        MandatoryElement("date", "MEDIUM", "UCP 600 Article 28(e) - Date of insurance", fields=("dates",)),
+        MandatoryElement("amount", "HIGH", "UCP 600 Article 28(f)(i) - Insured amount and currency", fields=("amounts",)),
+        MandatoryElement("risks_covered", "MEDIUM", "UCP 600 Article 28(g) - Risks covered",
+                         text_pattern=r"risks?|clauses?|all\s*risks|institute\s*cargo|rủi\s*ro|điều\s*kiện\s*bảo\s*hiểm"),
+    ),
+    "bank_guarantee": (
+        MandatoryElement("amount", "HIGH", _EXAMINATION_14, fields=("amounts",)),
+        MandatoryElement("beneficiary", "MEDIUM", _EXAMINATION_14, text_pattern=r"beneficiary|người\s*thụ\s*hưởng|bên\s*nhận\s*bảo\s*lãnh"),
+        MandatoryElement("expiry_date", "MEDIUM", _EXAMINATION_14, text_pattern=DATE_LABELS["expiry_date"]),
+    ),
+}
+
+# Checks that need judgement; they are always left to the LLM, with spans around these patterns
+JUDGEMENT_CHECKS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "commercial_invoice": (
+        ("Mô tả hàng hóa phải tương ứng với mô tả trong L/C (Article 18(c))", r"description|goods|commodity|hàng\s*hóa|mô\s*tả"),
+        ("Điều kiện giao hàng và số lượng nhất quán (Article 14(d), 30(b))", r"fob|cif|cfr|cip|incoterms?|quantity|số\s*lượng"),
+    ),
+    "letter_of_credit": (
+        ("Nơi hết hạn, ngân hàng được chỉ định và cách thức sử dụng L/C (Article 6)", r"available\s*with|place\s*of\s*expiry|by\s*(payment|negotiation|acceptance)"),
+        ("Chứng từ yêu cầu và điều kiện không rõ ràng hoặc không có chứng từ (Article 14(h))", r"documents?\s*required|additional\s*conditions|:46a:|:47a:"),
+    ),
+    "bill_of_lading": (
+        ("Vận đơn hoàn hảo, không có ghi chú xấu về hàng hóa hoặc bao bì (Article 27)", r"clean|damaged|torn|stained|shortage|said\s*to\s*contain"),
+        ("Tên người chuyên chở và chữ ký hợp lệ (Article 20(a)(i))", r"carrier|master|as\s*agent|signed"),
+    ),
+    "insurance_certificate": (
+        ("Rủi ro được bảo hiểm đúng yêu cầu L/C (Article 28(g)-(i))", r"risks?|clauses?|institute|war|strikes"),
+        ("Chứng từ bảo hiểm do công ty bảo hiểm hoặc đại lý phát hành và ký (Article 28(a))", r"insurer|underwriter|signed|agent"),
+    ),
+    "bank_guarantee": (
+        ("Điều kiện thanh toán và thời hạn hiệu lực của bảo lãnh", r"demand|payment|expiry|hiệu\s*lực"),
+    ),
+}
+
+# Extracted by their value (amount and date patterns); other elements are only recognised by a label,
+# whose wording varies ("POL:" for port of loading), so not finding one is left to the LLM
+_VALUE_FIELDS = frozenset({"amounts", "dates"})
+# Missing only when the text has no number or currency word at all
+_ANY_VALUE = _rx(r"\d|\$|\b(?:usd|vnd|vnđ|eur|jpy|gbp|dollars?|euros?|yen|đồng)\b")
+
+_COMPILED_ELEMENTS = {
+    doc_type: tuple(
+        (
+            element,
+            _rx(rf"^({element.reference_label})\s*:") if element.reference_label else None,
+            _rx(element.text_pattern) if element.text_pattern else None,
+        )
+        for element in elements
+    )
+    for doc_type, elements in MANDATORY_ELEMENTS.items()
+}
+_COMPILED_JUDGEMENT = {
+    doc_type: tuple((description, _rx(pattern)) for description, pattern in checks)
+    for doc_type, checks in JUDGEMENT_CHECKS.items()
+}
+
+# ---------------------------------------------------------------------------
+# Amount tolerance
+# ---------------------------------------------------------------------------
+
+_AMOUNT_TEXT = r"((?:usd|vnd|eur|jpy|gbp|\$)\s*[\d][\d,.]*|[\d][\d,.]*\s*(?:usd|vnd|eur|jpy|gbp))"
+# An amount belongs to a label only when it directly follows it ("L/C amount: USD ...", "... of the credit is USD ...")
+_AMOUNT_GAP = r"\s*(?:[:=\-]\s*)?(?:(?:is|of|là)\s+)?"
+_CREDIT_LABEL = r"(?:l/c\s*amount|credit\s*amount|amount\s*of\s*(?:the\s*)?credit|trị\s*giá\s*(?:l/c|tín\s*dụng\s*thư))"
+_CREDIT_AMOUNT = _rx(rf"{_CREDIT_LABEL}{_AMOUNT_GAP}{_AMOUNT_TEXT}")
+_INVOICE_TOTAL = _rx(rf"\b(?:grand\s*total|total\s*(?:amount|value)?|invoice\s*(?:amount|total)|amount\s*due|tổng\s*(?:cộng|số\s*tiền|giá\s*trị|tiền)){_AMOUNT_GAP}{_AMOUNT_TEXT}")
+_CIF_VALUE = _rx(rf"(?:cif|cip|invoice)\s*value{_AMOUNT_GAP}{_AMOUNT_TEXT}")
+_INSURED_AMOUNT = _rx(rf"(?:insured\s*(?:amount|value|sum)|sum\s*insured|amount\s*insured|số\s*tiền\s*bảo\s*hiểm){_AMOUNT_GAP}{_AMOUNT_TEXT}")
+_EXPLICIT_TOLERANCE = _rx(r"(?:\+/-|±|more\s*or\s*less|tolerance)\s*(\d{1,2}(?:[.,]\d+)?)\s*%|(\d{1,2}(?:[.,]\d+)?)\s*%\s*(?:more\s*or\s*less|\+/-|tolerance)")
+_ABOUT = _rx(r"\b(about|approximately|khoảng|xấp\s*xỉ)\b")
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RuleResult:
+    """Outcome of one deterministic rule"""
+    rule: str
+    status: str
+    description: str
+    regulation_reference: str
+    severity: str = "MEDIUM"
+    spans: List[Tuple[int, int]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result.pop("spans")
+        return result
+
+
+@dataclass
+class PrescreenResult:
+    """All rule outcomes for one document, plus what is left for the LLM"""
+    document_type: str
+    rules: List[RuleResult]
+    judgement_checks: List[str]
+    evidence_spans: List[Tuple[int, int]]  # Character ranges the rules matched
+    judgement_spans: List[Tuple[int, int]]  # Matches of the judgement check keywords
+
+    @property
+    def failures(self) -> List[RuleResult]:
+        return [r for r in self.rules if r.status == FAIL]
+
+    @property
+    def decided(self) -> List[RuleResult]:
+        return [r for r in self.rules if r.status in (PASS, FAIL)]
+
+    @property
+    def unresolved(self) -> List[RuleResult]:
+        return [r for r in self.rules if r.status == UNRESOLVED]
+
+    @property
+    def is_certain_failure(self) -> bool:
+        """A HIGH severity rule failed: the document is non-compliant whatever the LLM says"""
+        return any(r.severity == "HIGH" for r in self.failures)
+
+    @property
+    def is_unreadable(self) -> bool:
+        """No mandatory element was found at all: nothing for the LLM to validate"""
+        mandatory = [r for r in self.rules if r.rule.startswith("mandatory:")]
+        return bool(mandatory) and all(r.status != PASS for r in mandatory)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rules": [r.to_dict() for r in self.rules],
+            "failed": len(self.failures),
+            "unresolved": len(self.unresolved),
+            "judgement_checks": self.judgement_checks,
+        }
+
+
+class ComplianceRuleEngine:
+    """Evaluates mandatory-field, date-window and amount-tolerance rules for one document"""
+
+    def __init__(self, today: Optional[date] = None):
+        self._today = today
+
+    def evaluate(self, text: str, document_type: str, fields: Dict[str, Any]) -> PrescreenResult:
+        today = self._today or date.today()
+        rules: List[RuleResult] = []
+        rules.extend(self._mandatory_rules(text, document_type, fields))
+        labeled_dates = find_labeled_dates(text)
+        rules.extend(self._date_window_rules(document_type, labeled_dates, today))
+        rules.extend(self._amount_rules(text, document_type))
+
+        judgement, judgement_spans = [], []
+        for description, pattern in _COMPILED_JUDGEMENT.get(document_type, ()):
+            judgement.append(description)
+            judgement_spans.extend(match.span() for _, match in zip(range(3), pattern.finditer(text)))
+
+        return PrescreenResult(
+            document_type=document_type,
+            rules=rules,
+            judgement_checks=judgement,
+            evidence_spans=[span for rule in rules for span in rule.spans],
+            judgement_spans=judgement_spans,
+        )
+
+    def _mandatory_rules(self, text: str, document_type: str, fields: Dict[str, Any]) -> List[RuleResult]:
+        references = fields.get("reference_numbers") or []
+        results = []
+        for element, reference_label, text_pattern in _COMPILED_ELEMENTS.get(document_type, ()):
+            found = any(fields.get(key) for key in element.fields)
+            if not found and reference_label is not None:
+                found = any(reference_label.match(str(ref)) for ref in references)
+            spans = []
+            if text_pattern is not None:
+                match = text_pattern.search(text)
+                if match:
+                    found = True
+                    spans.append(match.span())
+            if found:
+                status, description = PASS, f"Có thông tin bắt buộc: {element.name}"
+            elif _VALUE_FIELDS.intersection(element.fields) and not _ANY_VALUE.search(text):
+                status, description = FAIL, f"Thiếu thông tin bắt buộc: {element.name}"
+            elif _VALUE_FIELDS.intersection(element.fields):
+                # The extractor's patterns missed a value that is written some other way ("48,000.00 US Dollars")
+                status, description = UNRESOLVED, f"Không trích xuất được thông tin bắt buộc: {element.name}"
+            else:
+                status, description = UNRESOLVED, f"Không tìm thấy nhãn của thông tin bắt buộc: {element.name}"
+            results.append(RuleResult(f"mandatory:{element.name}", status, description,
+                                      element.regulation_reference, element.severity, spans))
+        return results
+
+    def _date_window_rules(self, document_type: str, dates: Dict[str, List[_Evidence]], today: date) -> List[RuleResult]:
+        results = []
+
+        def first(name: str) -> Optional[_Evidence]:
+            return dates[name][0] if dates.get(name) else None
+
+        def window(rule: str, valid: Callable[..., bool], passed: str, failed: Callable[[], str],
+                   reference: str, severity: str, *evidence: _Evidence) -> RuleResult:
+            verdict = _verdict(valid, *evidence)
+            if verdict is None:
+                # "10/11/2026" reads as 10 November or October 11: only the LLM can tell from the context
+                status, description = UNRESOLVED, "Ngày có thể đọc là ngày/tháng hoặc tháng/ngày: " + ", ".join(
+                    " / ".join(d.isoformat() for d in e.values) for e in evidence)
+            elif verdict:
+                status, description = PASS, passed
+            else:
+                status, description = FAIL, failed()
+            return RuleResult(rule, status, description, reference, severity, [e.span for e in evidence])
+
+        issue, expiry = first("issue_date"), first("expiry_date")
+        latest_shipment, shipment = first("latest_shipment"), first("shipment_date")
+
+        if document_type == "letter_of_credit":
+            if expiry:
+                # Not certain on its own: the presentation date may precede today
+                results.append(window(
+                    "date:credit_not_expired", lambda e: e >= today,
+                    f"L/C còn hiệu lực đến {expiry.value.isoformat()}",
+                    lambda: f"L/C đã hết hạn ngày {expiry.value.isoformat()}",
+                    "UCP 600 Article 6(d)(i) - Expiry date", "MEDIUM", expiry,
+                ))
+                if issue:
+                    results.append(window(
+                        "date:issue_before_expiry", lambda i, e: i <= e,
+                        "Ngày phát hành trước ngày hết hạn",
+                        lambda: f"Ngày phát hành {issue.value.isoformat()} sau ngày hết hạn {expiry.value.isoformat()}",
+                        _CREDIT_6, "HIGH", issue, expiry,
+                    ))
+                if latest_shipment:
+                    results.append(window(
+                        "date:shipment_before_expiry", lambda s, e: s <= e,
+                        "Hạn giao hàng không sau ngày hết hạn",
+                        lambda: f"Hạn giao hàng {latest_shipment.value.isoformat()} sau ngày hết hạn {expiry.value.isoformat()}",
+                        "UCP 600 Article 6(d) / 14(c) - Expiry and presentation period", "MEDIUM",
+                        latest_shipment, expiry,
+                    ))
+        else:
+            # A document may be dated before the credit but not after its presentation (Article 14(i))
+            for evidence in filter(None, (issue, shipment)):
+                result = window(
+                    "date:not_future_dated", lambda d: d <= today,
+                    "Ngày chứng từ không sau ngày xuất trình",
+                    lambda: f"Chứng từ ghi ngày trong tương lai ({evidence.value.isoformat()})",
+                    "UCP 600 Article 14(i) - Document date", "HIGH", evidence,
+                )
+                results.append(result)
+                if result.status == FAIL:
+                    break
+
+        if document_type == "insurance_certificate" and issue and shipment:
+            results.append(window(
+                "date:insurance_before_shipment", lambda i, s: i <= s,
+                "Ngày bảo hiểm không sau ngày giao hàng",
+                lambda: f"Ngày bảo hiểm {issue.value.isoformat()} sau ngày giao hàng {shipment.value.isoformat()}",
+                "UCP 600 Article 28(e) - Date of insurance", "HIGH", issue, shipment,
+            ))
+        return results
+
+    def _amount_rules(self, text: str, document_type: str) -> List[RuleResult]:
+        results = []
+        if document_type == "commercial_invoice":
+            credit_match = _CREDIT_AMOUNT.search(text)
+            if not credit_match:
+                label = re.search(_CREDIT_LABEL, text, re.IGNORECASE)
+                if label:
+                    results.append(RuleResult("amount:within_credit", UNRESOLVED,
+                                              "Không đọc được số tiền L/C ngay sau nhãn của nó",
+                                              "UCP 600 Article 18(b) - Invoice amount", "HIGH", [label.span()]))
+                return results
+            credit = parse_amount(credit_match.group(1))
+            # Only labelled totals count: line items, tax and the credit amount itself are not the invoice amount
+            totals = [
+                (amount, match.span())
+                for match in _INVOICE_TOTAL.finditer(text)
+                if match.start(1) != credit_match.start(1)
+                for amount in [parse_amount(match.group(1))]
+                if amount and credit and amount.currency == credit.currency
+            ]
+            unresolved = None
+            if not credit or not totals:
+                unresolved = "Không xác định được tổng số tiền hóa đơn cùng loại tiền với L/C"
+            elif credit.ambiguous or any(amount.ambiguous for amount, _ in totals):
+                unresolved = "Dấu phân cách trong số tiền L/C hoặc hóa đơn không rõ là phần nghìn hay thập phân"
+            elif len({amount.value for amount, _ in totals}) > 1:
+                unresolved = "Hóa đơn ghi nhiều tổng số tiền khác nhau"
+            if unresolved:
+                results.append(RuleResult("amount:within_credit", UNRESOLVED, unresolved,
+                                          "UCP 600 Article 18(b) - Invoice amount", "HIGH",
+                                          [credit_match.span()] + [span for _, span in totals]))
+                return results
+            # Tolerance wording is only trusted next to the quoted credit amount
+            tolerance = self._tolerance(text[max(0, credit_match.start() - 100):credit_match.end() + 100])
+            invoice_amount, span = totals[0]
+            limit = credit.value * (1 + tolerance)
+            within = invoice_amount.value <= limit
+            results.append(RuleResult(
+                "amount:within_credit", PASS if within else FAIL,
+                f"Số tiền hóa đơn {invoice_amount.value:,.2f} {credit.currency} "
+                + (f"trong giới hạn L/C {limit:,.2f}" if within else f"vượt giới hạn L/C {limit:,.2f} (dung sai {tolerance:.0%})"),
+                "UCP 600 Article 18(b) / 30 - Amount tolerance", "HIGH", [credit_match.span(), span],
+            ))
+        elif document_type == "insurance_certificate":
+            insured_match, cif_match = _INSURED_AMOUNT.search(text), _CIF_VALUE.search(text)
+            if not insured_match or not cif_match:
+                return results
+            insured, cif = parse_amount(insured_match.group(1)), parse_amount(cif_match.group(1))
+            if not insured or not cif or insured.currency != cif.currency or insured.ambiguous or cif.ambiguous:
+                results.append(RuleResult("amount:insurance_coverage", UNRESOLVED,
+                                          "Không so sánh được số tiền bảo hiểm với giá trị CIF/CIP",
+                                          "UCP 600 Article 28(f)(ii) - Insurance coverage", "HIGH",
+                                          [insured_match.span(), cif_match.span()]))
+                return results
+            required = cif.value * MIN_INSURANCE_COVERAGE
+            covered = insured.value >= required
+            results.append(RuleResult(
+                "amount:insurance_coverage", PASS if covered else FAIL,
+                f"Số tiền bảo hiểm {insured.value:,.2f} {'đạt' if covered else 'thấp hơn'} mức tối thiểu {required:,.2f} (110% giá trị CIF/CIP)",
+                "UCP 600 Article 28(f)(ii) - Insurance coverage", "HIGH", [insured_match.span(), cif_match.span()],
+            ))
+        return results
+
+    @staticmethod
+    def _tolerance(context: str) -> Decimal:
+        """Explicit +/- percentage, else 10% for "about"/"approximately" (Article 30(a)), else none"""
+        explicit = _EXPLICIT_TOLERANCE.search(context)
+        if explicit:
+            return Decimal((explicit.group(1) or explicit.group(2)).replace(",", ".")) / 100
+        if _ABOUT.search(context):
+            return ABOUT_TOLERANCE
+        return Decimal(0)
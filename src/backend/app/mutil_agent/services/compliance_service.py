@@ -1,21 +1,41 @@
 import os
+import asyncio
 import logging
 import time
 import json
 import re
-from typing import Optional, Dict, Any, List
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, AsyncIterator, Awaitable, Callable, Tuple
 from enum import Enum
 
 from app.mutil_agent.services.bedrock_service import BedrockService
+from app.mutil_agent.services.bedrock_gateway import get_bedrock_gateway
 from app.mutil_agent.services.compliance_config import ComplianceConfig
+from app.mutil_agent.services.compliance_classifier import ClassificationResult, get_document_classifier
+from app.mutil_agent.services.compliance_extractor import get_field_extraction_engine
+from app.mutil_agent.services.compliance_rules import ComplianceRuleEngine, PrescreenResult, RuleResult
+from app.mutil_agent.services.compliance_consistency import (
+    AMBIGUOUS,
+    DISCREPANCY,
+    NOT_APPLICABLE,
+    PASS,
+    ConsistencyCheck,
+    ConsistencyEngine,
+    PresentationIndex,
+)
+from app.mutil_agent.services.regulation_cache import get_regulation_cache
+from app.mutil_agent.services.service_registry import get_service
+from app.mutil_agent.helpers.prompt_compaction import CompactionResult, PromptCompactor
+from app.mutil_agent.utils.tracing import span, traced
 from app.mutil_agent.config import (
-    BEDROCK_KNOWLEDGEBASE,
     KNOWLEDGEBASE_ID,
     MODEL_MAPPING,
     CONVERSATION_CHAT_MODEL_NAME,
     CONVERSATION_CHAT_TOP_P,
     CONVERSATION_CHAT_TEMPERATURE,
-    LLM_MAX_TOKENS
+    LLM_MAX_TOKENS,
+    COMPLIANCE_BATCH_MAX_CONCURRENCY,
+    COMPLIANCE_PROMPT_TOKEN_BUDGET
 )
 
 logger = logging.getLogger(__name__)
@@ -29,6 +49,19 @@ class ComplianceStatus(Enum):
     INSUFFICIENT_DATA = "INSUFFICIENT_DATA"
 
 
+RegulationLookup = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class BatchDocument:
+    """One document of a batch validation (text given directly or loaded lazily)"""
+    document_id: str
+    text: Optional[str] = None
+    load_text: Optional[Callable[[], Awaitable[str]]] = None  # e.g. PDF/OCR extraction
+    document_type: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)  # Merged into the document's result
+
+
 class ComplianceValidationService:
     """
     Clean and Flexible Compliance Validation Service
@@ -37,10 +70,14 @@ class ComplianceValidationService:
     
     def __init__(self):
         """Initialize the Compliance Validation Service"""
-        self.bedrock_kb_client = BEDROCK_KNOWLEDGEBASE
+        self.bedrock_kb_client = get_service("bedrock_knowledgebase")
+        self.bedrock_gateway = get_bedrock_gateway()
+        self.regulation_cache = get_regulation_cache()
         self.knowledge_base_id = KNOWLEDGEBASE_ID
         self.bedrock_service = None
         self.config = ComplianceConfig()
+        self.rule_engine = ComplianceRuleEngine()
+        self.prompt_compactor = PromptCompactor(COMPLIANCE_PROMPT_TOKEN_BUDGET)
         
         # Get model configuration
         model_name = CONVERSATION_CHAT_MODEL_NAME or "claude-37-sonnet"
@@ -63,7 +100,8 @@ class ComplianceValidationService:
                     model_id=bedrock_model_id,
                     temperature=temperature,
                     top_p=top_p,
-                    max_tokens=max_tokens
+                    max_tokens=max_tokens,
+                    agent="compliance",
                 )
                 logger.info(f"Bedrock service initialized")
             else:
@@ -73,13 +111,21 @@ class ComplianceValidationService:
             logger.error(f"Error initializing Compliance Service: {e}")
             raise
 
+    @traced("compliance.validate")
     async def validate_document_compliance(
         self,
         ocr_text: str,
-        document_type: Optional[str] = None
+        document_type: Optional[str] = None,
+        regulation_lookup: Optional[RegulationLookup] = None
     ) -> Dict[str, Any]:
         """
         Main compliance validation method with flexible document handling
+        
+        Args:
+            ocr_text: Document text
+            document_type: Document type (auto-detected if not provided)
+            regulation_lookup: Replaces _query_ucp_regulations, e.g. to share
+                one knowledge base lookup per document type across a batch
         """
         try:
             start_time = time.time()
@@ -88,9 +134,13 @@ class ComplianceValidationService:
             if not ocr_text or len(ocr_text.strip()) < 50:
                 raise ValueError("Văn bản quá ngắn để kiểm tra tuân thủ")
             
-            # Step 1: Flexible Document Classification
+            # Step 1: Flexible Document Classification (one pass, reused for confidence)
+            with span("compliance.classify"):
+                classification = get_document_classifier().classify(ocr_text)
             if not document_type:
-                document_type = await self._classify_document_flexible(ocr_text)
+                if classification.scores:
+                    logger.info(f"Document classification scores: {classification.scores}")
+                document_type = classification.document_type
             
             logger.info(f"Document classified as: {document_type}")
             
@@ -98,15 +148,32 @@ class ComplianceValidationService:
             is_trade_document = self.config.is_ucp_applicable(document_type)
             
             # Step 3: Flexible Field Extraction
-            extracted_fields = await self._extract_fields_flexible(ocr_text, document_type)
+            field_spans: List[Tuple[int, int]] = []
+            extracted_fields = await self._extract_fields_flexible(ocr_text, document_type, field_spans)
             
             # Step 4: Handle based on document type
+            prescreen = None
+            compaction = None
+            ai_validation_used = False
             if is_trade_document:
-                # Apply UCP 600 validation
-                ucp_regulations = await self._query_ucp_regulations(document_type, extracted_fields)
-                compliance_result = await self._validate_against_ucp(
-                    ocr_text, document_type, extracted_fields, ucp_regulations
-                )
+                # Deterministic rules first; KB and AI only when the outcome is still open
+                with span("compliance.prescreen", document_type=document_type):
+                    prescreen = self.rule_engine.evaluate(ocr_text, document_type, extracted_fields)
+                if prescreen.is_certain_failure or prescreen.is_unreadable:
+                    logger.info(f"Rule pre-screen decided {document_type} without AI ({len(prescreen.failures)} failed rules)")
+                    ucp_regulations = {"regulations_summary": "; ".join(
+                        sorted({rule.regulation_reference for rule in prescreen.failures})
+                    )}
+                    compliance_result = self._build_prescreen_result(prescreen)
+                else:
+                    # Apply UCP 600 validation
+                    ai_validation_used = True
+                    lookup = regulation_lookup or self._query_ucp_regulations
+                    ucp_regulations = await lookup(document_type, extracted_fields)
+                    compaction = self._compact_document(ocr_text, document_type, classification, field_spans, prescreen)
+                    compliance_result = await self._validate_against_ucp(
+                        ocr_text, document_type, extracted_fields, ucp_regulations, prescreen, compaction.text
+                    )
             else:
                 # Handle non-trade documents
                 ucp_regulations = {"regulations_summary": f"Tài liệu loại '{document_type}' không thuộc phạm vi áp dụng UCP 600"}
@@ -136,7 +203,7 @@ class ComplianceValidationService:
                 
                 # Enhanced report sections
                 "document_analysis": {
-                    "classification_confidence": self._get_classification_confidence(document_type, ocr_text),
+                    "classification_confidence": self._get_classification_confidence(document_type, ocr_text, classification),
                     "document_category": self._get_document_category(document_type),
                     "applicable_regulations": self._get_applicable_regulations(document_type),
                     "required_fields": self._get_required_fields(document_type),
@@ -154,9 +221,15 @@ class ComplianceValidationService:
                 "processing_details": {
                     "text_length": len(ocr_text),
                     "fields_extracted": len(extracted_fields),
-                    "kb_query_performed": is_trade_document,
-                    "ai_validation_used": is_trade_document,
-                    "processing_method": "ucp_validation" if is_trade_document else "non_trade_handling"
+                    "kb_query_performed": ai_validation_used,
+                    "ai_validation_used": ai_validation_used,
+                    "processing_method": (
+                        "non_trade_handling" if not is_trade_document
+                        else "ucp_validation" if ai_validation_used
+                        else "rule_prescreen"
+                    ),
+                    "rule_prescreen": prescreen.to_dict() if prescreen else None,
+                    "prompt_compaction": compaction.to_dict() if compaction else None
                 }
             }
             
@@ -175,109 +248,224 @@ class ComplianceValidationService:
                 "timestamp": time.time()
             }
 
+    async def iter_batch_validation(
+        self,
+        documents: List[BatchDocument],
+        max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Validate several documents (e.g. a full L/C presentation) concurrently
+        
+        At most max_concurrency documents are extracted and validated at once;
+        Bedrock calls are additionally paced by the shared gateway limiter.
+        UCP 600 regulations are looked up once per document type for the whole
+        batch instead of once per document.
+        
+        Yields events as they become available:
+        - {"event": "start", "data": {...}}: batch size and concurrency
+        - {"event": "document", "data": {...}}: one document's result (completion order)
+        - {"event": "presentation", "data": {...}}: cross-document consistency (2+ documents)
+        - {"event": "complete", "data": {...}}: status counts for the batch
+        """
+        max_concurrency = max(1, min(max_concurrency or COMPLIANCE_BATCH_MAX_CONCURRENCY, len(documents) or 1))
+        semaphore = asyncio.Semaphore(max_concurrency)
+        shared_regulations: Dict[str, asyncio.Future] = {}
+        start_time = time.time()
+        
+        async def shared_lookup(document_type: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+            # One in-flight lookup per document type, shared by every document of that type
+            if document_type not in shared_regulations:
+                shared_regulations[document_type] = asyncio.ensure_future(
+                    self._query_ucp_regulations(document_type, {})
+                )
+            # Shielded so one cancelled document does not cancel the lookup for the others
+            return await asyncio.shield(shared_regulations[document_type])
+        
+        async def validate(index: int, document: BatchDocument) -> Dict[str, Any]:
+            async with semaphore:
+                document_start = time.time()
+                try:
+                    text = document.text if document.text is not None else await document.load_text()
+                    result = await self.validate_document_compliance(
+                        ocr_text=text,
+                        document_type=document.document_type,
+                        regulation_lookup=shared_lookup
+                    )
+                    result.update(document.metadata)
+                except Exception as e:
+                    logger.error(f"Batch document {document.document_id} failed: {e}")
+                    result = {
+                        "compliance_status": ComplianceStatus.INSUFFICIENT_DATA.value,
+                        "confidence_score": 0.0,
+                        "document_type": document.document_type or "unknown",
+                        "error": str(e),
+                        "processing_time": round(time.time() - document_start, 2),
+                        **document.metadata
+                    }
+                return {"index": index, "document_id": document.document_id, "result": result}
+        
+        yield {"event": "start", "data": {"total_documents": len(documents), "max_concurrency": max_concurrency}}
+        
+        status_counts: Dict[str, int] = {}
+        validated: List[Dict[str, Any]] = []
+        tasks = [asyncio.ensure_future(validate(i, document)) for i, document in enumerate(documents)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                status = item["result"].get("compliance_status", ComplianceStatus.INSUFFICIENT_DATA.value)
+                status_counts[status] = status_counts.get(status, 0) + 1
+                if item["result"].get("extracted_fields"):
+                    validated.append({"document_id": item["document_id"], **item["result"]})
+                yield {"event": "document", "data": item}
+        finally:
+            # Consumer stopped early (e.g. client disconnected)
+            for task in [*tasks, *shared_regulations.values()]:
+                task.cancel()
+        
+        presentation_status = None
+        if len(validated) > 1:
+            consistency = await self.check_presentation_consistency(validated)
+            presentation_status = consistency["presentation_status"]
+            yield {"event": "presentation", "data": consistency}
+        
+        yield {"event": "complete", "data": {
+            "total_documents": len(documents),
+            "status_counts": status_counts,
+            "presentation_status": presentation_status,
+            "regulation_lookups": len(shared_regulations),
+            "processing_time": round(time.time() - start_time, 2)
+        }}
+
+    @traced("compliance.consistency")
+    async def check_presentation_consistency(
+        self,
+        documents: List[Dict[str, Any]],
+        resolve_ambiguous: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Cross-document UCP 600 checks for one presentation
+        
+        Deterministic rules run over an index of every document's extracted
+        fields; only the checks they cannot decide are sent to Bedrock, all
+        in a single prompt.
+        
+        Args:
+            documents: Dicts with document_id, document_type and extracted_fields
+            resolve_ambiguous: Ask the LLM about checks the rules left AMBIGUOUS
+        """
+        start_time = time.time()
+        checks = ConsistencyEngine().evaluate(PresentationIndex(documents))
+        ambiguous = [check for check in checks if check.status == AMBIGUOUS]
+        
+        llm_calls = 0
+        if ambiguous and resolve_ambiguous and self.bedrock_service:
+            llm_calls = 1
+            await self._resolve_ambiguous_checks(ambiguous)
+        
+        statuses = {check.status for check in checks}
+        if DISCREPANCY in statuses:
+            presentation_status = ComplianceStatus.NON_COMPLIANT
+        elif AMBIGUOUS in statuses:
+            presentation_status = ComplianceStatus.REQUIRES_REVIEW
+        elif PASS in statuses:
+            presentation_status = ComplianceStatus.COMPLIANT
+        else:
+            presentation_status = ComplianceStatus.INSUFFICIENT_DATA
+        
+        return {
+            "presentation_status": presentation_status.value,
+            "documents": [document.get("document_id") for document in documents],
+            "checks": [check.to_dict() for check in checks],
+            "discrepancies": [
+                self._format_violation(check.description, check.regulation_reference, check.severity)
+                for check in checks if check.status == DISCREPANCY
+            ],
+            "processing_details": {
+                "rules_evaluated": len(checks),
+                "resolved_by_rules": len([c for c in checks if c.resolved_by == "rules" and c.status not in (AMBIGUOUS, NOT_APPLICABLE)]),
+                "sent_to_llm": len(ambiguous) if llm_calls else 0,
+                "llm_calls": llm_calls,
+                "processing_time": round(time.time() - start_time, 2)
+            }
+        }
+
+    async def _resolve_ambiguous_checks(self, checks: List[ConsistencyCheck]) -> None:
+        """Let the LLM decide AMBIGUOUS checks in place (left AMBIGUOUS if it cannot)"""
+        try:
+            response = await self.bedrock_service.ai_ainvoke(self._build_consistency_prompt(checks))
+            response_text = self._extract_response_content(response)
+            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
+            decisions = json.loads(json_match.group(0)) if json_match else []
+        except Exception as e:
+            logger.error(f"Error resolving ambiguous consistency checks: {e}")
+            return
+        
+        for decision in decisions:
+            try:
+                check = checks[int(decision.get("index"))]
+            except (TypeError, ValueError, IndexError):
+                continue
+            status = str(decision.get("status", "")).upper()
+            if status in (PASS, DISCREPANCY):
+                check.status = status
+                check.resolved_by = "llm"
+                if decision.get("reason"):
+                    check.description = f"{check.description}. {decision['reason']}"
+
+    def _build_consistency_prompt(self, checks: List[ConsistencyCheck]) -> str:
+        """Build prompt for the cross-document checks the rules could not decide"""
+        cases = [
+            {
+                "index": i,
+                "rule": check.rule,
+                "question": check.description,
+                "regulation": check.regulation_reference,
+                "values": check.values
+            }
+            for i, check in enumerate(checks)
+        ]
+        return f"""
+Bạn là chuyên gia kiểm tra chứng từ theo UCP 600. Các trường hợp sau không thể kết luận bằng quy tắc cố định.
+Với mỗi trường hợp, hãy xác định dữ liệu giữa các chứng từ có mâu thuẫn (Điều 14(d) UCP 600) hay không.
+
+CÁC TRƯỜNG HỢP:
+{json.dumps(cases, ensure_ascii=False, indent=2)}
+
+Chỉ trả lời bằng một mảng JSON, mỗi phần tử cho một trường hợp:
+[
+    {{
+        "index": 0,
+        "status": "PASS/DISCREPANCY",
+        "reason": "Giải thích ngắn gọn"
+    }}
+]
+"""
+
     async def _classify_document_flexible(self, text: str) -> str:
         """Flexible document classification using configurable patterns"""
         try:
-            text_lower = text.lower()
-            classification_scores = {}
-            
-            # Score each document type based on keywords and patterns
-            for doc_type, config in self.config.DOCUMENT_PATTERNS.items():
-                score = 0
-                weight = config.get("weight", 1.0)
-                
-                # Keyword matching
-                for keyword in config["keywords"]:
-                    if keyword.lower() in text_lower:
-                        score += 1
-                
-                # Pattern matching (higher weight)
-                for pattern in config["patterns"]:
-                    matches = re.findall(pattern, text_lower, re.IGNORECASE)
-                    score += len(matches) * 2  # Patterns have higher weight
-                
-                # Apply document type weight
-                if score > 0:
-                    classification_scores[doc_type] = score * weight
-            
-            # Return the highest scoring document type
-            if classification_scores:
-                best_match = max(classification_scores.items(), key=lambda x: x[1])
-                logger.info(f"Document classification scores: {classification_scores}")
-                return best_match[0]
-            
-            # Fallback classification
-            return "general_document"
+            classification = get_document_classifier().classify(text)
+            if classification.scores:
+                logger.info(f"Document classification scores: {classification.scores}")
+            return classification.document_type
                 
         except Exception as e:
             logger.error(f"Error in flexible document classification: {e}")
             return "unknown"
 
-    async def _extract_fields_flexible(self, text: str, document_type: str) -> Dict[str, Any]:
-        """Flexible field extraction using configurable patterns"""
+    @traced("compliance.extract_fields")
+    async def _extract_fields_flexible(
+        self, text: str, document_type: str, spans: Optional[List[Tuple[int, int]]] = None
+    ) -> Dict[str, Any]:
+        """Flexible field extraction using configurable patterns (single compiled pass)"""
         try:
-            fields = {}
-            
-            # Extract common fields using configurable patterns
-            for field_type, patterns in self.config.FIELD_PATTERNS.items():
-                extracted_values = []
-                
-                for pattern in patterns:
-                    matches = re.findall(pattern, text, re.IGNORECASE)
-                    for match in matches:
-                        if isinstance(match, tuple):
-                            # Handle tuple matches (multiple groups)
-                            if field_type == "dates":
-                                # Reconstruct date from tuple
-                                date_parts = [str(x) for x in match if str(x).isdigit()]
-                                if len(date_parts) >= 3:
-                                    date_str = '/'.join(date_parts[:3])
-                                    extracted_values.append(date_str)
-                            elif field_type == "amounts":
-                                # Reconstruct amount from tuple
-                                amount_str = ' '.join(str(x) for x in match if str(x).strip())
-                                extracted_values.append(amount_str)
-                            elif field_type == "reference_numbers":
-                                # Take the actual number part
-                                if len(match) >= 2:
-                                    ref_type = match[0].strip()
-                                    ref_number = match[1].strip()
-                                    extracted_values.append(f"{ref_type}: {ref_number}")
-                        else:
-                            extracted_values.append(str(match).strip())
-                
-                # Store unique values, limit to reasonable number
-                if extracted_values:
-                    unique_values = list(dict.fromkeys(extracted_values))  # Preserve order, remove duplicates
-                    fields[field_type] = unique_values[:5]  # Limit to 5 items
-            
-            # Extract document-specific fields
-            if document_type in self.config.DOCUMENT_SPECIFIC_FIELDS:
-                specific_patterns = self.config.DOCUMENT_SPECIFIC_FIELDS[document_type]
-                
-                for field_name, patterns in specific_patterns.items():
-                    for pattern in patterns:
-                        match = re.search(pattern, text, re.IGNORECASE)
-                        if match:
-                            # Take the last group (actual content)
-                            #field_value = match.group(-1).strip()
-                            try:
-                                if match.groups():
-                                    field_value = match.groups()[-1].strip()
-                                else:
-                                    field_value = match.group(0).strip()
-                            except IndexError:
-                                field_value = match.group(0).strip()
-                            if field_value:
-                                fields[field_name] = field_value
-                                break  # Take first match for each field
-            
-            return fields
+            return get_field_extraction_engine(document_type).extract(text, spans)
             
         except Exception as e:
             logger.error(f"Error in flexible field extraction: {e}")
             return {}
 
+    @traced("compliance.kb_query")
     async def query_regulations_directly(self, query: str) -> Dict[str, Any]:
         """Direct query to UCP 600 knowledge base"""
         try:
@@ -290,8 +478,13 @@ class ComplianceValidationService:
             # Build UCP-specific query
             enhanced_query = self._build_ucp_query(query)
             
-            # Query knowledge base
-            response = self.bedrock_kb_client.retrieve_and_generate(
+            cached = self.regulation_cache.get("direct_query", query)
+            if cached is not None:
+                logger.info("UCP 600 answer served from regulation cache")
+                return cached
+            
+            # Query knowledge base (offloaded, does not block the event loop)
+            response = await self.bedrock_gateway.retrieve_and_generate(
                 input={"text": enhanced_query},
                 retrieveAndGenerateConfiguration={
                     "knowledgeBaseConfiguration": {
@@ -312,7 +505,7 @@ class ComplianceValidationService:
             answer = response.get('output', {}).get('text', 'Không tìm thấy thông tin')
             citations = response.get('citations', [])
             
-            return {
+            result = {
                 "answer": answer,
                 "sources": self._extract_sources(citations),
                 "confidence": self._calculate_query_confidence(answer, citations),
@@ -320,6 +513,8 @@ class ComplianceValidationService:
                 "knowledge_base_id": self.knowledge_base_id,
                 "timestamp": time.time()
             }
+            self.regulation_cache.set("direct_query", query, result)
+            return result
             
         except Exception as e:
             logger.error(f"Error in direct regulation query: {e}")
@@ -448,16 +643,27 @@ class ComplianceValidationService:
         }
 
     # Helper methods (keeping existing implementation)
+    @traced("compliance.kb_retrieval")
     async def _query_ucp_regulations(self, document_type: str, fields: Dict[str, Any]) -> Dict[str, Any]:
-        """Query relevant UCP 600 regulations"""
+        """
+        Query relevant UCP 600 regulations
+
+        The query depends on the document type only, so one cached answer serves
+        every document of that type; the extracted fields reach the model
+        through the validation prompt instead.
+        """
         try:
             if not self.bedrock_kb_client or not self.knowledge_base_id:
                 return {"regulations_summary": f"Fallback UCP regulations for {document_type}"}
             
             # Build query based on document type
-            query = self._build_regulation_query(document_type, fields)
+            query = self._build_regulation_query(document_type)
+            
+            cached = self.regulation_cache.get(document_type, query)
+            if cached is not None:
+                return cached
             
-            response = self.bedrock_kb_client.retrieve_and_generate(
+            response = await self.bedrock_gateway.retrieve_and_generate(
                 input={"text": query},
                 retrieveAndGenerateConfiguration={
                     "knowledgeBaseConfiguration": {
@@ -468,36 +674,46 @@ class ComplianceValidationService:
                 },
             )
             
-            return {
+            regulations = {
                 "regulations_summary": response.get('output', {}).get('text', ''),
                 "citations": response.get('citations', [])
             }
+            self.regulation_cache.set(document_type, query, regulations)
+            return regulations
             
         except Exception as e:
             logger.error(f"Error querying UCP regulations: {e}")
             return {"regulations_summary": f"Error querying regulations: {str(e)}"}
 
+    @traced("compliance.llm_validation")
     async def _validate_against_ucp(
         self, 
         text: str, 
         document_type: str, 
         fields: Dict[str, Any], 
-        regulations: Dict[str, Any]
+        regulations: Dict[str, Any],
+        prescreen: Optional[PrescreenResult] = None,
+        excerpt: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Validate document against UCP 600 using AI"""
+        """Validate document against UCP 600 using AI (only what the rule pre-screen left open)"""
         try:
             if not self.bedrock_service:
                 raise ValueError("Bedrock service not available")
             
             # Build validation prompt
-            validation_prompt = self._build_validation_prompt(text, document_type, fields, regulations)
+            validation_prompt = self._build_validation_prompt(
+                text, document_type, fields, regulations, prescreen, excerpt
+            )
             
             # Get AI validation
             response = await self.bedrock_service.ai_ainvoke(validation_prompt)
             validation_text = self._extract_response_content(response)
             
             # Parse validation result
-            return self._parse_validation_result(validation_text)
+            result = self._parse_validation_result(validation_text)
+            if prescreen:
+                result = self._merge_prescreen_failures(result, prescreen)
+            return result
             
         except Exception as e:
             logger.error(f"Error in UCP validation: {e}")
@@ -524,7 +740,7 @@ Vui lòng trả lời dựa trên UCP 600 và cung cấp:
 Trả lời bằng tiếng Việt.
 """
 
-    def _build_regulation_query(self, document_type: str, fields: Dict[str, Any]) -> str:
+    def _build_regulation_query(self, document_type: str) -> str:
         """Build query for relevant regulations"""
         doc_type_queries = {
             "commercial_invoice": "UCP 600 Article 18 về Commercial Invoice và các yêu cầu",
@@ -534,22 +750,97 @@ Trả lời bằng tiếng Việt.
             "insurance_certificate": "UCP 600 Article 28 về Insurance Certificate"
         }
         
-        base_query = doc_type_queries.get(document_type, f"UCP 600 regulations for {document_type}")
-        
-        if fields:
-            fields_str = ", ".join([f"{k}: {v}" for k, v in list(fields.items())[:3]])
-            base_query += f". Tài liệu có thông tin: {fields_str}"
-        
-        return base_query
+        return doc_type_queries.get(document_type, f"UCP 600 regulations for {document_type}")
+
+    def _build_prescreen_result(self, prescreen: PrescreenResult) -> Dict[str, Any]:
+        """Compliance result decided by the rule pre-screen alone"""
+        rules = prescreen.failures
+        if prescreen.is_unreadable:
+            status, confidence = ComplianceStatus.INSUFFICIENT_DATA, 0.0
+            rules = rules + [rule for rule in prescreen.unresolved if rule.rule.startswith("mandatory:")]
+        else:
+            status, confidence = ComplianceStatus.NON_COMPLIANT, 0.9
+        return {
+            "status": status,
+            "confidence": confidence,
+            "violations": self._prescreen_violations(rules),
+            "recommendations": [
+                {"description": f"Bổ sung hoặc sửa: {rule.description}", "priority": rule.severity}
+                for rule in rules
+            ]
+        }
+
+    def _merge_prescreen_failures(self, result: Dict[str, Any], prescreen: PrescreenResult) -> Dict[str, Any]:
+        """Add rule failures the AI was told about but may not repeat"""
+        if not prescreen.failures:
+            return result
+        result["violations"] = self._prescreen_violations(prescreen.failures) + list(result.get("violations", []))
+        if result.get("status") == ComplianceStatus.COMPLIANT:
+            result["status"] = ComplianceStatus.REQUIRES_REVIEW
+        return result
+
+    def _prescreen_violations(self, rules: List[RuleResult]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "type": "Rule Violation",
+                "description": rule.description,
+                "severity": rule.severity,
+                "regulation_reference": rule.regulation_reference
+            }
+            for rule in rules
+        ]
+
+    @traced("compliance.prompt_compaction")
+    def _compact_document(
+        self,
+        text: str,
+        document_type: str,
+        classification: ClassificationResult,
+        field_spans: List[Tuple[int, int]],
+        prescreen: PrescreenResult
+    ) -> CompactionResult:
+        """Keep the paragraphs around extracted fields, rule evidence and regulation keywords"""
+        spans = [(start, end, 3.0) for start, end in field_spans + prescreen.evidence_spans]
+        spans += [(start, end, 2.0) for start, end in prescreen.judgement_spans]
+        spans += [(start, end, 1.0) for start, end in classification.spans_for(document_type)]
+        compaction = self.prompt_compactor.compact(text, spans)
+        logger.info(
+            f"Prompt compaction for {document_type}: {compaction.original_tokens} -> "
+            f"{compaction.compacted_tokens} tokens (ratio {compaction.compression_ratio})"
+        )
+        return compaction
 
     def _build_validation_prompt(
         self, 
         text: str, 
         document_type: str, 
         fields: Dict[str, Any], 
-        regulations: Dict[str, Any]
+        regulations: Dict[str, Any],
+        prescreen: Optional[PrescreenResult] = None,
+        excerpt: Optional[str] = None
     ) -> str:
-        """Build prompt for compliance validation"""
+        """Build prompt for compliance validation (rule outcomes and a compacted excerpt instead of the full text)"""
+        if prescreen and excerpt:
+            decided = "\n".join(
+                f"- [{rule.status}] {rule.description} ({rule.regulation_reference})"
+                for rule in prescreen.decided
+            )
+            open_checks = "\n".join(
+                [f"- {rule.description} ({rule.regulation_reference})" for rule in prescreen.unresolved]
+                + [f"- {check}" for check in prescreen.judgement_checks]
+            )
+            document_section = f"""KẾT QUẢ KIỂM TRA TỰ ĐỘNG (đã xác định, không cần kiểm tra lại):
+{decided or '- Không có'}
+
+CẦN ĐÁNH GIÁ:
+{open_checks or '- Các yêu cầu UCP 600 còn lại cho loại chứng từ này'}
+
+TRÍCH ĐOẠN LIÊN QUAN CỦA TÀI LIỆU:
+{excerpt}"""
+        else:
+            document_section = f"""NỘI DUNG TÀI LIỆU:
+{text[:2000]}..."""
+        
         return f"""
 Bạn là chuyên gia kiểm tra tuân thủ UCP 600. Hãy phân tích tài liệu sau:
 
@@ -561,8 +852,7 @@ THÔNG TIN TRÍCH XUẤT:
 QUY ĐỊNH UCP 600 LIÊN QUAN:
 {regulations.get('regulations_summary', 'Không có quy định cụ thể')}
 
-NỘI DUNG TÀI LIỆU:
-{text[:2000]}...
+{document_section}
 
 Hãy đánh giá tuân thủ và trả lời theo format JSON:
 {{
@@ -728,24 +1018,20 @@ Hãy đánh giá tuân thủ và trả lời theo format JSON:
         except:
             return 0.5
 
-    def _get_classification_confidence(self, document_type: str, text: str) -> float:
+    def _get_classification_confidence(
+        self,
+        document_type: str,
+        text: str,
+        classification: Optional[ClassificationResult] = None
+    ) -> float:
         """Calculate classification confidence based on pattern matches"""
         try:
             if document_type not in self.config.DOCUMENT_PATTERNS:
                 return 0.5
             
-            config = self.config.DOCUMENT_PATTERNS[document_type]
-            text_lower = text.lower()
-            
-            keyword_matches = sum(1 for keyword in config["keywords"] if keyword.lower() in text_lower)
-            pattern_matches = sum(len(re.findall(pattern, text_lower, re.IGNORECASE)) 
-                                for pattern in config["patterns"])
-            
-            total_possible = len(config["keywords"]) + len(config["patterns"])
-            actual_matches = keyword_matches + pattern_matches
-            
-            confidence = min(actual_matches / total_possible, 1.0) if total_possible > 0 else 0.5
-            return round(confidence, 2)
+            if classification is None:
+                classification = get_document_classifier().classify(text)
+            return classification.confidence_for(document_type)
             
         except Exception as e:
             logger.error(f"Error calculating classification confidence: {e}")
@@ -893,13 +1179,13 @@ Hãy đánh giá tuân thủ và trả lời theo format JSON:
         
         # Map extracted fields to required fields (flexible matching)
         found_mandatory = []
-        for field in mandatory_fields:
+        for field_name in mandatory_fields:
             # Check if field or similar field exists
-            if any(field.lower() in key.lower() or key.lower() in field.lower() 
+            if any(field_name.lower() in key.lower() or key.lower() in field_name.lower() 
                    for key in extracted_fields.keys()):
-                found_mandatory.append(field)
+                found_mandatory.append(field_name)
         
-        missing_mandatory = [field for field in mandatory_fields if field not in found_mandatory]
+        missing_mandatory = [field_name for field_name in mandatory_fields if field_name not in found_mandatory]
         completeness_score = len(found_mandatory) / len(mandatory_fields) if mandatory_fields else 1.0
         
         return {
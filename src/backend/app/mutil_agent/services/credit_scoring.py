@@ -0,0 +1,274 @@
+"""
+Local credit scorecard
+Deterministic points-based scorecard over the applicant's financials,
+requested amount, loan term and collateral, vectorized with NumPy so a batch
+of thousands of applicants is scored in one call. The LLM only writes the
+narrative report around the score.
+
+Each characteristic is binned (upper bound inclusive) and mapped to points;
+missing inputs score the neutral 0. The sum is added to BASE_SCORE, clipped
+to the 403-706 scale and mapped to the 1 (best) - 10 (worst) credit rank.
+"""
+
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+SCORE_MIN = 403
+SCORE_MAX = 706
+BASE_SCORE = 550
+
+# Lower bound of ranks 9..1 (scores below 430 are rank 10)
+RANK_LOWER_BOUNDS = np.array([430, 455, 480, 545, 572, 588, 606, 622, 645])
+
+RANK_COMMENTS = {
+    10: "Xấu: Khách hàng không đủ điều kiện vay vốn tại hầu hết ngân hàng.",
+    9: "Xấu: Rủi ro cao, bị từ chối vay vốn, cần cải thiện tín dụng.",
+    8: "Dưới trung bình: Khó vay vốn, chỉ có thể vay tại công ty tài chính, lãi suất cao.",
+    7: "Dưới trung bình: Có thể vay vốn với hạn mức thấp, yêu cầu bổ sung hồ sơ nhiều.",
+    6: "Trung bình: Một số ngân hàng vẫn từ chối, cần tăng điểm để cải thiện cơ hội vay.",
+    5: "Trung bình: Vay vốn khó tại ngân hàng lớn, có thể mở thẻ tín dụng hạn mức thấp.",
+    4: "Tốt: Có thể được duyệt vay vốn với điều kiện chứng minh tài chính rõ ràng.",
+    3: "Tốt: Dễ dàng vay vốn tín chấp hoặc thế chấp, mở thẻ tín dụng dễ.",
+    2: "Rất tốt: Khả năng vay vốn cao, lãi suất tốt, nhiều ưu đãi từ ngân hàng.",
+    1: "Rất tốt: Dễ duyệt vay vốn lớn, mở thẻ tín dụng cao cấp, được ưu đãi tín dụng."
+}
+
+
+@dataclass(frozen=True)
+class Characteristic:
+    """One binned scorecard characteristic: len(points) == len(edges) + 1"""
+    name: str
+    edges: Tuple[float, ...]
+    points: Tuple[int, ...]
+    description: str
+
+
+CHARACTERISTICS: Tuple[Characteristic, ...] = (
+    Characteristic("debt_ratio", (0.3, 0.5, 0.7, 0.85), (35, 20, 0, -25, -45),
+                   "Nợ phải trả / Tổng tài sản"),
+    Characteristic("profit_margin", (0.0, 0.05, 0.10, 0.20), (-40, -10, 10, 25, 35),
+                   "Lợi nhuận / Doanh thu"),
+    Characteristic("debt_service_coverage", (1.0, 1.25, 1.5, 2.0), (-45, -15, 5, 20, 35),
+                   "Dòng tiền năm / Nghĩa vụ trả gốc năm"),
+    Characteristic("loan_to_revenue", (0.25, 0.5, 1.0, 2.0), (20, 10, 0, -20, -35),
+                   "Số tiền vay / Doanh thu"),
+    Characteristic("return_on_assets", (0.0, 0.03, 0.08), (-20, 0, 10, 20),
+                   "Lợi nhuận / Tổng tài sản"),
+    Characteristic("loan_term_months", (12, 36, 60, 120), (10, 5, 0, -10, -20),
+                   "Kỳ hạn vay (tháng)"),
+)
+
+COLLATERAL_POINTS = {
+    "cash_deposit": 30,
+    "real_estate": 25,
+    "securities": 20,
+    "equipment": 10,
+    "inventory": 5,
+    "none": -20,
+    "unknown": 0,
+}
+COLLATERAL_CATEGORIES = tuple(COLLATERAL_POINTS)
+_COLLATERAL_POINTS_ARRAY = np.array([COLLATERAL_POINTS[c] for c in COLLATERAL_CATEGORIES])
+_COLLATERAL_INDEX = {category: i for i, category in enumerate(COLLATERAL_CATEGORIES)}
+
+# Keywords (accent-free, lowercase) for free-text collateral descriptions; first match wins
+_COLLATERAL_KEYWORDS = (
+    ("none", ("none", "khong tai san", "khong co tai san", "tin chap", "unsecured", "no collateral")),
+    ("cash_deposit", ("cash", "deposit", "tien gui", "so tiet kiem", "ky quy")),
+    ("real_estate", ("real_estate", "real estate", "bat dong san", "nha dat", "quyen su dung dat", "nha o")),
+    ("securities", ("securities", "chung khoan", "co phieu", "trai phieu", "giay to co gia")),
+    ("equipment", ("equipment", "may moc", "thiet bi", "phuong tien", "o to")),
+    ("inventory", ("inventory", "hang ton kho", "hang hoa")),
+)
+
+FINANCIAL_FIELDS = ("revenue", "profit", "assets", "liabilities", "cash_flow")
+# Other keys accepted for a financial field, used when the field itself is missing
+FINANCIAL_ALIASES = {"liabilities": ("debt",)}
+# Characteristics computed from the financials (the rest: loan term and collateral)
+FINANCIAL_CHARACTERISTICS = tuple(c.name for c in CHARACTERISTICS if c.name != "loan_term_months")
+
+
+@dataclass
+class CreditScore:
+    """Score of one applicant with the points of each characteristic"""
+    score: int
+    rank: int
+    factors: Dict[str, Dict[str, Any]]
+
+    @property
+    def rank_comment(self) -> str:
+        return RANK_COMMENTS[self.rank]
+
+    @property
+    def uses_financials(self) -> bool:
+        """Some financial ratio was scored (False: only loan term and collateral; needs factors)"""
+        return any(self.factors.get(name, {}).get("value") is not None for name in FINANCIAL_CHARACTERISTICS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "creditScore": self.score,
+            "creditRank": self.rank,
+            "rankComment": self.rank_comment,
+            "scoreFactors": self.factors,
+        }
+
+
+def _to_float(value: Any) -> float:
+    """Number from int/float/str ("1,000,000,000"); NaN when missing or unparsable"""
+    if value is None or isinstance(value, bool):
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(",", "").replace(" ", ""))
+    except ValueError:
+        return np.nan
+
+
+def _financial(financials: Mapping[str, Any], field: str) -> float:
+    value = financials.get(field)
+    for alias in FINANCIAL_ALIASES.get(field, ()):
+        if value is None:
+            value = financials.get(alias)
+    return _to_float(value)
+
+
+def _normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFD", text.replace("đ", "d").replace("Đ", "D"))
+    return "".join(c for c in decomposed if unicodedata.category(c) != "Mn").lower().strip()
+
+
+def collateral_category(collateral_type: Optional[str]) -> str:
+    """Scorecard category of a collateral value (form option or free text)"""
+    if not collateral_type:
+        return "unknown"
+    normalized = _normalize(collateral_type)
+    if normalized in COLLATERAL_POINTS:
+        return normalized
+    for category, keywords in _COLLATERAL_KEYWORDS:
+        if any(keyword in normalized for keyword in keywords):
+            return category
+    return "unknown"
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise numerator / denominator, NaN where either is missing or denominator <= 0"""
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def _bin_points(values: np.ndarray, characteristic: Characteristic) -> np.ndarray:
+    points = np.asarray(characteristic.points)[np.digitize(values, characteristic.edges, right=True)]
+    return np.where(np.isnan(values), 0, points)
+
+
+def score_columns(
+    revenue: np.ndarray,
+    profit: np.ndarray,
+    assets: np.ndarray,
+    liabilities: np.ndarray,
+    cash_flow: np.ndarray,
+    requested_amount: np.ndarray,
+    loan_term: np.ndarray,
+    collateral_index: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Score applicants given as columns (NaN for missing values)
+
+    Args:
+        collateral_index: Index into COLLATERAL_CATEGORIES per applicant
+
+    Returns:
+        Arrays "score", "rank", the ratio of each characteristic and "points"
+        (applicants x characteristics, collateral last)
+    """
+    # Annual principal repayment; cash flow must cover it
+    annual_debt_service = _ratio(requested_amount * 12.0, loan_term)
+    ratios = {
+        "debt_ratio": _ratio(liabilities, assets),
+        "profit_margin": _ratio(profit, revenue),
+        "debt_service_coverage": _ratio(cash_flow, annual_debt_service),
+        "loan_to_revenue": _ratio(requested_amount, revenue),
+        "return_on_assets": _ratio(profit, assets),
+        "loan_term_months": np.where(loan_term > 0, loan_term, np.nan),
+    }
+    points = np.column_stack(
+        [_bin_points(ratios[c.name], c) for c in CHARACTERISTICS]
+        + [_COLLATERAL_POINTS_ARRAY[collateral_index]]
+    )
+    scores = np.clip(BASE_SCORE + points.sum(axis=1), SCORE_MIN, SCORE_MAX)
+    ranks = 10 - np.searchsorted(RANK_LOWER_BOUNDS, scores, side="right")
+    return {"score": scores, "rank": ranks, "points": points, **ratios}
+
+
+def _columns(applicants: Sequence[Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+    count = len(applicants)
+    financials = [applicant.get("financials") or {} for applicant in applicants]
+    columns = {
+        field: np.fromiter((_financial(f, field) for f in financials), dtype=float, count=count)
+        for field in FINANCIAL_FIELDS
+    }
+    columns["requested_amount"] = np.fromiter(
+        (_to_float(a.get("requested_amount")) for a in applicants), dtype=float, count=count
+    )
+    columns["loan_term"] = np.fromiter(
+        (_to_float(a.get("loan_term")) for a in applicants), dtype=float, count=count
+    )
+    columns["collateral_index"] = np.fromiter(
+        (_COLLATERAL_INDEX[collateral_category(a.get("collateral_type"))] for a in applicants),
+        dtype=np.intp, count=count,
+    )
+    return columns
+
+
+def score_batch(applicants: Sequence[Mapping[str, Any]], with_factors: bool = True) -> List[CreditScore]:
+    """
+    Score many applicants in one vectorized pass
+
+    Args:
+        applicants: Dicts with financials (revenue, profit, assets, liabilities
+            or debt, cash_flow), requested_amount, loan_term (months) and collateral_type
+            (RiskAssessmentRequest.model_dump() works as is)
+        with_factors: Include the per-characteristic breakdown (skip it for large batches)
+
+    Returns:
+        One CreditScore per applicant, in input order
+    """
+    if not applicants:
+        return []
+    columns = _columns(applicants)
+    result = score_columns(**columns)
+
+    # Python lists: element access on NumPy arrays is slow in a per-applicant loop
+    score_list = result["score"].tolist()
+    rank_list = result["rank"].tolist()
+    scores = [CreditScore(score=int(score), rank=int(rank), factors={}) for score, rank in zip(score_list, rank_list)]
+    if with_factors:
+        points = result["points"].tolist()
+        collateral = columns["collateral_index"].tolist()
+        values = [
+            (c.name, [None if v != v else round(v, 4) for v in result[c.name].tolist()])  # v != v: NaN
+            for c in CHARACTERISTICS
+        ]
+        for i, credit in enumerate(scores):
+            credit.factors = {name: {"value": column[i], "points": points[i][j]} for j, (name, column) in enumerate(values)}
+            credit.factors["collateral"] = {"value": COLLATERAL_CATEGORIES[collateral[i]], "points": points[i][-1]}
+    return scores
+
+
+def score_applicant(applicant: Mapping[str, Any]) -> CreditScore:
+    """Score one applicant (see score_batch)"""
+    return score_batch([applicant])[0]
+
+
+def describe_factors(factors: Mapping[str, Mapping[str, Any]]) -> Iterable[str]:
+    """Human-readable factor lines for the LLM prompt"""
+    descriptions = {c.name: c.description for c in CHARACTERISTICS}
+    descriptions["collateral"] = "Tài sản đảm bảo"
+    for name, factor in factors.items():
+        value = "không có dữ liệu" if factor["value"] is None else factor["value"]
+        yield f"{descriptions.get(name, name)}: {value} ({factor['points']:+d} điểm)"
@@ -80,7 +80,7 @@ class EnhancedBedrockService:
             logger.info(f"📚 Multi-chunk processing: {len(chunks)} chunks")
             
             # Summarize individual chunks
-            if use_parallel_processing and len(chunks) <= 5:
+            if use_parallel_processing:
                 chunk_summaries = await self._process_chunks_parallel(
                     chunks, summary_type, language
                 )
@@ -97,7 +97,7 @@ class EnhancedBedrockService:
         # Step 3: Prepare result
         processing_stats = {
             "total_chunks": len(chunks),
-            "processing_method": "parallel" if use_parallel_processing and len(chunks) <= 5 else "sequential",
+            "processing_method": "parallel" if use_parallel_processing else "sequential",
             "bedrock_calls": len(chunks) + (1 if len(chunks) > 1 else 0),
             "chunking_stats": chunking_stats
         }
@@ -160,17 +160,8 @@ class EnhancedBedrockService:
             )
             tasks.append(task)
         
-        # Execute in parallel with some concurrency control
-        semaphore = asyncio.Semaphore(3)  # Limit concurrent requests
-        
-        async def process_with_semaphore(task):
-            async with semaphore:
-                return await task
-        
-        results = await asyncio.gather(
-            *[process_with_semaphore(task) for task in tasks],
-            return_exceptions=True
-        )
+        # Concurrency is bounded by the shared adaptive Bedrock limiter
+        results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Handle any exceptions
         chunk_summaries = []
@@ -200,10 +191,6 @@ class EnhancedBedrockService:
                 )
                 chunk_summaries.append(summary)
                 
-                # Small delay to avoid rate limiting
-                if i < len(chunks) - 1:
-                    await asyncio.sleep(0.5)
-                    
             except Exception as e:
                 logger.error(f"❌ Error processing chunk {i}: {str(e)}")
                 chunk_summaries.append(f"[Lỗi xử lý chunk {i}: {str(e)}]")
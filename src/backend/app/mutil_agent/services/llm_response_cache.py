@@ -0,0 +1,372 @@
+"""
+Deterministic response cache for LLM summarization
+Users re-submit the same document with the same summary_type/max_length all
+the time, which renders the exact same prompt; the completion is reused
+instead of calling Bedrock again.
+
+- Key: SHA-256 over model ID, decoding parameters (temperature, top_p,
+  max_tokens) and the prompt, so any change to the model or the prompt
+  template misses.
+- Pluggable backends: in-process LRU ("memory") or a local SQLite file
+  ("sqlite", shared by the workers of one host and kept across restarts).
+- Concurrent identical prompts share one Bedrock call, also across event loops
+  (the main loop and the Strands bridge loop).
+- Routes listed in LLM_CACHE_DISABLED_ROUTES always call the model.
+- Hits/misses/bypasses are counted in get_stats() and exported on /metrics.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Tuple
+
+from app.mutil_agent.config import (
+    LLM_CACHE_BACKEND,
+    LLM_CACHE_DISABLED_ROUTES,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_SQLITE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+)
+from app.mutil_agent.utils.metrics import get_metrics_registry
+from app.mutil_agent.utils.tracing import current_span, current_trace
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_REQUESTS = get_metrics_registry().counter(
+    "kmult_llm_cache_requests_total", "LLM response cache lookups", ("namespace", "result")
+)
+_RESULT_LABELS = {"hits": "hit", "misses": "miss", "bypassed": "bypass", "shared": "shared"}
+
+
+class MemoryLRUBackend:
+    """In-process LRU with TTL"""
+
+    blocking = False
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 86400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """Local SQLite file with TTL and least-recently-used eviction"""
+
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int = 512, ttl_seconds: float = 86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_responses_accessed ON llm_responses (accessed_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        if self.max_entries <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl_seconds, now),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            if count > self.max_entries:
+                excess = count - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM llm_responses WHERE key IN"
+                    " (SELECT key FROM llm_responses ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                )
+                self.evictions += excess
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+
+class LLMResponseCache:
+    """Prompt-level completion cache in front of BedrockService"""
+
+    # Bump when cached text changes meaning (e.g. response post-processing) to invalidate old entries
+    CACHE_VERSION = 2
+
+    def __init__(self, backend=None, disabled_routes: Iterable[str] = ()):
+        self.backend = backend  # None disables caching
+        self.disabled_routes = frozenset(route.strip() for route in disabled_routes if route.strip())
+        # concurrent Futures, not asyncio ones: callers run on the main loop and on the Strands bridge loop
+        self._inflight: Dict[str, Future] = {}
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0, "shared": 0}
+
+    @classmethod
+    def make_key(cls, bedrock_service, prompt: Any) -> str:
+        """Cache key over model ID, decoding parameters and the prompt"""
+        material = json.dumps(
+            {
+                "v": cls.CACHE_VERSION,
+                "model_id": bedrock_service.model_id,
+                "temperature": bedrock_service.temperature,
+                "top_p": bedrock_service.top_p,
+                "max_tokens": bedrock_service.max_tokens,
+                "prompt": prompt if isinstance(prompt, str) else repr(prompt),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    @property
+    def enabled(self) -> bool:
+        """Caching applies to the current request (backend configured and route not opted out)"""
+        if self.backend is None:
+            return False
+        request_trace = current_trace()
+        return not (request_trace is not None and request_trace.route in self.disabled_routes)
+
+    async def complete(
+        self,
+        bedrock_service,
+        prompt: Any,
+        extract: Callable[[Any], str],
+        namespace: str = "default",
+    ) -> str:
+        """
+        Completion text for prompt, from the cache or from bedrock_service.ai_ainvoke
+
+        Args:
+            bedrock_service: BedrockService whose model/decoding parameters key the entry
+            prompt: Prompt passed to ai_ainvoke
+            extract: Turns the model response into the text that is cached and returned
+            namespace: Call site label for metrics (e.g. "summary.chunk")
+
+        Errors are not cached (extract must raise rather than return an error
+        message); blank completions are returned but not stored.
+        """
+        if not self.enabled:
+            self._count(namespace, "bypassed")
+            return extract(await bedrock_service.ai_ainvoke(prompt))
+
+        key = self.make_key(bedrock_service, prompt)
+        cached = await self._get(key)
+        if cached is not None:
+            self._count(namespace, "hits")
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # Identical prompt already being generated (e.g. duplicate chunks): share its result
+            self._count(namespace, "shared")
+            try:
+                return await asyncio.shield(asyncio.wrap_future(inflight))
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # This caller was cancelled
+                # The generating request went away; generate for this caller instead
+
+        self._count(namespace, "misses")
+        future: Future = Future()
+        self._inflight[key] = future
+        try:
+            text = extract(await bedrock_service.ai_ainvoke(prompt))
+            if text and text.strip():
+                await self._set(key, text)
+            future.set_result(text)
+            return text
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def stream(
+        self,
+        bedrock_service,
+        prompt: Any,
+        stream: Callable[[], AsyncIterator[str]],
+        namespace: str = "default",
+    ) -> AsyncIterator[str]:
+        """
+        Stream text deltas for prompt; a cached completion is yielded as one delta
+
+        The streamed text is stored only if the stream is consumed to the end.
+        """
+        if not self.enabled:
+            self._count(namespace, "bypassed")
+            async for delta in stream():
+                yield delta
+            return
+
+        key = self.make_key(bedrock_service, prompt)
+        cached = await self._get(key)
+        if cached is not None:
+            self._count(namespace, "hits")
+            yield cached
+            return
+
+        self._count(namespace, "misses")
+        parts = []
+        async for delta in stream():
+            parts.append(delta)
+            yield delta
+        text = "".join(parts)
+        if text.strip():
+            await self._set(key, text)
+
+    def clear(self) -> None:
+        """Drop all cached completions"""
+        if self.backend is not None:
+            self.backend.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self._stats["hits"] + self._stats["misses"] + self._stats["shared"]
+        return {
+            **self._stats,
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "entries": self.backend.size() if self.backend is not None else 0,
+            "evictions": getattr(self.backend, "evictions", 0),
+            "disabled_routes": sorted(self.disabled_routes),
+            "hit_rate": round((self._stats["hits"] + self._stats["shared"]) / lookups, 3) if lookups else 0.0,
+        }
+
+    def _count(self, namespace: str, stat: str) -> None:
+        self._stats[stat] += 1
+        LLM_CACHE_REQUESTS.inc(namespace=namespace, result=_RESULT_LABELS[stat])
+        span = current_span()
+        if span is not None:
+            span.set_attribute("llm_cache", _RESULT_LABELS[stat])
+
+    async def _get(self, key: str) -> Optional[str]:
+        try:
+            if self.backend.blocking:
+                return await asyncio.to_thread(self.backend.get, key)
+            return self.backend.get(key)
+        except Exception as e:  # A broken cache must never fail the request
+            logger.warning(f"LLM response cache read failed: {e}")
+            return None
+
+    async def _set(self, key: str, value: str) -> None:
+        try:
+            if self.backend.blocking:
+                await asyncio.to_thread(self.backend.set, key, value)
+            else:
+                self.backend.set(key, value)
+        except Exception as e:
+            logger.warning(f"LLM response cache write failed: {e}")
+
+
+def create_llm_cache_backend(
+    backend: str,
+    max_entries: int,
+    ttl_seconds: float,
+    sqlite_path: str,
+):
+    """Backend for LLM_CACHE_BACKEND ("memory", "sqlite" or "none")"""
+    name = (backend or "none").strip().lower()
+    if name == "memory":
+        return MemoryLRUBackend(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if name == "sqlite":
+        try:
+            return SQLiteBackend(sqlite_path, max_entries=max_entries, ttl_seconds=ttl_seconds)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"SQLite LLM cache unavailable ({sqlite_path}): {e}; using the memory backend")
+            return MemoryLRUBackend(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if name not in ("none", "off", ""):
+        logger.warning(f"Unknown LLM_CACHE_BACKEND {backend!r}; LLM response caching disabled")
+    return None
+
+
+_llm_response_cache: Optional[LLMResponseCache] = None
+_llm_response_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """
+    Get the process-wide LLM response cache
+
+    Returns:
+        LLMResponseCache instance configured from environment variables
+    """
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        with _llm_response_cache_lock:
+            if _llm_response_cache is None:
+                _llm_response_cache = LLMResponseCache(
+                    backend=create_llm_cache_backend(
+                        LLM_CACHE_BACKEND,
+                        max_entries=LLM_CACHE_MAX_ENTRIES,
+                        ttl_seconds=LLM_CACHE_TTL_SECONDS,
+                        sqlite_path=LLM_CACHE_SQLITE_PATH,
+                    ),
+                    disabled_routes=LLM_CACHE_DISABLED_ROUTES.split(","),
+                )
+    return _llm_response_cache
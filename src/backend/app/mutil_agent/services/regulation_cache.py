@@ -0,0 +1,266 @@
+"""
+Response cache for UCP 600 knowledge base queries
+Regulation lookups repeat heavily (the same article questions for every
+invoice or B/L), so answers are cached in-process, keyed by document type
+(or query kind) and the normalized query text, with TTL and LRU eviction.
+
+Optional near-duplicate mode matches rephrased queries ("UCP 600 article 18?"
+vs "ucp600 Article 18") with MinHash signatures over word shingles, bucketed
+by LSH bands so a lookup only compares against likely candidates. Queries
+whose numbers differ (article numbers, amounts, dates) never match, however
+similar the rest of the text is.
+"""
+
+import logging
+import random
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from app.mutil_agent.config import (
+    REGULATION_CACHE_MAX_ENTRIES,
+    REGULATION_CACHE_NEAR_DUPLICATE,
+    REGULATION_CACHE_SIMILARITY,
+    REGULATION_CACHE_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r"[^\w]+")
+_NUMBER = re.compile(r"\d+")
+# Split letter/digit runs so "ucp600" and "ucp 600" normalize the same
+_LETTER_DIGIT = re.compile(r"(?<=[^\W\d_])(?=\d)|(?<=\d)(?=[^\W\d_])")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold, NFC-normalize and strip punctuation/extra whitespace from a query"""
+    text = unicodedata.normalize("NFC", query).casefold()
+    text = _LETTER_DIGIT.sub(" ", text)
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+class MinHasher:
+    """MinHash signatures over word unigrams and bigrams"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+    @staticmethod
+    def shingles(normalized: str) -> Set[str]:
+        words = normalized.split()
+        return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+    def signature(self, normalized: str) -> Tuple[int, ...]:
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in self.shingles(normalized)]
+        if not hashes:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        )
+
+    @staticmethod
+    def similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of the underlying shingle sets"""
+        return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+@dataclass
+class _CacheEntry:
+    value: Dict[str, Any]
+    expires_at: float
+    namespace: str
+    numbers: FrozenSet[str]
+    signature: Optional[Tuple[int, ...]] = None
+
+
+class RegulationResponseCache:
+    """TTL + LRU cache for knowledge base answers, with optional near-duplicate matching"""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600,
+        near_duplicate: bool = False,
+        similarity_threshold: float = 0.85,
+        num_perm: int = 64,
+        bands: int = 16,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.near_duplicate = near_duplicate
+        self.similarity_threshold = similarity_threshold
+
+        self._entries: "OrderedDict[Tuple[str, str], _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "near_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+        if near_duplicate:
+            if num_perm % bands:
+                raise ValueError("num_perm must be a multiple of bands")
+            self._hasher = MinHasher(num_perm)
+            self._bands = bands
+            self._rows = num_perm // bands
+            self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[Tuple[str, str]]] = {}
+
+    def get(self, namespace: str, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached answer
+
+        Args:
+            namespace: Document type or query kind the answer belongs to
+            query: Query text as sent to the knowledge base
+
+        Returns:
+            Copy of the cached response, or None on a miss
+        """
+        normalized = normalize_query(query)
+        key = (namespace, normalized)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._live_entry_locked(key, now)
+            if entry is not None:
+                self._stats["hits"] += 1
+                return dict(entry.value)
+
+            if self.near_duplicate:
+                entry = self._near_duplicate_locked(namespace, normalized, now)
+                if entry is not None:
+                    self._stats["near_hits"] += 1
+                    return dict(entry.value)
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, namespace: str, query: str, value: Dict[str, Any]) -> None:
+        """Store a knowledge base answer"""
+        if self.max_entries <= 0:
+            return
+        normalized = normalize_query(query)
+        key = (namespace, normalized)
+        entry = _CacheEntry(
+            value=dict(value),
+            expires_at=time.monotonic() + self.ttl_seconds,
+            namespace=namespace,
+            numbers=frozenset(_NUMBER.findall(normalized)),
+        )
+        if self.near_duplicate:
+            entry.signature = self._hasher.signature(normalized)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            self._entries[key] = entry
+            if entry.signature is not None:
+                for band in self._band_keys(namespace, entry.signature):
+                    self._buckets.setdefault(band, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove_locked(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            if self.near_duplicate:
+                self._buckets.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["near_hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "near_duplicate": self.near_duplicate,
+                "hit_rate": round((lookups - self._stats["misses"]) / lookups, 3) if lookups else 0.0,
+            }
+
+    def _live_entry_locked(self, key: Tuple[str, str], now: float) -> Optional[_CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._remove_locked(key)
+            self._stats["expirations"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _near_duplicate_locked(self, namespace: str, normalized: str, now: float) -> Optional[_CacheEntry]:
+        signature = self._hasher.signature(normalized)
+        numbers = frozenset(_NUMBER.findall(normalized))
+
+        candidates: Set[Tuple[str, str]] = set()
+        for band in self._band_keys(namespace, signature):
+            candidates.update(self._buckets.get(band, ()))
+
+        best_key, best_score = None, self.similarity_threshold
+        for key in candidates:
+            entry = self._entries[key]
+            if entry.numbers != numbers:
+                continue
+            score = MinHasher.similarity(signature, entry.signature)
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None
+        entry = self._live_entry_locked(best_key, now)
+        if entry is not None:
+            logger.debug(f"Regulation cache near-duplicate hit (similarity {best_score:.2f})")
+        return entry
+
+    def _band_keys(self, namespace: str, signature: Tuple[int, ...]) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        rows = self._rows
+        return [(namespace, band, signature[band * rows:(band + 1) * rows]) for band in range(self._bands)]
+
+    def _remove_locked(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key)
+        if entry.signature is not None:
+            for band in self._band_keys(entry.namespace, entry.signature):
+                bucket = self._buckets.get(band)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._buckets[band]
+
+
+_regulation_cache: Optional[RegulationResponseCache] = None
+_regulation_cache_lock = threading.Lock()
+
+
+def get_regulation_cache() -> RegulationResponseCache:
+    """
+    Get the process-wide regulation response cache
+
+    Returns:
+        RegulationResponseCache instance configured from environment variables
+    """
+    global _regulation_cache
+    if _regulation_cache is None:
+        with _regulation_cache_lock:
+            if _regulation_cache is None:
+                _regulation_cache = RegulationResponseCache(
+                    max_entries=REGULATION_CACHE_MAX_ENTRIES,
+                    ttl_seconds=REGULATION_CACHE_TTL_SECONDS,
+                    near_duplicate=REGULATION_CACHE_NEAR_DUPLICATE,
+                    similarity_threshold=REGULATION_CACHE_SIMILARITY,
+                )
+    return _regulation_cache
@@ -2,6 +2,8 @@ from app.mutil_agent.models.risk import (
     RiskAssessmentRequest, RiskAssessmentResponse, RiskMonitorResponse, RiskAlertRequest, RiskScoreHistoryResponse, MarketDataResponse, Threat
 )
 from app.mutil_agent.services.bedrock_service import BedrockService
+from app.mutil_agent.services.credit_scoring import SCORE_MAX, describe_factors, score_applicant
+from app.mutil_agent.services.service_registry import get_service
 from app.mutil_agent.config import (
     MODEL_MAPPING,
     CONVERSATION_CHAT_MODEL_NAME,
@@ -11,81 +13,48 @@ from app.mutil_agent.config import (
 )
 import datetime
 import json
-import random
 import re
 import html
 
-# Khởi tạo BedrockService giống text_service
-model_name = CONVERSATION_CHAT_MODEL_NAME or "claude-37-sonnet"
+def create_risk_bedrock_service() -> BedrockService:
+    """Khởi tạo BedrockService giống text_service (created on first use via the service registry)"""
+    model_name = CONVERSATION_CHAT_MODEL_NAME or "claude-37-sonnet"
 
-# Handle the specific problematic model ID directly
-if model_name == "anthropic.claude-3-5-sonnet-20241022-v2:0":
-    model_name = "claude-37-sonnet"
-temperature = float(CONVERSATION_CHAT_TEMPERATURE or "0.6")
-top_p = float(CONVERSATION_CHAT_TOP_P or "0.6")
-max_tokens = int(LLM_MAX_TOKENS or "8192")
-if model_name in MODEL_MAPPING:
-    bedrock_model_id = MODEL_MAPPING[model_name]
-else:
-    bedrock_model_id = MODEL_MAPPING["claude-37-sonnet"]
+    # Handle the specific problematic model ID directly
+    if model_name == "anthropic.claude-3-5-sonnet-20241022-v2:0":
+        model_name = "claude-37-sonnet"
+    temperature = float(CONVERSATION_CHAT_TEMPERATURE or "0.6")
+    top_p = float(CONVERSATION_CHAT_TOP_P or "0.6")
+    max_tokens = int(LLM_MAX_TOKENS or "8192")
+    if model_name in MODEL_MAPPING:
+        bedrock_model_id = MODEL_MAPPING[model_name]
+    else:
+        bedrock_model_id = MODEL_MAPPING["claude-37-sonnet"]
 
-bedrock_service = BedrockService(
-    model_id=bedrock_model_id,
-    temperature=temperature,
-    top_p=top_p,
-    max_tokens=max_tokens
-)
+    return BedrockService(
+        model_id=bedrock_model_id,
+        temperature=temperature,
+        top_p=top_p,
+        max_tokens=max_tokens,
+        agent="risk_assessment",
+    )
 
 async def call_claude_sonnet(prompt: str) -> str:
-    response = await bedrock_service.ai_ainvoke(prompt)
+    response = await get_service("risk_bedrock_service").ai_ainvoke(prompt)
     # Nếu response là dict hoặc object, lấy text phù hợp
     if isinstance(response, dict):
         return response.get("completion") or response.get("result") or str(response)
     return str(response)
 
 async def assess_risk(request: RiskAssessmentRequest) -> dict:
-    # Thêm creditScore random, creditRank theo bảng, scoringDate là hôm nay
-    credit_score = random.randint(403, 706)
-    # Xác định rank theo bảng
-    def get_credit_rank(score):
-        if 403 <= score <= 429:
-            return 10
-        elif 430 <= score <= 454:
-            return 9
-        elif 455 <= score <= 479:
-            return 8
-        elif 480 <= score <= 544:
-            return 7
-        elif 545 <= score <= 571:
-            return 6
-        elif 572 <= score <= 587:
-            return 5
-        elif 588 <= score <= 605:
-            return 4
-        elif 606 <= score <= 621:
-            return 3
-        elif 622 <= score <= 644:
-            return 2
-        elif 645 <= score <= 706:
-            return 1
-        return None
-    credit_rank = get_credit_rank(credit_score)
+    # Điểm tín dụng từ scorecard nội bộ (tất định), scoringDate là hôm nay
+    credit = score_applicant(request.model_dump())
+    credit_score = credit.score
+    credit_rank = credit.rank
     scoring_date = datetime.datetime.now().strftime('%d/%m/%Y')
-    # Bảng nhận xét hạng điểm tín dụng
-    rank_comments = {
-        10: "Xấu: Khách hàng không đủ điều kiện vay vốn tại hầu hết ngân hàng.",
-        9: "Xấu: Rủi ro cao, bị từ chối vay vốn, cần cải thiện tín dụng.",
-        8: "Dưới trung bình: Khó vay vốn, chỉ có thể vay tại công ty tài chính, lãi suất cao.",
-        7: "Dưới trung bình: Có thể vay vốn với hạn mức thấp, yêu cầu bổ sung hồ sơ nhiều.",
-        6: "Trung bình: Một số ngân hàng vẫn từ chối, cần tăng điểm để cải thiện cơ hội vay.",
-        5: "Trung bình: Vay vốn khó tại ngân hàng lớn, có thể mở thẻ tín dụng hạn mức thấp.",
-        4: "Tốt: Có thể được duyệt vay vốn với điều kiện chứng minh tài chính rõ ràng.",
-        3: "Tốt: Dễ dàng vay vốn tín chấp hoặc thế chấp, mở thẻ tín dụng dễ.",
-        2: "Rất tốt: Khả năng vay vốn cao, lãi suất tốt, nhiều ưu đãi từ ngân hàng.",
-        1: "Rất tốt: Dễ duyệt vay vốn lớn, mở thẻ tín dụng cao cấp, được ưu đãi tín dụng."
-    }
-    rank_comment = rank_comments.get(credit_rank, "")
-    # Chèn creditScore và nhận xét vào prompt với danh nghĩa là điểm tín dụng CIC
+    rank_comment = credit.rank_comment
+    score_factors = "\n".join(f"  + {line}" for line in describe_factors(credit.factors))
+    # Chèn creditScore, các yếu tố chấm điểm và nhận xét vào prompt
     prompt = f"""
 Bạn là chuyên gia thẩm định tín dụng ngân hàng. Dựa trên hồ sơ khách hàng dưới đây, hãy phân tích chi tiết và trình bày kết quả theo các mục sau (không trả về JSON, không markdown, đúng các format mục ##1. ,...):
 ##1. Tóm tắt hồ sơ khách hàng:(có gạch đầu dòng)
@@ -109,7 +78,9 @@ Hồ sơ khách hàng: (đúng format như bên dưới, có gạch đầu dòng
 - Thông tin tài chính: {json.dumps(request.financials, ensure_ascii=False)}
 - Dữ liệu thị trường: {json.dumps(request.market_data, ensure_ascii=False)}
 - Yếu tố khác: {json.dumps(request.custom_factors, ensure_ascii=False)}
-- Điểm tín dụng CIC: {credit_score} (phải chú thích: dựa trên dữ liệu từ CIC tra cứu bằng CCCD của khách hàng)
+- Điểm tín dụng: {credit_score}/{SCORE_MAX}, hạng {credit_rank}/10 (phải chú thích: chấm điểm bằng scorecard nội bộ từ thông tin tài chính, số tiền vay, kỳ hạn và tài sản đảm bảo)
+- Các yếu tố chấm điểm:
+{score_factors}
 - Nhận xét điểm tín dụng: {rank_comment}
 
 {f"**TÀI LIỆU TÀI CHÍNH ĐÍNH KÈM:**\n{request.financial_documents}\n" if request.financial_documents else ""}
@@ -259,9 +230,13 @@ Hồ sơ khách hàng: (đúng format như bên dưới, có gạch đầu dòng
     match = re.search(r"đ[oơ]ng[\s\-\_\.,]*y", norm)
     approved = bool(match)
     sections["approved"] = approved
-    # Thêm creditScore random, creditRank theo bảng, scoringDate là hôm nay
+    # Thêm creditScore, creditRank, các yếu tố chấm điểm và scoringDate
     sections["creditScore"] = credit_score
     sections["creditRank"] = credit_rank
+    sections["scoreFactors"] = credit.factors
+    if not credit.uses_financials:
+        # E.g. /assess-file: the uploaded documents only reach the AI report, not the scorecard
+        sections["scoreNote"] = "Điểm tín dụng chỉ dựa trên kỳ hạn vay và tài sản đảm bảo (không có số liệu tài chính)"
     sections["scoringDate"] = scoring_date
     return sections
 
@@ -0,0 +1,173 @@
+"""
+Lazy service registry
+Heavy services (Bedrock clients, Strands agents, AI-backed services) are
+created on first use instead of at import time, so workers start quickly.
+
+Factories are registered as "module:attribute" paths and are only imported
+when the service is first requested, which keeps modules like strands,
+langchain_aws and boto3 out of the import graph until they are needed.
+The application lifespan can warm selected services up in the background
+(SERVICE_WARMUP) so the first request does not pay the initialization cost.
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+Factory = Union[str, Callable[[], Any]]
+
+# Services known to the application; factories are resolved lazily
+DEFAULT_SERVICES: Dict[str, str] = {
+    "bedrock_runtime": "app.mutil_agent.config:create_bedrock_runtime_client",
+    "bedrock_knowledgebase": "app.mutil_agent.config:create_bedrock_knowledgebase_client",
+    "compliance_service": "app.mutil_agent.services.compliance_service:ComplianceValidationService",
+    "text_service": "app.mutil_agent.services.text_service:TextSummaryService",
+    "risk_bedrock_service": "app.mutil_agent.services.risk_service:create_risk_bedrock_service",
+    "strands_agent_service": "app.mutil_agent.services.strands_agent_service:StrandsAgentService",
+    "strands_supervisor_agent": "app.mutil_agent.agents.strands_tools:create_supervisor_agent",
+    "strands_boto_session": "app.mutil_agent.agents.pure_strands_vpbank_system:create_boto_session",
+    "pure_strands_supervisor_agent": "app.mutil_agent.agents.pure_strands_vpbank_system:create_supervisor_agent",
+    "pure_strands_system": "app.mutil_agent.agents.pure_strands_vpbank_system:PureStrandsVPBankSystem",
+}
+
+
+def _resolve(factory: Factory) -> Callable[[], Any]:
+    if callable(factory):
+        return factory
+    module_name, _, attribute = factory.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class ServiceRegistry:
+    """Process-wide registry of lazily created singletons"""
+
+    def __init__(self):
+        self._factories: Dict[str, Factory] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._init_seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Factory) -> None:
+        """
+        Register a service factory
+
+        Args:
+            name: Service name used with get()
+            factory: Zero-argument callable, or "module:attribute" path to one
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._locks.setdefault(name, threading.Lock())
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """
+        Get a service, creating it on first use
+
+        Concurrent first calls for the same service wait for a single
+        initialization; different services initialize independently.
+        """
+        if name in self._instances:
+            return self._instances[name]
+
+        lock = self._locks.get(name)
+        if lock is None:
+            raise KeyError(f"Unknown service: {name}")
+        with lock:
+            if name not in self._instances:
+                started = time.perf_counter()
+                try:
+                    self._instances[name] = _resolve(self._factories[name])()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+                self._init_seconds[name] = time.perf_counter() - started
+                self._errors.pop(name, None)
+                logger.info(f"Initialized service '{name}' in {self._init_seconds[name]:.2f}s")
+        return self._instances[name]
+
+    def is_initialized(self, name: str) -> bool:
+        return name in self._instances
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._factories)
+
+    async def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Initialize services ahead of the first request
+
+        Factories run in worker threads so the event loop keeps serving
+        requests (and health checks) while services load. Failures are
+        logged and reported, never raised: the service is retried on first use.
+
+        Args:
+            names: Services to initialize (all registered services when None)
+
+        Returns:
+            Per-service outcome: init seconds or error message
+        """
+        names = list(names) if names is not None else self.names
+        unknown = [name for name in names if name not in self._factories]
+        if unknown:
+            logger.warning(f"Ignoring unknown services in warm-up: {unknown}")
+        names = [name for name in names if name in self._factories]
+
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(
+            *(asyncio.to_thread(self.get, name) for name in names), return_exceptions=True
+        )
+        report = {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(f"Warm-up of service '{name}' failed: {outcome}")
+                report[name] = {"error": str(outcome)}
+            else:
+                report[name] = {"init_seconds": round(self._init_seconds.get(name, 0.0), 3)}
+        logger.info(f"Service warm-up finished in {time.perf_counter() - started:.2f}s: {sorted(report)}")
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Initialization state of every registered service"""
+        return {
+            name: {
+                "initialized": name in self._instances,
+                "init_seconds": round(self._init_seconds[name], 3) if name in self._init_seconds else None,
+                "last_error": self._errors.get(name),
+            }
+            for name in self._factories
+        }
+
+
+_service_registry: Optional[ServiceRegistry] = None
+_service_registry_lock = threading.Lock()
+
+
+def get_service_registry() -> ServiceRegistry:
+    """
+    Get the process-wide service registry
+
+    Returns:
+        ServiceRegistry with the default application services registered
+    """
+    global _service_registry
+    if _service_registry is None:
+        with _service_registry_lock:
+            if _service_registry is None:
+                registry = ServiceRegistry()
+                for name, factory in DEFAULT_SERVICES.items():
+                    registry.register(name, factory)
+                _service_registry = registry
+    return _service_registry
+
+
+def get_service(name: str) -> Any:
+    """Shortcut for get_service_registry().get(name)"""
+    return get_service_registry().get(name)
@@ -15,8 +15,7 @@ from app.mutil_agent.agents.strands_tools import (
     compliance_validation_agent,
     risk_assessment_agent,
     document_intelligence_agent,
-    vpbank_supervisor_agent,
-    supervisor_agent
+    vpbank_supervisor_agent
 )
 
 # Initialize logging
@@ -358,7 +357,3 @@ class StrandsAgentService:
                 "framework": "strands_agents_sdk"
             }
         }
-
-
-# Global service instance
-strands_service = StrandsAgentService()
@@ -1,25 +1,18 @@
 import os
 import logging
 import asyncio
-import aiohttp
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
 from io import BytesIO
 import re
 
-# Document processing libraries
-try:
-    import PyPDF2
-    import docx
-except ImportError as e:
-    logging.warning(f"Document processing libraries not available: {e}")
-
 from app.mutil_agent.services.bedrock_service import BedrockService
+from app.mutil_agent.services.llm_response_cache import get_llm_response_cache
 from app.mutil_agent.helpers.improved_pdf_extractor import ImprovedPDFExtractor
 from app.mutil_agent.helpers.dynamic_summary_config import DynamicSummaryConfig
+from app.mutil_agent.utils.tracing import traced
 
 from app.mutil_agent.config import (
-    BEDROCK_RT, 
     MODEL_MAPPING, 
     CONVERSATION_CHAT_MODEL_NAME,
     CONVERSATION_CHAT_TOP_P,
@@ -40,6 +33,7 @@ class TextSummaryService:
         Initialize the Text Summary Service with AI models
         """
         self.bedrock_service = None
+        self.response_cache = get_llm_response_cache()
         
         # Get model configuration from environment
         model_name = CONVERSATION_CHAT_MODEL_NAME or "claude-37-sonnet"
@@ -63,7 +57,8 @@ class TextSummaryService:
                     model_id=bedrock_model_id,
                     temperature=temperature,
                     top_p=top_p,
-                    max_tokens=max_tokens
+                    max_tokens=max_tokens,
+                    agent="text_summary",
                 )
                 logger.info(f"✅ Initialized Bedrock service with {model_name}: {bedrock_model_id}")
             else:
@@ -72,6 +67,7 @@ class TextSummaryService:
             logger.warning(f"Bedrock service not available: {e}")
         
 
+    @traced("text.summarize")
     async def summarize_text(
         self, 
         text: str, 
@@ -85,60 +81,197 @@ class TextSummaryService:
         Performance optimized for VPBank K-MULT banking documents
         """
         try:
-            # Validate input
-            if not text or len(text.strip()) < 50:
-                raise ValueError("Văn bản quá ngắn để tóm tắt (tối thiểu 50 ký tự)")
-            
-            # Clean and prepare text
-            cleaned_text = self._clean_text(text)
-            
-            # Performance optimization: Skip expensive operations for small documents
-            FAST_PROCESSING_THRESHOLD = 10000  # 10K chars - process directly without analysis
-            
-            if len(cleaned_text) < FAST_PROCESSING_THRESHOLD:
-                # Fast path for small documents (most banking documents)
-                logger.info(f"🚀 Fast processing for small document ({len(cleaned_text):,} chars)")
-                return await self._summarize_direct(
-                    cleaned_text, summary_type, max_length, language, None
-                )
-            
-            # Standard processing with analysis for medium documents
-            document_analysis = None
-            if auto_adjust_length:
-                optimal_max_length, analysis = DynamicSummaryConfig.calculate_optimal_max_length(
-                    cleaned_text, summary_type, max_length
-                )
-                
-                # Use optimal length if significantly different from user input
-                if abs(optimal_max_length - max_length) > max_length * 0.5:
-                    logger.info(f"Auto-adjusting max_length: {max_length} → {optimal_max_length}")
-                    max_length = optimal_max_length
-                
-                document_analysis = analysis
-            
-            # Import chunking helper only when needed
-            from app.mutil_agent.helpers.document_chunking_helper import DocumentChunkingHelper
-            
-            # Initialize chunking helper
-            chunking_helper = DocumentChunkingHelper()
+            cleaned_text, max_length, document_analysis, chunking_helper = self._plan_summary(
+                text, summary_type, max_length, auto_adjust_length
+            )
             
-            # Smart chunking decision - now with 100K threshold (doubled from 50K)
-            if chunking_helper.should_chunk_document(cleaned_text):
-                logger.info(f"📚 Large document detected ({len(cleaned_text):,} chars), using optimized chunking approach")
+            if chunking_helper:
                 return await self._summarize_with_chunking(
                     cleaned_text, summary_type, max_length, language, 
                     document_analysis, chunking_helper
                 )
-            else:
-                logger.info(f"📄 Standard document processing ({len(cleaned_text):,} chars) - skipping chunking")
-                return await self._summarize_direct(
-                    cleaned_text, summary_type, max_length, language, document_analysis
-                )
+            return await self._summarize_direct(
+                cleaned_text, summary_type, max_length, language, document_analysis
+            )
                 
         except Exception as e:
             logger.error(f"Error in text summarization: {str(e)}")
             raise
 
+    @traced("text.stream_summary")
+    async def stream_summary(
+        self,
+        text: str,
+        summary_type: str = "general",
+        max_length: int = 3000,
+        language: str = "vietnamese",
+        auto_adjust_length: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of summarize_text
+        
+        Yields events as they become available:
+        - {"event": "start", "data": {...}}: processing plan
+        - {"event": "chunk_summary", "data": {...}}: one chunk summary (completion order)
+        - {"event": "summary_delta", "data": {"text": ...}}: final summary tokens
+        - {"event": "complete", "data": {...}}: same payload as summarize_text
+        """
+        if not self.bedrock_service:
+            raise ValueError("Không có AI service nào khả dụng để tóm tắt")
+        
+        cleaned_text, max_length, document_analysis, chunking_helper = self._plan_summary(
+            text, summary_type, max_length, auto_adjust_length
+        )
+        start_time = time.time()
+        
+        if not chunking_helper:
+            yield {"event": "start", "data": {"processing_method": "direct_ai_stream", "original_length": len(cleaned_text)}}
+            
+            prompt = self._generate_summary_prompt(
+                text=cleaned_text,
+                summary_type=summary_type,
+                max_length=max_length,
+                language=language
+            )
+            parts = []
+            async for delta in self._stream_completion(prompt, namespace="summary.direct"):
+                parts.append(delta)
+                yield {"event": "summary_delta", "data": {"text": delta}}
+            
+            summary = "".join(parts).strip()
+            if not summary:
+                raise ValueError("Không có AI service nào khả dụng để tóm tắt")
+            
+            yield {"event": "complete", "data": self._build_direct_response(
+                cleaned_text, summary, summary_type, max_length, language,
+                "bedrock_claude", time.time() - start_time, document_analysis,
+                processing_method="direct_ai_stream"
+            )}
+            return
+        
+        # Map: chunk summaries are emitted as soon as each one completes
+        chunking_result = chunking_helper.chunk_document(cleaned_text, preserve_structure=True)
+        total_chunks = len(chunking_result.chunks)
+        yield {"event": "start", "data": {
+            "processing_method": "chunked_bedrock_stream",
+            "original_length": len(cleaned_text),
+            "total_chunks": total_chunks
+        }}
+        
+        chunk_summaries = [""] * total_chunks
+        completed = 0
+        async for chunk_id, chunk_summary in chunking_helper.iter_chunk_summaries(
+            chunking_result.chunks, self.bedrock_service, summary_type, language
+        ):
+            chunk_summaries[chunk_id] = chunk_summary
+            completed += 1
+            yield {"event": "chunk_summary", "data": {
+                "chunk_id": chunk_id,
+                "summary": chunk_summary,
+                "completed": completed,
+                "total_chunks": total_chunks
+            }}
+        
+        # Reduce: final summary streamed token by token
+        if total_chunks > 1:
+            prompt, combined = chunking_helper.prepare_final_prompt(
+                chunk_summaries, summary_type, max_length, language, len(cleaned_text)
+            )
+            parts = []
+            if prompt is None:
+                parts.append(chunking_helper.NO_SUMMARY_MESSAGE)
+                yield {"event": "summary_delta", "data": {"text": parts[-1]}}
+            else:
+                try:
+                    async for delta in self._stream_completion(prompt, namespace="summary.final"):
+                        parts.append(delta)
+                        yield {"event": "summary_delta", "data": {"text": delta}}
+                except Exception as e:
+                    if parts:
+                        raise
+                    logger.error(f"❌ Final summary stream failed: {e}")
+                    parts.append(chunking_helper.fallback_final_summary(combined, max_length))
+                    yield {"event": "summary_delta", "data": {"text": parts[-1]}}
+            final_summary = "".join(parts).strip()
+        else:
+            final_summary = chunk_summaries[0] if chunk_summaries else "Không thể tạo tóm tắt."
+            yield {"event": "summary_delta", "data": {"text": final_summary}}
+        
+        yield {"event": "complete", "data": self._build_chunked_response(
+            cleaned_text, final_summary, chunk_summaries, chunking_result, chunking_helper,
+            summary_type, max_length, language, time.time() - start_time, document_analysis,
+            processing_method="chunked_bedrock_stream"
+        )}
+
+    @traced("text.plan_chunks")
+    def _plan_summary(
+        self,
+        text: str,
+        summary_type: str,
+        max_length: int,
+        auto_adjust_length: bool
+    ) -> Tuple[str, int, Optional[Dict], Optional[Any]]:
+        """
+        Clean text and decide how to summarize it
+        
+        Returns:
+            (cleaned_text, max_length, document_analysis, chunking_helper);
+            chunking_helper is None when the document is summarized directly
+        """
+        # Validate input
+        if not text or len(text.strip()) < 50:
+            raise ValueError("Văn bản quá ngắn để tóm tắt (tối thiểu 50 ký tự)")
+        
+        # Clean and prepare text
+        cleaned_text = self._clean_text(text)
+        
+        # Performance optimization: Skip expensive operations for small documents
+        FAST_PROCESSING_THRESHOLD = 10000  # 10K chars - process directly without analysis
+        
+        if len(cleaned_text) < FAST_PROCESSING_THRESHOLD:
+            # Fast path for small documents (most banking documents)
+            logger.info(f"🚀 Fast processing for small document ({len(cleaned_text):,} chars)")
+            return cleaned_text, max_length, None, None
+        
+        # Standard processing with analysis for medium documents
+        document_analysis = None
+        if auto_adjust_length:
+            optimal_max_length, analysis = DynamicSummaryConfig.calculate_optimal_max_length(
+                cleaned_text, summary_type, max_length
+            )
+            
+            # Use optimal length if significantly different from user input
+            if abs(optimal_max_length - max_length) > max_length * 0.5:
+                logger.info(f"Auto-adjusting max_length: {max_length} → {optimal_max_length}")
+                max_length = optimal_max_length
+            
+            document_analysis = analysis
+        
+        # Import chunking helper only when needed
+        from app.mutil_agent.helpers.document_chunking_helper import DocumentChunkingHelper
+        
+        # Initialize chunking helper
+        chunking_helper = DocumentChunkingHelper()
+        
+        # Smart chunking decision - now with 100K threshold (doubled from 50K)
+        if chunking_helper.should_chunk_document(cleaned_text):
+            logger.info(f"📚 Large document detected ({len(cleaned_text):,} chars), using optimized chunking approach")
+            return cleaned_text, max_length, document_analysis, chunking_helper
+        
+        logger.info(f"📄 Standard document processing ({len(cleaned_text):,} chars) - skipping chunking")
+        return cleaned_text, max_length, document_analysis, None
+
+    async def _stream_completion(self, prompt: str, namespace: str) -> AsyncIterator[str]:
+        """Stream text deltas for prompt from Bedrock (a cached completion arrives as one delta)"""
+        async def stream():
+            async for chunk in self.bedrock_service.ai_astream(prompt):
+                delta = self.bedrock_service.ai_chunk_stream(chunk)
+                if delta:
+                    yield delta
+        
+        async for delta in self.response_cache.stream(self.bedrock_service, prompt, stream, namespace=namespace):
+            yield delta
+
     async def _summarize_with_chunking(
         self,
         text: str,
@@ -164,8 +297,7 @@ class TextSummaryService:
             chunks=chunking_result.chunks,
             bedrock_service=self.bedrock_service,
             summary_type=summary_type,
-            language=language,
-            max_parallel=3
+            language=language
         )
         
         # Step 3: Create final summary
@@ -185,39 +317,10 @@ class TextSummaryService:
         end_time = time.time()
         processing_time = end_time - start_time
         
-        # Get processing statistics
-        processing_stats = chunking_helper.get_processing_stats(chunking_result)
-        processing_stats["actual_processing_time"] = round(processing_time, 2)
-        processing_stats["bedrock_calls_made"] = len(chunk_summaries) + (1 if len(chunking_result.chunks) > 1 else 0)
-        
-        # Prepare response
-        response = {
-            "summary": final_summary,
-            "summary_type": summary_type,
-            "language": language,
-            "original_length": len(text),
-            "summary_length": len(final_summary),
-            "compression_ratio": round(len(text) / len(final_summary), 2) if final_summary else 0,
-            "word_count": {
-                "original": len(text.split()),
-                "summary": len(final_summary.split()) if final_summary else 0
-            },
-            "max_length_used": max_length,
-            "processing_method": "chunked_bedrock_processing",
-            "model_used": "bedrock_claude",
-            "processing_time": round(processing_time, 2),
-            "processing_stats": processing_stats,
-            "chunk_summaries": chunk_summaries,
-            "chunking_info": {
-                "total_chunks": chunking_result.total_chunks,
-                "avg_chunk_size": chunking_result.avg_chunk_size,
-                "strategy": chunking_result.processing_strategy
-            }
-        }
-        
-        # Add document analysis if available
-        if document_analysis:
-            response["document_analysis"] = document_analysis
+        response = self._build_chunked_response(
+            text, final_summary, chunk_summaries, chunking_result, chunking_helper,
+            summary_type, max_length, language, processing_time, document_analysis
+        )
         
         logger.info(f"✅ Chunked summarization complete: {processing_time:.2f}s, {len(chunking_result.chunks)} chunks")
         return response
@@ -249,8 +352,9 @@ class TextSummaryService:
         if self.bedrock_service:
             try:
                 logger.info("🤖 Using Bedrock service for summarization")
-                response = await self.bedrock_service.ai_ainvoke(prompt)
-                summary = self._extract_summary_from_response(response)
+                summary = await self.response_cache.complete(
+                    self.bedrock_service, prompt, self._extract_summary_from_response, namespace="summary.direct"
+                )
                 model_used = "bedrock_claude"
                 logger.info(f"✅ Bedrock summarization successful: {len(summary)} characters")
             except Exception as e:
@@ -264,7 +368,76 @@ class TextSummaryService:
         end_time = time.time()
         processing_time = end_time - start_time
         
-        # Prepare response
+        response = self._build_direct_response(
+            text, summary, summary_type, max_length, language,
+            model_used, processing_time, document_analysis
+        )
+        
+        logger.info(f"✅ Direct summarization complete: {processing_time:.2f}s using {model_used}")
+        return response
+
+    def _build_chunked_response(
+        self,
+        text: str,
+        final_summary: str,
+        chunk_summaries: List[str],
+        chunking_result,
+        chunking_helper,
+        summary_type: str,
+        max_length: int,
+        language: str,
+        processing_time: float,
+        document_analysis: Optional[Dict],
+        processing_method: str = "chunked_bedrock_processing"
+    ) -> Dict[str, Any]:
+        """Response payload for chunked (map-reduce) summarization"""
+        # Get processing statistics
+        processing_stats = chunking_helper.get_processing_stats(chunking_result)
+        processing_stats["actual_processing_time"] = round(processing_time, 2)
+        processing_stats["bedrock_calls_made"] = len(chunk_summaries) + (1 if len(chunking_result.chunks) > 1 else 0)
+        
+        response = {
+            "summary": final_summary,
+            "summary_type": summary_type,
+            "language": language,
+            "original_length": len(text),
+            "summary_length": len(final_summary),
+            "compression_ratio": round(len(text) / len(final_summary), 2) if final_summary else 0,
+            "word_count": {
+                "original": len(text.split()),
+                "summary": len(final_summary.split()) if final_summary else 0
+            },
+            "max_length_used": max_length,
+            "processing_method": processing_method,
+            "model_used": "bedrock_claude",
+            "processing_time": round(processing_time, 2),
+            "processing_stats": processing_stats,
+            "chunk_summaries": chunk_summaries,
+            "chunking_info": {
+                "total_chunks": chunking_result.total_chunks,
+                "avg_chunk_size": chunking_result.avg_chunk_size,
+                "strategy": chunking_result.processing_strategy
+            }
+        }
+        
+        # Add document analysis if available
+        if document_analysis:
+            response["document_analysis"] = document_analysis
+        return response
+
+    def _build_direct_response(
+        self,
+        text: str,
+        summary: str,
+        summary_type: str,
+        max_length: int,
+        language: str,
+        model_used: str,
+        processing_time: float,
+        document_analysis: Optional[Dict],
+        processing_method: str = "direct_ai_call"
+    ) -> Dict[str, Any]:
+        """Response payload for single-call summarization"""
         response = {
             "summary": summary,
             "summary_type": summary_type,
@@ -277,7 +450,7 @@ class TextSummaryService:
                 "summary": len(summary.split())
             },
             "max_length_used": max_length,
-            "processing_method": "direct_ai_call",
+            "processing_method": processing_method,
             "model_used": model_used,
             "processing_time": round(processing_time, 2)
         }
@@ -285,25 +458,31 @@ class TextSummaryService:
         # Add document analysis if available
         if document_analysis:
             response["document_analysis"] = document_analysis
-        
-        logger.info(f"✅ Direct summarization complete: {processing_time:.2f}s using {model_used}")
         return response
 
     def _extract_summary_from_response(self, response) -> str:
-        """Extract summary text from AI service response"""
-        try:
-            if hasattr(response, 'content'):
-                return response.content.strip()
-            elif isinstance(response, str):
-                return response.strip()
-            elif isinstance(response, dict):
-                return response.get('content', str(response)).strip()
-            else:
-                return str(response).strip()
-        except Exception as e:
-            logger.error(f"Error extracting summary from response: {e}")
-            return "Lỗi trích xuất kết quả từ AI service"
+        """
+        Extract summary text from AI service response
+        
+        Raises:
+            ValueError: If the response holds no text (never returned as a summary or cached)
+        """
+        if hasattr(response, 'content'):
+            content = response.content
+        elif isinstance(response, dict):
+            content = response.get('content', '')
+        else:
+            content = response
+        if isinstance(content, list):  # Converse content blocks
+            content = "".join(
+                block.get('text', '') if isinstance(block, dict) else str(block) for block in content
+            )
+        summary = str(content).strip()
+        if not summary:
+            raise ValueError("AI service response contains no summary text")
+        return summary
 
+    @traced("document.extract_text")
     async def extract_text_from_document(
         self, 
         file_content: bytes, 
@@ -313,16 +492,20 @@ class TextSummaryService:
     ) -> str:
         """
         Extract text from various document formats
+
+        PDF parsing, OCR and DOCX parsing are blocking: they run in a worker
+        thread so concurrent uploads (batch validation, agent tools) are
+        extracted in parallel instead of stalling the event loop.
         """
         try:
             if file_extension == '.txt':
                 return file_content.decode('utf-8')
             
             elif file_extension == '.pdf':
-                return self._extract_text_from_pdf(file_content, max_pages)
+                return await asyncio.to_thread(self._extract_text_from_pdf, file_content, max_pages)
             
             elif file_extension in ['.docx', '.doc']:
-                return self._extract_text_from_docx(file_content)
+                return await asyncio.to_thread(self._extract_text_from_docx, file_content)
             
             else:
                 raise ValueError(f"Unsupported file format: {file_extension}")
@@ -331,6 +514,7 @@ class TextSummaryService:
             logger.error(f"Error extracting text from {filename}: {str(e)}")
             raise
 
+    @traced("pdf.parse")
     def _extract_text_from_pdf(self, file_content: bytes, max_pages: Optional[int] = None) -> str:
         """
         Extract text from PDF file using ImprovedPDFExtractor
@@ -362,9 +546,12 @@ class TextSummaryService:
             logger.error(f"Error extracting text from PDF: {str(e)}")
             raise
 
+    @traced("docx.parse")
     def _extract_text_from_docx(self, file_content: bytes) -> str:
         """Extract text from DOCX file"""
         try:
+            import docx
+
             doc = docx.Document(BytesIO(file_content))
             text = []
             for paragraph in doc.paragraphs:
@@ -0,0 +1,204 @@
+"""
+Adaptive concurrency limiter (AIMD)
+
+Replaces fixed semaphores and sleep-based rate limiting for Bedrock calls.
+The limit grows additively while calls succeed (about +1 per window of
+successful calls) and is cut multiplicatively when the service throttles,
+so callers converge on the account quota without hand-tuned constants.
+
+The limiter is thread-safe and not bound to one event loop: the FastAPI loop
+and the Strands async bridge loop share the same instance.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+THROTTLING_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceQuotaExceededException",
+    "ServiceUnavailableException",
+}
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """Whether error is a Bedrock/botocore throttling response"""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        code = response.get("Error", {}).get("Code")
+        if code in THROTTLING_ERROR_CODES:
+            return True
+    message = str(error)
+    return any(code in message for code in THROTTLING_ERROR_CODES)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limiter with additive-increase / multiplicative-decrease
+
+    Usage:
+        async with limiter:
+            await call_bedrock()
+
+    or, with throttle retries:
+        result = await limiter.call(lambda: call_bedrock())
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+        name: str = "adaptive-limiter",
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.name = name
+
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+        self._last_decrease = 0.0
+
+        self._successes = 0
+        self._throttles = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight"""
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        """Wait for a free slot (FIFO)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._in_flight < self.limit:
+                self._in_flight += 1
+                return
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove((loop, future))
+                    granted = False
+                except ValueError:
+                    granted = True
+            # A slot handed to us just before cancellation must be returned;
+            # if the future itself was cancelled, _grant returns it instead
+            if granted and future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Return a slot and wake waiters that now fit under the limit"""
+        with self._lock:
+            self._in_flight -= 1
+            self._wake_waiters_locked()
+
+    def on_success(self) -> None:
+        """Additive increase: about +1 slot per limit's worth of successes"""
+        with self._lock:
+            self._successes += 1
+            if self._limit < self.max_limit:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+                self._wake_waiters_locked()
+
+    def on_throttle(self) -> None:
+        """Multiplicative decrease, at most once per cooldown window"""
+        with self._lock:
+            self._throttles += 1
+            now = time.monotonic()
+            if now - self._last_decrease < self.decrease_cooldown:
+                return
+            self._last_decrease = now
+            previous = self.limit
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        logger.warning(f"[{self.name}] Throttled, concurrency {previous} -> {self.limit}")
+
+    async def call(
+        self,
+        make_call: Callable[[], Awaitable[Any]],
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+    ) -> Any:
+        """
+        Run make_call() under the limiter, retrying throttled attempts
+
+        Args:
+            make_call: Zero-argument function returning a fresh awaitable per attempt
+            max_retries: Throttle retries before the error is raised
+            base_delay: Initial backoff in seconds (doubled per retry, with jitter)
+
+        Returns:
+            The awaited result of make_call()
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self:
+                    return await make_call()
+            except Exception as e:
+                if not is_throttling_error(e) or attempt >= max_retries:
+                    raise
+                delay = base_delay * (2 ** attempt) * (0.5 + random.random())
+                attempt += 1
+                logger.info(f"[{self.name}] Retry {attempt}/{max_retries} in {delay:.2f}s after throttle")
+                await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics"""
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "successes": self._successes,
+                "throttles": self._throttles,
+            }
+
+    async def __aenter__(self) -> "AdaptiveConcurrencyLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc is None:
+                self.on_success()
+            elif is_throttling_error(exc):
+                self.on_throttle()
+        finally:
+            self.release()
+
+    def _wake_waiters_locked(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            loop, future = self._waiters.popleft()
+            self._in_flight += 1
+            try:
+                loop.call_soon_threadsafe(self._grant, future)
+            except RuntimeError:
+                # Waiter's event loop is closed; nobody will take this slot
+                self._in_flight -= 1
+
+    def _grant(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            self.release()
+        elif not future.done():
+            future.set_result(None)
@@ -0,0 +1,150 @@
+"""
+Sync -> async bridge for Strands @tool functions
+
+Strands calls tools synchronously, but our services are async. Instead of
+spinning up a new thread and event loop per tool call, coroutines are
+submitted to a small pool of long-lived event loops, each running in a daemon
+thread. Clients, sessions and connection pools created inside a loop survive
+across calls, and each call goes to the least busy loop, so a tool that still
+blocks its loop (service start-up, sync parsing) does not hold up the others.
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+from typing import Any, Awaitable, Callable, List, Optional, Union
+
+from app.mutil_agent.config import ASYNC_BRIDGE_LOOPS
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundEventLoop:
+    """A persistent event loop running in a dedicated daemon thread"""
+
+    def __init__(self, name: str = "async-bridge"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.pending = 0  # Calls submitted and not yet returned
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The bridge loop, started on first access"""
+        if self._loop is None or self._loop.is_closed():
+            with self._lock:
+                if self._loop is None or self._loop.is_closed():
+                    self._start()
+        return self._loop
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+        logger.info(f"[ASYNC_BRIDGE] Started background event loop '{self.name}'")
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the bridge loop and block until it completes
+
+        Args:
+            coro: Coroutine to execute
+            timeout: Seconds to wait for the result (None = wait indefinitely)
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the bridge loop itself (would deadlock)
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("run() cannot be called from the bridge event loop thread")
+
+        loop = self.loop
+        with self._lock:
+            self.pending += 1
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    @property
+    def thread(self) -> Optional[threading.Thread]:
+        return self._thread
+
+    def shutdown(self) -> None:
+        """Stop the loop and join its thread"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+
+class BridgePool:
+    """A fixed set of bridge loops; each call runs on the loop with the fewest pending calls"""
+
+    def __init__(self, size: int, name: str = "async-bridge"):
+        self._bridges: List[BackgroundEventLoop] = [
+            BackgroundEventLoop(name=f"{name}-{index}") for index in range(max(1, size))
+        ]
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the least busy loop and block until it completes"""
+        current = threading.current_thread()
+        # Called from a bridge loop: stay on it so run() raises rather than blocking that loop on another
+        bridge = next((b for b in self._bridges if b.thread is current), None)
+        bridge = bridge or min(self._bridges, key=lambda b: b.pending)
+        return bridge.run(coro, timeout=timeout)
+
+    def shutdown(self) -> None:
+        for bridge in self._bridges:
+            bridge.shutdown()
+
+
+_bridge = BridgePool(ASYNC_BRIDGE_LOOPS, name="strands-async-bridge")
+
+
+def run_sync(
+    awaitable: Union[Awaitable[Any], Callable[[], Awaitable[Any]]],
+    timeout: Optional[float] = None,
+) -> Any:
+    """
+    Run async code from a synchronous context on the least busy bridge loop
+
+    Args:
+        awaitable: A coroutine, or a zero-argument async function
+        timeout: Seconds to wait for the result (None = wait indefinitely)
+
+    Returns:
+        The coroutine's result
+    """
+    coro = awaitable() if not inspect.isawaitable(awaitable) else awaitable
+    return _bridge.run(coro, timeout=timeout)
+
+
+def shutdown_bridge() -> None:
+    """Stop the bridge loops (called on application shutdown)"""
+    _bridge.shutdown()
@@ -0,0 +1,216 @@
+"""
+LLM token and latency accounting
+Records every model invocation (BedrockService calls and Strands agent runs)
+with its input/output tokens, model ID, latency and time to first token,
+tagged by the calling agent and the HTTP route of the current request.
+
+- Rollups per (agent, route, model) are kept in memory and served by
+  GET /v1/agents/usage, sorted by tokens or seconds spent.
+- The same numbers are exported on /metrics as kmult_llm_* counters and
+  histograms.
+- The agent is the label of the BedrockService that made the call (or the
+  name given to record_strands_call); the route comes from the request trace.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.mutil_agent.utils.metrics import get_metrics_registry
+from app.mutil_agent.utils.tracing import current_span, current_trace
+
+UNATTRIBUTED = "unattributed"
+
+_metrics = get_metrics_registry()
+LLM_CALLS = _metrics.counter(
+    "kmult_llm_calls_total", "Model invocations", ("agent", "route", "model", "outcome")
+)
+LLM_TOKENS = _metrics.counter(
+    "kmult_llm_tokens_total", "Model tokens by direction", ("agent", "route", "model", "direction")
+)
+LLM_LATENCY = _metrics.histogram(
+    "kmult_llm_latency_seconds", "Model invocation latency", ("agent", "route", "model")
+)
+LLM_TIME_TO_FIRST_TOKEN = _metrics.histogram(
+    "kmult_llm_time_to_first_token_seconds", "Time to the first streamed token", ("agent", "route", "model")
+)
+
+
+def resolve_agent(agent: Optional[str] = None) -> str:
+    return agent or UNATTRIBUTED
+
+
+def current_route() -> str:
+    request_trace = current_trace()
+    return request_trace.route if request_trace is not None and request_trace.route else "background"
+
+
+@dataclass
+class UsageTotals:
+    """Accumulated usage of one (agent, route, model)"""
+    calls: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_seconds: float = 0.0
+    ttft_seconds: float = 0.0
+    ttft_samples: int = 0
+
+    def add(self, other: "UsageTotals") -> None:
+        self.calls += other.calls
+        self.errors += other.errors
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.latency_seconds += other.latency_seconds
+        self.ttft_seconds += other.ttft_seconds
+        self.ttft_samples += other.ttft_samples
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.input_tokens + self.output_tokens,
+            "latency_seconds": round(self.latency_seconds, 3),
+            "avg_latency_seconds": round(self.latency_seconds / self.calls, 3) if self.calls else 0.0,
+            "avg_time_to_first_token_seconds": (
+                round(self.ttft_seconds / self.ttft_samples, 3) if self.ttft_samples else None
+            ),
+        }
+
+
+class LLMUsageTracker:
+    """In-memory rollups of model usage per (agent, route, model)"""
+
+    GROUP_FIELDS = ("agent", "route", "model")
+    SORT_KEYS = ("total_tokens", "input_tokens", "output_tokens", "latency_seconds", "calls")
+
+    def __init__(self):
+        self._totals: Dict[Tuple[str, str, str], UsageTotals] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(
+        self,
+        agent: str,
+        model_id: str,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        latency: float = 0.0,
+        time_to_first_token: Optional[float] = None,
+        outcome: str = "ok",
+        route: Optional[str] = None,
+    ) -> None:
+        """Record one model invocation"""
+        route = route or current_route()
+        model_id = model_id or "unknown"
+        labels = {"agent": agent, "route": route, "model": model_id}
+
+        LLM_CALLS.inc(outcome=outcome, **labels)
+        LLM_TOKENS.inc(input_tokens, direction="input", **labels)
+        LLM_TOKENS.inc(output_tokens, direction="output", **labels)
+        LLM_LATENCY.observe(latency, **labels)
+        if time_to_first_token is not None:
+            LLM_TIME_TO_FIRST_TOKEN.observe(time_to_first_token, **labels)
+
+        sample = UsageTotals(
+            calls=1,
+            errors=0 if outcome == "ok" else 1,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency_seconds=latency,
+            ttft_seconds=time_to_first_token or 0.0,
+            ttft_samples=0 if time_to_first_token is None else 1,
+        )
+        with self._lock:
+            self._totals.setdefault((agent, route, model_id), UsageTotals()).add(sample)
+
+        parent = current_span()
+        if parent is not None:
+            parent.set_attribute("llm.input_tokens", parent.attributes.get("llm.input_tokens", 0) + input_tokens)
+            parent.set_attribute("llm.output_tokens", parent.attributes.get("llm.output_tokens", 0) + output_tokens)
+
+    def rollup(self, group_by: Tuple[str, ...] = GROUP_FIELDS, sort_by: str = "total_tokens") -> List[Dict[str, Any]]:
+        """
+        Usage grouped by a subset of agent/route/model
+
+        Args:
+            group_by: Fields to group by (e.g. ("agent",) for per-agent totals)
+            sort_by: One of SORT_KEYS; rows are sorted descending
+
+        Returns:
+            One dict per group with the grouping fields and the usage totals
+        """
+        unknown = [name for name in group_by if name not in self.GROUP_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown group_by fields {unknown}, expected a subset of {self.GROUP_FIELDS}")
+        if sort_by not in self.SORT_KEYS:
+            raise ValueError(f"Unknown sort_by {sort_by!r}, expected one of {self.SORT_KEYS}")
+
+        groups: Dict[Tuple[str, ...], UsageTotals] = {}
+        with self._lock:
+            for key, totals in self._totals.items():
+                values = dict(zip(self.GROUP_FIELDS, key))
+                group_key = tuple(values[name] for name in group_by)
+                groups.setdefault(group_key, UsageTotals()).add(totals)
+
+        rows = [{**dict(zip(group_by, key)), **totals.to_dict()} for key, totals in groups.items()]
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows
+
+
+def langchain_token_usage(message: Any) -> Tuple[int, int]:
+    """(input, output) tokens from a LangChain message's usage_metadata"""
+    usage = getattr(message, "usage_metadata", None) or {}
+    return int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0)
+
+
+def record_strands_call(agent: str, strands_agent: Any, prompt: Any, **kwargs) -> Any:
+    """
+    Invoke a Strands agent and record its model usage
+
+    Token counts come from the AgentResult's event loop metrics (accumulated
+    over all model calls of the run); nested agents invoked by its tools
+    record their own usage.
+    """
+    model_config = getattr(getattr(strands_agent, "model", None), "config", None) or {}
+    model_id = model_config.get("model_id", "unknown") if isinstance(model_config, dict) else "unknown"
+    tracker = get_llm_usage_tracker()
+    started = time.perf_counter()
+    try:
+        result = strands_agent(prompt, **kwargs)
+    except Exception:
+        tracker.record(agent, model_id, latency=time.perf_counter() - started, outcome="error")
+        raise
+
+    metrics = getattr(result, "metrics", None)
+    usage = getattr(metrics, "accumulated_usage", None) or {}
+    tracker.record(
+        agent,
+        model_id,
+        input_tokens=int(usage.get("inputTokens") or 0),
+        output_tokens=int(usage.get("outputTokens") or 0),
+        latency=time.perf_counter() - started,
+    )
+    return result
+
+
+_llm_usage_tracker: Optional[LLMUsageTracker] = None
+_llm_usage_tracker_lock = threading.Lock()
+
+
+def get_llm_usage_tracker() -> LLMUsageTracker:
+    """
+    Get the process-wide LLM usage tracker
+
+    Returns:
+        LLMUsageTracker fed by BedrockService and the Strands agents
+    """
+    global _llm_usage_tracker
+    if _llm_usage_tracker is None:
+        with _llm_usage_tracker_lock:
+            if _llm_usage_tracker is None:
+                _llm_usage_tracker = LLMUsageTracker()
+    return _llm_usage_tracker
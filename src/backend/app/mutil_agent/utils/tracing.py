@@ -0,0 +1,232 @@
+"""
+Lightweight span tracing for request pipelines
+Times the stages of a request (PDF parsing, OCR, classification, knowledge
+base retrieval, LLM calls, ...) without needing a tracing collector.
+
+- span("stage") works as a (sync or async) context manager, traced("stage")
+  as a decorator for sync/async functions and async generators.
+- Every finished span is observed in the kmult_stage_duration_seconds
+  histogram (rendered on /metrics) and attached to the current request trace,
+  which the middleware reports in the Server-Timing response header.
+- Identifiers follow OpenTelemetry/W3C Trace Context (128-bit trace id,
+  64-bit span id, traceparent header), and when the opentelemetry API is
+  installed each span is mirrored as an OpenTelemetry span so a configured
+  SDK/exporter picks it up.
+"""
+
+import functools
+import inspect
+import logging
+import re
+import secrets
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from app.mutil_agent.utils.metrics import get_metrics_registry
+
+try:
+    from opentelemetry import trace as _otel_trace
+except ImportError:  # Optional: spans are still timed and exported as metrics
+    _otel_trace = None
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+STAGE_DURATION = get_metrics_registry().histogram(
+    "kmult_stage_duration_seconds",
+    "Duration of traced pipeline stages",
+    ("stage", "outcome"),
+)
+
+
+@dataclass
+class Span:
+    """One timed stage of a request"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    end: Optional[float] = None
+    outcome: str = "ok"
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "duration_ms": round(self.duration * 1000, 2),
+            "outcome": self.outcome,
+            "attributes": self.attributes,
+        }
+
+
+@dataclass
+class Trace:
+    """Spans finished while handling one request"""
+    trace_id: str
+    parent_id: Optional[str] = None  # Remote parent from an incoming traceparent header
+    route: Optional[str] = None  # Route template of the request, set by the middleware
+    spans: List[Span] = field(default_factory=list)
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Total seconds per stage name, in order of first completion"""
+        totals: Dict[str, float] = {}
+        for finished in self.spans:
+            totals[finished.name] = totals.get(finished.name, 0.0) + finished.duration
+        return totals
+
+    def server_timing(self, max_entries: int = 20) -> str:
+        """Server-Timing header value (durations in ms)"""
+        entries = [
+            f"{re.sub(r'[^A-Za-z0-9_.-]', '_', name)};dur={seconds * 1000:.1f}"
+            for name, seconds in list(self.stage_totals().items())[:max_entries]
+        ]
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("kmult_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("kmult_span", default=None)
+
+
+def start_trace(traceparent: Optional[str] = None) -> Trace:
+    """
+    Start a request trace in the current context
+
+    Args:
+        traceparent: Incoming W3C traceparent header; its trace id is continued
+
+    Returns:
+        The new Trace (spans finished in this context are added to it)
+    """
+    match = _TRACEPARENT.match(traceparent.strip().lower()) if traceparent else None
+    if match:
+        request_trace = Trace(trace_id=match.group(1), parent_id=match.group(2))
+    else:
+        request_trace = Trace(trace_id=secrets.token_hex(16))
+    _current_trace.set(request_trace)
+    _current_span.set(None)
+    return request_trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def traceparent_header(request_trace: Trace, span_id: Optional[str] = None) -> str:
+    """W3C traceparent value for propagating the trace to a downstream call or back to the client"""
+    return f"00-{request_trace.trace_id}-{span_id or secrets.token_hex(8)}-01"
+
+
+class span:
+    """
+    Time a pipeline stage
+
+    Usage:
+        with span("compliance.classify", document_type=dt):
+            ...
+        async with span("bedrock.invoke", model_id=model_id) as s:
+            s.set_attribute("prompt_chars", len(prompt))
+    """
+
+    def __init__(self, name: str, **attributes: Any):
+        self.name = name
+        self.attributes = attributes
+        self._span: Optional[Span] = None
+        self._token = None
+        self._otel = None
+
+    def __enter__(self) -> Span:
+        parent = _current_span.get()
+        request_trace = _current_trace.get()
+        trace_id = parent.trace_id if parent else (request_trace.trace_id if request_trace else secrets.token_hex(16))
+        parent_id = parent.span_id if parent else (request_trace.parent_id if request_trace else None)
+        self._span = Span(
+            name=self.name,
+            trace_id=trace_id,
+            span_id=secrets.token_hex(8),
+            parent_id=parent_id,
+            start=time.perf_counter(),
+            attributes=dict(self.attributes),
+        )
+        self._token = _current_span.set(self._span)
+        if _otel_trace is not None:
+            self._otel = _otel_trace.get_tracer(__name__).start_as_current_span(self.name, attributes=self.attributes)
+            self._otel.__enter__()
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        finished = self._span
+        finished.end = time.perf_counter()
+        if exc_type is not None:
+            finished.outcome = "error" if issubclass(exc_type, Exception) else "cancelled"
+            finished.attributes.setdefault("error", exc_type.__name__)
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Finished in another context (e.g. an async generator closed by a different task)
+            pass
+        if self._otel is not None:
+            self._otel.__exit__(exc_type, exc, tb)
+
+        STAGE_DURATION.observe(finished.duration, stage=finished.name, outcome=finished.outcome)
+        request_trace = _current_trace.get()
+        if request_trace is not None and request_trace.trace_id == finished.trace_id:
+            request_trace.spans.append(finished)
+        return False
+
+    async def __aenter__(self) -> Span:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """
+    Decorator running a function (sync, async or async generator) inside a span
+
+    Args:
+        name: Stage name (defaults to the function's qualified name)
+        attributes: Static span attributes
+    """
+    def decorator(func: Callable) -> Callable:
+        stage = name or func.__qualname__
+
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def async_gen_wrapper(*args, **kwargs):
+                async with span(stage, **attributes):
+                    async for item in func(*args, **kwargs):
+                        yield item
+            return async_gen_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                async with span(stage, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compliance field extraction, legacy vs compiled engine
+
+Extracts text from the sample trade documents in data/ (PyPDF2), then times
+the original per-pattern implementation of
+ComplianceValidationService._extract_fields_flexible against
+FieldExtractionEngine and checks both return the same fields.
+
+Long L/C bundles are emulated with --scale (text repeated N times).
+
+Usage:
+    python tests/benchmarks/bench_compliance_extraction.py [--data-dir data] [--scale 1 20] [--repeat 5]
+"""
+
+import argparse
+import re
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src" / "backend"))
+
+from app.mutil_agent.services.compliance_classifier import get_document_classifier  # noqa: E402
+from app.mutil_agent.services.compliance_config import ComplianceConfig  # noqa: E402
+from app.mutil_agent.services.compliance_extractor import get_field_extraction_engine  # noqa: E402
+
+
+def legacy_extract_fields(text: str, document_type: str) -> dict:
+    """The pre-engine implementation, kept verbatim as the reference"""
+    config = ComplianceConfig
+    fields = {}
+
+    for field_type, patterns in config.FIELD_PATTERNS.items():
+        extracted_values = []
+
+        for pattern in patterns:
+            matches = re.findall(pattern, text, re.IGNORECASE)
+            for match in matches:
+                if isinstance(match, tuple):
+                    if field_type == "dates":
+                        date_parts = [str(x) for x in match if str(x).isdigit()]
+                        if len(date_parts) >= 3:
+                            extracted_values.append('/'.join(date_parts[:3]))
+                    elif field_type == "amounts":
+                        extracted_values.append(' '.join(str(x) for x in match if str(x).strip()))
+                    elif field_type == "reference_numbers":
+                        if len(match) >= 2:
+                            extracted_values.append(f"{match[0].strip()}: {match[1].strip()}")
+                else:
+                    extracted_values.append(str(match).strip())
+
+        if extracted_values:
+            fields[field_type] = list(dict.fromkeys(extracted_values))[:5]
+
+    if document_type in config.DOCUMENT_SPECIFIC_FIELDS:
+        for field_name, patterns in config.DOCUMENT_SPECIFIC_FIELDS[document_type].items():
+            for pattern in patterns:
+                match = re.search(pattern, text, re.IGNORECASE)
+                if match:
+                    try:
+                        field_value = match.groups()[-1].strip() if match.groups() else match.group(0).strip()
+                    except IndexError:
+                        field_value = match.group(0).strip()
+                    if field_value:
+                        fields[field_name] = field_value
+                        break
+
+    return fields
+
+
+def extract_pdf_text(path: Path) -> str:
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(BytesIO(path.read_bytes()))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def best_time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", type=Path, default=REPO_ROOT / "data", help="Directory with sample PDFs")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 20], help="Repeat each document's text N times")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    pdfs = sorted(args.data_dir.glob("*.pdf"))
+    if not pdfs:
+        sys.exit(f"No PDFs found in {args.data_dir}")
+
+    print(f"{'document':<28} {'type':<20} {'scale':>5} {'chars':>9} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8}")
+    for pdf in pdfs:
+        base_text = extract_pdf_text(pdf)
+        document_type = get_document_classifier().classify(base_text).document_type
+        engine = get_field_extraction_engine(document_type)
+
+        for scale in args.scale:
+            text = "\n".join([base_text] * scale)
+            expected = legacy_extract_fields(text, document_type)
+            actual = engine.extract(text)
+            if actual != expected:
+                print(f"  MISMATCH in {pdf.name} x{scale}:\n    legacy: {expected}\n    engine: {actual}")
+
+            legacy_s = best_time(lambda: legacy_extract_fields(text, document_type), args.repeat)
+            engine_s = best_time(lambda: engine.extract(text), args.repeat)
+            print(
+                f"{pdf.name[:28]:<28} {document_type[:20]:<20} {scale:>5} {len(text):>9,} "
+                f"{legacy_s * 1000:>10.2f} {engine_s * 1000:>10.2f} {legacy_s / engine_s:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark: state reads at the start of a follow-up chat turn
+
+Before the first token of a follow-up turn the conversation flow loads the
+latest checkpoint of the thread and the recent message window. This measures
+those reads per follow-up turn (and DynamoDB reads per turn, first turns
+included) with the hot conversation cache disabled, enabled with hit
+validation (CONVERSATION_CACHE_VALIDATE, the multi-worker default) and
+enabled without it, against DynamoDB with an artificial round-trip latency
+per request.
+
+Without the cache every turn loads and decodes the checkpoint and the
+message window. Validation replaces that with keys-only queries; without
+validation a conversation active on the same worker makes no DynamoDB
+requests at all.
+
+Usage:
+    python tests/benchmarks/bench_conversation_cache.py [--conversations 20] [--turns 10] [--latency-ms 15]
+    python tests/benchmarks/bench_conversation_cache.py --endpoint-url http://localhost:8000 --latency-ms 0
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src" / "backend"))
+
+
+def configure_environment(args) -> None:
+    # Must happen before app.mutil_agent.config is imported
+    template = REPO_ROOT / "src" / "backend" / "app" / "mutil_agent" / ".env-template"
+    for line in template.read_text().splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            os.environ.setdefault(key.strip(), value.strip().strip('"') or "0")
+    os.environ.update({
+        "AWS_REGION": "us-east-1",
+        "AWS_ACCESS_KEY_ID": os.environ.get("AWS_ACCESS_KEY_ID") or "testing",
+        "AWS_SECRET_ACCESS_KEY": os.environ.get("AWS_SECRET_ACCESS_KEY") or "testing",
+        "AWS_SESSION_TOKEN": "",
+        "DYNAMODB_ENDPOINT_URL": args.endpoint_url or "",
+        "MESSAGES_LIMIT": str(args.messages_limit),
+        "DYNAMODB_MESSAGE_TABLE": f"bench-messages-{uuid.uuid4().hex[:8]}",
+        "DYNAMODB_CHECKPOINT_TABLE": f"bench-checkpoints-{uuid.uuid4().hex[:8]}",
+        "DYNAMODB_WRITES_TABLE": f"bench-writes-{uuid.uuid4().hex[:8]}",
+    })
+
+
+async def conversation(saver_cls, message_cls, message_types, turns: int, messages_limit: int):
+    """Run `turns` turns of one conversation; returns the state read time of each follow-up turn"""
+    from langgraph.checkpoint.base import empty_checkpoint
+
+    conversation_id = uuid.uuid4()
+    history_types = [message_types.HUMAN, message_types.AI, message_types.HIDDEN]
+    config = {"configurable": {"thread_id": str(conversation_id), "checkpoint_ns": ""}}
+    read_times = []
+    for turn in range(turns):
+        await message_cls(conversation_id=conversation_id, message=f"Question {turn}", type=message_types.HUMAN).save(
+            durable=True
+        )
+        saver = saver_cls()  # One saver per /chat call, as in conversation_checkpointer_context
+        started = time.perf_counter()
+        await saver.aget_tuple({"configurable": {"thread_id": str(conversation_id)}})
+        history = await message_cls.find_by_conversation(conversation_id, history_types, limit=messages_limit)
+        if turn:
+            read_times.append(time.perf_counter() - started)
+
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": [message.message for message in history]}
+        config = await saver.aput(config, checkpoint, {"step": turn}, {})
+        await message_cls(conversation_id=conversation_id, message=f"Answer {turn}", type=message_types.AI).save()
+    return read_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=20, help="Concurrent conversations")
+    parser.add_argument("--turns", type=int, default=10, help="Turns per conversation")
+    parser.add_argument("--messages-limit", type=int, default=20, help="MESSAGES_LIMIT (history window)")
+    parser.add_argument("--latency-ms", type=float, default=15.0, help="Artificial round trip per request")
+    parser.add_argument("--endpoint-url", help="DynamoDB Local endpoint (default: in-process moto)")
+    args = parser.parse_args()
+    configure_environment(args)
+
+    mock = None
+    if not args.endpoint_url:
+        from moto import mock_aws
+        mock = mock_aws()
+        mock.start()
+
+    from app.mutil_agent.databases import dynamodb, dynamodb_conversation_cache, dynamodb_message_ops
+    from app.mutil_agent.databases.dynamodb import AsyncDynamoDBSaverCustom, create_tables_if_not_exist
+    from app.mutil_agent.databases.dynamodb_utils import get_dynamodb_client
+    from app.mutil_agent.models.message_dynamodb import MessageDynamoDB, MessageTypesDynamoDB
+
+    reads = []
+
+    def round_trip(model, **_):
+        if model.name in ("GetItem", "Query"):
+            reads.append(model.name)
+        if args.latency_ms > 0:
+            time.sleep(args.latency_ms / 1000)
+
+    async def setup():
+        await create_tables_if_not_exist()
+        await MessageDynamoDB.create_table_if_not_exists()
+
+    asyncio.run(setup())
+    get_dynamodb_client().meta.events.register("before-call.dynamodb.*", round_trip)
+    if MessageDynamoDB.get_client() is not get_dynamodb_client():
+        MessageDynamoDB.get_client().meta.events.register("before-call.dynamodb.*", round_trip)
+
+    async def run_mode():
+        results = await asyncio.gather(*(
+            conversation(
+                AsyncDynamoDBSaverCustom, MessageDynamoDB, MessageTypesDynamoDB, args.turns, args.messages_limit
+            )
+            for _ in range(args.conversations)
+        ))
+        return [sample for samples in results for sample in samples]
+
+    print(f"{args.conversations} conversations x {args.turns} turns, {args.latency_ms:g} ms per request, "
+          f"{'moto' if mock else args.endpoint_url}")
+    print(f"{'cache':>10} {'p50 ms':>8} {'p95 ms':>8} {'reads/turn':>11}")
+    for name, enabled, validate in (("disabled", False, True), ("validated", True, True), ("enabled", True, False)):
+        dynamodb_conversation_cache.CONVERSATION_CACHE_ENABLED = enabled
+        dynamodb.CONVERSATION_CACHE_VALIDATE = dynamodb_message_ops.CONVERSATION_CACHE_VALIDATE = validate
+        dynamodb_conversation_cache._conversation_cache = None
+        reads.clear()
+        times = sorted(asyncio.run(run_mode()))
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        print(
+            f"{name:>10} {statistics.median(times) * 1000:>8.2f} {p95 * 1000:>8.2f} "
+            f"{len(reads) / (args.conversations * args.turns):>11.2f}"
+        )
+
+    if mock is not None:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark DocumentChunkingHelper on large synthetic banking documents
+
+Generates 1 MB and 10 MB Vietnamese/English trade-finance documents and
+times both chunkers (structure-aware and sentence-based). Per-MB time should
+stay roughly constant between sizes if chunking scales linearly.
+
+Usage:
+    python tests/benchmarks/bench_document_chunking.py [--sizes 1 10] [--repeat 3]
+"""
+
+import argparse
+import importlib.util
+import random
+import time
+from pathlib import Path
+
+MODULE_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "src" / "backend" / "app" / "mutil_agent" / "helpers" / "document_chunking_helper.py"
+)
+
+SECTION_TITLES = [
+    "Điều {n}: Điều kiện thanh toán",
+    "Điều {n}: Chứng từ xuất trình",
+    "Section {n}: Letter of Credit Terms",
+    "Điều {n}: Bảo lãnh ngân hàng",
+    "Section {n}: Shipment Details",
+]
+
+SENTENCES = [
+    "Ngân hàng phát hành cam kết thanh toán số tiền {amount} USD khi nhận được bộ chứng từ hợp lệ.",
+    "Thư tín dụng số LC{ref} có hiệu lực đến ngày {day:02d}/{month:02d}/2025 tại Việt Nam.",
+    "The beneficiary shall present a full set of clean on board bills of lading within 21 days after shipment.",
+    "Hóa đơn thương mại phải được ký bởi người thụ hưởng và ghi rõ mô tả hàng hóa theo hợp đồng.",
+    "Partial shipments are allowed, transhipment is not allowed under UCP 600.",
+    "Khách hàng {ref} đề nghị giải ngân khoản vay {amount} VND để bổ sung vốn lưu động!",
+    "Is the insurance certificate issued for 110% of the CIF value?",
+    "Phí thông báo và phí sửa đổi do người thụ hưởng chịu, lãi suất {rate}% mỗi năm.",
+]
+
+
+def load_chunking_helper():
+    """Load the helper module directly so the benchmark does not need AWS dependencies"""
+    spec = importlib.util.spec_from_file_location("document_chunking_helper", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.DocumentChunkingHelper
+
+
+def generate_banking_document(target_bytes: int, seed: int = 42) -> str:
+    """Build a structured banking document of roughly target_bytes (UTF-8)"""
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    section = 1
+
+    while size < target_bytes:
+        title = rng.choice(SECTION_TITLES).format(n=section)
+        sentences = [
+            rng.choice(SENTENCES).format(
+                amount=rng.randint(10_000, 9_999_999),
+                ref=rng.randint(100000, 999999),
+                day=rng.randint(1, 28),
+                month=rng.randint(1, 12),
+                rate=round(rng.uniform(4, 12), 2),
+            )
+            for _ in range(rng.randint(4, 12))
+        ]
+        paragraph = f"{title}\n" + " ".join(sentences)
+        parts.append(paragraph)
+        size += len(paragraph.encode("utf-8")) + 2
+        section += 1
+
+    return "\n\n".join(parts)
+
+
+def time_chunker(chunk_fn, text: str, repeat: int):
+    """Return (best seconds, chunks) over repeat runs"""
+    best = float("inf")
+    chunks = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunks = chunk_fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best, chunks
+
+
+def check_offsets(text: str, chunks) -> None:
+    """Every chunk must be the exact slice of the source at its offsets"""
+    for chunk in chunks:
+        if text[chunk.start_pos:chunk.end_pos] != chunk.content:
+            raise AssertionError(f"Offset mismatch in chunk {chunk.chunk_id}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10], help="Document sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    helper = load_chunking_helper()()
+    results = {}
+
+    print(f"{'mode':<10} {'size':>6} {'chunks':>7} {'time (s)':>10} {'s/MB':>8}")
+    for size_mb in args.sizes:
+        text = generate_banking_document(size_mb * 1024 * 1024)
+        for mode, chunk_fn in (("structure", helper._chunk_by_structure), ("sentence", helper._chunk_by_sentences)):
+            seconds, chunks = time_chunker(chunk_fn, text, args.repeat)
+            check_offsets(text, chunks)
+            results[(mode, size_mb)] = seconds
+            print(f"{mode:<10} {size_mb:>4}MB {len(chunks):>7} {seconds:>10.3f} {seconds / size_mb:>8.3f}")
+
+    if len(args.sizes) >= 2:
+        small, large = min(args.sizes), max(args.sizes)
+        print()
+        for mode in ("structure", "sentence"):
+            ratio = results[(mode, large)] / results[(mode, small)]
+            print(f"{mode}: {large}MB/{small}MB time ratio = {ratio:.1f} (linear ≈ {large / small:.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Load test: concurrent chat turns against DynamoDB
+
+Each chat turn does what the conversation flow does per message: save the
+human message, load the conversation history, put a checkpoint plus its
+pending writes and save the AI reply. N turns run concurrently on one event
+loop, once with the blocking calls made inline on the loop (the previous
+behaviour) and once through the DynamoDB I/O executor.
+
+Reported per mode: wall time, turns/s, p50/p95 turn latency and the worst
+event loop stall (how late a 5 ms ticker woke up). With inline calls the
+turns serialize and the loop stalls for whole round trips; with the
+executor the wall time approaches a single turn's latency.
+
+By default runs in-process against moto with an artificial round-trip
+latency per request. moto's request handling shares the GIL with the event
+loop, so the executor's gain is understated there; point it at DynamoDB
+Local (or a real table) with --endpoint-url and --latency-ms 0 for
+realistic numbers.
+
+Usage:
+    python tests/benchmarks/bench_dynamodb_concurrency.py [--chats 50] [--latency-ms 15]
+    python tests/benchmarks/bench_dynamodb_concurrency.py --endpoint-url http://localhost:8000 --latency-ms 0
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src" / "backend"))
+
+
+def configure_environment(args) -> None:
+    # Must happen before app.mutil_agent.config is imported
+    template = REPO_ROOT / "src" / "backend" / "app" / "mutil_agent" / ".env-template"
+    for line in template.read_text().splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            os.environ.setdefault(key.strip(), value.strip().strip('"') or "0")
+    os.environ.update({
+        "AWS_REGION": "us-east-1",
+        "AWS_ACCESS_KEY_ID": os.environ.get("AWS_ACCESS_KEY_ID") or "testing",
+        "AWS_SECRET_ACCESS_KEY": os.environ.get("AWS_SECRET_ACCESS_KEY") or "testing",
+        "AWS_SESSION_TOKEN": "",
+        "DYNAMODB_ENDPOINT_URL": args.endpoint_url or "",
+        "DYNAMODB_MAX_POOL_CONNECTIONS": str(args.pool),
+        "DYNAMODB_MESSAGE_TABLE": f"bench-messages-{uuid.uuid4().hex[:8]}",
+        "DYNAMODB_CHECKPOINT_TABLE": f"bench-checkpoints-{uuid.uuid4().hex[:8]}",
+        "DYNAMODB_WRITES_TABLE": f"bench-writes-{uuid.uuid4().hex[:8]}",
+    })
+
+
+def add_round_trip_latency(client, latency: float) -> None:
+    """Sleep before every request, standing in for the network round trip"""
+    if latency > 0:
+        client.meta.events.register("before-call.dynamodb.*", lambda **_: time.sleep(latency))
+
+
+async def chat_turn(saver, message_cls, message_types, index: int) -> float:
+    started = time.perf_counter()
+    conversation_id = uuid.uuid4()
+    await message_cls(conversation_id=conversation_id, message=f"Question {index}", type=message_types.HUMAN).save()
+    await message_cls.find_by_conversation(conversation_id, [message_types.HUMAN, message_types.AI], limit=20)
+
+    config = {"configurable": {"thread_id": str(conversation_id), "checkpoint_ns": ""}}
+    checkpoint = {"v": 1, "id": str(uuid.uuid4()), "ts": "", "channel_values": {"messages": [f"Question {index}"]},
+                  "channel_versions": {}, "versions_seen": {}, "pending_sends": []}
+    saved = await saver.aput(config, checkpoint, {"step": 1}, {})
+    await saver.aput_writes(saved, [("messages", f"Answer {index}"), ("route", "chat")], task_id=str(index))
+
+    await message_cls(conversation_id=conversation_id, message=f"Answer {index}", type=message_types.AI).save()
+    return time.perf_counter() - started
+
+
+async def max_loop_stall(stop: asyncio.Event, interval: float = 0.005) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - expected)
+    return worst
+
+
+async def run_mode(chats: int):
+    from app.mutil_agent.databases import dynamodb_message_ops
+    from app.mutil_agent.databases.dynamodb import AsyncDynamoDBSaverCustom
+    from app.mutil_agent.models.message_dynamodb import MessageDynamoDB, MessageTypesDynamoDB
+
+    dynamodb_message_ops._message_operations = None  # Rebind to the current executor
+    saver = AsyncDynamoDBSaverCustom()
+    await chat_turn(saver, MessageDynamoDB, MessageTypesDynamoDB, -1)  # Warm up connections
+
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(max_loop_stall(stop))
+    started = time.perf_counter()
+    latencies = await asyncio.gather(
+        *(chat_turn(saver, MessageDynamoDB, MessageTypesDynamoDB, i) for i in range(chats))
+    )
+    wall = time.perf_counter() - started
+    stop.set()
+    return wall, sorted(latencies), await ticker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=50, help="Concurrent chat turns")
+    parser.add_argument("--latency-ms", type=float, default=15.0, help="Artificial round trip per request")
+    parser.add_argument("--pool", type=int, default=50, help="DYNAMODB_MAX_POOL_CONNECTIONS")
+    parser.add_argument("--endpoint-url", help="DynamoDB Local endpoint (default: in-process moto)")
+    args = parser.parse_args()
+    configure_environment(args)
+
+    mock = None
+    if not args.endpoint_url:
+        from moto import mock_aws
+        mock = mock_aws()
+        mock.start()
+
+    from app.mutil_agent.databases import dynamodb_executor
+    from app.mutil_agent.databases.dynamodb import create_tables_if_not_exist
+    from app.mutil_agent.databases.dynamodb_utils import get_dynamodb_client
+    from app.mutil_agent.models.message_dynamodb import MessageDynamoDB
+
+    class InlineExecutor(dynamodb_executor.DynamoDBExecutor):
+        """Blocking calls made directly on the event loop, as before the I/O executor"""
+
+        async def run(self, func, *args, **kwargs):
+            return func(*args, **kwargs)
+
+    async def setup():
+        await create_tables_if_not_exist()
+        await MessageDynamoDB.create_table_if_not_exists()
+
+    asyncio.run(setup())
+    client = get_dynamodb_client()
+    add_round_trip_latency(client, args.latency_ms / 1000)
+    add_round_trip_latency(MessageDynamoDB.get_client(), args.latency_ms / 1000)
+
+    print(f"{args.chats} concurrent chat turns, 5 requests each, {args.latency_ms:g} ms per request, "
+          f"{'moto' if mock else args.endpoint_url}")
+    print(f"{'mode':>9} {'wall s':>8} {'turns/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max loop stall ms':>18}")
+    modes = {
+        "inline": InlineExecutor(client=client, max_workers=1),
+        "executor": dynamodb_executor.DynamoDBExecutor(client=client, max_workers=args.pool),
+    }
+    for name, executor in modes.items():
+        dynamodb_executor._dynamodb_executor = executor
+        wall, latencies, stall = asyncio.run(run_mode(args.chats))
+        executor.shutdown(wait=True)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(
+            f"{name:>9} {wall:>8.2f} {args.chats / wall:>8.1f} {statistics.median(latencies) * 1000:>8.1f} "
+            f"{p95 * 1000:>8.1f} {stall * 1000:>18.1f}"
+        )
+
+    if mock is not None:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
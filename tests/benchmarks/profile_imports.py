@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of the backend application
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter (best
+of --repeat runs, after one warm-up run so bytecode compilation is not
+counted) and reports the total import time, the slowest top-level packages
+and the slowest individual modules. With --output the report is written as
+Markdown so startup cost can be tracked over time; --budget-ms turns it into
+a check that fails when the total exceeds the budget.
+
+Usage:
+    python tests/benchmarks/profile_imports.py [--module app.mutil_agent.main] [--top 25]
+        [--repeat 3] [--output docs/import-time-profile.md] [--budget-ms 3000]
+"""
+
+import argparse
+import os
+import platform
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+BACKEND_ROOT = REPO_ROOT / "src" / "backend"
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def run_importtime(module: str) -> List[ImportRecord]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(BACKEND_ROOT), os.environ.get("PYTHONPATH")])))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_ROOT, env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        tail = "\n".join(completed.stderr.strip().splitlines()[-5:])
+        sys.exit(f"Importing {module} failed:\n{tail}")
+
+    records = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def summarize(records: List[ImportRecord]) -> Dict[str, object]:
+    total_us = sum(r.self_us for r in records)
+    by_package: Dict[str, int] = defaultdict(int)
+    for record in records:
+        by_package[record.module.split(".")[0]] += record.self_us
+    return {
+        "total_us": total_us,
+        "modules": len(records),
+        "packages": sorted(by_package.items(), key=lambda item: -item[1]),
+        "slowest": sorted(records, key=lambda r: -r.self_us),
+    }
+
+
+def render_markdown(module: str, summary: Dict[str, object], top: int) -> str:
+    total_us = summary["total_us"]
+    lines = [
+        f"# Import-time profile: `{module}`",
+        "",
+        f"Generated {datetime.now(timezone.utc):%Y-%m-%d %H:%M UTC} with "
+        f"`python tests/benchmarks/profile_imports.py` (Python {platform.python_version()}, {platform.machine()}).",
+        "",
+        f"- Total import time: **{total_us / 1000:.1f} ms**",
+        f"- Modules imported: {summary['modules']}",
+        "",
+        f"## Top {top} packages (self time of all their modules)",
+        "",
+        "| package | ms | share |",
+        "|---|---:|---:|",
+    ]
+    for package, self_us in summary["packages"][:top]:
+        lines.append(f"| `{package}` | {self_us / 1000:.1f} | {self_us / total_us:.1%} |")
+    lines += [
+        "",
+        f"## Top {top} modules (self time)",
+        "",
+        "| module | self ms | cumulative ms |",
+        "|---|---:|---:|",
+    ]
+    for record in summary["slowest"][:top]:
+        lines.append(f"| `{record.module}` | {record.self_us / 1000:.1f} | {record.cumulative_us / 1000:.1f} |")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.mutil_agent.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=25, help="Rows per table")
+    parser.add_argument("--repeat", type=int, default=3, help="Measured runs (the fastest is reported)")
+    parser.add_argument("--output", type=Path, help="Write the Markdown report to this file")
+    parser.add_argument("--budget-ms", type=float, help="Exit with status 1 if the total exceeds this")
+    args = parser.parse_args()
+
+    run_importtime(args.module)  # Warm-up: compile bytecode, fill the OS file cache
+    summary = min(
+        (summarize(run_importtime(args.module)) for _ in range(args.repeat)),
+        key=lambda s: s["total_us"],
+    )
+    report = render_markdown(args.module, summary, args.top)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(report, encoding="utf-8")
+        print(f"Report written to {args.output}")
+    print(report)
+
+    total_ms = summary["total_us"] / 1000
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        sys.exit(f"Import time {total_ms:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
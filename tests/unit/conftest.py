@@ -0,0 +1,58 @@
+"""
+Unit test setup: make the backend importable and give app.mutil_agent.config
+the settings from .env-template (empty values become "0"), as the benchmarks do.
+AWS settings point at fake credentials so DynamoDB tests can run under moto.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT / "src" / "backend"))
+
+_template = REPO_ROOT / "src" / "backend" / "app" / "mutil_agent" / ".env-template"
+for _line in _template.read_text().splitlines():
+    _key, _sep, _value = _line.partition("=")
+    if _sep:
+        os.environ.setdefault(_key.strip(), _value.strip().strip('"') or "0")
+os.environ.update({
+    "AWS_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SESSION_TOKEN": "",
+    "DYNAMODB_ENDPOINT_URL": "",
+    "CHECKPOINT_S3_BUCKET": "",
+})
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    """In-process DynamoDB (moto) with the shared clients, executor and queues bound to it"""
+    mock_aws = pytest.importorskip("moto").mock_aws
+    from app.mutil_agent.databases import dynamodb_utils
+
+    with mock_aws():
+        # Clients bound to the mock
+        monkeypatch.setattr(dynamodb_utils, "_dynamodb_client", None, raising=False)
+        monkeypatch.setattr(dynamodb_utils, "_dynamodb_resource", None, raising=False)
+        from app.mutil_agent.databases import (
+            dynamodb_checkpoint_storage,
+            dynamodb_executor,
+            dynamodb_message_ops,
+            dynamodb_write_behind,
+        )
+        from app.mutil_agent.models.message_dynamodb import MessageDynamoDB
+        monkeypatch.setattr(dynamodb_executor, "_dynamodb_executor", None)
+        monkeypatch.setattr(dynamodb_checkpoint_storage, "_checkpoint_compactors", {})
+        monkeypatch.setattr(dynamodb_checkpoint_storage, "_s3_client", None)
+        monkeypatch.setattr(dynamodb_message_ops, "_message_operations", None)
+        monkeypatch.setattr(dynamodb_write_behind, "_message_write_queue", None)
+        monkeypatch.setattr(MessageDynamoDB, "_client", None, raising=False)
+        monkeypatch.setattr(MessageDynamoDB, "_resource", None, raising=False)
+        yield
+        queue = dynamodb_write_behind._message_write_queue
+        if queue is not None:
+            queue.close()
@@ -0,0 +1,44 @@
+"""Amount parsing of the presentation consistency engine"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.mutil_agent.services.compliance_consistency import parse_amount
+
+
+@pytest.mark.parametrize(
+    "raw, value, currency",
+    [
+        # Both separators: the last one is the decimal mark
+        ("USD 10,000.50", "10000.50", "USD"),
+        ("USD 12.500,00", "12500.00", "USD"),
+        ("10.000,50 VND", "10000.50", "VND"),
+        ("EUR 1.234,56", "1234.56", "EUR"),
+        ("USD 1,234,567.89", "1234567.89", "USD"),
+        ("EUR 1.234.567,89", "1234567.89", "EUR"),
+        # One separator followed by exactly 3 digits: thousands, whatever the currency
+        ("USD 100.000", "100000", "USD"),
+        ("USD 1,500", "1500", "USD"),
+        ("EUR 2.500", "2500", "EUR"),
+        ("10.000 VND", "10000", "VND"),
+        # Repeated separator: thousands
+        ("1.200.000 đồng", "1200000", "VND"),
+        ("USD 1,200,000", "1200000", "USD"),
+        # Otherwise a decimal mark
+        ("USD 10.50", "10.50", "USD"),
+        ("EUR 99,9", "99.9", "EUR"),
+        ("2,5 tỷ VND", "2500000000", "VND"),
+        ("5 triệu VND", "5000000", "VND"),
+        ("$ 48,000.00.", "48000.00", "USD"),
+        ("1234", "1234", None),
+    ],
+)
+def test_parse_amount(raw, value, currency):
+    amount = parse_amount(raw)
+    assert amount.value == Decimal(value)
+    assert amount.currency == currency
+
+
+def test_parse_amount_without_number():
+    assert parse_amount("USD") is None
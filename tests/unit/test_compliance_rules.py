@@ -0,0 +1,123 @@
+"""Rule pre-screen: only unambiguous evidence decides a document without the LLM"""
+
+from datetime import date
+
+from app.mutil_agent.services.compliance_rules import FAIL, PASS, UNRESOLVED, ComplianceRuleEngine
+
+INVOICE_FIELDS = {
+    "reference_numbers": ["Invoice: INV-001"],
+    "dates": ["01/03/2024"],
+    "seller": "ABC Export Co",
+    "buyer": "XYZ Import JSC",
+    "amounts": ["USD 48,000.00"],
+}
+
+
+def invoice(body: str) -> str:
+    return (
+        "COMMERCIAL INVOICE\nInvoice No: INV-001\nSeller: ABC Export Co\nBuyer: XYZ Import JSC\n"
+        f"Description of goods: 1000 cartons of coffee\n{body}\n"
+    )
+
+
+def amount_rule(text: str):
+    result = ComplianceRuleEngine(today=date(2024, 6, 1)).evaluate(text, "commercial_invoice", INVOICE_FIELDS)
+    rule = next(r for r in result.rules if r.rule == "amount:within_credit")
+    return rule, result
+
+
+def test_european_credit_amount_is_not_a_failure():
+    rule, result = amount_rule(invoice("L/C amount: USD 50.000,00\nTotal amount: USD 48,000.00"))
+    assert rule.status == PASS
+    assert not result.is_certain_failure
+
+
+def test_invoice_total_over_credit_fails():
+    rule, result = amount_rule(invoice("L/C amount: USD 40,000.00\nTotal: USD 48,000.00"))
+    assert rule.status == FAIL
+    assert result.is_certain_failure
+
+
+def test_line_items_are_not_the_invoice_amount():
+    rule, _ = amount_rule(invoice(
+        "L/C amount: USD 50,000.00\nItem 1 USD 30,000.00\nFreight USD 60,000.00 (paid by buyer)\nTotal: USD 48,000.00"
+    ))
+    assert rule.status == PASS
+
+
+def test_ambiguous_separator_is_unresolved():
+    rule, result = amount_rule(invoice("L/C amount: USD 50.000\nTotal: USD 48,000.00"))
+    assert rule.status == UNRESOLVED
+    assert not result.is_certain_failure
+
+
+def test_credit_amount_not_next_to_its_label_is_unresolved():
+    rule, result = amount_rule(invoice("L/C amount: see clause 32B, USD 40,000.00 deposit\nTotal: USD 48,000.00"))
+    assert rule.status == UNRESOLVED
+    assert not result.is_certain_failure
+
+
+def test_conflicting_totals_are_unresolved():
+    rule, _ = amount_rule(invoice("L/C amount: USD 50,000.00\nTotal: USD 48,000.00\nGrand total: USD 52,000.00"))
+    assert rule.status == UNRESOLVED
+
+
+def test_missing_label_is_left_to_the_llm():
+    text = (
+        "BILL OF LADING\nB/L No: BL-1\nShipper: ABC Export Co\nConsignee: to order\nVessel: Ever Given\n"
+        "POL: Ho Chi Minh City\nPOD: Rotterdam\nShipped on board 01/03/2024\n"
+    )
+    result = ComplianceRuleEngine(today=date(2024, 6, 1)).evaluate(text, "bill_of_lading", {"dates": ["01/03/2024"]})
+    port = next(r for r in result.rules if r.rule == "mandatory:port_loading")
+    assert port.status == UNRESOLVED
+    assert not result.is_certain_failure
+    assert not result.is_unreadable
+
+
+def rules_by_name(text: str, document_type: str, fields, today=date(2026, 10, 18)):
+    result = ComplianceRuleEngine(today=today).evaluate(text, document_type, fields)
+    return {r.rule: r for r in result.rules}, result
+
+
+def test_amount_the_extractor_missed_is_unresolved():
+    fields = {k: v for k, v in INVOICE_FIELDS.items() if k != "amounts"}
+    for body in ("Total amount: 48,000.00 US Dollars", "Grand total: 1.200.000.000 VNĐ"):
+        rules, result = rules_by_name(invoice(body), "commercial_invoice", fields)
+        assert rules["mandatory:amount"].status == UNRESOLVED
+        assert not result.is_certain_failure
+
+
+def test_amount_absent_from_the_text_fails():
+    text = "COMMERCIAL INVOICE\nSeller: ABC Export Co\nBuyer: XYZ Import JSC\nDescription of goods: coffee\n"
+    rules, result = rules_by_name(text, "commercial_invoice", {"seller": "ABC Export Co"})
+    assert rules["mandatory:amount"].status == FAIL
+    assert result.is_certain_failure
+
+
+def test_latest_date_of_shipment_is_not_the_document_date():
+    rules, result = rules_by_name(
+        invoice("Invoice date: 01/10/2026\nAs per L/C: latest date of shipment 15/12/2026\nTotal: USD 48,000.00"),
+        "commercial_invoice", INVOICE_FIELDS,
+    )
+    assert rules["date:not_future_dated"].status == PASS
+    assert not result.is_certain_failure
+
+
+def test_day_month_ambiguity_is_unresolved():
+    rules, result = rules_by_name(invoice("Invoice date: 10/11/2026\nTotal: USD 48,000.00"),
+                                  "commercial_invoice", INVOICE_FIELDS)
+    assert rules["date:not_future_dated"].status == UNRESOLVED
+    assert not result.is_certain_failure
+
+
+def test_unambiguous_future_date_fails():
+    rules, result = rules_by_name(invoice("Invoice date: 25/12/2026\nTotal: USD 48,000.00"),
+                                  "commercial_invoice", INVOICE_FIELDS)
+    assert rules["date:not_future_dated"].status == FAIL
+    assert result.is_certain_failure
+
+
+def test_credit_issued_after_expiry_fails_whatever_the_reading():
+    text = "LETTER OF CREDIT\nDate of issue: 05/06/2026\nExpiry date: 01/02/2026\n"
+    rules, _ = rules_by_name(text, "letter_of_credit", {"dates": ["05/06/2026"]})
+    assert rules["date:issue_before_expiry"].status == FAIL
@@ -0,0 +1,71 @@
+"""Checkpoint storage and compaction against DynamoDB (moto)"""
+
+import uuid
+
+import pytest
+
+pytest.importorskip("moto")
+
+from langgraph.checkpoint.base import empty_checkpoint  # noqa: E402
+
+from app.mutil_agent.databases.dynamodb import AsyncDynamoDBSaverCustom  # noqa: E402
+from app.mutil_agent.databases.dynamodb_checkpoint_storage import get_checkpoint_compactor  # noqa: E402
+from app.mutil_agent.databases.dynamodb_schema import create_table_if_not_exists  # noqa: E402
+from app.mutil_agent.databases.dynamodb_utils import get_dynamodb_client, get_dynamodb_resource  # noqa: E402
+
+
+async def create_tables(checkpoint_table: str, writes_table: str) -> None:
+    await create_table_if_not_exists(get_dynamodb_resource(), get_dynamodb_client(), checkpoint_table, "checkpoint")
+    await create_table_if_not_exists(get_dynamodb_resource(), get_dynamodb_client(), writes_table, "writes")
+
+
+async def put_checkpoints(saver, thread_id: str, count: int):
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    for step in range(count):
+        config = await saver.aput(config, empty_checkpoint(), {"step": step}, {})
+    return config
+
+
+@pytest.mark.asyncio
+async def test_compaction_uses_the_saver_tables(dynamodb):
+    await create_tables("custom-checkpoints", "custom-writes")
+    saver = AsyncDynamoDBSaverCustom("custom-checkpoints", "custom-writes")
+    compactor = get_checkpoint_compactor("custom-checkpoints", "custom-writes")
+    thread_id = str(uuid.uuid4())
+
+    await put_checkpoints(saver, thread_id, compactor.keep_latest + 3)
+
+    assert saver.compactor is compactor
+    assert compactor.get_stats()["pending_threads"] == 1
+    assert get_checkpoint_compactor().get_stats()["pending_threads"] == 0
+    assert (await saver.acompact(thread_id))["checkpoints"] == 3
+    remaining = [c async for c in saver.alist({"configurable": {"thread_id": thread_id}})]
+    assert len(remaining) == compactor.keep_latest
+
+
+@pytest.mark.asyncio
+async def test_rejected_put_leaves_no_header_or_blob(dynamodb):
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+    from app.mutil_agent.databases import dynamodb_checkpoint_storage
+    from app.mutil_agent.databases.dynamodb_checkpoint_storage import CheckpointStorage, get_checkpoint_s3_client
+
+    s3 = get_checkpoint_s3_client()
+    s3.create_bucket(Bucket="checkpoints")
+    storage = CheckpointStorage(JsonPlusSerializer(), mode="delta", s3_bucket="checkpoints", s3_offload_bytes=0)
+    await create_tables("good-checkpoints", "good-writes")
+    thread_id = str(uuid.uuid4())
+
+    rejected = AsyncDynamoDBSaverCustom("missing-checkpoints", "missing-writes", storage=storage)
+    checkpoint = empty_checkpoint()
+    with pytest.raises(Exception):
+        await rejected.aput({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}, checkpoint, {}, {})
+    assert s3.list_objects_v2(Bucket="checkpoints").get("KeyCount") == 0
+    assert dynamodb_checkpoint_storage._recall_header(("missing-checkpoints", thread_id, "", checkpoint["id"])) is None
+
+    saver = AsyncDynamoDBSaverCustom("good-checkpoints", "good-writes", storage=storage)
+    config = await put_checkpoints(saver, thread_id, 2)
+    assert s3.list_objects_v2(Bucket="checkpoints")["KeyCount"] == 2
+    assert dynamodb_checkpoint_storage._recall_header(
+        ("good-checkpoints", thread_id, "", config["configurable"]["checkpoint_id"])
+    )["kind"] == "delta"
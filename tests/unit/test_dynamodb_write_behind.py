@@ -0,0 +1,71 @@
+"""WriteBehindQueue flusher behaviour"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.mutil_agent.databases.dynamodb_write_behind import WriteBehindQueue
+
+
+class BlockingClient:
+    """batch_write_item waits for release() so a batch can be held in flight"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.released = threading.Event()
+        self.batches = []
+
+    def batch_write_item(self, RequestItems):
+        self.started.set()
+        self.released.wait(5)
+        self.batches.append(RequestItems)
+        return {}
+
+    def release(self):
+        self.released.set()
+
+
+def item(item_id: str) -> dict:
+    return {"id": {"S": item_id}, "message": {"S": f"message {item_id}"}}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_durable_put_does_not_stop_the_flusher():
+    client = BlockingClient()
+    queue = WriteBehindQueue(client, "messages", flush_interval=0.01)
+    try:
+        waiter = asyncio.create_task(queue.put(item("a"), wait=True))
+        assert await asyncio.to_thread(client.started.wait, 5)
+
+        # Client disconnect: the durable save is cancelled while its batch is in flight
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        client.release()
+
+        await asyncio.wait_for(queue.put(item("b"), wait=True), timeout=5)
+        assert await queue.flush(timeout=5)
+        stats = queue.get_stats()
+        assert stats["pending"] == 0 and stats["in_flight"] == 0
+        assert stats["written"] == 2 and stats["failed"] == 0
+        assert queue._thread.is_alive()
+    finally:
+        client.release()
+        queue.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_raised_to_durable_writers():
+    class FailingClient:
+        def batch_write_item(self, RequestItems):
+            raise RuntimeError("throttled")
+
+    queue = WriteBehindQueue(FailingClient(), "messages", flush_interval=0.01)
+    try:
+        with pytest.raises(RuntimeError, match="throttled"):
+            await queue.put(item("a"), wait=True)
+        assert await queue.flush(timeout=5)
+        assert queue.get_stats()["failed"] == 1
+    finally:
+        queue.close()
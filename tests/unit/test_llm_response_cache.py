@@ -0,0 +1,79 @@
+"""LLMResponseCache sharing and storing rules"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.mutil_agent.helpers.document_chunking_helper import DocumentChunkingHelper
+from app.mutil_agent.services.llm_response_cache import LLMResponseCache, MemoryLRUBackend
+
+
+class SlowBedrock:
+    model_id = "test-model"
+    temperature = 0.0
+    top_p = 1.0
+    max_tokens = 100
+
+    def __init__(self, response, delay: float = 0.0):
+        self.response = response
+        self.delay = delay
+        self.calls = 0
+
+    async def ai_ainvoke(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.response
+
+
+def extract(response) -> str:
+    return DocumentChunkingHelper()._extract_response_text(response)
+
+
+@pytest.mark.asyncio
+async def test_prompt_in_flight_on_another_loop_is_shared():
+    cache = LLMResponseCache(backend=MemoryLRUBackend())
+    bedrock = SlowBedrock(SimpleNamespace(content="summary"), delay=0.3)
+    started = threading.Event()
+    results = {}
+
+    def bridge_loop():
+        async def generate():
+            task = asyncio.ensure_future(cache.complete(bedrock, "prompt", extract))
+            await asyncio.sleep(0)
+            started.set()
+            results["bridge"] = await task
+        asyncio.run(generate())
+
+    thread = threading.Thread(target=bridge_loop)
+    thread.start()
+    assert await asyncio.to_thread(started.wait, 5)
+
+    assert await cache.complete(bedrock, "prompt", extract) == "summary"
+    await asyncio.to_thread(thread.join, 5)
+    assert results["bridge"] == "summary"
+    assert bedrock.calls == 1
+    assert cache.get_stats()["shared"] == 1
+
+
+@pytest.mark.parametrize("response", [
+    SimpleNamespace(content="   "),
+    {"content": ""},
+    SimpleNamespace(content=[{"type": "image"}]),
+])
+@pytest.mark.asyncio
+async def test_responses_without_text_raise_and_are_not_cached(response):
+    cache = LLMResponseCache(backend=MemoryLRUBackend())
+    with pytest.raises(ValueError):
+        await cache.complete(SlowBedrock(response), "prompt", extract)
+    assert cache.backend.size() == 0
+
+
+@pytest.mark.asyncio
+async def test_converse_content_blocks_are_joined_and_cached():
+    cache = LLMResponseCache(backend=MemoryLRUBackend())
+    bedrock = SlowBedrock(SimpleNamespace(content=[{"text": "Tóm tắt "}, {"text": "văn bản"}]))
+    assert await cache.complete(bedrock, "prompt", extract) == "Tóm tắt văn bản"
+    assert await cache.complete(bedrock, "prompt", extract) == "Tóm tắt văn bản"
+    assert bedrock.calls == 1
@@ -0,0 +1,22 @@
+"""Prompt compaction stays within budget and reports what it kept"""
+
+from app.mutil_agent.helpers.prompt_compaction import GAP_MARKER, PromptCompactor
+
+
+def test_oversized_paragraphs_fall_back_to_the_best_one_truncated():
+    compactor = PromptCompactor(token_budget=50, max_paragraph_chars=100_000)
+    text = "header " * 400 + "\n\n" + "evidence " * 400
+    evidence = text.index("evidence")
+
+    result = compactor.compact(text, [(evidence, evidence + 8, 3.0)])
+
+    assert result.paragraphs_selected == 1
+    assert result.text.startswith(GAP_MARKER) and "evidence" in result.text and "header" not in result.text
+    assert 0 < result.compacted_tokens <= result.token_budget
+    assert result.compression_ratio == round(result.compacted_tokens / result.original_tokens, 3)
+
+
+def test_text_within_budget_is_unchanged():
+    result = PromptCompactor(token_budget=1000).compact("short document", [])
+    assert result.text == "short document"
+    assert result.compression_ratio == 1.0